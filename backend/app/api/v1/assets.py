@@ -2,8 +2,10 @@
 Multi-tenant  asset management API endpoints.
 """
 from fastapi import APIRouter, Depends, HTTPException, status, Query, File, UploadFile, BackgroundTasks
-from typing import List, Dict, Any, Optional
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, List, Dict, Any, Optional
 from uuid import UUID
+import json
 import logging
 
 from ...core.dependencies import get_current_user
@@ -17,8 +19,10 @@ from ...schemas.assets import (
     EnhancedAssetScanRequest, EnhancedAssetScanResponse
 )
 from ...services.asset_service import asset_service
+from ...services.domain_ingestion import domain_ingestion_service
 from ...services.module_registry import module_registry
 from ...services.dns_service import dns_service
+from ...services.count_service import CountMode
 from ...schemas.dns import (
     DNSRecord, DNSRecordListResponse, DNSRecordWithAssetInfo, 
     PaginatedDNSResponse, PaginatedGroupedDNSResponse
@@ -415,12 +419,12 @@ async def get_scan_job_status_endpoint(
             if asset_id:
                 try:
                     # Count subdomains discovered
-                    subdomains_response = asset_service.supabase.table("subdomains").select(
+                    subdomains_response = await asset_service.supabase.table("subdomains").select(
                         "id", count="exact"
                     ).eq("asset_id", asset_id).execute()
                     
                     # Count DNS records
-                    dns_response = asset_service.supabase.table("dns_records").select(
+                    dns_response = await asset_service.supabase.table("dns_records").select(
                         "id", count="exact"
                     ).eq("asset_id", asset_id).execute()
                     
@@ -507,19 +511,14 @@ async def create_asset_with_domains(
         
         asset = await asset_service.create_asset(asset_create, current_user.id)
         
-        # Create apex domains
-        domains = []
-        for domain_name in asset_data.domains:
-            domain_create = ApexDomainCreate(
-                asset_id=asset.id,
-                domain=domain_name
-            )
-            domain = await asset_service.create_apex_domain(domain_create, current_user.id)
-            domains.append(domain)
+        # Bulk-insert apex domains (normalized, deduped, chunked)
+        ingestion = await domain_ingestion_service.ingest(str(asset.id), asset_data.domains)
+        domains = await asset_service.get_apex_domains(str(asset.id), current_user.id, include_stats=False)
         
         return {
             "asset": asset,
-            "domains": domains
+            "domains": domains,
+            "ingestion": ingestion
         }
         
     except Exception as e:
@@ -617,7 +616,7 @@ async def debug_subdomains_count(
             asset_ids = [asset.id for asset in assets]
             
             # Use the service's supabase client directly for debugging
-            asset_scan_jobs_response = asset_service.supabase.table("asset_scan_jobs").select(
+            asset_scan_jobs_response = await asset_service.supabase.table("asset_scan_jobs").select(
                 "id, asset_id, status, modules, total_domains"
             ).in_("asset_id", asset_ids).execute()
             
@@ -628,7 +627,7 @@ async def debug_subdomains_count(
                 asset_scan_job_ids = [job["id"] for job in asset_scan_jobs_response.data]
                 
                 # Count subdomains for these asset scan jobs
-                subdomains_response = asset_service.supabase.table("subdomains").select(
+                subdomains_response = await asset_service.supabase.table("subdomains").select(
                     "id, subdomain, scan_job_id, parent_domain"
                 ).in_("scan_job_id", asset_scan_job_ids).limit(10).execute()
                 
@@ -647,11 +646,60 @@ async def debug_subdomains_count(
 # Cross-Asset Subdomain Operations (New Optimized Endpoints)
 # ================================================================
 
+async def _prepend(first: Optional[List[Dict[str, Any]]], batches: AsyncIterator[List[Dict[str, Any]]]) -> AsyncIterator[List[Dict[str, Any]]]:
+    """Yield an already fetched first batch, then the rest."""
+    if first is None:
+        return
+    yield first
+    async for batch in batches:
+        yield batch
+
+
+async def _stream_subdomains_json(batches: AsyncIterator[List[Dict[str, Any]]]) -> AsyncIterator[str]:
+    """
+    Serialize subdomain batches as one JSON array, one chunk per batch.
+
+    A failure after the 200 went out is re-raised without the closing
+    bracket, so the server aborts the response and the client sees a
+    broken transfer instead of a valid-looking truncated array.
+    """
+    yield "["
+    first = True
+    try:
+        async for batch in batches:
+            chunk = ",".join(json.dumps(row) for row in batch)
+            yield chunk if first else "," + chunk
+            first = False
+    except Exception as e:
+        logger.error(f"❌ Subdomain stream aborted: {str(e)}")
+        raise
+    yield "]"
+
+
+async def _stream_subdomains_ndjson(batches: AsyncIterator[List[Dict[str, Any]]]) -> AsyncIterator[str]:
+    """
+    Serialize subdomain batches as newline-delimited JSON.
+
+    A failure after the 200 went out ends the stream with an
+    {"error": ..., "rows_streamed": n} record as its last line.
+    """
+    streamed = 0
+    try:
+        async for batch in batches:
+            yield "".join(json.dumps(row) + "\n" for row in batch)
+            streamed += len(batch)
+    except Exception as e:
+        logger.error(f"❌ Subdomain stream aborted after {streamed} rows: {str(e)}")
+        detail = e.detail if isinstance(e, HTTPException) else str(e)
+        yield json.dumps({"error": f"Failed to retrieve all user subdomains: {detail}", "rows_streamed": streamed}) + "\n"
+
+
 @router.get("/subdomains/all", response_model=List[Dict[str, Any]])
 async def get_all_user_subdomains(
-    limit: int = Query(10000, description="Maximum number of subdomains to return"),
-    offset: int = Query(0, description="Pagination offset"),
+    limit: int = Query(10000, ge=1, description="Maximum number of subdomains to return"),
+    offset: int = Query(0, ge=0, description="Pagination offset"),
     module: str = Query(None, description="Filter by reconnaissance module"),
+    format: str = Query("json", pattern="^(json|ndjson)$", description="Response format: json (array) or ndjson"),
     current_user: UserResponse = Depends(get_current_user)
 ):
     """
@@ -662,13 +710,30 @@ async def get_all_user_subdomains(
     
     Returns subdomains with metadata including discovery source, SSL info, 
     and parent scan job details.
+    
+    The response is streamed: rows are fetched with keyset pagination in
+    batches and written as they arrive, so server memory stays flat no
+    matter how large `limit` is. Use `format=ndjson` for line-by-line parsing.
+    
+    The first batch is fetched before the response starts, so a failing
+    query returns a real error status. A later failure ends an NDJSON
+    stream with an {"error": ...} line and aborts a JSON one.
     """
-    return await asset_service.get_all_user_subdomains(
+    batches = asset_service.iter_all_user_subdomains(
         user_id=current_user.id,
         limit=limit,
         offset=offset,
         module_filter=module
     )
+    try:
+        first = await anext(batches)
+    except StopAsyncIteration:
+        first = None
+    batches = _prepend(first, batches)
+    
+    if format == "ndjson":
+        return StreamingResponse(_stream_subdomains_ndjson(batches), media_type="application/x-ndjson")
+    return StreamingResponse(_stream_subdomains_json(batches), media_type="application/json")
 
 # ================================================================
 # NEW: Efficient Paginated Subdomains Endpoint
@@ -681,6 +746,8 @@ async def get_paginated_subdomains(
     asset_id: Optional[str] = Query(None, description="Filter by asset ID"),
     parent_domain: Optional[str] = Query(None, description="Filter by apex domain"),
     search: Optional[str] = Query(None, description="Search subdomain names"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor (overrides page)"),
+    since: Optional[str] = Query(None, description="Only subdomains discovered after this watermark (a previous next_watermark, or an ISO timestamp)"),
     current_user: UserResponse = Depends(get_current_user)
 ):
     """
@@ -700,6 +767,10 @@ async def get_paginated_subdomains(
     - Use per_page=25-100 for optimal performance
     - Implement infinite scroll or traditional pagination
     - Use asset_id filter when navigating from asset detail pages
+    - Follow `pagination.next_cursor` via `cursor=` for constant-cost deep pages
+      (`page` is a compatibility shim; totals are only computed without a cursor)
+    - Sync incrementally with `since=<pagination.next_watermark>`: only
+      subdomains discovered after the previous sync, oldest first
     
     Note: source_module filter removed for production - tool names not exposed.
     """
@@ -710,7 +781,9 @@ async def get_paginated_subdomains(
         per_page=per_page,
         asset_id=asset_id,
         parent_domain=parent_domain,
-        search=search
+        search=search,
+        cursor=cursor,
+        since=since
     )
 
 
@@ -723,6 +796,8 @@ async def get_paginated_dns_records(
     record_type: Optional[str] = Query(None, description="Filter by DNS record type (A, AAAA, CNAME, MX, TXT)"),
     search: Optional[str] = Query(None, description="Search subdomain names"),
     grouped: bool = Query(False, description="Group DNS records by subdomain for elegant display"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor (overrides page)"),
+    count: CountMode = Query(CountMode.PLANNED, description="Total count mode for ungrouped records: exact, planned, or none"),
     current_user: UserResponse = Depends(get_current_user)
 ):
     """
@@ -749,6 +824,9 @@ async def get_paginated_dns_records(
     - record_type: Filter by DNS record type (A, AAAA, CNAME, MX, TXT)
     - search: Search subdomain names (case-insensitive partial match)
     - **grouped**: Boolean (default: false) - If true, groups records by subdomain
+    - cursor: Keyset cursor from `pagination.next_cursor` (constant cost per page)
+    - count: `planned` (default, estimate + cached exact), `exact`, or `none`;
+      `pagination.total_is_exact` says whether to render the total as "~N"
     
     Response (ungrouped):
     - dns_records: List of individual DNS records with asset names
@@ -785,7 +863,8 @@ async def get_paginated_dns_records(
                 asset_id=asset_uuid,
                 parent_domain=parent_domain,
                 record_type=record_type,
-                search=search
+                search=search,
+                cursor=cursor
             )
         else:
             # Ungrouped view - individual DNS records
@@ -796,7 +875,9 @@ async def get_paginated_dns_records(
                 asset_id=asset_uuid,
                 parent_domain=parent_domain,
                 record_type=record_type,
-                search=search
+                search=search,
+                cursor=cursor,
+                count_mode=count
             )
         
         return result
@@ -939,25 +1020,13 @@ async def bulk_upload_domains(
         unique_domains = list(dict.fromkeys(domains_to_add))
         duplicates_removed = len(domains_to_add) - len(unique_domains)
         
-        # Add domains to the asset
-        added_count = 0
-        duplicates_in_db = 0
-        failed_to_add = 0
-        
-        for domain in unique_domains:
-            try:
-                domain_data = ApexDomainCreate(domain=domain, asset_id=asset_id)
-                await asset_service.create_apex_domain(domain_data, current_user.id)
-                added_count += 1
-            except HTTPException as e:
-                if "already exists" in str(e.detail).lower():
-                    duplicates_in_db += 1
-                else:
-                    failed_to_add += 1
-                    failed_lines.append(f"Domain {domain}: {e.detail}")
-            except Exception as e:
-                failed_to_add += 1
-                failed_lines.append(f"Domain {domain}: {str(e)}")
+        # Add domains to the asset in bulk (existing domains are skipped)
+        ingestion = await domain_ingestion_service.ingest(asset_id, unique_domains)
+        added_count = ingestion["inserted"]
+        duplicates_in_db = ingestion["skipped"]
+        failed_to_add = ingestion["invalid"]
+        for domain in ingestion["invalid_domains"]:
+            failed_lines.append(f"Domain {domain}: Rejected (not a valid apex domain)")
         
         # Return response in the format expected by frontend
         return {
@@ -1041,7 +1110,10 @@ async def get_asset_dns_records(
     scan_job_id: Optional[str] = Query(None, description="Filter by scan job UUID"),
     batch_scan_id: Optional[str] = Query(None, description="Filter by batch scan UUID"),
     limit: Optional[int] = Query(50, ge=1, le=1000, description="Records per page (default: 50, max: 1000)"),
-    offset: Optional[int] = Query(0, ge=0, le=5000, description="Pagination offset (default: 0, max: 5000)"),
+    offset: Optional[int] = Query(0, ge=0, description="Pagination offset (legacy - prefer cursor)"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    count: CountMode = Query(CountMode.PLANNED, description="Total count mode: exact, planned (estimate + cached exact), or none"),
+    since: Optional[str] = Query(None, description="Only records added or changed after this watermark (a previous next_watermark, or an ISO timestamp)"),
     current_user: UserResponse = Depends(get_current_user)
 ):
     """
@@ -1062,7 +1134,10 @@ async def get_asset_dns_records(
     - Use `record_type` filter to narrow results (e.g., only A records)
     - Use date filters for recent scans: `resolved_after=2025-11-01T00:00:00Z`
     - Combine filters to reduce result set size
-    - Avoid deep pagination (offset > 5000) - use filters instead
+    - Page with `cursor=<next_cursor>` - every page costs the same as the first
+    - Sync incrementally with `since=<next_watermark>`: only records added or
+      changed since the previous sync, oldest change first; repeat until a
+      page returns fewer than `limit` records
     
     **Example Queries:**
     - Get all A records: `?record_type=A&limit=100`
@@ -1073,8 +1148,11 @@ async def get_asset_dns_records(
     **Returns:**
     - `dns_records`: List of DNS record objects
     - `total_count`: Total matching records (for pagination UI)
+    - `total_is_exact`: False when `total_count` is a planner estimate
     - `limit`: Applied records per page
     - `offset`: Applied pagination offset
+    - `next_cursor`: Cursor for the next page (null on the last page)
+    - `next_watermark`: Next `since` value (delta queries only)
     - `warning`: Optional warning for large result sets or performance tips
     """
     try:
@@ -1101,6 +1179,11 @@ async def get_asset_dns_records(
         logger.info(f"User {current_user.id} querying DNS records for asset {asset_id}")
         
         # If subdomain_name filter is provided, use the subdomain-specific query
+        if subdomain_name and since:
+            raise HTTPException(
+                status_code=400,
+                detail="since cannot be combined with subdomain_name"
+            )
         if subdomain_name:
             result = await dns_service.get_dns_records_by_subdomain(
                 asset_id=asset_uuid,
@@ -1111,7 +1194,8 @@ async def get_asset_dns_records(
                 scan_job_id=scan_job_uuid,
                 batch_scan_id=batch_scan_uuid,
                 limit=limit,
-                offset=offset
+                offset=offset,
+                cursor=cursor
             )
         else:
             # Standard asset-level query
@@ -1123,7 +1207,10 @@ async def get_asset_dns_records(
                 scan_job_id=scan_job_uuid,
                 batch_scan_id=batch_scan_uuid,
                 limit=limit,
-                offset=offset
+                offset=offset,
+                cursor=cursor,
+                count_mode=count,
+                since=since
             )
         
         logger.info(f"Returning {len(result['dns_records'])} DNS records (total: {result['total_count']})")
@@ -214,7 +214,7 @@ async def upgrade_user_to_pro(
         # Step 3: Perform the upgrade
         paid_at = datetime.now(timezone.utc).isoformat()
         
-        result = supabase_client.service_client.table("user_quotas").upsert({
+        result = await supabase_client.async_service_client.table("user_quotas").upsert({
             "user_id": user_id,
             "plan_type": "pro",
             "stripe_customer_id": stripe_customer_id,
@@ -260,7 +260,7 @@ async def get_billing_status(
     paid_at = None
     if plan_type in ["pro", "enterprise"]:
         try:
-            result = supabase_client.service_client.table("user_quotas").select(
+            result = await supabase_client.async_service_client.table("user_quotas").select(
                 "paid_at"
             ).eq("user_id", user_id).limit(1).execute()
             if result.data and len(result.data) > 0:
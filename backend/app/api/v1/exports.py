@@ -1,29 +1,47 @@
 """
 Data Export API Endpoints.
 
-Provides streaming CSV/JSON exports for reconnaissance data.
+Provides streaming exports for reconnaissance data in CSV, JSON, NDJSON,
+gzip-compressed CSV/NDJSON and Parquet.
 URLs export requires PRO subscription, other exports are free.
 
+Rows are read through the export engine (keyset pagination with read-ahead,
+see services/export_engine.py), so exports cost O(n) and stay consistent
+while scans keep inserting rows. Each batch is serialized in one pass by
+the format's encoder (services/export_encoders.py).
+
+Large exports can instead run as snapshot jobs (POST /exports/jobs): the
+export is written to a file in the background and then downloaded with
+ETag and HTTP Range support, so interrupted downloads resume.
+
+Incremental syncs: every export returns an `X-Next-Watermark` header (jobs
+return `next_watermark`). Passing it back as `since=` exports only the rows
+added or changed after it, oldest change first.
+
 Author: Pluckware Development Team
 Date: January 2026
 """
 
-import csv
-import io
-import json
-from typing import Optional, AsyncGenerator
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from fastapi.responses import StreamingResponse
+import asyncio
+from typing import Any, Dict, List, Optional, AsyncGenerator
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
+from fastapi.responses import FileResponse, StreamingResponse
 
 from ...schemas.auth import UserResponse
+from ...schemas.exports import ExportJobCreate, ExportJobResponse, ExportType
+from ...core.config import settings
 from ...core.dependencies import get_current_user
-from ...core.supabase_client import supabase_client
 from ...dependencies.tier_check import get_user_tier
+from ...services.export_engine import EXPORT_SPECS, ExportFilter, ExportSpec, export_engine
+from ...services.export_encoders import EXPORT_MEDIA_TYPES, ExportEncoder, create_encoder, parquet_available
+from ...services.export_jobs import export_job_service
+from ...utils.pagination import InvalidWatermarkError, decode_watermark, encode_watermark, watermark_ceiling
 
 router = APIRouter()
 
-# Batch size for streaming exports
-EXPORT_BATCH_SIZE = 1000
+EXPORT_FORMAT_PATTERN = r"^(csv|json|ndjson|csv\.gz|ndjson\.gz|parquet)$"
+EXPORT_FORMAT_DESCRIPTION = "Export format: csv, json, ndjson, csv.gz, ndjson.gz or parquet"
+SINCE_DESCRIPTION = "Only rows added or changed after this watermark (X-Next-Watermark of a previous export, or an ISO timestamp)"
 
 
 async def check_pro_required(user_id: str) -> bool:
@@ -32,540 +50,338 @@ async def check_pro_required(user_id: str) -> bool:
     return plan_type in ['paid', 'pro', 'enterprise']
 
 
-def format_csv_row(row: list) -> str:
-    """Format a row as CSV, properly escaping values."""
-    output = io.StringIO()
-    writer = csv.writer(output, quoting=csv.QUOTE_MINIMAL)
-    writer.writerow(row)
-    return output.getvalue()
+async def require_pro(current_user: UserResponse) -> None:
+    """Raise 403 unless the user can export URLs."""
+    user_id = current_user.id if hasattr(current_user, 'id') else current_user.get("id") or current_user.get("sub")
+
+    if not await check_pro_required(user_id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="URL export requires a Pro subscription. Upgrade to export all URLs."
+        )
+
+
+def validate_since(since: Optional[str]) -> None:
+    """Reject a malformed watermark with 400 before any response is started."""
+    if since is None:
+        return
+    try:
+        decode_watermark(since)
+    except InvalidWatermarkError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+async def stream_export(
+    spec: ExportSpec,
+    filters: List[ExportFilter],
+    encoder: ExportEncoder,
+    since: Optional[str] = None,
+    until: Optional[str] = None
+) -> AsyncGenerator[bytes, None]:
+    """Stream an export, encoding one keyset batch per chunk."""
+    yield encoder.header()
+
+    async for batch in export_engine.iter_batches(spec, filters, since=since, until=until):
+        # Encode off the event loop; the engine is already fetching the next batch
+        chunk = await asyncio.to_thread(encoder.encode_batch, batch)
+        if chunk:
+            yield chunk
+
+    yield encoder.finish()
+
+
+def export_response(
+    name: str,
+    export_format: str,
+    filters: List[ExportFilter],
+    filename: str,
+    since: Optional[str] = None
+) -> StreamingResponse:
+    """
+    StreamingResponse for an export in the requested format.
+
+    The `X-Next-Watermark` header covers every row up to the settled upper
+    bound of this export, so the next `since=` sync starts exactly there.
+    """
+    if export_format == "parquet" and not parquet_available():
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Parquet export is not available on this server. Use ndjson.gz or csv.gz instead."
+        )
+    validate_since(since)
+
+    spec = EXPORT_SPECS[name]
+    encoder = create_encoder(export_format, spec.columns)
+    until = watermark_ceiling(settings.delta_settle_seconds)
+    return StreamingResponse(
+        stream_export(spec, filters, encoder, since, until),
+        media_type=encoder.media_type,
+        headers={
+            "Content-Disposition": f"attachment; filename={filename}.{export_format}",
+            "X-Next-Watermark": encode_watermark(until),
+        }
+    )
 
 
 # =============================================================================
 # URLs Export (PRO ONLY)
 # =============================================================================
 
-async def stream_urls_csv(
+def url_filters(
     asset_id: Optional[str] = None,
     is_alive: Optional[bool] = None,
     status_code: Optional[int] = None,
     has_params: Optional[bool] = None,
-) -> AsyncGenerator[str, None]:
-    """Stream URLs as CSV."""
-    supabase = supabase_client.service_client
-    
-    # CSV Header
-    yield format_csv_row([
-        "url", "domain", "path", "status_code", "is_alive", 
-        "content_type", "title", "has_params", "first_discovered_at"
-    ])
-    
-    offset = 0
-    while True:
-        # Build query
-        query = supabase.table("urls").select(
-            "url, domain, path, status_code, is_alive, content_type, title, has_params, first_discovered_at"
-        )
-        
-        # Apply filters
-        if asset_id:
-            query = query.eq("asset_id", asset_id)
-        if is_alive is not None:
-            query = query.eq("is_alive", is_alive)
-        if status_code:
-            query = query.eq("status_code", status_code)
-        if has_params is not None:
-            query = query.eq("has_params", has_params)
-        
-        # Pagination
-        query = query.order("first_discovered_at", desc=True)
-        query = query.range(offset, offset + EXPORT_BATCH_SIZE - 1)
-        
-        result = query.execute()
-        batch = result.data or []
-        
-        if not batch:
-            break
-        
-        for row in batch:
-            yield format_csv_row([
-                row.get("url", ""),
-                row.get("domain", ""),
-                row.get("path", ""),
-                row.get("status_code", ""),
-                row.get("is_alive", ""),
-                row.get("content_type", ""),
-                row.get("title", ""),
-                row.get("has_params", ""),
-                row.get("first_discovered_at", ""),
-            ])
-        
-        offset += EXPORT_BATCH_SIZE
-        
-        # Safety check - if batch is smaller than limit, we're done
-        if len(batch) < EXPORT_BATCH_SIZE:
-            break
-
-
-async def stream_urls_json(
-    asset_id: Optional[str] = None,
-    is_alive: Optional[bool] = None,
-    status_code: Optional[int] = None,
-    has_params: Optional[bool] = None,
-) -> AsyncGenerator[str, None]:
-    """Stream URLs as JSON array."""
-    supabase = supabase_client.service_client
-    
-    yield "["
-    first = True
-    offset = 0
-    
-    while True:
-        # Build query
-        query = supabase.table("urls").select(
-            "url, domain, path, status_code, is_alive, content_type, title, has_params, first_discovered_at"
-        )
-        
-        # Apply filters
-        if asset_id:
-            query = query.eq("asset_id", asset_id)
-        if is_alive is not None:
-            query = query.eq("is_alive", is_alive)
-        if status_code:
-            query = query.eq("status_code", status_code)
-        if has_params is not None:
-            query = query.eq("has_params", has_params)
-        
-        # Pagination
-        query = query.order("first_discovered_at", desc=True)
-        query = query.range(offset, offset + EXPORT_BATCH_SIZE - 1)
-        
-        result = query.execute()
-        batch = result.data or []
-        
-        if not batch:
-            break
-        
-        for row in batch:
-            if not first:
-                yield ","
-            yield json.dumps(row)
-            first = False
-        
-        offset += EXPORT_BATCH_SIZE
-        
-        if len(batch) < EXPORT_BATCH_SIZE:
-            break
-    
-    yield "]"
+) -> List[ExportFilter]:
+    """Export filters for URLs."""
+    filters = []
+    if asset_id:
+        filters.append(("eq", "asset_id", asset_id))
+    if is_alive is not None:
+        filters.append(("eq", "is_alive", is_alive))
+    if status_code:
+        filters.append(("eq", "status_code", status_code))
+    if has_params is not None:
+        filters.append(("eq", "has_params", has_params))
+    return filters
 
 
 @router.get("/urls")
 async def export_urls(
-    format: str = Query("csv", regex="^(csv|json)$", description="Export format"),
+    format: str = Query("csv", pattern=EXPORT_FORMAT_PATTERN, description=EXPORT_FORMAT_DESCRIPTION),
     asset_id: Optional[str] = Query(None, description="Filter by asset/program ID"),
     is_alive: Optional[bool] = Query(None, description="Filter by alive status"),
     status_code: Optional[int] = Query(None, description="Filter by status code"),
     has_params: Optional[bool] = Query(None, description="Filter by has parameters"),
+    since: Optional[str] = Query(None, description=SINCE_DESCRIPTION),
     current_user: UserResponse = Depends(get_current_user)
 ):
     """
-    Export URLs as CSV or JSON.
-    
+    Export URLs.
+
     **Requires PRO subscription.**
-    
-    Streams the full dataset matching your filters.
+
+    Streams the full dataset matching your filters, or with `since` only
+    the rows added or changed after that watermark.
     """
-    # Get user ID
-    user_id = current_user.id if hasattr(current_user, 'id') else current_user.get("id") or current_user.get("sub")
-    
-    # Check PRO status
-    is_pro = await check_pro_required(user_id)
-    if not is_pro:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="URL export requires a Pro subscription. Upgrade to export all URLs."
-        )
-    
-    if format == "csv":
-        return StreamingResponse(
-            stream_urls_csv(asset_id, is_alive, status_code, has_params),
-            media_type="text/csv",
-            headers={"Content-Disposition": "attachment; filename=urls-export.csv"}
-        )
-    else:
-        return StreamingResponse(
-            stream_urls_json(asset_id, is_alive, status_code, has_params),
-            media_type="application/json",
-            headers={"Content-Disposition": "attachment; filename=urls-export.json"}
-        )
+    await require_pro(current_user)
+
+    return export_response("urls", format, url_filters(asset_id, is_alive, status_code, has_params), "urls-export", since)
 
 
 # =============================================================================
 # Subdomains Export (FREE)
 # =============================================================================
 
-async def stream_subdomains_csv(
+def subdomain_filters(
     asset_id: Optional[str] = None,
     parent_domain: Optional[str] = None,
-) -> AsyncGenerator[str, None]:
-    """Stream subdomains as CSV."""
-    supabase = supabase_client.service_client
-    
-    # CSV Header (source_module excluded)
-    yield format_csv_row([
-        "subdomain", "parent_domain", "discovered_at"
-    ])
-    
-    offset = 0
-    while True:
-        query = supabase.table("subdomains").select(
-            "subdomain, parent_domain, discovered_at"
-        )
-        
-        if asset_id:
-            query = query.eq("asset_id", asset_id)
-        if parent_domain:
-            query = query.eq("parent_domain", parent_domain)
-        
-        query = query.order("discovered_at", desc=True)
-        query = query.range(offset, offset + EXPORT_BATCH_SIZE - 1)
-        
-        result = query.execute()
-        batch = result.data or []
-        
-        if not batch:
-            break
-        
-        for row in batch:
-            yield format_csv_row([
-                row.get("subdomain", ""),
-                row.get("parent_domain", ""),
-                row.get("discovered_at", ""),
-            ])
-        
-        offset += EXPORT_BATCH_SIZE
-        if len(batch) < EXPORT_BATCH_SIZE:
-            break
-
-
-async def stream_subdomains_json(
-    asset_id: Optional[str] = None,
-    parent_domain: Optional[str] = None,
-) -> AsyncGenerator[str, None]:
-    """Stream subdomains as JSON array (source_module excluded)."""
-    supabase = supabase_client.service_client
-    
-    yield "["
-    first = True
-    offset = 0
-    
-    while True:
-        query = supabase.table("subdomains").select(
-            "subdomain, parent_domain, discovered_at"
-        )
-        
-        if asset_id:
-            query = query.eq("asset_id", asset_id)
-        if parent_domain:
-            query = query.eq("parent_domain", parent_domain)
-        
-        query = query.order("discovered_at", desc=True)
-        query = query.range(offset, offset + EXPORT_BATCH_SIZE - 1)
-        
-        result = query.execute()
-        batch = result.data or []
-        
-        if not batch:
-            break
-        
-        for row in batch:
-            if not first:
-                yield ","
-            yield json.dumps(row)
-            first = False
-        
-        offset += EXPORT_BATCH_SIZE
-        if len(batch) < EXPORT_BATCH_SIZE:
-            break
-    
-    yield "]"
+) -> List[ExportFilter]:
+    """Export filters for subdomains (source_module is never exported)."""
+    filters = []
+    if asset_id:
+        filters.append(("eq", "asset_id", asset_id))
+    if parent_domain:
+        filters.append(("eq", "parent_domain", parent_domain))
+    return filters
 
 
 @router.get("/subdomains")
 async def export_subdomains(
-    format: str = Query("csv", regex="^(csv|json)$", description="Export format"),
+    format: str = Query("csv", pattern=EXPORT_FORMAT_PATTERN, description=EXPORT_FORMAT_DESCRIPTION),
     asset_id: Optional[str] = Query(None, description="Filter by asset/program ID"),
     parent_domain: Optional[str] = Query(None, description="Filter by parent domain"),
+    since: Optional[str] = Query(None, description=SINCE_DESCRIPTION),
     current_user: UserResponse = Depends(get_current_user)
 ):
     """
-    Export subdomains as CSV or JSON.
-    
+    Export subdomains.
+
     **Free for all users.**
-    
-    Streams the full dataset matching your filters.
+
+    Streams the full dataset matching your filters, or with `since` only
+    the rows added or changed after that watermark.
     """
-    if format == "csv":
-        return StreamingResponse(
-            stream_subdomains_csv(asset_id, parent_domain),
-            media_type="text/csv",
-            headers={"Content-Disposition": "attachment; filename=subdomains-export.csv"}
-        )
-    else:
-        return StreamingResponse(
-            stream_subdomains_json(asset_id, parent_domain),
-            media_type="application/json",
-            headers={"Content-Disposition": "attachment; filename=subdomains-export.json"}
-        )
+    return export_response("subdomains", format, subdomain_filters(asset_id, parent_domain), "subdomains-export", since)
 
 
 # =============================================================================
 # DNS Records Export (FREE)
 # =============================================================================
 
-async def stream_dns_csv(
+def dns_filters(
     asset_id: Optional[str] = None,
     record_type: Optional[str] = None,
     subdomain: Optional[str] = None,
-) -> AsyncGenerator[str, None]:
-    """Stream DNS records as CSV."""
-    supabase = supabase_client.service_client
-    
-    yield format_csv_row([
-        "subdomain", "parent_domain", "record_type", "record_value", "ttl", "resolved_at"
-    ])
-    
-    offset = 0
-    while True:
-        query = supabase.table("dns_records").select(
-            "subdomain, parent_domain, record_type, record_value, ttl, resolved_at"
-        )
-        
-        if asset_id:
-            query = query.eq("asset_id", asset_id)
-        if record_type:
-            query = query.eq("record_type", record_type)
-        if subdomain:
-            query = query.ilike("subdomain", f"%{subdomain}%")
-        
-        query = query.order("resolved_at", desc=True)
-        query = query.range(offset, offset + EXPORT_BATCH_SIZE - 1)
-        
-        result = query.execute()
-        batch = result.data or []
-        
-        if not batch:
-            break
-        
-        for row in batch:
-            yield format_csv_row([
-                row.get("subdomain", ""),
-                row.get("parent_domain", ""),
-                row.get("record_type", ""),
-                row.get("record_value", ""),
-                row.get("ttl", ""),
-                row.get("resolved_at", ""),
-            ])
-        
-        offset += EXPORT_BATCH_SIZE
-        if len(batch) < EXPORT_BATCH_SIZE:
-            break
-
-
-async def stream_dns_json(
-    asset_id: Optional[str] = None,
-    record_type: Optional[str] = None,
-    subdomain: Optional[str] = None,
-) -> AsyncGenerator[str, None]:
-    """Stream DNS records as JSON array."""
-    supabase = supabase_client.service_client
-    
-    yield "["
-    first = True
-    offset = 0
-    
-    while True:
-        query = supabase.table("dns_records").select(
-            "subdomain, parent_domain, record_type, record_value, ttl, resolved_at"
-        )
-        
-        if asset_id:
-            query = query.eq("asset_id", asset_id)
-        if record_type:
-            query = query.eq("record_type", record_type)
-        if subdomain:
-            query = query.ilike("subdomain", f"%{subdomain}%")
-        
-        query = query.order("resolved_at", desc=True)
-        query = query.range(offset, offset + EXPORT_BATCH_SIZE - 1)
-        
-        result = query.execute()
-        batch = result.data or []
-        
-        if not batch:
-            break
-        
-        for row in batch:
-            if not first:
-                yield ","
-            yield json.dumps(row)
-            first = False
-        
-        offset += EXPORT_BATCH_SIZE
-        if len(batch) < EXPORT_BATCH_SIZE:
-            break
-    
-    yield "]"
+) -> List[ExportFilter]:
+    """Export filters for DNS records."""
+    filters = []
+    if asset_id:
+        filters.append(("eq", "asset_id", asset_id))
+    if record_type:
+        filters.append(("eq", "record_type", record_type))
+    if subdomain:
+        filters.append(("ilike", "subdomain", f"%{subdomain}%"))
+    return filters
 
 
 @router.get("/dns")
 async def export_dns_records(
-    format: str = Query("csv", regex="^(csv|json)$", description="Export format"),
+    format: str = Query("csv", pattern=EXPORT_FORMAT_PATTERN, description=EXPORT_FORMAT_DESCRIPTION),
     asset_id: Optional[str] = Query(None, description="Filter by asset/program ID"),
     record_type: Optional[str] = Query(None, description="Filter by record type (A, AAAA, CNAME, MX, TXT)"),
     subdomain: Optional[str] = Query(None, description="Search by subdomain (partial match)"),
+    since: Optional[str] = Query(None, description=SINCE_DESCRIPTION),
     current_user: UserResponse = Depends(get_current_user)
 ):
     """
-    Export DNS records as CSV or JSON.
-    
+    Export DNS records.
+
     **Free for all users.**
-    
-    Streams the full dataset matching your filters.
+
+    Streams the full dataset matching your filters, or with `since` only
+    the rows added or changed after that watermark.
     """
-    if format == "csv":
-        return StreamingResponse(
-            stream_dns_csv(asset_id, record_type, subdomain),
-            media_type="text/csv",
-            headers={"Content-Disposition": "attachment; filename=dns-records-export.csv"}
-        )
-    else:
-        return StreamingResponse(
-            stream_dns_json(asset_id, record_type, subdomain),
-            media_type="application/json",
-            headers={"Content-Disposition": "attachment; filename=dns-records-export.json"}
-        )
+    return export_response("dns", format, dns_filters(asset_id, record_type, subdomain), "dns-records-export", since)
 
 
 # =============================================================================
 # HTTP Probes Export (FREE)
 # =============================================================================
 
-async def stream_probes_csv(
-    asset_id: Optional[str] = None,
-    status_code: Optional[int] = None,
-) -> AsyncGenerator[str, None]:
-    """Stream HTTP probes as CSV."""
-    supabase = supabase_client.service_client
-    
-    yield format_csv_row([
-        "url", "subdomain", "status_code", "title", "webserver", 
-        "content_type", "ip", "created_at"
-    ])
-    
-    offset = 0
-    while True:
-        query = supabase.table("http_probes").select(
-            "url, subdomain, status_code, title, webserver, content_type, ip, created_at"
-        )
-        
-        if asset_id:
-            query = query.eq("asset_id", asset_id)
-        if status_code:
-            query = query.eq("status_code", status_code)
-        
-        query = query.order("created_at", desc=True)
-        query = query.range(offset, offset + EXPORT_BATCH_SIZE - 1)
-        
-        result = query.execute()
-        batch = result.data or []
-        
-        if not batch:
-            break
-        
-        for row in batch:
-            yield format_csv_row([
-                row.get("url", ""),
-                row.get("subdomain", ""),
-                row.get("status_code", ""),
-                row.get("title", ""),
-                row.get("webserver", ""),
-                row.get("content_type", ""),
-                row.get("ip", ""),
-                row.get("created_at", ""),
-            ])
-        
-        offset += EXPORT_BATCH_SIZE
-        if len(batch) < EXPORT_BATCH_SIZE:
-            break
-
-
-async def stream_probes_json(
+def probe_filters(
     asset_id: Optional[str] = None,
     status_code: Optional[int] = None,
-) -> AsyncGenerator[str, None]:
-    """Stream HTTP probes as JSON array."""
-    supabase = supabase_client.service_client
-    
-    yield "["
-    first = True
-    offset = 0
-    
-    while True:
-        query = supabase.table("http_probes").select(
-            "url, subdomain, status_code, title, webserver, content_type, ip, created_at"
-        )
-        
-        if asset_id:
-            query = query.eq("asset_id", asset_id)
-        if status_code:
-            query = query.eq("status_code", status_code)
-        
-        query = query.order("created_at", desc=True)
-        query = query.range(offset, offset + EXPORT_BATCH_SIZE - 1)
-        
-        result = query.execute()
-        batch = result.data or []
-        
-        if not batch:
-            break
-        
-        for row in batch:
-            if not first:
-                yield ","
-            yield json.dumps(row)
-            first = False
-        
-        offset += EXPORT_BATCH_SIZE
-        if len(batch) < EXPORT_BATCH_SIZE:
-            break
-    
-    yield "]"
+) -> List[ExportFilter]:
+    """Export filters for HTTP probes."""
+    filters = []
+    if asset_id:
+        filters.append(("eq", "asset_id", asset_id))
+    if status_code:
+        filters.append(("eq", "status_code", status_code))
+    return filters
 
 
 @router.get("/probes")
 async def export_http_probes(
-    format: str = Query("csv", regex="^(csv|json)$", description="Export format"),
+    format: str = Query("csv", pattern=EXPORT_FORMAT_PATTERN, description=EXPORT_FORMAT_DESCRIPTION),
     asset_id: Optional[str] = Query(None, description="Filter by asset/program ID"),
     status_code: Optional[int] = Query(None, description="Filter by status code"),
+    since: Optional[str] = Query(None, description=SINCE_DESCRIPTION),
     current_user: UserResponse = Depends(get_current_user)
 ):
     """
-    Export HTTP probes as CSV or JSON.
-    
+    Export HTTP probes.
+
     **Free for all users.**
-    
-    Streams the full dataset matching your filters.
+
+    Streams the full dataset matching your filters, or with `since` only
+    the rows added or changed after that watermark.
     """
-    if format == "csv":
-        return StreamingResponse(
-            stream_probes_csv(asset_id, status_code),
-            media_type="text/csv",
-            headers={"Content-Disposition": "attachment; filename=http-probes-export.csv"}
+    return export_response("probes", format, probe_filters(asset_id, status_code), "http-probes-export", since)
+
+
+# =============================================================================
+# Snapshot Export Jobs
+# =============================================================================
+
+def job_filters(request: ExportJobCreate) -> List[ExportFilter]:
+    """Export filters for a job request (same rules as the streaming endpoints)."""
+    if request.export_type == ExportType.URLS:
+        return url_filters(request.asset_id, request.is_alive, request.status_code, request.has_params)
+    if request.export_type == ExportType.SUBDOMAINS:
+        return subdomain_filters(request.asset_id, request.parent_domain)
+    if request.export_type == ExportType.DNS:
+        return dns_filters(request.asset_id, request.record_type, request.subdomain)
+    return probe_filters(request.asset_id, request.status_code)
+
+
+def job_response(job: Dict[str, Any], reused: bool = False) -> ExportJobResponse:
+    download_url = None
+    if job["status"] == "completed":
+        download_url = f"{settings.api_v1_str}/exports/jobs/{job['job_id']}/download"
+    return ExportJobResponse(**job, reused=reused, download_url=download_url)
+
+
+async def get_job_or_404(job_id: str, current_user: UserResponse) -> Dict[str, Any]:
+    job = export_job_service.get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Export job not found")
+    if job["export_type"] == ExportType.URLS.value:
+        await require_pro(current_user)
+    return job
+
+
+@router.post("/jobs", response_model=ExportJobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def create_export_job(
+    request: ExportJobCreate,
+    current_user: UserResponse = Depends(get_current_user)
+):
+    """
+    Start a snapshot export in the background.
+
+    Poll `GET /exports/jobs/{job_id}` for progress, then download the file
+    from `download_url`. An identical request made while a snapshot is
+    running or still fresh returns that job (`reused: true`).
+
+    With `since`, only rows added or changed after that watermark are
+    exported; every job returns the `next_watermark` for the next sync.
+
+    URL exports require a Pro subscription.
+    """
+    if request.export_type == ExportType.URLS:
+        await require_pro(current_user)
+    if request.format == "parquet" and not parquet_available():
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Parquet export is not available on this server. Use ndjson.gz or csv.gz instead."
         )
-    else:
-        return StreamingResponse(
-            stream_probes_json(asset_id, status_code),
-            media_type="application/json",
-            headers={"Content-Disposition": "attachment; filename=http-probes-export.json"}
+    validate_since(request.since)
+
+    job, reused = await export_job_service.create_job(
+        request.export_type.value, request.format, job_filters(request), current_user.id, request.since
+    )
+    return job_response(job, reused)
+
+
+@router.get("/jobs/{job_id}", response_model=ExportJobResponse)
+async def get_export_job(
+    job_id: str,
+    current_user: UserResponse = Depends(get_current_user)
+):
+    """Get the status and progress (rows/bytes written) of an export job."""
+    return job_response(await get_job_or_404(job_id, current_user))
+
+
+@router.get("/jobs/{job_id}/download")
+async def download_export_job(
+    job_id: str,
+    if_none_match: Optional[str] = Header(None),
+    current_user: UserResponse = Depends(get_current_user)
+):
+    """
+    Download a finished export snapshot.
+
+    Supports `Range` (including multiple ranges) and `If-Range` for resumed
+    or parallel downloads, and `If-None-Match` against the snapshot ETag.
+    """
+    job = await get_job_or_404(job_id, current_user)
+    if job["status"] != "completed":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Export job is {job['status']}; download is available once it completes"
         )
+
+    path = export_job_service.snapshot_path(job)
+    if not path.exists():
+        raise HTTPException(status_code=status.HTTP_410_GONE, detail="Export snapshot has expired")
+
+    if if_none_match and job["etag"] in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": job["etag"]})
+
+    return FileResponse(
+        path,
+        media_type=EXPORT_MEDIA_TYPES[job["format"]],
+        filename=f"{job['export_type']}-export.{job['format']}",
+        headers={"ETag": job["etag"], "Cache-Control": "private, no-transform"}
+    )
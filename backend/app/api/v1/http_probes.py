@@ -11,17 +11,64 @@ Phase: HTTPx Frontend Implementation - Phase 1
 
 from typing import List, Optional, Dict, Any
 from uuid import UUID
+import json
 import logging
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from ...schemas.http_probes import HTTPProbeResponse, HTTPProbeStatsResponse
 from ...schemas.auth import UserResponse
 from ...core.dependencies import get_current_user
+from ...core.config import settings
 from ...core.supabase_client import supabase_client
+from ...utils.pagination import (
+    InvalidCursorError,
+    InvalidWatermarkError,
+    apply_delta,
+    apply_keyset,
+    delta_page,
+    encode_cursor,
+    keyset_page,
+    watermark_ceiling,
+)
+from ...services.count_service import CountMode, count_service
+from ...services.result_cache import result_cache
 
 
 router = APIRouter()
 
 
+def _apply_probe_filters(
+    query,
+    asset_id: Optional[str] = None,
+    scan_job_id: Optional[str] = None,
+    parent_domain: Optional[str] = None,
+    status_code: Optional[int] = None,
+    subdomain: Optional[str] = None,
+    technology: Optional[str] = None,
+):
+    """Apply the /http-probes list filters to a query (shared by page and count queries)."""
+    if asset_id:
+        query = query.eq("asset_id", asset_id)
+    
+    if scan_job_id:
+        query = query.eq("scan_job_id", scan_job_id)
+    
+    if parent_domain:
+        query = query.eq("parent_domain", parent_domain)
+    
+    if status_code:
+        query = query.eq("status_code", status_code)
+    
+    if subdomain:
+        # Use ilike for case-insensitive partial match
+        query = query.ilike("subdomain", f"%{subdomain}%")
+    
+    if technology:
+        # Filter by technology in JSONB array
+        query = query.filter("technologies", "cs", json.dumps([technology]))
+    
+    return query
+
+
 @router.get("")
 async def get_http_probes(
     asset_id: Optional[str] = Query(None, description="Filter by asset ID"),
@@ -31,7 +78,10 @@ async def get_http_probes(
     subdomain: Optional[str] = Query(None, description="Filter by subdomain (partial match)"),
     technology: Optional[str] = Query(None, description="Filter by technology (e.g., 'IIS:10.0')"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum number of probes to return"),
-    offset: int = Query(0, ge=0, description="Number of probes to skip (pagination)"),
+    offset: int = Query(0, ge=0, description="Number of probes to skip (legacy pagination - prefer cursor)"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    since: Optional[str] = Query(None, description="Only probes added after this watermark (a previous next_watermark, or an ISO timestamp)"),
+    count: CountMode = Query(CountMode.PLANNED, description="Total count mode: exact, planned (estimate + cached exact), or none"),
     current_user: UserResponse = Depends(get_current_user)
 ) -> Dict[str, Any]:
     """
@@ -45,67 +95,109 @@ async def get_http_probes(
     - Subdomain: Search by subdomain name (partial match)
     - Technology: Filter by detected technology (e.g., "IIS:10.0", "Apache")
     
-    Pagination: Use `limit` and `offset` parameters (default: 100 items per page).
+    Pagination: Use `limit` with `cursor` (keyset - every page costs the same).
+    Pass the previous response's `next_cursor` as `cursor`; it is null on the
+    last page. `offset` is kept for compatibility but degrades on deep pages.
     
-    Returns probes array with total count for proper pagination.
+    Totals (`count=`): `planned` (default) returns a planner estimate and
+    caches a background exact count for the same filters; `exact` always
+    counts; `none` skips it. `total_is_exact` says which one you got.
+    
+    Incremental sync (`since=`): returns only probes added after the
+    watermark, oldest first, with no total. Pass `next_watermark` back as
+    `since` until `has_more` is false.
     
     LEAN Architecture: All authenticated users see ALL data.
     """
     try:
         # Use service_client to bypass RLS - LEAN architecture allows all authenticated users
-        supabase = supabase_client.service_client
+        supabase = supabase_client.async_service_client
+        
+        probe_filters = {
+            "asset_id": asset_id,
+            "scan_job_id": scan_job_id,
+            "parent_domain": parent_domain,
+            "status_code": status_code,
+            "subdomain": subdomain,
+            "technology": technology,
+        }
+        count_signature = count_service.signature("http_probes", probe_filters)
+        
+        # Subdomain ILIKE can't use an index - only ever estimate those totals
+        if since:
+            count_method = None
+        elif subdomain and count != CountMode.NONE and not cursor:
+            count_method = "planned"
+        else:
+            count_method = count_service.count_method(count, count_signature, cursor)
         
-        # Start building the query with count for efficient pagination
         query = supabase.table("http_probes").select(
             "id, scan_job_id, asset_id, status_code, url, title, webserver, "
             "content_length, final_url, ip, technologies, cdn_name, content_type, "
             "asn, chain_status_codes, location, favicon_md5, subdomain, parent_domain, "
             "scheme, port, created_at",
-            count="exact"
+            count=count_method
         )
+        query = _apply_probe_filters(query, **probe_filters)
         
-        # Apply filters
-        if asset_id:
-            query = query.eq("asset_id", asset_id)
-        
-        if scan_job_id:
-            query = query.eq("scan_job_id", scan_job_id)
-        
-        if parent_domain:
-            query = query.eq("parent_domain", parent_domain)
-        
-        if status_code:
-            query = query.eq("status_code", status_code)
-        
-        if subdomain:
-            # Use ilike for case-insensitive partial match
-            query = query.ilike("subdomain", f"%{subdomain}%")
-        
-        if technology:
-            # Filter by technology in JSONB array
-            import json
-            query = query.filter("technologies", "cs", json.dumps([technology]))
-        
-        # Order by created_at descending (most recent first)
-        query = query.order("created_at", desc=True)
+        # Order by created_at descending (most recent first) and paginate:
+        # - Keyset (cursor, or first page): seeks via (created_at, id) index
+        # - Legacy offset shim: .range() skips rows, cost grows with offset
+        # - Delta (since=): new probes, oldest first, within a settled window
+        until = watermark_ceiling(settings.delta_settle_seconds) if since else None
+        use_keyset = cursor is not None or offset == 0
+        if since:
+            query = apply_delta(query, "created_at", limit, since, until)
+        elif use_keyset:
+            query = apply_keyset(query, "created_at", limit, cursor)
+        else:
+            query = query.order("created_at", desc=True, nullsfirst=False).order("id", desc=True)
+            query = query.range(offset, offset + limit - 1)
         
-        # Apply pagination
-        query = query.range(offset, offset + limit - 1)
+        # Execute query (count, when requested, comes back with the page)
+        response = await query.execute()
         
-        # Execute query (count included via count="exact")
-        response = query.execute()
+        next_watermark = None
+        if since:
+            probes_data, next_watermark, has_more = delta_page(response.data, "created_at", limit, until)
+            next_cursor = None
+        elif use_keyset:
+            probes_data, next_cursor = keyset_page(response.data, "created_at", limit)
+        else:
+            probes_data = response.data or []
+            next_cursor = None
+            if len(probes_data) == limit:
+                next_cursor = encode_cursor(probes_data[-1].get("created_at"), probes_data[-1]["id"])
         
-        probes_data = response.data or []
-        total_count = response.count if response.count is not None else len(probes_data)
+        if since:
+            total_count, total_is_exact = None, False
+        elif subdomain:
+            total_count, total_is_exact = (response.count if count != CountMode.NONE else None), False
+        else:
+            total_count, total_is_exact = count_service.resolve(
+                count,
+                count_signature,
+                response.count,
+                lambda: _apply_probe_filters(
+                    supabase.table("http_probes").select("id", count="exact", head=True), **probe_filters
+                ),
+                cursor
+            )
         
         # Return with pagination info
         return {
             "probes": probes_data,
             "total": total_count,
+            "total_is_exact": total_is_exact,
             "limit": limit,
-            "offset": offset
+            "offset": offset,
+            "next_cursor": next_cursor,
+            "next_watermark": next_watermark,
+            "has_more": has_more if since else next_cursor is not None
         }
         
+    except (InvalidCursorError, InvalidWatermarkError) as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         logging.error(f"Failed to fetch HTTP probes: {str(e)}")
         raise HTTPException(
@@ -114,6 +206,102 @@ async def get_http_probes(
         )
 
 
+async def _compute_http_probe_stats(supabase, asset_id: Optional[str], scan_job_id: Optional[str]) -> Dict[str, Any]:
+    """Compute HTTP probe stats (served through the result cache by get_http_probe_stats)."""
+    # Check if filters are applied
+    has_filters = asset_id is not None or scan_job_id is not None
+    
+    if not has_filters:
+        # ================================================================
+        # OPTIMIZED PATH: Use http_probe_stats VIEW for global stats
+        # Single query replaces fetching all 22K+ rows
+        # ================================================================
+        stats_result = await supabase.table("http_probe_stats").select("*").execute()
+        stats = stats_result.data[0] if stats_result.data else {}
+        
+        total_probes = stats.get("total_probes", 0)
+        redirect_chains_count = stats.get("with_redirects", 0)
+        
+        # Build status distribution from pre-computed counts
+        status_code_dist = {}
+        if stats.get("status_2xx", 0) > 0:
+            status_code_dist[200] = stats.get("status_2xx", 0)
+        if stats.get("status_3xx", 0) > 0:
+            status_code_dist[301] = stats.get("status_3xx", 0)
+        if stats.get("status_4xx", 0) > 0:
+            status_code_dist[404] = stats.get("status_4xx", 0)
+        if stats.get("status_5xx", 0) > 0:
+            status_code_dist[500] = stats.get("status_5xx", 0)
+        
+        # Get top webservers from VIEW
+        servers_result = await supabase.table("http_probe_webserver_counts").select("*").limit(10).execute()
+        top_servers = [
+            {"name": s.get("webserver", "Unknown"), "count": s.get("count", 0)}
+            for s in (servers_result.data or [])
+        ]
+        
+        # For technologies, we still need to sample (JSONB arrays require expansion)
+        # Fetch a representative sample of 500 probes with technologies
+        tech_sample = await supabase.table("http_probes").select(
+            "technologies"
+        ).not_.is_("technologies", "null").limit(500).execute()
+        
+        tech_counts = {}
+        for probe in (tech_sample.data or []):
+            technologies = probe.get("technologies", [])
+            if isinstance(technologies, list):
+                for tech in technologies:
+                    tech_counts[tech] = tech_counts.get(tech, 0) + 1
+        
+        top_technologies = [
+            {"name": tech, "count": count}
+            for tech, count in sorted(tech_counts.items(), key=lambda x: x[1], reverse=True)[:10]
+        ]
+        
+        # CDN counts from sample
+        cdn_sample = await supabase.table("http_probes").select(
+            "cdn_name"
+        ).not_.is_("cdn_name", "null").limit(500).execute()
+        
+        cdn_counts = {}
+        for probe in (cdn_sample.data or []):
+            cdn = probe.get("cdn_name")
+            if cdn:
+                cdn_counts[cdn] = cdn_counts.get(cdn, 0) + 1
+        
+    else:
+        # ================================================================
+        # FILTERED PATH: Single-pass SQL aggregation
+        # One RPC returns exact distributions for the whole filtered set
+        # (replaces a count query + a 1000-row Python sample)
+        # ================================================================
+        agg_result = await supabase.rpc("get_http_probe_stats_aggregate", {
+            "p_asset_id": asset_id,
+            "p_scan_job_id": scan_job_id,
+            "p_top_n": 10
+        }).execute()
+        stats = agg_result.data or {}
+        
+        total_probes = stats.get("total_probes", 0)
+        redirect_chains_count = stats.get("redirect_chains_count", 0)
+        status_code_dist = {
+            int(code): count
+            for code, count in (stats.get("status_code_distribution") or {}).items()
+        }
+        top_technologies = stats.get("top_technologies", [])
+        top_servers = stats.get("top_servers", [])
+        cdn_counts = stats.get("cdn_usage") or {}
+    
+    return {
+        "total_probes": total_probes,
+        "status_code_distribution": status_code_dist,
+        "top_technologies": top_technologies,
+        "top_servers": top_servers,
+        "cdn_usage": cdn_counts,
+        "redirect_chains_count": redirect_chains_count
+    }
+
+
 # NOTE: Static routes like /stats/summary MUST be defined BEFORE dynamic routes like /{probe_id}
 # FastAPI matches routes in order of definition
 @router.get("/stats/summary", response_model=HTTPProbeStatsResponse)
@@ -129,6 +317,9 @@ async def get_http_probe_stats(
     Previously: Fetched all 22K+ rows in batches (~4.4 seconds)
     Now: 3-4 optimized queries (~0.5 seconds)
     
+    Filtered queries call the `get_http_probe_stats_aggregate` SQL function
+    for exact distributions in a single round trip.
+    
     Returns summary metrics including:
     - Total probe count
     - Status code distribution (200s, 404s, 500s, etc.)
@@ -141,145 +332,17 @@ async def get_http_probe_stats(
     """
     try:
         # Use service_client to bypass RLS - LEAN architecture allows all authenticated users
-        supabase = supabase_client.service_client
-        
-        # Check if filters are applied
-        has_filters = asset_id is not None or scan_job_id is not None
+        supabase = supabase_client.async_service_client
         
-        if not has_filters:
-            # ================================================================
-            # OPTIMIZED PATH: Use http_probe_stats VIEW for global stats
-            # Single query replaces fetching all 22K+ rows
-            # ================================================================
-            stats_result = supabase.table("http_probe_stats").select("*").execute()
-            stats = stats_result.data[0] if stats_result.data else {}
-            
-            total_probes = stats.get("total_probes", 0)
-            redirect_chains_count = stats.get("with_redirects", 0)
-            
-            # Build status distribution from pre-computed counts
-            status_code_dist = {}
-            if stats.get("status_2xx", 0) > 0:
-                status_code_dist[200] = stats.get("status_2xx", 0)
-            if stats.get("status_3xx", 0) > 0:
-                status_code_dist[301] = stats.get("status_3xx", 0)
-            if stats.get("status_4xx", 0) > 0:
-                status_code_dist[404] = stats.get("status_4xx", 0)
-            if stats.get("status_5xx", 0) > 0:
-                status_code_dist[500] = stats.get("status_5xx", 0)
-            
-            # Get top webservers from VIEW
-            servers_result = supabase.table("http_probe_webserver_counts").select("*").limit(10).execute()
-            top_servers = [
-                {"name": s.get("webserver", "Unknown"), "count": s.get("count", 0)}
-                for s in (servers_result.data or [])
-            ]
-            
-            # For technologies, we still need to sample (JSONB arrays require expansion)
-            # Fetch a representative sample of 500 probes with technologies
-            tech_sample = supabase.table("http_probes").select(
-                "technologies"
-            ).not_.is_("technologies", "null").limit(500).execute()
-            
-            tech_counts = {}
-            for probe in (tech_sample.data or []):
-                technologies = probe.get("technologies", [])
-                if isinstance(technologies, list):
-                    for tech in technologies:
-                        tech_counts[tech] = tech_counts.get(tech, 0) + 1
-            
-            top_technologies = [
-                {"name": tech, "count": count}
-                for tech, count in sorted(tech_counts.items(), key=lambda x: x[1], reverse=True)[:10]
-            ]
-            
-            # CDN counts from sample
-            cdn_sample = supabase.table("http_probes").select(
-                "cdn_name"
-            ).not_.is_("cdn_name", "null").limit(500).execute()
-            
-            cdn_counts = {}
-            for probe in (cdn_sample.data or []):
-                cdn = probe.get("cdn_name")
-                if cdn:
-                    cdn_counts[cdn] = cdn_counts.get(cdn, 0) + 1
-            
-        else:
-            # ================================================================
-            # FILTERED PATH: Use count queries with filters
-            # Still optimized but cannot use pre-computed views
-            # ================================================================
-            count_query = supabase.table("http_probes").select("id", count="exact")
-            if asset_id:
-                count_query = count_query.eq("asset_id", asset_id)
-            if scan_job_id:
-                count_query = count_query.eq("scan_job_id", scan_job_id)
-            count_result = count_query.limit(1).execute()
-            total_probes = count_result.count or 0
-            
-            # For filtered queries, fetch a sample for distributions
-            sample_query = supabase.table("http_probes").select(
-                "status_code, webserver, technologies, cdn_name, chain_status_codes"
-            )
-            if asset_id:
-                sample_query = sample_query.eq("asset_id", asset_id)
-            if scan_job_id:
-                sample_query = sample_query.eq("scan_job_id", scan_job_id)
-            
-            # Fetch up to 1000 for distribution calculations
-            sample_result = sample_query.limit(1000).execute()
-            probes = sample_result.data or []
-            
-            # Calculate distributions from sample
-            status_code_dist = {}
-            for probe in probes:
-                code = probe.get("status_code")
-                if code:
-                    status_code_dist[code] = status_code_dist.get(code, 0) + 1
-            
-            tech_counts = {}
-            for probe in probes:
-                technologies = probe.get("technologies", [])
-                if isinstance(technologies, list):
-                    for tech in technologies:
-                        tech_counts[tech] = tech_counts.get(tech, 0) + 1
-            
-            top_technologies = [
-                {"name": tech, "count": count}
-                for tech, count in sorted(tech_counts.items(), key=lambda x: x[1], reverse=True)[:10]
-            ]
-            
-            server_counts = {}
-            for probe in probes:
-                server = probe.get("webserver")
-                if server:
-                    server_counts[server] = server_counts.get(server, 0) + 1
-            
-            top_servers = [
-                {"name": server, "count": count}
-                for server, count in sorted(server_counts.items(), key=lambda x: x[1], reverse=True)[:10]
-            ]
-            
-            cdn_counts = {}
-            for probe in probes:
-                cdn = probe.get("cdn_name")
-                if cdn:
-                    cdn_counts[cdn] = cdn_counts.get(cdn, 0) + 1
-            
-            redirect_chains_count = sum(
-                1 for probe in probes 
-                if probe.get("chain_status_codes") and len(probe.get("chain_status_codes", [])) > 0
-            )
-        
-        return HTTPProbeStatsResponse(
-            total_probes=total_probes,
-            status_code_distribution=status_code_dist,
-            top_technologies=top_technologies,
-            top_servers=top_servers,
-            cdn_usage=cdn_counts,
-            redirect_chains_count=redirect_chains_count
+        stats = await result_cache.get_or_compute(
+            "http_probe_stats",
+            {"asset_id": asset_id, "scan_job_id": scan_job_id},
+            lambda: _compute_http_probe_stats(supabase, asset_id, scan_job_id),
+            asset_id=asset_id
         )
         
+        return HTTPProbeStatsResponse(**stats)
+        
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -318,10 +381,10 @@ async def get_http_probe_by_id(
     
     try:
         # Use service_client to bypass RLS - LEAN architecture allows all authenticated users
-        supabase = supabase_client.service_client
+        supabase = supabase_client.async_service_client
         
         # Get the probe
-        response = supabase.table("http_probes").select("*").eq("id", probe_id).execute()
+        response = await supabase.table("http_probes").select("*").eq("id", probe_id).execute()
         
         if not response.data or len(response.data) == 0:
             raise HTTPException(
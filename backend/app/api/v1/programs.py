@@ -17,6 +17,9 @@ import logging
 from ...core.dependencies import get_current_user
 from ...schemas.auth import UserResponse
 from ...core.supabase_client import supabase_client
+from ...utils.pagination import InvalidCursorError, apply_keyset, keyset_page, encode_cursor
+from ...services.result_cache import result_cache
+from ...services.single_flight import single_flight
 
 router = APIRouter(prefix="/programs", tags=["programs"])
 logger = logging.getLogger(__name__)
@@ -32,13 +35,15 @@ async def list_programs(
     search: Optional[str] = Query(None, description="Search by program name"),
     page: int = Query(1, ge=1, description="Page number (1-indexed)"),
     per_page: int = Query(25, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor (overrides page)"),
     current_user: UserResponse = Depends(get_current_user)
 ):
     """
     List all bug bounty programs with reconnaissance statistics.
     
     All authenticated users have access to all programs.
-    This is the LEAN public data model.
+    This is the LEAN public data model, so pages are served from the
+    shared result cache.
     
     Returns:
         Paginated response with:
@@ -47,48 +52,21 @@ async def list_programs(
     """
     try:
         # Use service client for public data access
-        client = supabase_client.service_client
+        client = supabase_client.async_service_client
         
-        # Build query with count for pagination
-        query = client.table("assets").select(
-            "id, name, description, is_active, priority, tags, created_at, updated_at",
-            count="exact"
+        result = await result_cache.get_or_compute(
+            "programs",
+            {"include_stats": include_stats, "search": search, "page": page, "per_page": per_page, "cursor": cursor},
+            lambda: _list_programs_page(client, include_stats, search, page, per_page, cursor)
         )
+        programs, pagination = result["programs"], result["pagination"]
         
-        # Apply search filter
-        if search:
-            query = query.ilike("name", f"%{search}%")
-        
-        # Apply pagination (convert page/per_page to offset)
-        offset = (page - 1) * per_page
-        query = query.range(offset, offset + per_page - 1)
-        query = query.order("created_at", desc=True)
+        logger.info(f"Returning {len(programs)} programs (page {page}/{pagination['total_pages']}) for user {current_user.id}")
         
-        result = query.execute()
-        programs = result.data or []
-        total = result.count or 0
-        
-        # Enrich with statistics if requested
-        if include_stats and programs:
-            programs = await _enrich_programs_with_stats(client, programs)
-        
-        # Calculate pagination metadata
-        total_pages = (total + per_page - 1) // per_page if total > 0 else 0
-        
-        logger.info(f"Returning {len(programs)} programs (page {page}/{total_pages}) for user {current_user.id}")
-        
-        return {
-            "programs": programs,
-            "pagination": {
-                "total": total,
-                "page": page,
-                "per_page": per_page,
-                "total_pages": total_pages,
-                "has_next": page < total_pages,
-                "has_prev": page > 1
-            }
-        }
+        return result
         
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         logger.error(f"Error listing programs: {str(e)}")
         raise HTTPException(
@@ -107,6 +85,7 @@ async def get_all_subdomains(
     page: int = Query(1, ge=1, description="Page number"),
     per_page: int = Query(100, ge=1, le=1000, description="Items per page"),
     search: Optional[str] = Query(None, description="Search subdomain names"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor (overrides page)"),
     current_user: UserResponse = Depends(get_current_user)
 ):
     """
@@ -116,12 +95,12 @@ async def get_all_subdomains(
         Paginated list of all subdomains
     """
     try:
-        client = supabase_client.service_client
+        client = supabase_client.async_service_client
         
         # Build subdomains query - NOTE: source_module NOT exposed to users
         query = client.table("subdomains").select(
             "id, subdomain, parent_domain, discovered_at, scan_job_id",
-            count="exact"
+            count=None if cursor else "exact"
         )
         
         # Apply search filter
@@ -129,28 +108,17 @@ async def get_all_subdomains(
             query = query.ilike("subdomain", f"%{search}%")
         
         # Apply pagination
-        offset = (page - 1) * per_page
-        query = query.range(offset, offset + per_page - 1)
-        query = query.order("discovered_at", desc=True)
+        subdomains, next_cursor, total = await _fetch_page(query, "discovered_at", page, per_page, cursor)
         
-        result = query.execute()
-        total = result.count or 0
-        total_pages = (total + per_page - 1) // per_page if total > 0 else 0
-        
-        logger.info(f"Returning {len(result.data or [])} subdomains (all programs)")
+        logger.info(f"Returning {len(subdomains)} subdomains (all programs)")
         
         return {
-            "subdomains": result.data or [],
-            "pagination": {
-                "total": total,
-                "page": page,
-                "per_page": per_page,
-                "total_pages": total_pages,
-                "has_next": page < total_pages,
-                "has_prev": page > 1
-            }
+            "subdomains": subdomains,
+            "pagination": _pagination_meta(total, page, per_page, cursor, next_cursor)
         }
         
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         logger.error(f"Error getting all subdomains: {str(e)}")
         raise HTTPException(
@@ -184,26 +152,15 @@ async def get_program(
         )
     
     try:
-        client = supabase_client.service_client
-        
-        result = client.table("assets").select(
-            "id, name, description, is_active, priority, tags, created_at, updated_at"
-        ).eq("id", program_id).maybe_single().execute()
+        client = supabase_client.async_service_client
         
-        # maybe_single() returns None when no record found
-        if result is None or not result.data:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Program not found"
-            )
-        
-        program = result.data
-        
-        # Get detailed stats
-        enriched = await _enrich_programs_with_stats(client, [program])
+        # Identical concurrent requests (e.g. many tabs refreshing) share one load
+        program = await single_flight.do(
+            "program_detail", {"program_id": program_id}, lambda: _load_program(client, program_id)
+        )
         
         logger.info(f"Returning program {program_id} for user {current_user.id}")
-        return enriched[0] if enriched else program
+        return program
         
     except HTTPException:
         raise
@@ -225,6 +182,7 @@ async def get_program_subdomains(
     page: int = Query(1, ge=1, description="Page number"),
     per_page: int = Query(100, ge=1, le=1000, description="Items per page"),
     search: Optional[str] = Query(None, description="Search subdomain names"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor (overrides page)"),
     current_user: UserResponse = Depends(get_current_user)
 ):
     """
@@ -236,10 +194,10 @@ async def get_program_subdomains(
     Note: source_module filter removed - internal tool names not exposed.
     """
     try:
-        client = supabase_client.service_client
+        client = supabase_client.async_service_client
         
         # Verify program exists
-        program_check = client.table("assets").select("id").eq("id", program_id).execute()
+        program_check = await client.table("assets").select("id").eq("id", program_id).execute()
         if not program_check.data:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -247,26 +205,19 @@ async def get_program_subdomains(
             )
         
         # Get asset_scan_job IDs for this program
-        scan_jobs = client.table("asset_scan_jobs").select("id").eq("asset_id", program_id).execute()
+        scan_jobs = await client.table("asset_scan_jobs").select("id").eq("asset_id", program_id).execute()
         scan_job_ids = [job["id"] for job in (scan_jobs.data or [])]
         
         if not scan_job_ids:
             return {
                 "subdomains": [],
-                "pagination": {
-                    "total": 0,
-                    "page": page,
-                    "per_page": per_page,
-                    "total_pages": 0,
-                    "has_next": False,
-                    "has_prev": False
-                }
+                "pagination": _pagination_meta(0, page, per_page, None, None)
             }
         
         # Build subdomains query - NOTE: source_module NOT exposed to users
         query = client.table("subdomains").select(
             "id, subdomain, parent_domain, discovered_at, scan_job_id",
-            count="exact"
+            count=None if cursor else "exact"
         ).in_("scan_job_id", scan_job_ids)
         
         # Apply search filter only
@@ -274,28 +225,17 @@ async def get_program_subdomains(
             query = query.ilike("subdomain", f"%{search}%")
         
         # Apply pagination
-        offset = (page - 1) * per_page
-        query = query.range(offset, offset + per_page - 1)
-        query = query.order("discovered_at", desc=True)
+        subdomains, next_cursor, total = await _fetch_page(query, "discovered_at", page, per_page, cursor)
         
-        result = query.execute()
-        total = result.count or 0
-        total_pages = (total + per_page - 1) // per_page if total > 0 else 0
-        
-        logger.info(f"Returning {len(result.data or [])} subdomains for program {program_id}")
+        logger.info(f"Returning {len(subdomains)} subdomains for program {program_id}")
         
         return {
-            "subdomains": result.data or [],
-            "pagination": {
-                "total": total,
-                "page": page,
-                "per_page": per_page,
-                "total_pages": total_pages,
-                "has_next": page < total_pages,
-                "has_prev": page > 1
-            }
+            "subdomains": subdomains,
+            "pagination": _pagination_meta(total, page, per_page, cursor, next_cursor)
         }
         
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except HTTPException:
         raise
     except Exception as e:
@@ -317,6 +257,7 @@ async def get_program_dns_records(
     per_page: int = Query(100, ge=1, le=1000, description="Items per page"),
     record_type: Optional[str] = Query(None, description="Filter by record type (A, AAAA, CNAME, MX, TXT)"),
     subdomain: Optional[str] = Query(None, description="Filter by subdomain"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor (overrides page)"),
     current_user: UserResponse = Depends(get_current_user)
 ):
     """
@@ -326,10 +267,10 @@ async def get_program_dns_records(
         Paginated list of DNS records
     """
     try:
-        client = supabase_client.service_client
+        client = supabase_client.async_service_client
         
         # Verify program exists
-        program_check = client.table("assets").select("id").eq("id", program_id).execute()
+        program_check = await client.table("assets").select("id").eq("id", program_id).execute()
         if not program_check.data:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -339,7 +280,7 @@ async def get_program_dns_records(
         # Build DNS records query - FIXED: use correct column names
         query = client.table("dns_records").select(
             "id, subdomain, parent_domain, record_type, record_value, ttl, resolved_at, cloud_provider, cdn_provider",
-            count="exact"
+            count=None if cursor else "exact"
         ).eq("asset_id", program_id)
         
         # Apply filters
@@ -349,28 +290,17 @@ async def get_program_dns_records(
             query = query.ilike("subdomain", f"%{subdomain}%")
         
         # Apply pagination
-        offset = (page - 1) * per_page
-        query = query.range(offset, offset + per_page - 1)
-        query = query.order("resolved_at", desc=True)
-        
-        result = query.execute()
-        total = result.count or 0
-        total_pages = (total + per_page - 1) // per_page if total > 0 else 0
+        dns_records, next_cursor, total = await _fetch_page(query, "resolved_at", page, per_page, cursor)
         
-        logger.info(f"Returning {len(result.data or [])} DNS records for program {program_id}")
+        logger.info(f"Returning {len(dns_records)} DNS records for program {program_id}")
         
         return {
-            "dns_records": result.data or [],
-            "pagination": {
-                "total": total,
-                "page": page,
-                "per_page": per_page,
-                "total_pages": total_pages,
-                "has_next": page < total_pages,
-                "has_prev": page > 1
-            }
+            "dns_records": dns_records,
+            "pagination": _pagination_meta(total, page, per_page, cursor, next_cursor)
         }
         
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except HTTPException:
         raise
     except Exception as e:
@@ -392,6 +322,7 @@ async def get_program_http_probes(
     per_page: int = Query(100, ge=1, le=1000, description="Items per page"),
     status_code: Optional[int] = Query(None, description="Filter by HTTP status code"),
     technology: Optional[str] = Query(None, description="Filter by detected technology"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor (overrides page)"),
     current_user: UserResponse = Depends(get_current_user)
 ):
     """
@@ -401,10 +332,10 @@ async def get_program_http_probes(
         Paginated list of HTTP probe results
     """
     try:
-        client = supabase_client.service_client
+        client = supabase_client.async_service_client
         
         # Verify program exists
-        program_check = client.table("assets").select("id").eq("id", program_id).execute()
+        program_check = await client.table("assets").select("id").eq("id", program_id).execute()
         if not program_check.data:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -414,7 +345,7 @@ async def get_program_http_probes(
         # Build HTTP probes query - FIXED: use correct column names (cdn_name, created_at)
         query = client.table("http_probes").select(
             "id, url, status_code, title, content_length, content_type, technologies, webserver, cdn_name, created_at",
-            count="exact"
+            count=None if cursor else "exact"
         ).eq("asset_id", program_id)
         
         # Apply filters
@@ -425,28 +356,17 @@ async def get_program_http_probes(
             query = query.contains("technologies", [technology])
         
         # Apply pagination
-        offset = (page - 1) * per_page
-        query = query.range(offset, offset + per_page - 1)
-        query = query.order("created_at", desc=True)
-        
-        result = query.execute()
-        total = result.count or 0
-        total_pages = (total + per_page - 1) // per_page if total > 0 else 0
+        probes, next_cursor, total = await _fetch_page(query, "created_at", page, per_page, cursor)
         
-        logger.info(f"Returning {len(result.data or [])} HTTP probes for program {program_id}")
+        logger.info(f"Returning {len(probes)} HTTP probes for program {program_id}")
         
         return {
-            "probes": result.data or [],
-            "pagination": {
-                "total": total,
-                "page": page,
-                "per_page": per_page,
-                "total_pages": total_pages,
-                "has_next": page < total_pages,
-                "has_prev": page > 1
-            }
+            "probes": probes,
+            "pagination": _pagination_meta(total, page, per_page, cursor, next_cursor)
         }
         
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except HTTPException:
         raise
     except Exception as e:
@@ -461,6 +381,123 @@ async def get_program_http_probes(
 # Helper Functions
 # ================================================================
 
+async def _list_programs_page(
+    client,
+    include_stats: bool,
+    search: Optional[str],
+    page: int,
+    per_page: int,
+    cursor: Optional[str]
+) -> Dict[str, Any]:
+    """Fetch one page of programs (shared by all users via the result cache)."""
+    # Build query with count for pagination
+    query = client.table("assets").select(
+        "id, name, description, is_active, priority, tags, created_at, updated_at",
+        count=None if cursor else "exact"
+    )
+    
+    # Apply search filter
+    if search:
+        query = query.ilike("name", f"%{search}%")
+    
+    # Apply pagination (keyset cursor, or page/per_page compatibility shim)
+    programs, next_cursor, total = await _fetch_page(query, "created_at", page, per_page, cursor)
+    
+    # Enrich with statistics if requested
+    if include_stats and programs:
+        programs = await _enrich_programs_with_stats(client, programs)
+    
+    pagination = _pagination_meta(total, page, per_page, cursor, next_cursor)
+    
+    return {
+        "programs": programs,
+        "pagination": pagination
+    }
+
+
+async def _load_program(client, program_id: str) -> Dict[str, Any]:
+    """Load one program with its detailed statistics (404 if missing)."""
+    result = await client.table("assets").select(
+        "id, name, description, is_active, priority, tags, created_at, updated_at"
+    ).eq("id", program_id).maybe_single().execute()
+    
+    # maybe_single() returns None when no record found
+    if result is None or not result.data:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Program not found"
+        )
+    
+    program = result.data
+    
+    # Get detailed stats
+    enriched = await _enrich_programs_with_stats(client, [program])
+    return enriched[0] if enriched else program
+
+
+async def _fetch_page(
+    query,
+    sort_column: str,
+    page: int,
+    per_page: int,
+    cursor: Optional[str]
+) -> tuple:
+    """
+    Execute a list query newest-first with keyset pagination.
+    
+    `cursor` (or page 1) seeks via the (sort_column, id) index so every page
+    costs the same. page > 1 without a cursor is the legacy OFFSET shim.
+    
+    Returns:
+        (rows, next_cursor, total) - total is None on cursor pages
+    """
+    if cursor or page == 1:
+        result = await apply_keyset(query, sort_column, per_page, cursor).execute()
+        rows, next_cursor = keyset_page(result.data, sort_column, per_page)
+    else:
+        offset = (page - 1) * per_page
+        query = query.order(sort_column, desc=True, nullsfirst=False).order("id", desc=True)
+        result = await query.range(offset, offset + per_page - 1).execute()
+        rows = result.data or []
+        next_cursor = None
+        if len(rows) == per_page:
+            next_cursor = encode_cursor(rows[-1].get(sort_column), rows[-1]["id"])
+    
+    total = None if cursor else (result.count or 0)
+    return rows, next_cursor, total
+
+
+def _pagination_meta(
+    total: Optional[int],
+    page: int,
+    per_page: int,
+    cursor: Optional[str],
+    next_cursor: Optional[str]
+) -> Dict[str, Any]:
+    """Build pagination metadata (page fields are null when paging by cursor)."""
+    if cursor:
+        return {
+            "total": None,
+            "page": None,
+            "per_page": per_page,
+            "total_pages": None,
+            "has_next": next_cursor is not None,
+            "has_prev": True,
+            "next_cursor": next_cursor
+        }
+    
+    total_pages = (total + per_page - 1) // per_page if total > 0 else 0
+    return {
+        "total": total,
+        "page": page,
+        "per_page": per_page,
+        "total_pages": total_pages,
+        "has_next": next_cursor is not None,
+        "has_prev": page > 1,
+        "next_cursor": next_cursor
+    }
+
+
 async def _enrich_programs_with_stats(client, programs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """
     Enrich programs with statistics using BATCH queries (optimized).
@@ -480,7 +517,7 @@ async def _enrich_programs_with_stats(client, programs: List[Dict[str, Any]]) ->
     # This replaces 3 queries per program
     # ================================================================
     try:
-        overview_result = client.table("asset_overview").select(
+        overview_result = await client.table("asset_overview").select(
             "id, domain_count, subdomain_count"
         ).in_("id", program_ids).execute()
         
@@ -501,7 +538,7 @@ async def _enrich_programs_with_stats(client, programs: List[Dict[str, Any]]) ->
     # ================================================================
     try:
         # Get the most recent scan for each asset in one query
-        scans_result = client.table("asset_scan_jobs").select(
+        scans_result = await client.table("asset_scan_jobs").select(
             "asset_id, created_at"
         ).in_("asset_id", program_ids).order(
             "created_at", desc=True
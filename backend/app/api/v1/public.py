@@ -73,12 +73,12 @@ async def get_showcase(request: Request):
         return cached
     
     try:
-        client = supabase_client.service_client
+        client = supabase_client.async_service_client
         
         # ====================================================================
         # Get all programs (assets) for name lookup
         # ====================================================================
-        programs_result = client.table("assets").select("id, name").execute()
+        programs_result = await client.table("assets").select("id, name").execute()
         programs = {p["id"]: p["name"] for p in (programs_result.data or [])}
         program_ids = list(programs.keys())
         
@@ -106,14 +106,14 @@ async def get_showcase(request: Request):
             program_id = p["id"]
             
             # Count subdomains for this program
-            sub_count_result = client.table("subdomains")\
+            sub_count_result = await client.table("subdomains")\
                 .select("id", count="exact")\
                 .eq("asset_id", program_id)\
                 .execute()
             subdomain_count = sub_count_result.count or 0
             
             # Count servers (http_probes) for this program
-            server_count_result = client.table("http_probes")\
+            server_count_result = await client.table("http_probes")\
                 .select("id", count="exact")\
                 .eq("asset_id", program_id)\
                 .execute()
@@ -131,7 +131,7 @@ async def get_showcase(request: Request):
         # ====================================================================
         subdomains_data = []
         # Get a larger sample and pick randomly
-        subs_result = client.table("subdomains")\
+        subs_result = await client.table("subdomains")\
             .select("subdomain, parent_domain, asset_id")\
             .limit(100)\
             .execute()
@@ -151,7 +151,7 @@ async def get_showcase(request: Request):
         # Get random DNS records (5 records)
         # ====================================================================
         dns_data = []
-        dns_result = client.table("dns_records")\
+        dns_result = await client.table("dns_records")\
             .select("subdomain, record_type, record_value, ttl, asset_id")\
             .limit(100)\
             .execute()
@@ -172,7 +172,7 @@ async def get_showcase(request: Request):
         # Get random web servers / HTTP probes (5 records)
         # ====================================================================
         servers_data = []
-        probes_result = client.table("http_probes")\
+        probes_result = await client.table("http_probes")\
             .select("url, status_code, title, webserver, content_length, technologies, asset_id")\
             .limit(100)\
             .execute()
@@ -203,35 +203,35 @@ async def get_showcase(request: Request):
         
         # Get URL stats from materialized view (fast!)
         try:
-            url_stats = client.table("url_stats").select("total_urls").execute()
+            url_stats = await client.table("url_stats").select("total_urls").execute()
             if url_stats.data and len(url_stats.data) > 0:
                 total_urls = url_stats.data[0].get("total_urls", 0)
         except Exception:
             # Fallback to count if MV doesn't exist
-            urls_count = client.table("urls").select("id", count="exact").limit(1).execute()
+            urls_count = await client.table("urls").select("id", count="exact").limit(1).execute()
             total_urls = urls_count.count or 0
         
         # Get HTTP probe stats from materialized view (fast!)
         try:
-            probe_stats = client.table("http_probe_stats").select("total_probes").execute()
+            probe_stats = await client.table("http_probe_stats").select("total_probes").execute()
             if probe_stats.data and len(probe_stats.data) > 0:
                 total_probes = probe_stats.data[0].get("total_probes", 0)
         except Exception:
             # Fallback to count if MV doesn't exist
-            probes_count = client.table("http_probes").select("id", count="exact").limit(1).execute()
+            probes_count = await client.table("http_probes").select("id", count="exact").limit(1).execute()
             total_probes = probes_count.count or 0
         
         # Get DNS count from subdomain_current_dns MV (has total_records per subdomain)
         # Or use direct count with limit for reasonable performance
         try:
-            dns_count = client.table("dns_records").select("id", count="exact").limit(1).execute()
+            dns_count = await client.table("dns_records").select("id", count="exact").limit(1).execute()
             total_dns = dns_count.count or 0
         except Exception:
             total_dns = 0
         
         # Count subdomains (smaller table, direct count is OK)
         try:
-            subs_count = client.table("subdomains").select("id", count="exact").limit(1).execute()
+            subs_count = await client.table("subdomains").select("id", count="exact").limit(1).execute()
             total_subdomains = subs_count.count or 0
         except Exception:
             total_subdomains = 0
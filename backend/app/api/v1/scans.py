@@ -337,7 +337,7 @@ async def list_scans(
     """
     try:
         from ...core.supabase_client import supabase_client
-        supabase = supabase_client.service_client
+        supabase = supabase_client.async_service_client
         
         # Build query
         query = supabase.table("scans").select(
@@ -356,12 +356,12 @@ async def list_scans(
         if status_filter:
             count_response = count_response.eq("status", status_filter)
         
-        count_result = count_response.execute()
+        count_result = await count_response.execute()
         total_count = count_result.count or 0
         
         # Apply pagination
         query = query.range(offset, offset + limit - 1)
-        response = query.execute()
+        response = await query.execute()
         
         scans = response.data or []
         
@@ -23,11 +23,73 @@ from ...dependencies.tier_check import (
     get_remaining_url_quota,
 )
 from ...core.tier_limits import get_tier_limits
+from ...core.config import settings
+from ...utils.pagination import (
+    InvalidCursorError,
+    InvalidWatermarkError,
+    apply_delta,
+    apply_keyset,
+    delta_page,
+    encode_cursor,
+    keyset_page,
+    watermark_ceiling,
+)
+from ...services.count_service import CountMode, count_service
+from ...services.result_cache import result_cache
 
 
 router = APIRouter()
 
 
+def _apply_url_filters(
+    query,
+    asset_id: Optional[str] = None,
+    scan_job_id: Optional[str] = None,
+    parent_domain: Optional[str] = None,
+    is_alive: Optional[bool] = None,
+    status_code: Optional[int] = None,
+    has_params: Optional[bool] = None,
+    file_extension: Optional[str] = None,
+    domain: Optional[str] = None,
+    search: Optional[str] = None,
+):
+    """Apply the /urls list filters to a query (shared by page and count queries)."""
+    if asset_id:
+        query = query.eq("asset_id", asset_id)
+    
+    if scan_job_id:
+        query = query.eq("scan_job_id", scan_job_id)
+    
+    if parent_domain:
+        # Use the indexed parent_domain column for fast exact match
+        # This replaces the slow ILIKE pattern that caused timeouts
+        query = query.eq("parent_domain", parent_domain)
+    
+    if is_alive is not None:
+        query = query.eq("is_alive", is_alive)
+    
+    if status_code:
+        query = query.eq("status_code", status_code)
+    
+    if has_params is not None:
+        query = query.eq("has_params", has_params)
+    
+    if file_extension:
+        query = query.eq("file_extension", file_extension)
+    
+    if domain:
+        # Use ilike for case-insensitive partial match
+        query = query.ilike("domain", f"%{domain}%")
+    
+    if search:
+        # Search across multiple fields
+        query = query.or_(
+            f"url.ilike.%{search}%,domain.ilike.%{search}%,title.ilike.%{search}%"
+        )
+    
+    return query
+
+
 @router.get("")
 async def get_urls(
     response: Response,
@@ -41,7 +103,10 @@ async def get_urls(
     domain: Optional[str] = Query(None, description="Filter by domain (partial match)"),
     search: Optional[str] = Query(None, description="Search in URL, domain, or title"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum number of URLs to return"),
-    offset: int = Query(0, ge=0, description="Number of URLs to skip (pagination)"),
+    offset: int = Query(0, ge=0, description="Number of URLs to skip (legacy pagination - prefer cursor)"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    since: Optional[str] = Query(None, description="Only rows added or changed after this watermark (a previous next_watermark, or an ISO timestamp)"),
+    count: CountMode = Query(CountMode.PLANNED, description="Total count mode: exact, planned (estimate + cached exact), or none"),
     current_user: UserResponse = Depends(get_current_user)
 ) -> Dict[str, Any]:
     """
@@ -59,7 +124,19 @@ async def get_urls(
     - Domain: Search by domain name (partial match)
     - Search: Search across URL, domain, and title
     
-    Pagination: Use `limit` and `offset` parameters (default: 100 items per page).
+    Pagination: Use `limit` with `cursor` (keyset - every page costs the same).
+    Pass the previous response's `next_cursor` as `cursor` to get the next page;
+    `next_cursor` is null on the last page. `offset` is kept for compatibility
+    but degrades linearly on deep pages.
+    
+    Totals (`count=`): `planned` (default) returns a planner estimate and
+    computes the exact count in the background, serving it on later requests
+    with the same filters; `exact` always counts; `none` skips the total.
+    `total_is_exact` tells the UI whether to render the total as "~N".
+    
+    Incremental sync (`since=`): returns only URLs added or changed (e.g.
+    resolved) after the watermark, oldest change first, with no total.
+    Pass `next_watermark` back as `since` until `has_more` is false.
     
     **Free tier limit:** 250 total URLs. Upgrade to see all URLs.
     
@@ -102,7 +179,7 @@ async def get_urls(
             }
         
         # Use service_client to bypass RLS - LEAN architecture allows all authenticated users
-        supabase = supabase_client.service_client
+        supabase = supabase_client.async_service_client
         
         # Check if any filters are applied
         has_filters = any([
@@ -125,56 +202,34 @@ async def get_urls(
             "has_params, file_extension, created_at, updated_at"
         )
         
+        url_filters = {
+            "asset_id": asset_id,
+            "scan_job_id": scan_job_id,
+            "parent_domain": parent_domain,
+            "is_alive": is_alive,
+            "status_code": status_code,
+            "has_params": has_params,
+            "file_extension": file_extension,
+            "domain": domain,
+            "search": search,
+        }
+        count_signature = count_service.signature("urls", url_filters)
+        
         # Count strategy:
         # - No filters: use MV (fast)
-        # - Simple filters (asset_id, status_code, etc.): use count="exact" (indexes make it fast)
-        # - Expensive ILIKE filters: skip count to avoid timeout
-        if has_expensive_filters:
-            # ILIKE with leading wildcards causes full table scans - skip count
-            query = supabase.table("urls").select(select_fields)
-        elif has_filters:
-            # Simple indexed filters - count is fast
-            query = supabase.table("urls").select(select_fields, count="exact")
+        # - Simple filters (asset_id, status_code, etc.): count mode decides
+        #   (planned estimate + cached exact count by default)
+        # - Expensive ILIKE filters: planner estimate only - an exact count
+        #   would scan the whole table, so it is never run for these
+        if not has_filters or count == CountMode.NONE or cursor or since:
+            count_method = None
+        elif has_expensive_filters:
+            count_method = "planned"
         else:
-            # No filters - will use MV for count
-            query = supabase.table("urls").select(select_fields)
+            count_method = count_service.count_method(count, count_signature, cursor)
         
-        # Apply filters
-        if asset_id:
-            query = query.eq("asset_id", asset_id)
-        
-        if scan_job_id:
-            query = query.eq("scan_job_id", scan_job_id)
-        
-        if parent_domain:
-            # Use the indexed parent_domain column for fast exact match
-            # This replaces the slow ILIKE pattern that caused timeouts
-            query = query.eq("parent_domain", parent_domain)
-        
-        if is_alive is not None:
-            query = query.eq("is_alive", is_alive)
-        
-        if status_code:
-            query = query.eq("status_code", status_code)
-        
-        if has_params is not None:
-            query = query.eq("has_params", has_params)
-        
-        if file_extension:
-            query = query.eq("file_extension", file_extension)
-        
-        if domain:
-            # Use ilike for case-insensitive partial match
-            query = query.ilike("domain", f"%{domain}%")
-        
-        if search:
-            # Search across multiple fields
-            query = query.or_(
-                f"url.ilike.%{search}%,domain.ilike.%{search}%,title.ilike.%{search}%"
-            )
-        
-        # Order by first_discovered_at descending (most recent first)
-        query = query.order("first_discovered_at", desc=True)
+        query = supabase.table("urls").select(select_fields, count=count_method)
+        query = _apply_url_filters(query, **url_filters)
         
         # For free tier: limit results based on remaining quota
         effective_limit = limit
@@ -200,36 +255,48 @@ async def get_urls(
             max_can_return = urls_remaining - offset
             effective_limit = min(limit, max_can_return)
         
-        # Apply pagination
-        query = query.range(effective_offset, effective_offset + effective_limit - 1)
+        # Apply pagination (most recent first):
+        # - Keyset (cursor, or first page): seeks via (first_discovered_at, id) index
+        # - Legacy offset shim: .range() skips rows, cost grows with offset
+        # - Delta (since=): changed rows, oldest change first, via (updated_at, id)
+        until = watermark_ceiling(settings.delta_settle_seconds) if since else None
+        use_keyset = cursor is not None or effective_offset == 0
+        if since:
+            query = apply_delta(query, "updated_at", effective_limit, since, until)
+        elif use_keyset:
+            query = apply_keyset(query, "first_discovered_at", effective_limit, cursor)
+        else:
+            query = query.order("first_discovered_at", desc=True, nullsfirst=False).order("id", desc=True)
+            query = query.range(effective_offset, effective_offset + effective_limit - 1)
         
         # Execute query
-        result = query.execute()
-        
-        urls_data = result.data or []
+        result = await query.execute()
+        
+        next_watermark = None
+        if since:
+            urls_data, next_watermark, has_more = delta_page(result.data, "updated_at", effective_limit, until)
+            next_cursor = None
+        elif use_keyset:
+            urls_data, next_cursor = keyset_page(result.data, "first_discovered_at", effective_limit)
+        else:
+            urls_data = result.data or []
+            next_cursor = None
+            if len(urls_data) == effective_limit:
+                last = urls_data[-1]
+                next_cursor = encode_cursor(last.get("first_discovered_at"), last["id"])
         urls_count = len(urls_data)
         
         # Get total count based on query strategy:
-        # - Expensive ILIKE filters: count not available, estimate from results
-        # - Simple indexed filters: use count from query
-        # - No filters: use url_stats MV
-        if has_expensive_filters:
-            # For ILIKE queries, we don't have exact count
-            # Return result count + offset as minimum estimate
-            # If we got a full page, there's likely more
-            if len(urls_data) == effective_limit:
-                # Got full page - estimate there are more (at least current position + results)
-                total_count = offset + len(urls_data) + 1  # +1 indicates "more available"
-            else:
-                # Got partial page - this is the actual total
-                total_count = offset + len(urls_data)
-        elif has_filters:
-            # Simple indexed filters - use count from query
-            total_count = result.count if result.count is not None else len(urls_data)
-        else:
+        # - No filters: use url_stats MV (refreshed periodically, so approximate)
+        # - Expensive ILIKE filters: planner estimate
+        # - Simple indexed filters: exact / estimate / cached exact per count mode
+        total_is_exact = False
+        if count == CountMode.NONE or since:
+            total_count = None
+        elif not has_filters:
             # No filters - use url_stats MV for fast total count
             try:
-                stats_result = supabase.table("url_stats").select("total_urls").execute()
+                stats_result = await supabase.table("url_stats").select("total_urls").execute()
                 if stats_result.data and len(stats_result.data) > 0:
                     total_count = stats_result.data[0].get("total_urls", len(urls_data))
                 else:
@@ -237,6 +304,19 @@ async def get_urls(
             except Exception:
                 # Fallback if MV doesn't exist
                 total_count = len(urls_data)
+        elif has_expensive_filters:
+            # Cursor pages don't recount - clients keep the first page's estimate
+            total_count = result.count if not cursor else None
+        else:
+            total_count, total_is_exact = count_service.resolve(
+                count,
+                count_signature,
+                result.count,
+                lambda: _apply_url_filters(
+                    supabase.table("urls").select("id", count="exact", head=True), **url_filters
+                ),
+                cursor
+            )
         
         # For free tier: track URLs viewed
         if is_limited and urls_count > 0:
@@ -248,8 +328,12 @@ async def get_urls(
         return {
             "urls": urls_data,
             "total": total_count,
+            "total_is_exact": total_is_exact,
             "limit": limit,
             "offset": offset,
+            "next_cursor": next_cursor,
+            "next_watermark": next_watermark,
+            "has_more": has_more if since else next_cursor is not None,
             "quota": {
                 "plan_type": plan_type,
                 "urls_limit": urls_limit,
@@ -260,6 +344,8 @@ async def get_urls(
             },
         }
         
+    except (InvalidCursorError, InvalidWatermarkError) as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         # Log the full error but don't expose internal details to the client
         import logging
@@ -270,6 +356,105 @@ async def get_urls(
         )
 
 
+async def _compute_url_stats(supabase, asset_id: Optional[str], scan_job_id: Optional[str]) -> Dict[str, Any]:
+    """Compute URL stats (served through the result cache by get_url_stats)."""
+    # Check if filters are applied
+    has_filters = asset_id is not None or scan_job_id is not None
+    
+    if not has_filters:
+        # ================================================================
+        # OPTIMIZED PATH: Use materialized views for global stats
+        # Single query replaces 6+ queries on 362K rows
+        # ================================================================
+        
+        # Get pre-computed stats from url_stats MV
+        stats_result = await supabase.table("url_stats").select("*").execute()
+        stats = stats_result.data[0] if stats_result.data else {}
+        
+        total_urls = stats.get("total_urls", 0)
+        alive_urls = stats.get("alive_urls", 0)
+        dead_urls = stats.get("dead_urls", 0)
+        pending_urls = stats.get("pending_urls", 0)
+        urls_with_params = stats.get("urls_with_params", 0)
+        unique_domains = stats.get("unique_domains", 0)
+        
+        # Get top sources from MV
+        sources_result = await supabase.table("url_top_sources").select("*").limit(5).execute()
+        top_sources = [
+            {"source": s.get("source"), "count": s.get("count", 0)}
+            for s in (sources_result.data or [])
+        ]
+        
+        # Get top status codes from MV
+        status_result = await supabase.table("url_top_status_codes").select("*").limit(5).execute()
+        top_status_codes = [
+            {"status_code": s.get("status_code"), "count": s.get("count", 0)}
+            for s in (status_result.data or [])
+        ]
+        
+        # Get top file extensions from MV
+        ext_result = await supabase.table("url_top_extensions").select("*").limit(10).execute()
+        top_file_extensions = [
+            {"extension": e.get("file_extension"), "count": e.get("count", 0)}
+            for e in (ext_result.data or [])
+        ]
+        
+        # For technologies, we still need to sample (JSONB arrays require expansion)
+        # Fetch a representative sample of 500 URLs with technologies
+        tech_sample = await supabase.table("urls").select(
+            "technologies"
+        ).not_.is_("technologies", "null").limit(500).execute()
+        
+        tech_counts = {}
+        for url_row in (tech_sample.data or []):
+            technologies = url_row.get("technologies", [])
+            if isinstance(technologies, list):
+                for tech in technologies:
+                    tech_counts[tech] = tech_counts.get(tech, 0) + 1
+        
+        top_technologies = [
+            {"name": tech, "count": count}
+            for tech, count in sorted(tech_counts.items(), key=lambda x: x[1], reverse=True)[:10]
+        ]
+        
+    else:
+        # ================================================================
+        # FILTERED PATH: Single-pass SQL aggregation
+        # One RPC returns every counter and exact top-N distribution
+        # (replaces 5 count queries + a 1000-row Python sample)
+        # ================================================================
+        agg_result = await supabase.rpc("get_url_stats_aggregate", {
+            "p_asset_id": asset_id,
+            "p_scan_job_id": scan_job_id,
+            "p_top_n": 10
+        }).execute()
+        stats = agg_result.data or {}
+        
+        total_urls = stats.get("total_urls", 0)
+        alive_urls = stats.get("alive_urls", 0)
+        dead_urls = stats.get("dead_urls", 0)
+        pending_urls = stats.get("pending_urls", 0)
+        urls_with_params = stats.get("urls_with_params", 0)
+        unique_domains = stats.get("unique_domains", 0)
+        top_sources = stats.get("top_sources", [])[:5]
+        top_status_codes = stats.get("top_status_codes", [])[:5]
+        top_technologies = stats.get("top_technologies", [])
+        top_file_extensions = stats.get("top_file_extensions", [])
+    
+    return {
+        "total_urls": total_urls,
+        "alive_urls": alive_urls,
+        "dead_urls": dead_urls,
+        "pending_urls": pending_urls,
+        "urls_with_params": urls_with_params,
+        "unique_domains": unique_domains,
+        "top_sources": top_sources,
+        "top_status_codes": top_status_codes,
+        "top_technologies": top_technologies,
+        "top_file_extensions": top_file_extensions
+    }
+
+
 # NOTE: Static routes like /stats MUST be defined BEFORE dynamic routes like /{url_id}
 @router.get("/stats", response_model=URLStatsResponse)
 async def get_url_stats(
@@ -284,6 +469,9 @@ async def get_url_stats(
     Previously: 6+ sequential queries on 362K rows (~4 seconds)
     Now: 3-4 queries on pre-computed MVs (~100ms)
     
+    Filtered queries call the `get_url_stats_aggregate` SQL function, which
+    returns exact counters and distributions in a single round trip.
+    
     Returns summary metrics including:
     - Total URL count
     - Alive/dead/pending counts
@@ -298,187 +486,17 @@ async def get_url_stats(
     """
     try:
         # Use service_client to bypass RLS
-        supabase = supabase_client.service_client
+        supabase = supabase_client.async_service_client
         
-        # Check if filters are applied
-        has_filters = asset_id is not None or scan_job_id is not None
-        
-        if not has_filters:
-            # ================================================================
-            # OPTIMIZED PATH: Use materialized views for global stats
-            # Single query replaces 6+ queries on 362K rows
-            # ================================================================
-            
-            # Get pre-computed stats from url_stats MV
-            stats_result = supabase.table("url_stats").select("*").execute()
-            stats = stats_result.data[0] if stats_result.data else {}
-            
-            total_urls = stats.get("total_urls", 0)
-            alive_urls = stats.get("alive_urls", 0)
-            dead_urls = stats.get("dead_urls", 0)
-            pending_urls = stats.get("pending_urls", 0)
-            urls_with_params = stats.get("urls_with_params", 0)
-            unique_domains = stats.get("unique_domains", 0)
-            
-            # Get top sources from MV
-            sources_result = supabase.table("url_top_sources").select("*").limit(5).execute()
-            top_sources = [
-                {"source": s.get("source"), "count": s.get("count", 0)}
-                for s in (sources_result.data or [])
-            ]
-            
-            # Get top status codes from MV
-            status_result = supabase.table("url_top_status_codes").select("*").limit(5).execute()
-            top_status_codes = [
-                {"status_code": s.get("status_code"), "count": s.get("count", 0)}
-                for s in (status_result.data or [])
-            ]
-            
-            # Get top file extensions from MV
-            ext_result = supabase.table("url_top_extensions").select("*").limit(10).execute()
-            top_file_extensions = [
-                {"extension": e.get("file_extension"), "count": e.get("count", 0)}
-                for e in (ext_result.data or [])
-            ]
-            
-            # For technologies, we still need to sample (JSONB arrays require expansion)
-            # Fetch a representative sample of 500 URLs with technologies
-            tech_sample = supabase.table("urls").select(
-                "technologies"
-            ).not_.is_("technologies", "null").limit(500).execute()
-            
-            tech_counts = {}
-            for url_row in (tech_sample.data or []):
-                technologies = url_row.get("technologies", [])
-                if isinstance(technologies, list):
-                    for tech in technologies:
-                        tech_counts[tech] = tech_counts.get(tech, 0) + 1
-            
-            top_technologies = [
-                {"name": tech, "count": count}
-                for tech, count in sorted(tech_counts.items(), key=lambda x: x[1], reverse=True)[:10]
-            ]
-            
-        else:
-            # ================================================================
-            # FILTERED PATH: Use count queries with filters
-            # Still optimized with indexed columns
-            # ================================================================
-            def apply_filters(q):
-                if asset_id:
-                    q = q.eq("asset_id", asset_id)
-                if scan_job_id:
-                    q = q.eq("scan_job_id", scan_job_id)
-                return q
-            
-            # Get total count
-            total_query = apply_filters(
-                supabase.table("urls").select("id", count="exact")
-            )
-            total_result = total_query.limit(1).execute()
-            total_urls = total_result.count or 0
-            
-            # Get alive count
-            alive_query = apply_filters(
-                supabase.table("urls").select("id", count="exact").eq("is_alive", True)
-            )
-            alive_result = alive_query.limit(1).execute()
-            alive_urls = alive_result.count or 0
-            
-            # Get dead count
-            dead_query = apply_filters(
-                supabase.table("urls").select("id", count="exact").eq("is_alive", False)
-            )
-            dead_result = dead_query.limit(1).execute()
-            dead_urls = dead_result.count or 0
-            
-            # Get pending count (not yet resolved)
-            pending_query = apply_filters(
-                supabase.table("urls").select("id", count="exact").is_("resolved_at", "null")
-            )
-            pending_result = pending_query.limit(1).execute()
-            pending_urls = pending_result.count or 0
-            
-            # Get URLs with params count
-            params_query = apply_filters(
-                supabase.table("urls").select("id", count="exact").eq("has_params", True)
-            )
-            params_result = params_query.limit(1).execute()
-            urls_with_params = params_result.count or 0
-            
-            # Get unique domains count (using sample for filtered queries)
-            domains_query = apply_filters(
-                supabase.table("urls").select("domain").limit(10000)
-            )
-            domains_result = domains_query.execute()
-            unique_domains = len(set(d.get("domain") for d in (domains_result.data or []) if d.get("domain")))
-            
-            # For aggregations, fetch a sample with filters applied
-            sample_query = apply_filters(
-                supabase.table("urls").select("sources, status_code, technologies, file_extension").limit(1000)
-            )
-            sample_result = sample_query.execute()
-            sample_data = sample_result.data or []
-            
-            # Calculate top sources
-            source_counts = {}
-            for row in sample_data:
-                sources = row.get("sources", [])
-                if isinstance(sources, list):
-                    for source in sources:
-                        source_counts[source] = source_counts.get(source, 0) + 1
-            top_sources = [
-                {"source": s, "count": c}
-                for s, c in sorted(source_counts.items(), key=lambda x: x[1], reverse=True)[:5]
-            ]
-            
-            # Calculate top status codes
-            status_counts = {}
-            for row in sample_data:
-                code = row.get("status_code")
-                if code:
-                    status_counts[code] = status_counts.get(code, 0) + 1
-            top_status_codes = [
-                {"status_code": s, "count": c}
-                for s, c in sorted(status_counts.items(), key=lambda x: x[1], reverse=True)[:5]
-            ]
-            
-            # Calculate top technologies
-            tech_counts = {}
-            for row in sample_data:
-                techs = row.get("technologies", [])
-                if isinstance(techs, list):
-                    for tech in techs:
-                        tech_counts[tech] = tech_counts.get(tech, 0) + 1
-            top_technologies = [
-                {"name": t, "count": c}
-                for t, c in sorted(tech_counts.items(), key=lambda x: x[1], reverse=True)[:10]
-            ]
-            
-            # Calculate top file extensions
-            ext_counts = {}
-            for row in sample_data:
-                ext = row.get("file_extension")
-                if ext:
-                    ext_counts[ext] = ext_counts.get(ext, 0) + 1
-            top_file_extensions = [
-                {"extension": e, "count": c}
-                for e, c in sorted(ext_counts.items(), key=lambda x: x[1], reverse=True)[:10]
-            ]
-        
-        return URLStatsResponse(
-            total_urls=total_urls,
-            alive_urls=alive_urls,
-            dead_urls=dead_urls,
-            pending_urls=pending_urls,
-            urls_with_params=urls_with_params,
-            unique_domains=unique_domains,
-            top_sources=top_sources,
-            top_status_codes=top_status_codes,
-            top_technologies=top_technologies,
-            top_file_extensions=top_file_extensions
+        stats = await result_cache.get_or_compute(
+            "url_stats",
+            {"asset_id": asset_id, "scan_job_id": scan_job_id},
+            lambda: _compute_url_stats(supabase, asset_id, scan_job_id),
+            asset_id=asset_id
         )
         
+        return URLStatsResponse(**stats)
+        
     except Exception as e:
         # Log the full error but don't expose internal details to the client
         import logging
@@ -549,10 +567,10 @@ async def get_url_by_id(
                 )
         
         # Use service_client to bypass RLS
-        supabase = supabase_client.service_client
+        supabase = supabase_client.async_service_client
         
         # Get the URL
-        response = supabase.table("urls").select("*").eq("id", url_id).execute()
+        response = await supabase.table("urls").select("*").eq("id", url_id).execute()
         
         if not response.data or len(response.data) == 0:
             raise HTTPException(
@@ -205,6 +205,122 @@ class Settings(BaseSettings):
     ecs_task_execution_role_arn: str = Field(default="", description="ECS task execution role ARN for container startup")
     ecs_task_role_arn: str = Field(default="", description="ECS task role ARN for main application containers")
     ecs_subfinder_task_role_arn: str = Field(default="", description="ECS task role ARN for subfinder batch containers")
+
+    # ECS Launch Scheduler (concurrent RunTask calls, token-bucket rate limited)
+    ecs_launch_max_concurrency: int = Field(default=8, description="Max ECS API calls in flight at once (launch thread pool size)")
+    ecs_run_task_rate: float = Field(default=10.0, description="Sustained RunTask calls per second across all pipelines in this process")
+    ecs_run_task_burst: int = Field(default=20, description="RunTask calls allowed in a burst before pacing kicks in")
+    ecs_launch_max_retries: int = Field(default=5, description="Retries for a throttled ECS API call")
+    ecs_launch_backoff_base: float = Field(default=0.5, description="Base seconds for exponential backoff after throttling")
+
+    # Task Runner (ECS in the cloud; local processes/containers for end-to-end benchmarks)
+    task_runner: str = Field(default="auto", description="'auto' (ECS when a client is available, mock otherwise), 'ecs' or 'local'")
+    local_runner_mode: str = Field(default="subprocess", description="Local runner backend: 'subprocess' (Go binaries) or 'docker' (module images)")
+    local_runner_bin_dir: str = Field(default="./bin", description="Directory holding locally built module binaries (subfinder-go, dnsx-go, ...)")
+    local_runner_image_prefix: str = Field(default="neobotnet-", description="Local image name prefix for docker mode (e.g. neobotnet-dnsx-go)")
+    local_runner_log_dir: str = Field(default="/tmp/neobotnet-tasks", description="Directory for local task output logs")
+
+    # Consumer Autoscaling (lag-driven; scale_factor is the starting/minimum task count per group)
+    consumer_autoscaling_enabled: bool = Field(default=True, description="Add consumer tasks while a scan runs when consumer-group backlog grows")
+    consumer_autoscale_interval: float = Field(default=15.0, description="Seconds between consumer-group lag samples")
+    consumer_autoscale_cooldown: float = Field(default=60.0, description="Minimum seconds between scale-ups of the same consumer group")
+    consumer_autoscale_target_backlog_per_task: int = Field(default=500, description="Backlog per task tolerated before scaling up (also used until throughput is known)")
+    consumer_autoscale_drain_seconds: float = Field(default=120.0, description="Seconds the scaled group should take to clear its current backlog")
+    consumer_autoscale_max_step: int = Field(default=3, description="Max tasks added to a group in one scale-up")
+    consumer_autoscale_max_tasks_per_group: int = Field(default=10, description="Max consumer tasks in one consumer group")
+    consumer_autoscale_max_tasks_per_scan: int = Field(default=30, description="Max consumer tasks across all groups of one scan")
+    consumer_autoscale_global_max_extra_tasks: int = Field(default=100, description="Max autoscaled (extra) consumer tasks across all scans in this process")
+
+    # Stream Lifecycle (acknowledged-entry trimming, per-scan memory budget, finished-stream TTL)
+    stream_trim_interval: float = Field(default=30.0, description="Seconds between XTRIM MINID passes over a running scan's streams")
+    stream_scan_memory_budget_mb: int = Field(default=256, description="Redis memory a scan's streams may use before producers are asked to pause")
+    stream_backpressure_resume_ratio: float = Field(default=0.7, description="Backpressure is released once usage drops below this fraction of the budget")
+    stream_backpressure_ttl: int = Field(default=120, description="Seconds a backpressure signal lives unless refreshed (producers resume if the API stops)")
+    stream_finished_ttl: int = Field(default=86400, description="Seconds a finished scan's streams are kept for debugging before Redis deletes them")
+
+    # Pipeline Checkpointing (crash-safe streaming pipelines, resumed by any API process)
+    pipeline_checkpoint_enabled: bool = Field(default=True, description="Persist streaming pipeline state to Redis and resume pipelines whose process died")
+    pipeline_checkpoint_interval: float = Field(default=15.0, description="Seconds between checkpoint saves (and lease renewals) of a running pipeline")
+    pipeline_lease_ttl: int = Field(default=60, description="Seconds without a lease renewal after which another process resumes the pipeline")
+    pipeline_recovery_interval: float = Field(default=30.0, description="Seconds between scans for pipelines without a live owner")
+
+    # Warm Consumer Pool (long-lived consumer workers take assignments instead of per-scan task launches)
+    warm_pool_enabled: bool = Field(default=False, description="Hand streaming consumers to warm workers when one is idle (on-demand launch otherwise)")
+    warm_pool_modules: str = Field(default="dnsx,httpx,katana,url-resolver", description="Comma-separated consumer modules kept warm")
+    warm_pool_min_size: int = Field(default=1, description="Warm workers kept per module even without recent demand")
+    warm_pool_max_size: int = Field(default=10, description="Max warm workers per module")
+    warm_pool_demand_window: float = Field(default=3600.0, description="Seconds of consumer demand considered when sizing the pool")
+    warm_pool_idle_timeout: int = Field(default=600, description="Seconds an idle worker above the target size waits before exiting")
+    warm_pool_heartbeat_seconds: float = Field(default=10.0, description="Worker heartbeat interval (workers are live for 3 missed beats)")
+    warm_pool_reconcile_interval: float = Field(default=30.0, description="Seconds between pool size reconciliations")
+    warm_pool_start_grace: float = Field(default=180.0, description="Seconds a just-launched worker counts as live before its first heartbeat")
+    warm_pool_pickup_timeout: float = Field(default=15.0, description="Seconds to wait for a claimed worker to take an assignment before launching on demand")
+    warm_pool_worker_cpu: int = Field(default=1024, description="CPU units per warm worker task")
+    warm_pool_worker_memory: int = Field(default=2048, description="Memory (MB) per warm worker task")
+
+    # Shared Consumer Fleet (multi-asset scans share DNSx/HTTPx consumers through a fan-in stream)
+    consumer_fleet_enabled: bool = Field(default=False, description="Share Subfinder-stage consumer tasks across the assets of a multi-asset scan")
+    consumer_fleet_min_assets: int = Field(default=3, description="Assets with the same modules needed before they share a consumer fleet")
+    consumer_fleet_assets_per_task: int = Field(default=5, description="Assets per shared consumer task at launch (the autoscaler adds more on backlog)")
+    consumer_fleet_producer_check_interval: float = Field(default=30.0, description="Seconds between checks that a fleet member's Subfinder task is still running")
+    fargate_vcpu_hour_price: float = Field(default=0.04048, description="USD per vCPU-hour used for task cost comparisons")
+    fargate_gb_hour_price: float = Field(default=0.004445, description="USD per GB-hour of task memory used for task cost comparisons")
+
+    # Batch Packing (balance predicted per-domain work across optimizer batches)
+    batch_packing_enabled: bool = Field(default=True, description="Bin-pack domains into batches by known subdomain/URL counts instead of fixed-size chunks")
+
+    # Resource Model (task sizes and durations learned from finished batch_scan_jobs)
+    resource_model_enabled: bool = Field(default=True, description="Size tasks and timeouts from the history-trained model once a module has enough finished jobs")
+    resource_model_refit_interval: float = Field(default=21600.0, description="Seconds between background refits of the resource model")
+    resource_model_history_limit: int = Field(default=5000, description="Most recent finished jobs the model is fitted on")
+    resource_model_min_samples: int = Field(default=20, description="Completed jobs a module needs before its model is used")
+    resource_model_min_size_runs: int = Field(default=3, description="Runs at a CPU/memory size before it can be recommended")
+    resource_model_min_success_rate: float = Field(default=0.9, description="Share of successful runs a size needs to be recommended")
+    resource_model_ridge: float = Field(default=0.1, description="Ridge penalty of the duration regression (keeps single-size histories well-posed)")
+    resource_model_target_fraction: float = Field(default=0.5, description="Target job duration as a fraction of the module timeout when sizing")
+    resource_model_timeout_factor: float = Field(default=1.5, description="Headroom applied to the ~95th percentile predicted duration for timeouts")
+    resource_model_holdout_fraction: float = Field(default=0.2, description="Newest share of completed jobs held out by the backtest")
+
+    # Async Data-Access Pool (PostgREST over a shared keep-alive HTTP client)
+    db_pool_max_connections: int = Field(default=20, description="Max pooled HTTP connections to PostgREST (HTTP/2 multiplexes requests over each)")
+    db_pool_max_keepalive: int = Field(default=20, description="Idle keep-alive connections retained in the pool")
+    db_pool_keepalive_expiry: float = Field(default=30.0, description="Seconds an idle pooled connection is kept open")
+    db_request_timeout: float = Field(default=30.0, description="PostgREST request timeout in seconds")
+    
+    # List Endpoint Counts (planner estimate + lazily cached exact count)
+    exact_count_cache_ttl: int = Field(default=300, description="Seconds a background exact COUNT(*) is reused for the same filter signature")
+    exact_count_cache_max_entries: int = Field(default=5000, description="Max cached filter signatures before oldest entries are evicted")
+    
+    # Shared Result Cache (Redis, versioned per asset, stale-while-revalidate)
+    result_cache_enabled: bool = Field(default=True, description="Cache LEAN read endpoint results in Redis")
+    result_cache_ttl: int = Field(default=60, description="Seconds a cached result is served as fresh")
+    result_cache_stale_ttl: int = Field(default=300, description="Extra seconds a stale result is served while it is refreshed in the background")
+    result_cache_max_entry_bytes: int = Field(default=1_048_576, description="Results larger than this (serialized) are not cached")
+    result_cache_max_entries: int = Field(default=10000, description="Max cached results before the oldest keys are evicted")
+    
+    # Materialized View Refresh Scheduler (scan-completion driven; pg_cron remains the fallback)
+    mv_refresh_enabled: bool = Field(default=True, description="Refresh dashboard materialized views when scans finish")
+    mv_refresh_debounce_seconds: float = Field(default=15.0, description="Seconds to coalesce scan completions before refreshing asset views")
+    mv_refresh_global_interval: float = Field(default=600.0, description="Minimum seconds between refreshes of the heavy global views (DNS, URLs)")
+    
+    # Scan Job Status Events (Supabase Realtime; DB polling remains the fallback)
+    job_events_enabled: bool = Field(default=True, description="Wake waiting pipelines from job status change events instead of polling")
+    job_events_fallback_poll_interval: float = Field(default=60.0, description="Seconds between safety re-reads of job status while events are live")
+    
+    # Single-Flight Request Coalescing (cross-worker leader lock in Redis)
+    single_flight_lock_ttl: float = Field(default=30.0, description="Seconds a cross-worker single-flight leader lock is held at most")
+    single_flight_wait_timeout: float = Field(default=10.0, description="Seconds a worker waits for another worker's in-flight result before querying itself")
+    single_flight_result_ttl: float = Field(default=5.0, description="Seconds a leader's result stays readable for waiting workers")
+    
+    # Data Exports (keyset streaming with read-ahead)
+    export_batch_size: int = Field(default=1000, description="Rows in the first export batch; later batches adapt to row width")
+    export_min_batch_size: int = Field(default=200, description="Smallest export batch, for very wide rows")
+    export_max_batch_size: int = Field(default=5000, description="Largest export batch, for narrow rows")
+    export_target_batch_bytes: int = Field(default=1_048_576, description="Approximate serialized size each export batch is sized towards")
+    export_jobs_dir: str = Field(default="/tmp/neobotnet-exports", description="Directory where export job snapshots are written")
+    export_snapshot_ttl: int = Field(default=3600, description="Seconds a finished export snapshot is kept and reused for identical requests")
+    export_jobs_max_concurrent: int = Field(default=2, description="Export jobs materialized at once per API task")
+    delta_settle_seconds: int = Field(default=60, description="Delta (since=) queries stop this many seconds before now so rows still being committed are not skipped")
     
     # Rate Limiting Configuration
     rate_limit_per_minute: int = Field(default=60, description="API requests per minute per user")
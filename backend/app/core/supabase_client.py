@@ -1,6 +1,8 @@
 """
 Supabase client configuration and initialization.
 """
+import httpx
+from postgrest import AsyncPostgrestClient
 from supabase import create_client, Client
 from .config import settings
 
@@ -11,6 +13,8 @@ class SupabaseClient:
     def __init__(self):
         self._client: Client = None
         self._service_client: Client = None
+        self._async_service_client: AsyncPostgrestClient = None
+        self._http_pool: httpx.AsyncClient = None
     
     @property
     def client(self) -> Client:
@@ -32,6 +36,51 @@ class SupabaseClient:
             )
         return self._service_client
     
+    @property
+    def async_service_client(self) -> AsyncPostgrestClient:
+        """
+        Get the non-blocking service role data client.
+        
+        Same query-builder API as `service_client.table(...)` / `.rpc(...)`,
+        but `.execute()` is awaitable and runs on a shared keep-alive
+        connection pool, so PostgREST round trips never block the event loop.
+        Use this from every `async def` handler/service.
+        """
+        if not self._async_service_client:
+            rest_url = f"{settings.supabase_url.rstrip('/')}/rest/v1"
+            self._async_service_client = AsyncPostgrestClient(
+                rest_url,
+                headers={
+                    "apiKey": settings.supabase_service_role_key,
+                    "Authorization": f"Bearer {settings.supabase_service_role_key}",
+                },
+                http_client=self._get_http_pool(rest_url),
+            )
+        return self._async_service_client
+    
+    def _get_http_pool(self, base_url: str) -> httpx.AsyncClient:
+        """Create the pooled HTTP/2 keep-alive client shared by all async queries."""
+        if not self._http_pool:
+            self._http_pool = httpx.AsyncClient(
+                base_url=base_url,
+                timeout=settings.db_request_timeout,
+                limits=httpx.Limits(
+                    max_connections=settings.db_pool_max_connections,
+                    max_keepalive_connections=settings.db_pool_max_keepalive,
+                    keepalive_expiry=settings.db_pool_keepalive_expiry,
+                ),
+                follow_redirects=True,
+                http2=True,
+            )
+        return self._http_pool
+    
+    async def aclose(self) -> None:
+        """Close pooled async connections (called on application shutdown)."""
+        if self._http_pool:
+            await self._http_pool.aclose()
+        self._http_pool = None
+        self._async_service_client = None
+    
     def get_user_client(self, access_token: str) -> Client:
         """Get a client with user's access token."""
         # Note: This method is currently unused as we simplified authentication
@@ -44,4 +93,4 @@ class SupabaseClient:
 
 
 # Global Supabase client instance
-supabase_client = SupabaseClient() 
\ No newline at end of file
+supabase_client = SupabaseClient()
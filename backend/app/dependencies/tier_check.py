@@ -15,7 +15,7 @@ async def get_user_tier(user_id: str) -> str:
     """
     try:
         # Use .limit(1) instead of .single() to avoid exception on no results
-        result = supabase_client.service_client.table("user_quotas").select(
+        result = await supabase_client.async_service_client.table("user_quotas").select(
             "plan_type"
         ).eq("user_id", user_id).limit(1).execute()
         
@@ -32,7 +32,7 @@ async def get_user_urls_viewed(user_id: str) -> int:
     Used for enforcing 250 URL limit for free tier.
     """
     try:
-        result = supabase_client.service_client.table("user_usage").select(
+        result = await supabase_client.async_service_client.table("user_usage").select(
             "urls_viewed_count"
         ).eq("user_id", user_id).single().execute()
         
@@ -53,14 +53,14 @@ async def increment_urls_viewed(user_id: str, count: int) -> None:
     try:
         # First, try to ensure user has a record (upsert with current value if exists)
         # This handles the case where user_usage doesn't exist yet
-        supabase_client.service_client.table("user_usage").upsert({
+        await supabase_client.async_service_client.table("user_usage").upsert({
             "user_id": user_id,
             "urls_viewed_count": count  # Initial value if new record
         }, on_conflict="user_id", ignore_duplicates=True).execute()
         
         # Then, atomically increment using raw SQL via RPC
         # This prevents race conditions by doing increment at database level
-        supabase_client.service_client.rpc(
+        await supabase_client.async_service_client.rpc(
             "increment_url_quota",
             {"p_user_id": user_id, "p_count": count}
         ).execute()
@@ -69,7 +69,7 @@ async def increment_urls_viewed(user_id: str, count: int) -> None:
         try:
             current = await get_user_urls_viewed(user_id)
             new_count = current + count
-            supabase_client.service_client.table("user_usage").upsert({
+            await supabase_client.async_service_client.table("user_usage").upsert({
                 "user_id": user_id,
                 "urls_viewed_count": new_count
             }, on_conflict="user_id").execute()
@@ -110,7 +110,7 @@ async def get_paid_spots_remaining() -> int:
     Counts actual 'pro' users who have completed payment.
     """
     try:
-        result = supabase_client.service_client.rpc(
+        result = await supabase_client.async_service_client.rpc(
             "get_paid_user_count"
         ).execute()
         pro_count = result.data if result.data else 0
@@ -129,7 +129,7 @@ async def has_spots_available() -> bool:
         True if spots available, False if sold out
     """
     try:
-        result = supabase_client.service_client.rpc(
+        result = await supabase_client.async_service_client.rpc(
             "has_paid_spots_available",
             {"max_spots": MAX_PAID_USERS}
         ).execute()
@@ -28,6 +28,8 @@ from .api.v1.billing import router as billing_router  # Stripe billing
 from .api.v1.exports import router as exports_router  # Data exports (CSV/JSON)
 from .middleware.rate_limit import TieredRateLimitMiddleware  # Tiered rate limiting
 from .services.websocket_manager import websocket_manager, batch_progress_notifier
+from .services.result_cache import result_cache
+from .services.single_flight import single_flight
 
 # Configure logging for CloudWatch visibility
 # Use INFO level to capture our UUID debugging logs
@@ -120,7 +122,7 @@ class DynamicCORSMiddleware(BaseHTTPMiddleware):
         if origin and is_origin_allowed(origin):
             response.headers["Access-Control-Allow-Origin"] = origin
             response.headers["Access-Control-Allow-Credentials"] = "true"
-            response.headers["Access-Control-Expose-Headers"] = "Content-Type"
+            response.headers["Access-Control-Expose-Headers"] = "Content-Type, X-Next-Watermark"
         
         return response
 
@@ -200,6 +202,30 @@ async def lifespan(app: FastAPI):
         logger.error("   Scans may fail. Check scan_module_profiles table exists.")
         # Don't crash the app, but scans won't work without module config
     
+    # ============================================================
+    # Job Status Events (pipelines fall back to polling without them)
+    # ============================================================
+    from app.services.job_events import job_status_events
+    await job_status_events.start()
+    
+    # ============================================================
+    # Warm Consumer Pool (no-op unless WARM_POOL_ENABLED)
+    # ============================================================
+    from app.services.warm_pool import warm_pool
+    await warm_pool.start()
+    
+    # ============================================================
+    # Pipeline Recovery (resumes streaming pipelines orphaned by a restart)
+    # ============================================================
+    from app.services.pipeline_checkpoint import pipeline_checkpoints
+    pipeline_checkpoints.start()
+    
+    # ============================================================
+    # Resource Model (refits task sizing from finished jobs in the background)
+    # ============================================================
+    from app.services.resource_model import resource_model
+    resource_model.start()
+    
     logger.info("🟢 Application startup complete")
     
     yield
@@ -223,6 +249,36 @@ async def lifespan(app: FastAPI):
             await websocket_manager.redis_client.close()
             logger.info("✅ WebSocket manager cleaned up successfully")
             
+        # Close the job status event channel
+        from app.services.job_events import job_status_events
+        await job_status_events.stop()
+        
+        # Stop sizing the warm pool (idle workers reap themselves)
+        from app.services.warm_pool import warm_pool
+        await warm_pool.shutdown()
+        
+        # Stop recovery; pipelines resumed here release their leases so
+        # another process takes them over right away
+        from app.services.pipeline_checkpoint import pipeline_checkpoints
+        await pipeline_checkpoints.shutdown()
+        
+        # Stop the resource model refit loop (the fitted model dies with the process)
+        from app.services.resource_model import resource_model
+        await resource_model.shutdown()
+        
+        # Stop the materialized view refresh loop (pg_cron covers anything pending)
+        from app.services.mv_refresh_scheduler import mv_refresh_scheduler
+        await mv_refresh_scheduler.shutdown()
+        
+        # Cancel in-flight export snapshot jobs
+        from app.services.export_jobs import export_job_service
+        await export_job_service.shutdown()
+        
+        # Close pooled async database connections
+        from app.core.supabase_client import supabase_client
+        await supabase_client.aclose()
+        logger.info("✅ Async database connection pool closed")
+            
     except Exception as e:
         logger.error(f"⚠️ Error during cleanup: {e}")
     
@@ -339,5 +395,7 @@ async def health_check():
             "enabled": websocket_stats.get("redis_connected", False),
             "active_connections": websocket_stats.get("total_connections", 0),
             "connected_users": websocket_stats.get("total_users", 0)
-        }
+        },
+        "result_cache": result_cache.get_stats(),
+        "single_flight": single_flight.get_stats()
     } 
\ No newline at end of file
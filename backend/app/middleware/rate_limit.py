@@ -150,7 +150,7 @@ class TieredRateLimitMiddleware(BaseHTTPMiddleware):
                 import hashlib
                 
                 key_hash = hashlib.sha256(api_key.encode()).hexdigest()
-                result = supabase_client.service_client.table("api_keys").select(
+                result = await supabase_client.async_service_client.table("api_keys").select(
                     "user_id"
                 ).eq("key_hash", key_hash).eq("is_active", True).single().execute()
                 
@@ -285,11 +285,15 @@ class DNSRecordListResponse(BaseModel):
         ..., 
         description="List of DNS records for the current page"
     )
-    total_count: int = Field(
-        ..., 
-        description="Total number of DNS records matching the query",
+    total_count: Optional[int] = Field(
+        None, 
+        description="Total number of DNS records matching the query (null when not computed)",
         ge=0
     )
+    total_is_exact: bool = Field(
+        False,
+        description="False when total_count is a planner estimate (render as \"~N\")"
+    )
     limit: int = Field(
         ..., 
         description="Number of records per page (applied limit)",
@@ -301,6 +305,14 @@ class DNSRecordListResponse(BaseModel):
         description="Pagination offset (starting position)",
         ge=0
     )
+    next_cursor: Optional[str] = Field(
+        None,
+        description="Opaque cursor for the next page (pass back as `cursor`); null on the last page"
+    )
+    next_watermark: Optional[str] = Field(
+        None,
+        description="Delta queries only: pass back as `since` to get records changed after this page"
+    )
     warning: Optional[str] = Field(
         None,
         description="Warning message for large result sets or performance tips"
@@ -329,8 +341,10 @@ class DNSRecordListResponse(BaseModel):
                     }
                 ],
                 "total_count": 1020,
+                "total_is_exact": True,
                 "limit": 50,
                 "offset": 0,
+                "next_cursor": "eyJ2IjoiMjAyNS0xMS0wMlQxMjowMDowMFoiLCJpZCI6IjU1MGU4NDAwIn0",
                 "warning": None
             }
         }
@@ -351,7 +365,7 @@ class PaginatedDNSResponse(BaseModel):
     )
     pagination: Dict[str, Any] = Field(
         ...,
-        description="Pagination metadata (total, page, per_page, total_pages, has_next, has_prev)"
+        description="Pagination metadata (total, page, per_page, total_pages, has_next, has_prev, next_cursor)"
     )
     filters: Dict[str, Any] = Field(
         ...,
@@ -391,7 +405,8 @@ class PaginatedDNSResponse(BaseModel):
                     "per_page": 50,
                     "total_pages": 58,
                     "has_next": True,
-                    "has_prev": False
+                    "has_prev": False,
+                    "next_cursor": "eyJ2IjoiMjAyNS0xMS0wMlQxMjowMDowMFoiLCJpZCI6IjU1MGU4NDAwIn0"
                 },
                 "filters": {
                     "asset_id": None,
@@ -581,7 +596,8 @@ class PaginatedGroupedDNSResponse(BaseModel):
                     "per_page": 50,
                     "total_pages": 3,
                     "has_next": True,
-                    "has_prev": False
+                    "has_prev": False,
+                    "next_cursor": "eyJ2IjoiMjAyNS0xMS0wMlQxMjowMDowMFoiLCJpZCI6IjU1MGU4NDAwIn0"
                 },
                 "filters": {
                     "asset_id": None,
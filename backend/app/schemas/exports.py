@@ -0,0 +1,80 @@
+"""
+Export Job Schemas.
+
+Request and status models for asynchronous snapshot exports
+(POST /exports/jobs). Filters mirror the query parameters of the
+streaming /exports/* endpoints.
+
+Author: Pluckware Development Team
+Date: January 2026
+"""
+
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, Optional
+from pydantic import BaseModel, Field
+
+
+class ExportType(str, Enum):
+    """Dataset exported by a job (same names as the /exports/* endpoints)."""
+    URLS = "urls"
+    SUBDOMAINS = "subdomains"
+    DNS = "dns"
+    PROBES = "probes"
+
+
+class ExportJobStatus(str, Enum):
+    """Lifecycle of an export job."""
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class ExportJobCreate(BaseModel):
+    """Request to materialize an export snapshot."""
+    export_type: ExportType
+    format: str = Field(
+        default="csv.gz",
+        pattern=r"^(csv|json|ndjson|csv\.gz|ndjson\.gz|parquet)$",
+        description="Export format: csv, json, ndjson, csv.gz, ndjson.gz or parquet"
+    )
+    asset_id: Optional[str] = Field(default=None, description="Filter by asset/program ID")
+    # urls
+    is_alive: Optional[bool] = None
+    has_params: Optional[bool] = None
+    # urls, probes
+    status_code: Optional[int] = None
+    # subdomains
+    parent_domain: Optional[str] = None
+    # dns
+    record_type: Optional[str] = None
+    subdomain: Optional[str] = Field(default=None, description="DNS subdomain search (partial match)")
+    since: Optional[str] = Field(
+        default=None,
+        description="Only rows added or changed after this watermark (next_watermark of a previous export)"
+    )
+
+
+class ExportJobResponse(BaseModel):
+    """Status and progress of an export job."""
+    job_id: str
+    export_type: ExportType
+    format: str
+    status: ExportJobStatus
+    filters: Dict[str, Any] = {}
+    rows_written: int = 0
+    bytes_written: int = 0
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    expires_at: Optional[datetime] = None
+    etag: Optional[str] = None
+    error: Optional[str] = None
+    since: Optional[str] = None
+    next_watermark: Optional[str] = Field(
+        default=None,
+        description="Pass as `since` to export only rows added or changed after this snapshot"
+    )
+    reused: bool = Field(default=False, description="True when an identical recent snapshot was returned")
+    download_url: Optional[str] = None
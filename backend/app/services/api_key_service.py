@@ -80,7 +80,7 @@ class APIKeyService:
     KEY_LENGTH = 32  # Random part length
     
     def __init__(self):
-        self.supabase = supabase_client.service_client
+        self.supabase = supabase_client.async_service_client
         # Derive encryption key from JWT secret (or use dedicated key)
         self._init_encryption_key()
     
@@ -124,7 +124,7 @@ class APIKeyService:
         Returns:
             APIKey if exists, None otherwise
         """
-        result = self.supabase.table("api_keys").select(
+        result = await self.supabase.table("api_keys").select(
             "id, user_id, key_prefix, created_at, last_used_at, is_active"
         ).eq(
             "user_id", user_id
@@ -147,7 +147,7 @@ class APIKeyService:
         Returns:
             APIKeyWithSecret if exists, None otherwise
         """
-        result = self.supabase.table("api_keys").select(
+        result = await self.supabase.table("api_keys").select(
             "id, user_id, key_prefix, encrypted_key, created_at, last_used_at, is_active"
         ).eq(
             "user_id", user_id
@@ -224,7 +224,7 @@ class APIKeyService:
         encrypted_key = self._encrypt_key(raw_key)
         
         # Insert into database
-        result = self.supabase.table("api_keys").insert({
+        result = await self.supabase.table("api_keys").insert({
             "user_id": user_id,
             "key_hash": key_hash,
             "key_prefix": key_prefix,
@@ -267,7 +267,7 @@ class APIKeyService:
         
         try:
             # Use .limit(1) instead of .single() to avoid exception on no results
-            result = self.supabase.table("api_keys").select(
+            result = await self.supabase.table("api_keys").select(
                 "id, user_id, is_active"
             ).eq(
                 "key_hash", key_hash
@@ -291,7 +291,7 @@ class APIKeyService:
             
             # Update last_used_at (fire and forget)
             try:
-                self.supabase.rpc(
+                await self.supabase.rpc(
                     "update_api_key_last_used",
                     {"p_key_hash": key_hash}
                 ).execute()
@@ -321,7 +321,7 @@ class APIKeyService:
         Returns:
             True if deleted, False if not found
         """
-        result = self.supabase.table("api_keys").delete().eq(
+        result = await self.supabase.table("api_keys").delete().eq(
             "user_id", user_id
         ).eq(
             "is_active", True
@@ -7,9 +7,10 @@ NOTE: Scan coordination has been moved to ScanOrchestrator (app/services/scan_or
 import uuid
 import logging
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import AsyncIterator, List, Dict, Any, Optional
 from fastapi import HTTPException, status
 
+from ..core.config import settings
 from ..core.supabase_client import supabase_client
 from ..schemas.assets import (
     Asset, AssetCreate, AssetUpdate, AssetWithStats,
@@ -17,10 +18,25 @@ from ..schemas.assets import (
     UserAssetSummary
 )
 from ..utils.json_encoder import deep_uuid_serialize
+from ..utils.pagination import (
+    InvalidCursorError,
+    InvalidWatermarkError,
+    apply_delta,
+    apply_keyset,
+    delta_page,
+    encode_cursor,
+    keyset_page,
+    watermark_ceiling,
+)
+from .result_cache import cached_result, result_cache
+from .single_flight import coalesced
 
 
 logger = logging.getLogger(__name__)
 
+# Rows fetched per round trip when streaming large subdomain result sets
+STREAM_BATCH_SIZE = 1000
+
 
 class AssetService:
     """
@@ -40,7 +56,7 @@ class AssetService:
     """
     
     def __init__(self):
-        self.supabase = supabase_client.service_client
+        self.supabase = supabase_client.async_service_client
         self.logger = logging.getLogger(__name__)
         self.logger.info("AssetService initialized (CRUD operations only)")
 
@@ -61,7 +77,7 @@ class AssetService:
                 "tags": asset_data.tags or []
             }
             
-            response = self.supabase.table("assets").insert(asset_record).execute()
+            response = await self.supabase.table("assets").insert(asset_record).execute()
             
             if not response.data:
                 raise HTTPException(
@@ -69,6 +85,7 @@ class AssetService:
                     detail="Failed to create asset"
                 )
             
+            await result_cache.bump_asset_version(response.data[0]["id"])
             return Asset(**response.data[0])
             
         except HTTPException:
@@ -97,7 +114,7 @@ class AssetService:
                 # OPTIMIZED: Use asset_overview VIEW for pre-computed stats
                 # Single query replaces 25+ individual queries per asset
                 # ================================================================
-                response = self.supabase.table("asset_overview").select("*").order("created_at", desc=True).execute()
+                response = await self.supabase.table("asset_overview").select("*").order("created_at", desc=True).execute()
                 
                 if not response.data:
                     return []
@@ -107,7 +124,7 @@ class AssetService:
                 # ================================================================
                 # BATCH QUERY: Get all scan stats in ONE query
                 # ================================================================
-                scans_response = self.supabase.table("asset_scan_jobs").select(
+                scans_response = await self.supabase.table("asset_scan_jobs").select(
                     "asset_id, status"
                 ).in_("asset_id", asset_ids).execute()
                 
@@ -154,7 +171,7 @@ class AssetService:
                 return assets_with_stats
             else:
                 # Get ALL assets without stats (no user_id filter - LEAN architecture)
-                response = self.supabase.table("assets").select("*").order("created_at", desc=True).execute()
+                response = await self.supabase.table("assets").select("*").order("created_at", desc=True).execute()
                 return [AssetWithStats(**asset) for asset in response.data]
                 
         except Exception as e:
@@ -172,7 +189,7 @@ class AssetService:
         """
         try:
             # No user_id filter - LEAN architecture: all authenticated users see all data
-            response = self.supabase.table("assets").select("*").eq("id", asset_id).execute()
+            response = await self.supabase.table("assets").select("*").eq("id", asset_id).execute()
             
             if not response.data:
                 raise HTTPException(
@@ -202,7 +219,7 @@ class AssetService:
             asset = await self.get_asset(asset_id)
             
             # Get apex domain count
-            domains_response = self.supabase.table("apex_domains").select("id").eq("asset_id", asset_id).execute()
+            domains_response = await self.supabase.table("apex_domains").select("id").eq("asset_id", asset_id).execute()
             apex_domain_count = len(domains_response.data) if domains_response.data else 0
             
             # ================================================================
@@ -210,7 +227,7 @@ class AssetService:
             # ================================================================
             
             # Calculate total subdomains through asset_scan_jobs relationship
-            subdomain_response = self.supabase.table("subdomains").select(
+            subdomain_response = await self.supabase.table("subdomains").select(
                 """
                 id,
                 asset_scan_jobs!inner(asset_id)
@@ -220,7 +237,7 @@ class AssetService:
             total_subdomains = len(subdomain_response.data) if subdomain_response.data else 0
             
             # Calculate scan statistics (unified asset-level)
-            asset_scan_jobs_response = self.supabase.table("asset_scan_jobs").select(
+            asset_scan_jobs_response = await self.supabase.table("asset_scan_jobs").select(
                 "id, status"
             ).eq("asset_id", asset_id).execute()
             
@@ -287,7 +304,7 @@ class AssetService:
             
             update_data["updated_at"] = datetime.utcnow().isoformat()
             
-            response = self.supabase.table("assets").update(update_data).eq("id", asset_id).eq("user_id", user_id).execute()
+            response = await self.supabase.table("assets").update(update_data).eq("id", asset_id).eq("user_id", user_id).execute()
             
             if not response.data:
                 raise HTTPException(
@@ -295,6 +312,7 @@ class AssetService:
                     detail="Asset not found or no changes made"
                 )
             
+            await result_cache.bump_asset_version(asset_id)
             return Asset(**response.data[0])
             
         except HTTPException:
@@ -313,7 +331,7 @@ class AssetService:
             await self.get_asset(asset_id, user_id)
             
             # Delete the asset (CASCADE will handle related data)
-            response = self.supabase.table("assets").delete().eq("id", asset_id).eq("user_id", user_id).execute()
+            response = await self.supabase.table("assets").delete().eq("id", asset_id).eq("user_id", user_id).execute()
             
             if not response.data:
                 raise HTTPException(
@@ -321,6 +339,7 @@ class AssetService:
                     detail="Asset not found"
                 )
             
+            await result_cache.bump_asset_version(asset_id)
             return {"message": "Asset deleted successfully"}
             
         except HTTPException:
@@ -350,7 +369,7 @@ class AssetService:
                 "is_active": domain_data.is_active
             }
             
-            response = self.supabase.table("apex_domains").insert(domain_record).execute()
+            response = await self.supabase.table("apex_domains").insert(domain_record).execute()
             
             if not response.data:
                 raise HTTPException(
@@ -358,6 +377,7 @@ class AssetService:
                     detail="Failed to create apex domain"
                 )
             
+            await result_cache.bump_asset_version(str(domain_data.asset_id))
             return ApexDomain(**response.data[0])
             
         except HTTPException:
@@ -382,7 +402,7 @@ class AssetService:
             await self.get_asset(asset_id, user_id)
             
             # Query 1: Fetch apex domains for this asset
-            response = self.supabase.table("apex_domains").select("*").eq("asset_id", asset_id).order("created_at", desc=True).execute()
+            response = await self.supabase.table("apex_domains").select("*").eq("asset_id", asset_id).order("created_at", desc=True).execute()
             
             if not response.data:
                 return []
@@ -391,7 +411,7 @@ class AssetService:
                 # Query 2: Get all subdomain counts for this asset grouped by parent_domain
                 # This is efficient: uses idx_subdomains_asset_id, filters to ONE asset
                 # Returns: [{parent_domain: "example.com", count: 150}, ...]
-                counts_response = self.supabase.from_("subdomains").select(
+                counts_response = await self.supabase.from_("subdomains").select(
                     "parent_domain"
                 ).eq("asset_id", asset_id).execute()
                 
@@ -447,14 +467,14 @@ class AssetService:
             
             if not update_data:
                 # Get current domain
-                response = self.supabase.table("apex_domains").select("*").eq("id", domain_id).eq("asset_id", asset_id).execute()
+                response = await self.supabase.table("apex_domains").select("*").eq("id", domain_id).eq("asset_id", asset_id).execute()
                 if not response.data:
                     raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Apex domain not found")
                 return ApexDomain(**response.data[0])
             
             update_data["updated_at"] = datetime.utcnow().isoformat()
             
-            response = self.supabase.table("apex_domains").update(update_data).eq("id", domain_id).eq("asset_id", asset_id).execute()
+            response = await self.supabase.table("apex_domains").update(update_data).eq("id", domain_id).eq("asset_id", asset_id).execute()
             
             if not response.data:
                 raise HTTPException(
@@ -462,6 +482,7 @@ class AssetService:
                     detail="Apex domain not found"
                 )
             
+            await result_cache.bump_asset_version(asset_id)
             return ApexDomain(**response.data[0])
             
         except HTTPException:
@@ -479,7 +500,7 @@ class AssetService:
             # Verify asset exists and belongs to user
             await self.get_asset(asset_id, user_id)
             
-            response = self.supabase.table("apex_domains").delete().eq("id", domain_id).eq("asset_id", asset_id).execute()
+            response = await self.supabase.table("apex_domains").delete().eq("id", domain_id).eq("asset_id", asset_id).execute()
             
             if not response.data:
                 raise HTTPException(
@@ -487,6 +508,7 @@ class AssetService:
                     detail="Apex domain not found"
                 )
             
+            await result_cache.bump_asset_version(asset_id)
             return {"message": "Apex domain deleted successfully"}
             
         except HTTPException:
@@ -519,7 +541,7 @@ class AssetService:
         """
         try:
             # First verify the user owns this asset
-            asset_response = self.supabase.table("assets").select("id").eq("id", asset_id).eq("user_id", user_id).execute()
+            asset_response = await self.supabase.table("assets").select("id").eq("id", asset_id).eq("user_id", user_id).execute()
             
             if not asset_response.data:
                 raise HTTPException(
@@ -565,7 +587,7 @@ class AssetService:
             # Use range for all queries to bypass Supabase client's 1000 default limit
             query = query.order("discovered_at", desc=True).range(offset, offset + limit - 1)
             
-            response = query.execute()
+            response = await query.execute()
             
             if not response.data:
                 # Return empty list but log for debugging
@@ -609,87 +631,133 @@ class AssetService:
         Get all subdomains discovered across all assets for a user.
         
         This method joins assets, asset_scan_jobs, and subdomains.
+        Materializes the full result - use `iter_all_user_subdomains` for
+        large result sets.
         
         LEAN MVP: All authenticated users see ALL data (no user filtering).
         """
+        subdomains = []
+        try:
+            async for batch in self.iter_all_user_subdomains(user_id, limit=limit, offset=offset, module_filter=module_filter):
+                subdomains.extend(batch)
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Failed to retrieve all user subdomains: {str(e)}"
+            )
+        
+        self.logger.info(f"Retrieved {len(subdomains)} subdomains across all user assets for {user_id}")
+        return subdomains
+
+    async def iter_all_user_subdomains(
+        self,
+        user_id: str,
+        limit: Optional[int] = None,
+        offset: int = 0,
+        module_filter: Optional[str] = None,
+        batch_size: int = STREAM_BATCH_SIZE
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Stream all subdomains across all assets in keyset-paginated batches.
+        
+        Walks (discovered_at DESC, id DESC) one batch at a time, so only
+        `batch_size` rows are held in memory regardless of the result size.
+        
+        Args:
+            user_id: Requesting user (LEAN architecture - used for logging only)
+            limit: Maximum subdomains to yield (None = all)
+            offset: Rows to skip before the first batch (compatibility)
+            module_filter: Ignored - source_module not exposed via API
+            batch_size: Rows fetched per round trip
+            
+        Yields:
+            Lists of flattened subdomain dicts (at most `batch_size` each)
+        
+        Raises:
+            HTTPException: 500 if a query fails before the first batch.
+                Later failures are re-raised as they are: a streaming
+                caller has already sent its status by then.
+        """
+        streamed = 0
         try:
             # Get ALL assets (LEAN architecture - no user_id filter)
-            assets_response = self.supabase.table("assets").select("id").execute()
+            assets_response = await self.supabase.table("assets").select("id").execute()
             
             if not assets_response.data:
                 self.logger.info("No assets found in database")
-                return []
+                return
             
             asset_ids = [a["id"] for a in assets_response.data]
-            self.logger.info(f"Found {len(asset_ids)} total assets: {asset_ids[:5]}...")
             
-            # DEBUG: Let's also check how many asset_scan_jobs exist for these assets
-            asset_scan_jobs_response = self.supabase.table("asset_scan_jobs").select("id, asset_id").in_("asset_id", asset_ids).execute()
-            self.logger.info(f"Found {len(asset_scan_jobs_response.data) if asset_scan_jobs_response.data else 0} asset scan jobs for these assets")
+            cursor = None
+            remaining = limit
             
-            if asset_scan_jobs_response.data:
-                asset_scan_job_ids = [job["id"] for job in asset_scan_jobs_response.data]
-                self.logger.info(f"Asset scan job IDs: {asset_scan_job_ids[:5]}...")  # Log first 5
+            while remaining is None or remaining > 0:
+                page_size = batch_size if remaining is None else min(batch_size, remaining)
                 
-                # DEBUG: Check how many subdomains exist for these asset scan jobs
-                subdomains_count_response = self.supabase.table("subdomains").select("id").in_("scan_job_id", asset_scan_job_ids).execute()
-                self.logger.info(f"Total subdomains found in these asset scan jobs: {len(subdomains_count_response.data) if subdomains_count_response.data else 0}")
-            
-            # Build the query to get subdomains across all assets
-            # MIGRATION NOTE (2025-10-06): Only selecting fields that exist after schema cleanup
-            # Removed fields (ip_addresses, status_code, etc.) will be in future module-specific tables
-            query = self.supabase.table("subdomains").select(
-                """
-                id,
-                subdomain,
-                parent_domain,
-                scan_job_id,
-                discovered_at,
-                last_checked,
-                asset_scan_jobs!inner(
+                # MIGRATION NOTE (2025-10-06): Only selecting fields that exist after schema cleanup
+                # Removed fields (ip_addresses, status_code, etc.) will be in future module-specific tables
+                query = self.supabase.table("subdomains").select(
+                    """
                     id,
-                    asset_id,
-                    status,
-                    created_at
-                )
-                """
-            ).in_("asset_scan_jobs.asset_id", asset_ids)
-            
-            # Module filter removed for production - source_module not exposed via API
-            
-            # Apply pagination and ordering
-            # Use range for all queries to bypass Supabase client's 1000 default limit
-            query = query.order("discovered_at", desc=True).range(offset, offset + limit - 1)
-            
-            response = query.execute()
-            
-            self.logger.info(f"Query returned {len(response.data) if response.data else 0} results")
-            
-            if not response.data:
-                self.logger.info(f"No subdomains found across all user assets for {user_id}. This might be normal if no scans have been completed.")
-                return []
-            
-            # Transform the data to flatten the asset_scan_jobs relationship
-            subdomains = []
-            for item in response.data:
-                scan_job = item.pop("asset_scan_jobs", {})
+                    subdomain,
+                    parent_domain,
+                    scan_job_id,
+                    discovered_at,
+                    last_checked,
+                    asset_scan_jobs!inner(
+                        id,
+                        asset_id,
+                        status,
+                        created_at
+                    )
+                    """
+                ).in_("asset_scan_jobs.asset_id", asset_ids)
                 
-                subdomain_data = {
-                    **item,
-                    "scan_job_domain": item.get("parent_domain"),  # Use parent_domain from subdomain
-                    "scan_job_type": "subdomain",  # asset_scan_jobs are always subdomain scans
-                    "scan_job_status": scan_job.get("status"),
-                    "scan_job_created_at": scan_job.get("created_at")
-                }
-                subdomains.append(subdomain_data)
+                # Module filter removed for production - source_module not exposed via API
+                
+                query = apply_keyset(query, "discovered_at", page_size, cursor)
+                if cursor is None and offset > 0:
+                    # Legacy offset only applies to the first batch; keyset takes over after
+                    query = query.offset(offset)
+                
+                response = await query.execute()
+                rows, cursor = keyset_page(response.data, "discovered_at", page_size)
+                
+                if not rows:
+                    break
+                
+                # Transform the data to flatten the asset_scan_jobs relationship
+                batch = []
+                for item in rows:
+                    scan_job = item.pop("asset_scan_jobs", {}) or {}
+                    batch.append({
+                        **item,
+                        "scan_job_domain": item.get("parent_domain"),  # Use parent_domain from subdomain
+                        "scan_job_type": "subdomain",  # asset_scan_jobs are always subdomain scans
+                        "scan_job_status": scan_job.get("status"),
+                        "scan_job_created_at": scan_job.get("created_at")
+                    })
+                
+                streamed += len(batch)
+                if remaining is not None:
+                    remaining -= len(batch)
+                
+                yield batch
+                
+                if cursor is None:
+                    break
             
-            self.logger.info(f"Retrieved {len(subdomains)} subdomains across all user assets for {user_id}")
-            return subdomains
+            self.logger.info(f"Streamed {streamed} subdomains across all user assets for {user_id}")
             
         except HTTPException:
             raise
         except Exception as e:
             self.logger.error(f"Error retrieving all user subdomains for {user_id}: {str(e)}")
+            if streamed:
+                raise
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Failed to retrieve all user subdomains: {str(e)}"
@@ -702,7 +770,9 @@ class AssetService:
         per_page: int = 50,
         asset_id: Optional[str] = None,
         parent_domain: Optional[str] = None,
-        search: Optional[str] = None
+        search: Optional[str] = None,
+        cursor: Optional[str] = None,
+        since: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Get paginated subdomains with efficient loading and filtering.
@@ -719,9 +789,16 @@ class AssetService:
             asset_id: Optional asset filter
             parent_domain: Optional apex domain filter  
             search: Optional search term for subdomain names
+            cursor: Opaque keyset cursor from a previous page (overrides page)
+            since: Delta watermark - only subdomains discovered after it,
+                oldest first (overrides cursor and page)
             
         Returns:
             Dict containing subdomains, pagination info, and statistics
+            
+        Raises:
+            InvalidCursorError: If the cursor is malformed
+            InvalidWatermarkError: If the watermark is malformed
         """
         try:
             # Validate pagination parameters
@@ -734,7 +811,7 @@ class AssetService:
             offset = (page - 1) * per_page
             
             # LEAN Architecture: Get ALL assets (no user_id filter)
-            assets_response = self.supabase.table("assets").select("id, name").execute()
+            assets_response = await self.supabase.table("assets").select("id, name").execute()
             
             if not assets_response.data:
                 return {
@@ -776,7 +853,7 @@ class AssetService:
                     status,
                     created_at
                 )
-                """, count="exact"
+                """, count=None if cursor or since else "exact"
             ).in_("asset_scan_jobs.asset_id", all_asset_ids)
             
             # Apply filters progressively
@@ -792,22 +869,36 @@ class AssetService:
                 # Use ilike for case-insensitive search
                 base_query = base_query.ilike("subdomain", f"%{search}%")
             
-            # Get total count (Supabase will return this in response)
-            count_response = base_query.limit(1).execute()
-            total_count = count_response.count if hasattr(count_response, 'count') else 0
-            
-            # Calculate pagination metadata
-            total_pages = (total_count + per_page - 1) // per_page if total_count > 0 else 0
-            has_next = page < total_pages
-            has_prev = page > 1
-            
-            # Get paginated data
-            paginated_query = base_query.order("discovered_at", desc=True).range(offset, offset + per_page - 1)
-            response = paginated_query.execute()
+            # Get paginated data (total count comes back on the same round trip):
+            # - Keyset (cursor, or page 1): seeks via (discovered_at, id) index
+            # - page > 1 without cursor: legacy OFFSET compatibility shim
+            # - Delta (since=): discovered after the watermark, oldest first
+            next_watermark = None
+            if since:
+                until = watermark_ceiling(settings.delta_settle_seconds)
+                response = await apply_delta(base_query, "discovered_at", per_page, since, until).execute()
+                rows, next_watermark, has_more = delta_page(response.data, "discovered_at", per_page, until)
+                next_cursor = None
+            elif cursor or page == 1:
+                response = await apply_keyset(base_query, "discovered_at", per_page, cursor).execute()
+                rows, next_cursor = keyset_page(response.data, "discovered_at", per_page)
+            else:
+                paginated_query = base_query.order("discovered_at", desc=True, nullsfirst=False).order("id", desc=True)
+                response = await paginated_query.range(offset, offset + per_page - 1).execute()
+                rows = response.data or []
+                next_cursor = None
+                if len(rows) == per_page:
+                    next_cursor = encode_cursor(rows[-1].get("discovered_at"), rows[-1]["id"])
+            
+            # Calculate pagination metadata (cursor pages don't recount)
+            total_count = None if cursor or since else (response.count or 0)
+            total_pages = (total_count + per_page - 1) // per_page if total_count else 0
+            has_next = has_more if since else next_cursor is not None
+            has_prev = cursor is not None or page > 1
             
             # Transform the data to flatten asset_scan_jobs relationship
             subdomains = []
-            for item in response.data:
+            for item in rows:
                 scan_job = item.pop("asset_scan_jobs", {})
                 asset_id_from_scan = scan_job.get("asset_id")
                 
@@ -834,11 +925,13 @@ class AssetService:
                 "subdomains": subdomains,
                 "pagination": {
                     "total": total_count,
-                    "page": page,
+                    "page": None if cursor or since else page,
                     "per_page": per_page,
-                    "total_pages": total_pages,
+                    "total_pages": None if cursor or since else total_pages,
                     "has_next": has_next,
-                    "has_prev": has_prev
+                    "has_prev": has_prev,
+                    "next_cursor": next_cursor,
+                    "next_watermark": next_watermark
                 },
                 "filters": {
                     "asset_id": asset_id,
@@ -851,6 +944,11 @@ class AssetService:
             self.logger.info(f"Retrieved page {page} ({len(subdomains)} subdomains) of {total_count} total")
             return result
             
+        except (InvalidCursorError, InvalidWatermarkError) as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
         except Exception as e:
             self.logger.error(f"Error retrieving paginated subdomains for {user_id}: {str(e)}")
             raise HTTPException(
@@ -867,11 +965,11 @@ class AssetService:
         """Get user's asset summary statistics."""
         try:
             # Get asset count
-            assets_response = self.supabase.table("assets").select("id").eq("user_id", user_id).execute()
+            assets_response = await self.supabase.table("assets").select("id").eq("user_id", user_id).execute()
             total_assets = len(assets_response.data) if assets_response.data else 0
             
             # Get domain count  
-            domains_response = self.supabase.table("apex_domains").select(
+            domains_response = await self.supabase.table("apex_domains").select(
                 "id"
             ).in_("asset_id", [a["id"] for a in assets_response.data] if assets_response.data else []).execute()
             total_domains = len(domains_response.data) if domains_response.data else 0
@@ -880,14 +978,14 @@ class AssetService:
             total_subdomains = 0
             try:
                 # Get all asset scan jobs for this user's assets
-                asset_scan_jobs_response = self.supabase.table("asset_scan_jobs").select("id").eq("user_id", user_id).execute()
+                asset_scan_jobs_response = await self.supabase.table("asset_scan_jobs").select("id").eq("user_id", user_id).execute()
                 
                 if asset_scan_jobs_response.data:
                     asset_scan_job_ids = [job['id'] for job in asset_scan_jobs_response.data]
                     
                     # Count total subdomains across all asset scan jobs
                     if asset_scan_job_ids:
-                        subdomains_response = self.supabase.table("subdomains").select("id", count="exact").in_("scan_job_id", asset_scan_job_ids).execute()
+                        subdomains_response = await self.supabase.table("subdomains").select("id", count="exact").in_("scan_job_id", asset_scan_job_ids).execute()
                         total_subdomains = subdomains_response.count if subdomains_response.count is not None else 0
             except Exception as e:
                 self.logger.warning(f"Failed to calculate total subdomains for user {user_id}: {str(e)}")
@@ -906,6 +1004,7 @@ class AssetService:
                 detail=f"Failed to get user summary: {str(e)}"
             )
 
+    @coalesced("asset_domains")
     async def get_paginated_asset_domains(
         self, 
         user_id: str,
@@ -920,6 +1019,9 @@ class AssetService:
         
         This method provides paginated domain management for asset detail pages.
         Supports filtering by status and search terms.
+        
+        Per-domain statistics are fetched with grouped RPCs, so a page costs
+        3 round trips regardless of per_page.
         """
         try:
             # Validate pagination parameters
@@ -954,68 +1056,61 @@ class AssetService:
                 # Use ilike for case-insensitive search
                 base_query = base_query.ilike("domain", f"%{search}%")
             
-            # Get total count
-            count_response = base_query.limit(1).execute()
-            total_count = count_response.count if hasattr(count_response, 'count') else 0
+            # Get paginated data (count="exact" comes back with the same request)
+            paginated_query = base_query.order("domain", desc=False).range(offset, offset + per_page - 1)
+            response = await paginated_query.execute()
+            total_count = response.count or 0
             
             # Calculate pagination metadata
             total_pages = (total_count + per_page - 1) // per_page if total_count > 0 else 0
             has_next = page < total_pages
             has_prev = page > 1
             
-            # Get paginated data
-            paginated_query = base_query.order("domain", desc=False).range(offset, offset + per_page - 1)
-            response = paginated_query.execute()
+            # ================================================================
+            # Batched Domain Statistics (2 grouped queries per page, not 2N)
+            # ================================================================
+            page_items = response.data or []
+            subdomain_counts: Dict[str, int] = {}
+            scan_rollup: Dict[str, Any] = {}
+            
+            if page_items:
+                domain_names = [item.get("domain") for item in page_items]
+                
+                # One grouped count over parent_domain IN (...) for the whole page
+                counts_response = await self.supabase.rpc(
+                    "get_subdomain_counts_by_parent_domain",
+                    {"p_domains": domain_names}
+                ).execute()
+                subdomain_counts = {
+                    row["parent_domain"]: row["subdomain_count"]
+                    for row in (counts_response.data or [])
+                }
+                
+                # Scan status is per asset, so it is identical for every domain on the page
+                rollup_response = await self.supabase.rpc(
+                    "get_asset_scan_status_rollup",
+                    {"p_asset_ids": [asset_id]}
+                ).execute()
+                if rollup_response.data:
+                    scan_rollup = rollup_response.data[0]
             
             # Transform and enrich domain data with real statistics
             domains = []
-            for item in response.data:
+            for item in page_items:
                 # Extract asset info
                 asset_info = item.pop("assets", {})
                 asset_name = asset_info.get("name", "Unknown Asset") if asset_info else "Unknown Asset"
                 
-                # ================================================================
-                # FIXED: Calculate Real Domain Statistics (Phase 1c)
-                # ================================================================
-                
-                domain_id = item.get("id")
-                domain_name = item.get("domain")
-                
-                # Count subdomains for this specific domain
-                subdomain_count_response = self.supabase.table("subdomains").select(
-                    "id", count="exact"
-                ).eq("parent_domain", domain_name).execute()
-                
-                total_subdomains = subdomain_count_response.count if hasattr(subdomain_count_response, 'count') else 0
-                
-                # Count asset scan jobs for this domain (through asset_id)
-                scan_count_response = self.supabase.table("asset_scan_jobs").select(
-                    "id, status", count="exact"
-                ).eq("asset_id", asset_id).execute()
-                
-                total_scans = scan_count_response.count if hasattr(scan_count_response, 'count') else 0
-                completed_scans = 0
-                running_scans = 0
-                
-                # Calculate scan status breakdown for this asset (shared across all domains)
-                if scan_count_response.data:
-                    for scan in scan_count_response.data:
-                        scan_status = scan.get("status", "").lower()
-                        if scan_status == "completed":
-                            completed_scans += 1
-                        elif scan_status in ["running", "pending"]:
-                            running_scans += 1
-                
                 # Note: used_modules removed for production - tool names not exposed via API
                 
                 # Build domain object with real statistics
                 domain_data = {
                     **item,
                     "asset_name": asset_name,
-                    "total_scans": total_scans,
-                    "completed_scans": completed_scans,
-                    "running_scans": running_scans, 
-                    "total_subdomains": total_subdomains
+                    "total_scans": scan_rollup.get("total_scans", 0),
+                    "completed_scans": scan_rollup.get("completed_scans", 0),
+                    "running_scans": scan_rollup.get("running_scans", 0), 
+                    "total_subdomains": subdomain_counts.get(item.get("domain"), 0)
                 }
                 domains.append(domain_data)
             
@@ -1053,6 +1148,7 @@ class AssetService:
                 detail=f"Failed to retrieve paginated domains: {str(e)}"
             )
 
+    @cached_result("filter_options")
     async def get_comprehensive_filter_options(
         self, 
         user_id: str = None,  # Kept for API compatibility but ignored (LEAN architecture)
@@ -1067,12 +1163,15 @@ class AssetService:
         When asset_id is provided, domains are filtered to only those
         belonging to that specific program - enables cascading filters.
         
+        Results are shared across users via the result cache and invalidated
+        when the asset's data version changes.
+        
         Returns:
             Dict with domains, assets, and stats
         """
         try:
             # LEAN Architecture: Get ALL assets (no user_id filter)
-            all_assets_response = self.supabase.table("assets").select("id, name").order("name").execute()
+            all_assets_response = await self.supabase.table("assets").select("id, name").order("name").execute()
             all_assets_data = all_assets_response.data or []
             
             # Determine which asset IDs to query for domains
@@ -1099,12 +1198,12 @@ class AssetService:
             # and already contains all unique domains
             if asset_id:
                 # Get domains from apex_domains table for specific asset
-                domains_response = self.supabase.table("apex_domains").select(
+                domains_response = await self.supabase.table("apex_domains").select(
                     "domain"
                 ).eq("asset_id", asset_id).order("domain").execute()
             else:
                 # Get all domains from apex_domains table (no limit needed, only ~243 rows)
-                domains_response = self.supabase.table("apex_domains").select(
+                domains_response = await self.supabase.table("apex_domains").select(
                     "domain"
                 ).order("domain").execute()
             
@@ -39,7 +39,7 @@ class BatchExecutionService:
     """
     
     def __init__(self):
-        self.supabase = supabase_client.service_client
+        self.supabase = supabase_client.async_service_client
         
     async def create_batch_jobs(self, batch_jobs: List[BatchScanJob]) -> Dict[str, Any]:
         """
@@ -81,7 +81,7 @@ class BatchExecutionService:
                 }
                 
                 # Insert batch job
-                response = self.supabase.table("batch_scan_jobs").insert(batch_record).execute()
+                response = await self.supabase.table("batch_scan_jobs").insert(batch_record).execute()
                 
                 if not response.data:
                     raise Exception(f"Failed to create batch job {batch_job.id}")
@@ -191,7 +191,7 @@ class BatchExecutionService:
                         # We need to query the database to find which asset this domain belongs to
                         # This is inefficient but necessary for the fallback
                         try:
-                            domain_query = self.supabase.table("apex_domains").select("asset_id").eq("domain", domain).limit(1).execute()
+                            domain_query = await self.supabase.table("apex_domains").select("asset_id").eq("domain", domain).limit(1).execute()
                             if domain_query.data:
                                 asset_id = domain_query.data[0]["asset_id"]
                                 break
@@ -234,7 +234,7 @@ class BatchExecutionService:
             logger.info(f"🔬 DIAGNOSTIC: About to INSERT asset_scan_jobs (ONLY ATTEMPT - OPTION B) | scan_ids={scan_ids_to_insert} | count={len(asset_scan_records)} | source=batch_execution._create_asset_scan_jobs | action=SINGLE_INSERT_ATTEMPT")
             
             try:
-                response = self.supabase.table("asset_scan_jobs").insert(asset_scan_records).execute()
+                response = await self.supabase.table("asset_scan_jobs").insert(asset_scan_records).execute()
                 
                 if response.data:
                     logger.info(f"✅ Successfully created {len(response.data)} asset_scan_job records")
@@ -269,7 +269,7 @@ class BatchExecutionService:
             assignments.append(assignment)
         
         if assignments:
-            response = self.supabase.table("batch_domain_assignments").insert(assignments).execute()
+            response = await self.supabase.table("batch_domain_assignments").insert(assignments).execute()
             
             if not response.data:
                 logger.error(f"Failed to create domain assignments for batch {batch_job.id}")
@@ -441,7 +441,7 @@ class BatchExecutionService:
                     update_data["error_message"] = error_message
             
             # Update domain assignment
-            response = self.supabase.table("batch_domain_assignments").update(update_data).eq(
+            response = await self.supabase.table("batch_domain_assignments").update(update_data).eq(
                 "batch_scan_id", batch_id
             ).eq("domain", domain).execute()
             
@@ -459,7 +459,7 @@ class BatchExecutionService:
         
         try:
             # Get domain assignment counts
-            response = self.supabase.table("batch_domain_assignments").select(
+            response = await self.supabase.table("batch_domain_assignments").select(
                 "status"
             ).eq("batch_scan_id", batch_id).execute()
             
@@ -493,7 +493,7 @@ class BatchExecutionService:
     async def _get_batch_job(self, batch_id: str) -> Dict[str, Any]:
         """Get batch job details from database."""
         
-        response = self.supabase.table("batch_scan_jobs").select("*").eq("id", batch_id).execute()
+        response = await self.supabase.table("batch_scan_jobs").select("*").eq("id", batch_id).execute()
         
         if not response.data:
             raise HTTPException(
@@ -515,7 +515,7 @@ class BatchExecutionService:
     async def _update_batch_job(self, batch_id: str, update_data: Dict[str, Any]):
         """Update batch job with given data."""
         
-        response = self.supabase.table("batch_scan_jobs").update(update_data).eq("id", batch_id).execute()
+        response = await self.supabase.table("batch_scan_jobs").update(update_data).eq("id", batch_id).execute()
         
         if not response.data:
             logger.error(f"Failed to update batch job {batch_id}")
@@ -26,6 +26,27 @@ class BatchMetrics:
     resource_efficiency: float
     error_rate: float
 
+@dataclass
+class FleetMetrics:
+    """Shared consumer fleet vs per-asset consumers for one multi-asset scan."""
+    fleet_id: str
+    assets: int
+    messages_routed: int
+    shared_tasks: int
+    per_asset_tasks: int
+    shared_task_seconds: float
+    per_asset_task_seconds: float
+    shared_cost_usd: float
+    per_asset_cost_usd: float
+    shared_messages_per_task_second: float
+    per_asset_messages_per_task_second: float
+
+    @property
+    def cost_savings_percentage(self) -> float:
+        if not self.per_asset_cost_usd:
+            return 0.0
+        return (1 - self.shared_cost_usd / self.per_asset_cost_usd) * 100
+
 class BatchMonitoringService:
     """
     Service for monitoring batch processing performance and costs.
@@ -64,6 +85,34 @@ class BatchMonitoringService:
         except Exception as e:
             logger.error(f"Failed to record batch metrics for {batch_id}: {str(e)}")
     
+    async def record_fleet_comparison(self, fleet_id: str, metrics: FleetMetrics) -> None:
+        """Record how a shared consumer fleet compared with per-asset consumers."""
+        try:
+            logger.info(
+                f"Fleet {fleet_id}: {metrics.assets} assets on {metrics.shared_tasks} shared tasks "
+                f"(per-asset: {metrics.per_asset_tasks}), "
+                f"{metrics.shared_task_seconds:.0f} vs {metrics.per_asset_task_seconds:.0f} task-seconds, "
+                f"${metrics.shared_cost_usd:.4f} vs ${metrics.per_asset_cost_usd:.4f} "
+                f"({metrics.cost_savings_percentage:.1f}% saved), "
+                f"{metrics.shared_messages_per_task_second:.2f} vs "
+                f"{metrics.per_asset_messages_per_task_second:.2f} messages/task-second"
+            )
+            
+            await self._send_cloudwatch_metrics(fleet_id, BatchMetrics(
+                batch_id=fleet_id,
+                total_domains=metrics.messages_routed,
+                processing_time_seconds=metrics.shared_task_seconds,
+                cost_savings_percentage=metrics.cost_savings_percentage,
+                resource_efficiency=(
+                    metrics.shared_messages_per_task_second / metrics.per_asset_messages_per_task_second
+                    if metrics.per_asset_messages_per_task_second else 0.0
+                ),
+                error_rate=0.0
+            ))
+            
+        except Exception as e:
+            logger.error(f"Failed to record fleet metrics for {fleet_id}: {str(e)}")
+    
     async def get_performance_summary(self, days: int = 7) -> Dict[str, Any]:
         """Get performance summary for the last N days."""
         try:
@@ -17,22 +17,65 @@ Performance Goals:
 • Minimal database writes (batches vs individual jobs)
 """
 
+import heapq
+import math
 import uuid
 import json
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Sequence, Tuple
 from fastapi import HTTPException, status
 import logging
 
+from ..core.config import settings
 from ..core.supabase_client import supabase_client
 from ..schemas.batch import (
     BatchOptimizationRequest, BatchOptimizationResult, BatchScanJob,
     BatchType, BatchStatus, ResourceProfile, ModuleProfile,
     BatchDomainAssignment, DomainAssignmentStatus
 )
+from .resource_model import resource_model
 
 logger = logging.getLogger(__name__)
 
+
+def pack_by_work(domains: Sequence[str], work: Dict[str, float], max_batch_size: int) -> List[List[str]]:
+    """
+    Split domains into balanced batches (longest processing time first).
+    
+    Uses as many batches as fixed-size chunking would (same task count, so
+    no extra task cost). Domains go out heaviest first, each to the batch
+    with the least predicted work that still has room for another domain.
+    A domain much heavier than the rest therefore ends up in a batch of its
+    own, or with only light domains.
+    
+    Args:
+        domains: Domains in request order
+        work: Domain -> predicted work (missing domains count as 1.0)
+        max_batch_size: Max domains per batch
+        
+    Returns:
+        Batches, heaviest first; domains keep request order within a batch
+    """
+    if not domains:
+        return []
+    
+    batch_count = math.ceil(len(domains) / max_batch_size)
+    open_batches = [(0.0, b) for b in range(batch_count)]  # (predicted work, batch index)
+    batches: List[List[int]] = [[] for _ in range(batch_count)]
+    loads = [0.0] * batch_count
+    
+    heaviest_first = sorted(range(len(domains)), key=lambda i: (-work.get(domains[i], 1.0), i))
+    for i in heaviest_first:
+        load, b = heapq.heappop(open_batches)
+        batches[b].append(i)
+        loads[b] = load + work.get(domains[i], 1.0)
+        if len(batches[b]) < max_batch_size:
+            heapq.heappush(open_batches, (loads[b], b))
+    
+    order = sorted(range(batch_count), key=lambda b: (-loads[b], b))
+    return [[domains[i] for i in sorted(batches[b])] for b in order]
+
+
 class BatchOptimizer:
     """
     Intelligent batch optimization for reconnaissance scans.
@@ -42,6 +85,9 @@ class BatchOptimizer:
     asset-level progress tracking.
     """
     
+    # Modules whose work per apex domain follows its URLs rather than its subdomains
+    URL_DRIVEN_MODULES = {"katana": "url_count", "url-resolver": "url_count", "waymore": "url_count"}
+    
     def __init__(self):
         self.supabase = supabase_client.service_client
         self.module_profiles_cache: Dict[str, ModuleProfile] = {}
@@ -239,9 +285,16 @@ class BatchOptimizer:
         batches = []
         max_batch_size = module_profile.max_batch_size
         
-        # Split domains into optimal batch sizes
-        for i in range(0, len(domains), max_batch_size):
-            batch_domains = domains[i:i + max_batch_size]
+        # Balance predicted work across batches so one huge apex domain does
+        # not hold up a batch of small ones (fixed-size chunks otherwise)
+        if settings.batch_packing_enabled:
+            domain_work = await self._estimate_domain_work(module, domains)
+            batch_plan = pack_by_work(domains, domain_work, max_batch_size)
+        else:
+            domain_work = {}
+            batch_plan = [domains[i:i + max_batch_size] for i in range(0, len(domains), max_batch_size)]
+        
+        for batch_domains in batch_plan:
             
             # Calculate resources for this batch size
             resource_profile = await self._calculate_batch_resources(module, len(batch_domains))
@@ -260,9 +313,11 @@ class BatchOptimizer:
                 "optimization_batch": True,
                 "priority": priority,
                 "module_profile_version": module_profile.version,
-                "batch_strategy": "multi_domain_optimized",
+                "batch_strategy": "work_balanced" if settings.batch_packing_enabled else "multi_domain_optimized",
                 "asset_scan_records": asset_scan_records
             }
+            if domain_work:
+                batch_metadata["predicted_work"] = sum(domain_work.get(d, 1.0) for d in batch_domains)
             
             # ✅ NEW: Add asset_id for single-asset batches (required for DNSX)
             if is_single_asset:
@@ -481,6 +536,33 @@ class BatchOptimizer:
         logger.info(f"✅ Created {len(batches)} database-fetch batch(es) for {subdomain_count} subdomains")
         return batches
     
+    async def _estimate_domain_work(self, module: str, domains: List[str]) -> Dict[str, float]:
+        """
+        Predicted work per apex domain, from what it produced last time.
+        
+        A domain's work is 1 plus the items the module will process for it:
+        known URLs for URL-driven modules, known subdomains otherwise. New
+        domains (no history) count as 1.
+        
+        Returns:
+            Domain -> predicted work ({} if the counts are unavailable, which
+            makes every domain weigh the same)
+        """
+        driver = self.URL_DRIVEN_MODULES.get(module, "subdomain_count")
+        try:
+            response = self.supabase.rpc(
+                "get_domain_workload_counts",
+                {"p_domains": list(domains)}
+            ).execute()
+            work = {row["parent_domain"]: 1.0 + float(row[driver] or 0) for row in response.data or []}
+            if work:
+                heaviest = max(work.values())
+                logger.info(f"📦 Work estimates for {len(work)}/{len(domains)} {module} domains (heaviest {heaviest:.0f})")
+            return work
+        except Exception as e:
+            logger.warning(f"⚠️  Domain work estimates unavailable for {module}, packing by domain count: {str(e)}")
+            return {}
+    
     async def _get_module_profile(self, module_name: str) -> ModuleProfile:
         """Get module profile with caching."""
         
@@ -523,6 +605,18 @@ class BatchOptimizer:
     async def _calculate_batch_resources(self, module_name: str, domain_count: int) -> ResourceProfile:
         """Calculate optimal resources for a batch using database function."""
         
+        # Sizes learned from finished jobs take over once the module has enough history
+        recommendation = resource_model.recommend(module_name, domain_count)
+        if recommendation:
+            return ResourceProfile(
+                cpu=recommendation.cpu,
+                memory=recommendation.memory,
+                estimated_duration_minutes=recommendation.estimated_duration_minutes,
+                description=f"History model ({recommendation.samples} jobs) for {domain_count} domains",
+                domain_count=domain_count,
+                module_name=module_name
+            )
+        
         try:
             # Use the database function for consistent resource calculation
             response = self.supabase.rpc(
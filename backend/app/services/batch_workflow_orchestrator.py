@@ -46,6 +46,11 @@ from ..schemas.batch import (
 from .resource_calculator import resource_calculator, ResourceAllocation
 from .batch_optimizer import batch_optimizer
 from .batch_execution import batch_execution_service
+from .task_runner import (
+    TaskRunner, TaskSpec, EcsTaskRunner, LocalTaskRunner, MODULE_BINARIES, mock_task_runner
+)
+from .pipeline_context import PipelineContext
+from .warm_pool import warm_pool, WARM_ARN_PREFIX
 
 logger = logging.getLogger(__name__)
 
@@ -61,6 +66,8 @@ class BatchWorkflowOrchestrator:
         self.supabase = supabase_client.service_client
         self.redis_client = None
         self.ecs_client = None
+        # Explicit runner (e.g. LocalTaskRunner); chosen per launch otherwise
+        self.task_runner: Optional[TaskRunner] = None
         self._init_aws_clients()
         
     def _init_aws_clients(self):
@@ -79,6 +86,59 @@ class BatchWorkflowOrchestrator:
         except Exception as e:
             logger.error(f"Failed to initialize AWS clients: {str(e)}")
     
+    def _get_task_runner(self) -> TaskRunner:
+        """
+        Runner for module tasks, per settings.task_runner.
+        
+        "local" runs tasks on this machine, "ecs"/"auto" use ECS when a
+        client is available and fall back to the mock runner otherwise.
+        """
+        if self.task_runner is not None:
+            return self.task_runner
+        
+        if settings.task_runner == "local":
+            self.task_runner = LocalTaskRunner()
+            logger.info(f"🖥️ Using local task runner ({self.task_runner.mode})")
+            return self.task_runner
+        
+        if self.ecs_client:
+            return EcsTaskRunner(
+                self.ecs_client,
+                cluster=self._get_cluster_name(),
+                subnets=self._get_subnet_ids(),
+                security_groups=self._get_security_group_ids()
+            )
+        
+        logger.warning("ECS client not available - returning mock results")
+        return mock_task_runner
+    
+    async def _build_task_spec(
+        self,
+        runner: TaskRunner,
+        batch_job: BatchScanJob,
+        name: str,
+        environment: List[Dict[str, str]],
+        cpu: int,
+        memory: int,
+        tags: List[Dict[str, str]],
+        context: Optional[PipelineContext] = None
+    ) -> TaskSpec:
+        """Describe a module task; ECS names are resolved only for runners that need them."""
+        spec = TaskSpec(
+            module=batch_job.module,
+            name=name,
+            environment=environment,
+            cpu=cpu,
+            memory=memory,
+            tags=tags
+        )
+        if runner.requires_task_definition:
+            spec.task_definition = self._get_task_definition_name(batch_job.module)
+            spec.container_name = self._get_container_name(batch_job.module)
+            spec.task_role_arn = await self._get_task_role_arn(batch_job.module, context=context)
+            spec.execution_role_arn = self._get_execution_role_arn()
+        return spec
+    
     async def get_redis(self):
         """Get Redis connection for progress tracking."""
         if not self.redis_client:
@@ -366,16 +426,13 @@ class BatchWorkflowOrchestrator:
         batch_jobs: List[BatchScanJob], 
         allocations: List[ResourceAllocation]
     ) -> List[Dict[str, Any]]:
-        """Launch ECS tasks for all batch jobs with optimized resources."""
+        """Launch ECS tasks for all batch jobs with optimized resources (concurrently)."""
         
-        launch_results = []
-        
-        for i, batch_job in enumerate(batch_jobs):
+        async def launch(i: int, batch_job: BatchScanJob) -> Dict[str, Any]:
             allocation = allocations[i] if i < len(allocations) and allocations[i] else None
             
             try:
                 result = await self._launch_single_batch_task(batch_job, allocation)
-                launch_results.append(result)
                 
                 # Update batch job with ECS task ARN
                 if result.get("task_arn"):
@@ -385,72 +442,52 @@ class BatchWorkflowOrchestrator:
                         "started_at": datetime.utcnow().isoformat()
                     })
                 
+                return result
+                
             except Exception as e:
                 logger.error(f"Failed to launch batch {batch_job.id}: {str(e)}")
-                launch_results.append({
-                    "batch_id": str(batch_job.id),
-                    "status": "failed",
-                    "error": str(e)
-                })
                 
                 # Update batch status to failed
                 await batch_execution_service._update_batch_status(
                     str(batch_job.id), BatchStatus.FAILED, {"error_message": str(e)}
                 )
+                return {
+                    "batch_id": str(batch_job.id),
+                    "status": "failed",
+                    "error": str(e)
+                }
         
-        return launch_results
+        # Independent launches overlap; ecs_launcher bounds and paces the RunTask calls
+        return list(await asyncio.gather(*[
+            launch(i, batch_job) for i, batch_job in enumerate(batch_jobs)
+        ]))
     
     async def _launch_single_batch_task(
         self, 
         batch_job: BatchScanJob, 
         allocation: Optional[ResourceAllocation]
     ) -> Dict[str, Any]:
-        """Launch a single ECS task for a batch job."""
+        """Launch a single task for a batch job (ECS, local or mock runner)."""
         
-        if not self.ecs_client:
-            logger.warning("ECS client not available - returning mock result")
-            return {
-                "batch_id": str(batch_job.id),
-                "task_arn": f"arn:aws:ecs:us-east-1:123456789012:task/mock-{batch_job.id}",
-                "status": "mock_launched",
-                "cpu": allocation.cpu if allocation else batch_job.allocated_cpu,
-                "memory": allocation.memory if allocation else batch_job.allocated_memory
-            }
+        runner = self._get_task_runner()
         
         try:
             # Use enhanced allocation if available, otherwise fall back to batch job allocation
             cpu = allocation.cpu if allocation else batch_job.allocated_cpu
             memory = allocation.memory if allocation else batch_job.allocated_memory
             
-            # Get task definition for the module
-            task_definition = self._get_task_definition_name(batch_job.module)
-            
-            # Build environment variables for the container
-            environment = await self._build_container_environment(batch_job, allocation)
-            
-            # Launch ECS task
-            response = self.ecs_client.run_task(
-                cluster=self._get_cluster_name(),
-                taskDefinition=task_definition,
-                launchType='FARGATE',
-                networkConfiguration={
-                    'awsvpcConfiguration': {
-                        'subnets': self._get_subnet_ids(),
-                        'securityGroups': self._get_security_group_ids(),
-                        'assignPublicIp': 'ENABLED'
-                    }
-                },
-                overrides={
-                    'taskRoleArn': await self._get_task_role_arn(batch_job.module),
-                    'executionRoleArn': self._get_execution_role_arn(),
-                    'cpu': str(cpu),
-                    'memory': str(memory),
-                    'containerOverrides': [{
-                        'name': self._get_container_name(batch_job.module),
-                        'environment': environment,
-                        # No 'command' key - containers use environment variables only ✅
-                    }]
-                },
+            # Build environment variables for the container (not needed for mock launches)
+            environment = []
+            if runner is not mock_task_runner:
+                environment = await self._build_container_environment(batch_job, allocation)
+            
+            spec = await self._build_task_spec(
+                runner,
+                batch_job,
+                name=str(batch_job.id),
+                environment=environment,
+                cpu=cpu,
+                memory=memory,
                 tags=[
                     {'key': 'BatchId', 'value': str(batch_job.id)},
                     {'key': 'Module', 'value': batch_job.module},
@@ -460,31 +497,31 @@ class BatchWorkflowOrchestrator:
                 ]
             )
             
-            if not response.get('tasks'):
-                raise Exception("No tasks returned from ECS")
-            
-            task_arn = response['tasks'][0]['taskArn']
+            task_arn = (await runner.run(spec))[0]
             
-            logger.info(f"Successfully launched ECS task {task_arn} for batch {batch_job.id}")
+            logger.info(f"Successfully launched task {task_arn} for batch {batch_job.id}")
             
-            return {
+            result = {
                 "batch_id": str(batch_job.id),
                 "task_arn": task_arn,
-                "status": "launched",
+                "status": runner.launched_status,
                 "cpu": cpu,
-                "memory": memory,
-                "cluster": self._get_cluster_name(),
-                "task_definition": task_definition
+                "memory": memory
             }
+            if runner.requires_task_definition:
+                result["cluster"] = self._get_cluster_name()
+                result["task_definition"] = spec.task_definition
+            return result
             
         except Exception as e:
-            logger.error(f"ECS task launch failed for batch {batch_job.id}: {str(e)}")
+            logger.error(f"Task launch failed for batch {batch_job.id}: {str(e)}")
             raise
     
     async def _build_container_environment(
         self, 
         batch_job: BatchScanJob, 
-        allocation: Optional[ResourceAllocation]
+        allocation: Optional[ResourceAllocation],
+        context: Optional[PipelineContext] = None
     ) -> List[Dict[str, str]]:
         """
         Build STANDARD environment variables for ALL scan module containers.
@@ -493,6 +530,9 @@ class BatchWorkflowOrchestrator:
         All scan modules receive identical base environment variables,
         with module-specific extensions via MODULE_CONFIG.
         
+        Pipelines pass their PipelineContext so the module profile loaded
+        once per scan is reused instead of asking the registry per task.
+        
         See: docs/container_standard/CONTAINER_INTERFACE_STANDARD.md
         """
         
@@ -525,8 +565,11 @@ class BatchWorkflowOrchestrator:
         # MODULE-SPECIFIC CONFIGURATION
         # ============================================================
         
-        # Get module profile from registry
-        module_profile = await module_registry.get_module(batch_job.module)
+        # Get module profile (pipeline context first, registry otherwise)
+        if context is not None and batch_job.module in context.module_profiles:
+            module_profile = context.module_profile(batch_job.module)
+        else:
+            module_profile = await module_registry.get_module(batch_job.module)
         if not module_profile:
             logger.warning(
                 f"⚠️ Module '{batch_job.module}' not found in registry for batch {batch_job.id}. "
@@ -670,17 +713,20 @@ class BatchWorkflowOrchestrator:
         """Get security group IDs for ECS tasks."""
         return ['sg-04fd4ee68cb17298d']  # ECS tasks security group (ALB-compatible)
     
-    async def _get_task_role_arn(self, module: str = None) -> str:
+    async def _get_task_role_arn(self, module: str = None, context: Optional[PipelineContext] = None) -> str:
         """
         Get task role ARN for the specific module.
         
-        Uses database-driven configuration from module optimization_hints.
-        Falls back to settings if not configured in database.
+        Uses database-driven configuration from module optimization_hints
+        (from the pipeline context when given). Falls back to settings if
+        not configured in database.
         """
         role_arn = None
         
-        # Try to get module-specific role from database
-        if module:
+        # Try to get module-specific role from the pipeline context, then the database
+        if module and context is not None and module in context.module_profiles:
+            role_arn = context.module_hints(module).get("task_role_arn")
+        elif module:
             try:
                 module_profile = await module_registry.get_module(module)
                 if module_profile and module_profile.optimization_hints:
@@ -797,73 +843,11 @@ class BatchWorkflowOrchestrator:
                 "is_healthy": bool
             }
         """
-        if not self.ecs_client:
-            logger.warning("ECS client not available - returning mock status")
-            return {
-                "task_arn": task_arn,
-                "status": "RUNNING",
-                "last_status": "RUNNING",
-                "desired_status": "RUNNING",
-                "health_status": "HEALTHY",
-                "is_healthy": True,
-                "mock": True
-            }
-        
         try:
-            cluster = cluster_name or self._get_cluster_name()
-            
-            response = self.ecs_client.describe_tasks(
-                cluster=cluster,
-                tasks=[task_arn]
-            )
-            
-            if not response.get('tasks'):
-                logger.error(f"Task not found: {task_arn}")
-                return {
-                    "task_arn": task_arn,
-                    "status": "NOT_FOUND",
-                    "is_healthy": False,
-                    "error": "Task not found in ECS"
-                }
-            
-            task = response['tasks'][0]
-            
-            # Extract task status
-            last_status = task.get('lastStatus', 'UNKNOWN')
-            desired_status = task.get('desiredStatus', 'UNKNOWN')
-            health_status = task.get('healthStatus', 'UNKNOWN')
-            
-            # Check if task is healthy
-            is_healthy = (
-                last_status == 'RUNNING' and
-                desired_status == 'RUNNING' and
-                health_status in ['HEALTHY', 'UNKNOWN']
-            )
-            
-            result = {
-                "task_arn": task_arn,
-                "status": last_status,
-                "last_status": last_status,
-                "desired_status": desired_status,
-                "health_status": health_status,
-                "is_healthy": is_healthy
-            }
-            
-            # If task stopped, get stop details
-            if last_status == 'STOPPED':
-                result["stop_code"] = task.get('stopCode', 'UNKNOWN')
-                result["stopped_reason"] = task.get('stoppedReason', 'Unknown reason')
-                
-                # Get container exit code
-                containers = task.get('containers', [])
-                if containers:
-                    result["exit_code"] = containers[0].get('exitCode')
-                
-                is_healthy = False
-                result["is_healthy"] = False
-            
-            logger.debug(f"Task {task_arn[:50]}... status: {last_status}")
-            
+            if task_arn.startswith(WARM_ARN_PREFIX):
+                return await warm_pool.describe(task_arn)
+            result = await self._get_task_runner().describe(task_arn, cluster_name)
+            logger.debug(f"Task {task_arn[:50]}... status: {result.get('status')}")
             return result
             
         except Exception as e:
@@ -1068,7 +1052,8 @@ class BatchWorkflowOrchestrator:
     async def launch_streaming_producer(
         self,
         producer_job: BatchScanJob,
-        stream_key: str
+        stream_key: str,
+        context: Optional[PipelineContext] = None
     ) -> Dict[str, Any]:
         """
         Launch a streaming producer task (e.g., Subfinder).
@@ -1078,6 +1063,7 @@ class BatchWorkflowOrchestrator:
         Args:
             producer_job: BatchScanJob for producer module
             stream_key: Redis Stream key for output
+            context: Optional PipelineContext with the module profiles
             
         Returns:
             Dictionary with task ARN and launch info
@@ -1090,14 +1076,16 @@ class BatchWorkflowOrchestrator:
         # Build environment variables for producer
         producer_env = await self._build_streaming_producer_environment(
             producer_job,
-            stream_key
+            stream_key,
+            context=context
         )
         
         # Launch producer task
         producer_result = await self._launch_streaming_task(
             producer_job,
             producer_env,
-            role="producer"
+            role="producer",
+            context=context
         )
         
         logger.info(f"✅ Producer launched: {producer_result['task_arn']}")
@@ -1115,7 +1103,8 @@ class BatchWorkflowOrchestrator:
         stream_key: str,
         consumer_group_name: str,
         consumer_name: str,
-        stream_output_key: str = None  # Optional: For consumers that also produce (e.g., HTTPx → Katana)
+        stream_output_key: str = None,  # Optional: For consumers that also produce (e.g., HTTPx → Katana)
+        context: Optional[PipelineContext] = None
     ) -> Dict[str, Any]:
         """
         Launch a streaming consumer task (e.g., DNSx, HTTPx, Katana).
@@ -1132,6 +1121,7 @@ class BatchWorkflowOrchestrator:
             consumer_group_name: Consumer group name (e.g., "dnsx-consumers")
             consumer_name: Unique consumer identifier
             stream_output_key: Optional Redis Stream key to produce to (for chained consumers)
+            context: Optional PipelineContext with the module profiles
             
         Returns:
             Dictionary with task ARN and launch info
@@ -1153,15 +1143,20 @@ class BatchWorkflowOrchestrator:
             stream_key,
             consumer_group_name,
             consumer_name,
-            stream_output_key=stream_output_key
+            stream_output_key=stream_output_key,
+            context=context
         )
         
-        # Launch consumer task
-        consumer_result = await self._launch_streaming_task(
-            consumer_job,
-            consumer_env,
-            role="consumer"
-        )
+        # Hand the consumer to an idle warm worker when the pool has one,
+        # otherwise launch a task on demand
+        consumer_result = await warm_pool.assign(consumer_job, consumer_env)
+        if consumer_result is None:
+            consumer_result = await self._launch_streaming_task(
+                consumer_job,
+                consumer_env,
+                role="consumer",
+                context=context
+            )
         
         logger.info(f"✅ Consumer launched: {consumer_result['task_arn']}")
         
@@ -1230,18 +1225,9 @@ class BatchWorkflowOrchestrator:
         # Step 4: Launch both tasks concurrently
         logger.info("🚀 Launching producer and consumer tasks concurrently...")
         
-        # Launch producer
-        producer_result = await self._launch_streaming_task(
-            producer_job,
-            producer_env,
-            "producer"
-        )
-        
-        # Launch consumer
-        consumer_result = await self._launch_streaming_task(
-            consumer_job,
-            consumer_env,
-            "consumer"
+        producer_result, consumer_result = await asyncio.gather(
+            self._launch_streaming_task(producer_job, producer_env, "producer"),
+            self._launch_streaming_task(consumer_job, consumer_env, "consumer")
         )
         
         logger.info(f"✅ Streaming pipeline launched successfully")
@@ -1259,7 +1245,8 @@ class BatchWorkflowOrchestrator:
     async def _build_streaming_producer_environment(
         self,
         batch_job: BatchScanJob,
-        stream_key: str
+        stream_key: str,
+        context: Optional[PipelineContext] = None
     ) -> List[Dict[str, str]]:
         """
         Build environment variables for streaming producer (e.g., Subfinder).
@@ -1267,6 +1254,7 @@ class BatchWorkflowOrchestrator:
         Adds streaming-specific variables:
         - STREAMING_MODE=true
         - STREAM_OUTPUT_KEY={stream_key}
+        - STREAM_BACKPRESSURE_KEY=scan:{asset_scan_id}:backpressure (with a context)
         
         Args:
             batch_job: Producer BatchScanJob
@@ -1276,7 +1264,7 @@ class BatchWorkflowOrchestrator:
             List of environment variable dictionaries
         """
         # Start with standard environment
-        environment = await self._build_container_environment(batch_job, None)
+        environment = await self._build_container_environment(batch_job, None, context=context)
         
         # Add streaming-specific variables
         streaming_vars = [
@@ -1285,6 +1273,14 @@ class BatchWorkflowOrchestrator:
             {"name": "MODULE_ROLE", "value": "producer"},
         ]
         
+        # Producers pause while the scan's streams are over their memory budget
+        if context and context.asset_scan_id:
+            from app.services.stream_coordinator import stream_coordinator
+            streaming_vars.append({
+                "name": "STREAM_BACKPRESSURE_KEY",
+                "value": stream_coordinator.generate_backpressure_key(context.asset_scan_id)
+            })
+        
         environment.extend(streaming_vars)
         
         logger.debug(f"📋 Built streaming producer environment: {len(environment)} variables")
@@ -1296,7 +1292,8 @@ class BatchWorkflowOrchestrator:
         stream_key: str,
         consumer_group_name: str,
         consumer_name: str,
-        stream_output_key: str = None  # Optional: For consumers that also produce
+        stream_output_key: str = None,  # Optional: For consumers that also produce
+        context: Optional[PipelineContext] = None
     ) -> List[Dict[str, str]]:
         """
         Build environment variables for streaming consumer (e.g., DNSx, HTTPx, Katana).
@@ -1322,7 +1319,7 @@ class BatchWorkflowOrchestrator:
             List of environment variable dictionaries
         """
         # Start with standard environment
-        environment = await self._build_container_environment(batch_job, None)
+        environment = await self._build_container_environment(batch_job, None, context=context)
         
         # Add streaming-specific variables
         streaming_vars = [
@@ -1351,77 +1348,59 @@ class BatchWorkflowOrchestrator:
         self,
         batch_job: BatchScanJob,
         environment: List[Dict[str, str]],
-        role: str
+        role: str,
+        count: int = 1,
+        context: Optional[PipelineContext] = None
     ) -> Dict[str, Any]:
         """
-        Launch a single streaming task (producer or consumer).
+        Launch a streaming task (producer or consumer).
         
         Similar to _launch_single_batch_task but with custom environment.
+        Runs on the configured TaskRunner: ECS (RunTask on the ecs_launcher
+        pool, so concurrent launches overlap), local processes, or mock.
         
         Args:
             batch_job: BatchScanJob configuration
             environment: Custom environment variables (including streaming vars)
             role: "producer" or "consumer" (for logging)
+            count: Identical copies to launch (RunTask count). Only safe when
+                   the tasks need no per-task environment (e.g. CONSUMER_NAME)
+            context: Optional PipelineContext (task role from the cached profile)
             
         Returns:
-            Dictionary with task launch result
+            Dictionary with task launch result ("task_arns" lists every
+            launched copy, "task_arn" is the first)
         """
-        if not self.ecs_client:
-            logger.warning(f"ECS client not available - returning mock result for {role}")
-            return {
-                "batch_id": str(batch_job.id),
-                "task_arn": f"arn:aws:ecs:us-east-1:123456789012:task/mock-{role}-{batch_job.id}",
-                "status": "mock_launched",
-                "role": role,
-                "cpu": batch_job.allocated_cpu,
-                "memory": batch_job.allocated_memory
-            }
+        runner = self._get_task_runner()
         
         try:
-            task_definition = self._get_task_definition_name(batch_job.module)
-            
-            # Launch ECS task with custom environment
-            response = self.ecs_client.run_task(
-                cluster=self._get_cluster_name(),
-                taskDefinition=task_definition,
-                launchType='FARGATE',
-                networkConfiguration={
-                    'awsvpcConfiguration': {
-                        'subnets': self._get_subnet_ids(),
-                        'securityGroups': self._get_security_group_ids(),
-                        'assignPublicIp': 'ENABLED'
-                    }
-                },
-                overrides={
-                    'taskRoleArn': await self._get_task_role_arn(batch_job.module),
-                    'executionRoleArn': self._get_execution_role_arn(),
-                    'cpu': str(batch_job.allocated_cpu),
-                    'memory': str(batch_job.allocated_memory),
-                    'containerOverrides': [{
-                        'name': self._get_container_name(batch_job.module),
-                        'environment': environment,
-                    }]
-                },
+            spec = await self._build_task_spec(
+                runner,
+                batch_job,
+                name=f"{role}-{batch_job.id}",
+                environment=environment,
+                cpu=batch_job.allocated_cpu,
+                memory=batch_job.allocated_memory,
                 tags=[
                     {'key': 'BatchId', 'value': str(batch_job.id)},
                     {'key': 'Module', 'value': batch_job.module},
                     {'key': 'Role', 'value': role},
                     {'key': 'StreamingMode', 'value': 'true'},
                     {'key': 'Purpose', 'value': 'StreamingPipeline'}
-                ]
+                ],
+                context=context
             )
             
-            if not response.get('tasks'):
-                raise Exception(f"No tasks returned from ECS for {role}")
-            
-            task_arn = response['tasks'][0]['taskArn']
+            # Launch task(s) with custom environment
+            task_arns = await runner.run(spec, count=count)
             
-            logger.info(f"✅ Launched {role} task: {task_arn}")
+            logger.info(f"✅ Launched {role} task: {task_arns[0]}" + (f" (+{len(task_arns) - 1} more)" if len(task_arns) > 1 else ""))
             
             return {
                 "batch_id": str(batch_job.id),
-                "task_arn": task_arn,
-                "status": "launched",
+                "task_arn": task_arns[0],
+                "task_arns": task_arns,
+                "status": runner.launched_status,
                 "role": role,
                 "cpu": batch_job.allocated_cpu,
                 "memory": batch_job.allocated_memory
@@ -1431,6 +1410,56 @@ class BatchWorkflowOrchestrator:
             logger.error(f"❌ Failed to launch {role} task: {str(e)}")
             raise
 
+    
+    async def launch_warm_workers(self, module: str, count: int = 1) -> List[str]:
+        """
+        Launch long-lived warm pool workers for a consumer module.
+        
+        Workers run containers/warm-worker on top of the module image
+        ({project}-{env}-{module}-warm task definition) and only need Redis
+        to take assignments; each assignment carries the consumer's full
+        container environment.
+        
+        Args:
+            module: Consumer module (e.g., "dnsx")
+            count: Workers to launch
+            
+        Returns:
+            Task ARNs of the launched workers
+        """
+        runner = self._get_task_runner()
+        environment = [
+            {"name": "REDIS_HOST", "value": getattr(settings, 'redis_host', 'localhost')},
+            {"name": "REDIS_PORT", "value": str(getattr(settings, 'redis_port', 6379))},
+            {"name": "WARM_POOL_MODULE", "value": module},
+            {"name": "WARM_POOL_IDLE_TIMEOUT", "value": str(settings.warm_pool_idle_timeout)},
+            {"name": "WARM_POOL_HEARTBEAT", "value": str(int(settings.warm_pool_heartbeat_seconds))},
+        ]
+        spec = TaskSpec(
+            module=module,
+            name=f"warm-{uuid.uuid4().hex[:8]}",
+            environment=environment,
+            cpu=settings.warm_pool_worker_cpu,
+            memory=settings.warm_pool_worker_memory,
+            tags=[
+                {'key': 'Module', 'value': module},
+                {'key': 'Role', 'value': 'warm-worker'},
+                {'key': 'Purpose', 'value': 'WarmConsumerPool'}
+            ],
+            binary=f"{MODULE_BINARIES[module]}-warm"
+        )
+        if runner.requires_task_definition:
+            project = getattr(settings, 'project_name', 'neobotnet-v2')
+            env = getattr(settings, 'environment', 'dev')
+            spec.task_definition = f"{project}-{env}-{module}-warm"
+            spec.container_name = self._get_container_name(module)
+            spec.task_role_arn = await self._get_task_role_arn(module)
+            spec.execution_role_arn = self._get_execution_role_arn()
+        
+        task_arns = await runner.run(spec, count=count)
+        logger.info(f"🔥 Launched {len(task_arns)} warm {module} worker(s)")
+        return task_arns
+
 
 # Global instance
 batch_workflow_orchestrator = BatchWorkflowOrchestrator()
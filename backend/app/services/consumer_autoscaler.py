@@ -0,0 +1,286 @@
+"""
+Consumer Autoscaler - Lag-Driven Scaling of Streaming Consumer Tasks
+
+`scale_factor` used to be chosen up front and applied to every consumer
+stage alike, so DNSx was often under-provisioned while Katana idled. The
+pipeline now launches `scale_factor` tasks per consumer group as a
+starting point, and this controller watches each group while the scan
+runs:
+
+    backlog       = lag (not yet delivered) + pending (delivered, unacked)
+    arrival rate  = growth of the stream's entries-added counter
+    task rate     = entries delivered to the group per second, per task
+
+    needed tasks  = (arrival rate + backlog / drain_seconds) / task rate
+                    (backlog / target_backlog_per_task until a rate is known)
+
+When a group needs more tasks it launches them into the same consumer
+group (new consumer names), at most `max_step` at a time and once per
+cooldown, within per-group, per-scan and global (per API process) caps.
+Surplus tasks are never stopped mid-batch: they drain and exit with the
+stream like every consumer does, so scaling down only means not launching.
+Every decision is logged.
+
+`decide()` is a pure function of two backlog samples, so the policy can be
+replayed against recorded stream arrival curves (tests/test_consumer_autoscaler.py).
+"""
+import asyncio
+import logging
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from ..core.config import settings
+from .stream_coordinator import stream_coordinator
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ScalingPolicy:
+    """Autoscaling knobs (defaults from settings)."""
+    target_backlog_per_task: int
+    drain_seconds: float
+    cooldown_seconds: float
+    max_step: int
+    max_tasks_per_group: int
+    max_tasks_per_scan: int
+    global_max_extra_tasks: int
+
+    @classmethod
+    def from_settings(cls) -> "ScalingPolicy":
+        return cls(
+            target_backlog_per_task=settings.consumer_autoscale_target_backlog_per_task,
+            drain_seconds=settings.consumer_autoscale_drain_seconds,
+            cooldown_seconds=settings.consumer_autoscale_cooldown,
+            max_step=settings.consumer_autoscale_max_step,
+            max_tasks_per_group=settings.consumer_autoscale_max_tasks_per_group,
+            max_tasks_per_scan=settings.consumer_autoscale_max_tasks_per_scan,
+            global_max_extra_tasks=settings.consumer_autoscale_global_max_extra_tasks,
+        )
+
+
+@dataclass
+class ScalingDecision:
+    """What the controller decided for one group at one step."""
+    action: str  # "scale_up", "hold", "drain", "done"
+    tasks: int
+    desired: int
+    backlog: int
+    arrival_rate: float
+    task_rate: Optional[float]
+    add: int = 0
+    reason: str = ""
+
+
+@dataclass
+class ScalableGroup:
+    """One consumer group of a running scan."""
+    module: str
+    stream_key: str
+    group_name: str
+    # Launches `n` more consumer tasks into the group; returns their ARNs
+    launch: Callable[[int], Awaitable[List[str]]]
+    tasks: int
+    min_tasks: int
+    added_tasks: int = 0
+    done: bool = False
+    last_sample: Optional[Dict[str, Any]] = None
+    last_sample_at: Optional[float] = None
+    last_scaled_at: float = float("-inf")
+    last_action: Optional[str] = None
+
+
+@dataclass
+class ScanScaling:
+    """Consumer groups of one scan under autoscaling."""
+    scan_id: str
+    groups: List[ScalableGroup]
+    decisions: List[Dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def total_tasks(self) -> int:
+        return sum(group.tasks for group in self.groups)
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "groups": {
+                group.group_name: {"module": group.module, "tasks": group.tasks, "added": group.added_tasks}
+                for group in self.groups
+            },
+            "scale_ups": sum(1 for d in self.decisions if d["action"] == "scale_up"),
+            "tasks_added": sum(group.added_tasks for group in self.groups),
+        }
+
+
+def decide(
+    group: ScalableGroup,
+    sample: Dict[str, Any],
+    now: float,
+    policy: ScalingPolicy,
+    scan_headroom: int,
+    global_headroom: int
+) -> ScalingDecision:
+    """
+    Scaling decision for one group from its previous and current backlog samples.
+
+    Args:
+        group: Group state (task count, previous sample, last scale time)
+        sample: Current stream_coordinator.get_group_backlog() sample
+        now: Monotonic timestamp of the sample
+        policy: Scaling policy
+        scan_headroom: Tasks the scan may still add (per-scan cap)
+        global_headroom: Tasks this process may still add (global cap)
+    """
+    backlog = int(sample.get("lag") or 0) + int(sample.get("pending") or 0)
+    previous = group.last_sample
+    elapsed = (now - group.last_sample_at) if group.last_sample_at is not None else 0
+
+    arrival_rate = 0.0
+    task_rate = None
+    if previous is not None and elapsed > 0:
+        arrival_rate = max(0.0, (sample["entries_added"] - previous["entries_added"]) / elapsed)
+        if sample.get("entries_read") is not None and previous.get("entries_read") is not None:
+            delivered_rate = (sample["entries_read"] - previous["entries_read"]) / elapsed
+            if delivered_rate > 0 and group.tasks > 0:
+                task_rate = delivered_rate / group.tasks
+
+    if sample.get("completed") and backlog == 0:
+        return ScalingDecision("done", group.tasks, group.tasks, backlog, arrival_rate, task_rate,
+                               reason="stream complete and drained")
+
+    if task_rate:
+        needed = (arrival_rate + backlog / policy.drain_seconds) / task_rate
+    else:
+        needed = backlog / policy.target_backlog_per_task
+    desired = max(group.min_tasks, min(policy.max_tasks_per_group, math.ceil(needed)))
+
+    decision = ScalingDecision("hold", group.tasks, desired, backlog, arrival_rate, task_rate)
+
+    if desired < group.tasks:
+        decision.action = "drain"
+        decision.reason = f"{group.tasks - desired} surplus task(s) drain with the stream"
+        return decision
+    if desired == group.tasks:
+        decision.reason = "capacity matches backlog"
+        return decision
+    if backlog <= policy.target_backlog_per_task:
+        decision.reason = "backlog below per-task target"
+        return decision
+    if now - group.last_scaled_at < policy.cooldown_seconds:
+        decision.reason = "cooling down after last scale-up"
+        return decision
+
+    add = min(desired - group.tasks, policy.max_step, scan_headroom, global_headroom)
+    if add <= 0:
+        decision.reason = "at per-scan or global task cap"
+        return decision
+
+    decision.action = "scale_up"
+    decision.add = add
+    decision.reason = (
+        f"backlog {backlog}, arrival {arrival_rate:.1f}/s, "
+        f"per-task {task_rate:.1f}/s" if task_rate else f"backlog {backlog}, no throughput yet"
+    )
+    return decision
+
+
+class ConsumerAutoscaler:
+    """
+    Watches the consumer groups of running scans and adds tasks as backlog grows.
+    """
+
+    def __init__(
+        self,
+        policy: Optional[ScalingPolicy] = None,
+        sampler: Optional[Callable[[str, str], Awaitable[Optional[Dict[str, Any]]]]] = None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.policy = policy or ScalingPolicy.from_settings()
+        self.sampler = sampler or stream_coordinator.get_group_backlog
+        self.clock = clock
+        # Tasks added beyond scale_factor by scans currently running in this process
+        self.extra_tasks = 0
+
+    async def step(self, scan: ScanScaling) -> List[ScalingDecision]:
+        """Sample every active group of the scan once and apply the decisions."""
+        decisions = []
+        for group in scan.groups:
+            if group.done:
+                continue
+
+            sample = await self.sampler(group.stream_key, group.group_name)
+            if sample is None:
+                continue
+            now = self.clock()
+
+            decision = decide(
+                group, sample, now, self.policy,
+                scan_headroom=self.policy.max_tasks_per_scan - scan.total_tasks,
+                global_headroom=self.policy.global_max_extra_tasks - self.extra_tasks
+            )
+            group.last_sample, group.last_sample_at = sample, now
+
+            if decision.action == "scale_up":
+                try:
+                    task_arns = await group.launch(decision.add)
+                except Exception as e:
+                    logger.error(f"❌ Autoscale launch failed for {group.group_name}: {str(e)}")
+                    task_arns = []
+                group.tasks += len(task_arns)
+                group.added_tasks += len(task_arns)
+                self.extra_tasks += len(task_arns)
+                group.last_scaled_at = now
+                logger.info(
+                    f"📈 Autoscale {group.module} ({group.group_name}): "
+                    f"{decision.tasks} → {group.tasks} tasks ({decision.reason})"
+                )
+            elif decision.action == "done":
+                group.done = True
+                logger.info(f"🏁 Autoscale {group.module} ({group.group_name}): {decision.reason}")
+            elif decision.action != group.last_action:
+                logger.info(
+                    f"📊 Autoscale {group.module} ({group.group_name}): {decision.action} at "
+                    f"{group.tasks} task(s), desired {decision.desired} ({decision.reason})"
+                )
+
+            group.last_action = decision.action
+            scan.decisions.append({
+                "group": group.group_name,
+                "action": decision.action,
+                "tasks": group.tasks,
+                "desired": decision.desired,
+                "backlog": decision.backlog,
+                "add": decision.add,
+            })
+            decisions.append(decision)
+        return decisions
+
+    async def run(self, scan: ScanScaling, interval: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Control the scan's groups until every stream has drained (or cancelled).
+
+        Returns:
+            Autoscaling summary (tasks per group, scale-ups)
+        """
+        interval = interval if interval is not None else settings.consumer_autoscale_interval
+        logger.info(
+            f"📈 Autoscaling {len(scan.groups)} consumer group(s) for scan {scan.scan_id} "
+            f"(max {self.policy.max_tasks_per_group}/group, {self.policy.max_tasks_per_scan}/scan)"
+        )
+        try:
+            while not all(group.done for group in scan.groups):
+                await asyncio.sleep(interval)
+                try:
+                    await self.step(scan)
+                except Exception as e:
+                    logger.warning(f"⚠️ Autoscale step failed for scan {scan.scan_id}: {str(e)}")
+        finally:
+            # Added tasks stop counting against the global cap once the scan ends
+            self.extra_tasks -= sum(group.added_tasks for group in scan.groups)
+        return scan.summary()
+
+
+# Create singleton instance
+consumer_autoscaler = ConsumerAutoscaler()
@@ -0,0 +1,449 @@
+"""
+Shared Consumer Fleet - One Consumer Pool per Module Across Assets
+
+ScanOrchestrator runs one ScanPipeline per asset, and every pipeline used to
+launch its own consumer tasks: a 40-asset scan started 40 DNSx and 40 HTTPx
+tasks, most of them idle while their asset's Subfinder was still searching.
+
+In fleet mode the per-asset pipelines still create their jobs and launch
+their producers into per-asset streams, but the Subfinder consumers are
+shared:
+
+    scan:{subfinder job A}:subfinder:output ─┐
+    scan:{subfinder job B}:subfinder:output ─┼─ FanInRouter ─→ scan:fleet-{scan}:subfinder:output
+    scan:{subfinder job C}:subfinder:output ─┘                    │
+                                                   shared dnsx-consumers / httpx-consumers
+
+- The router reads each asset stream through its own consumer group
+  (so acknowledged entries are trimmed as usual), copies data entries into
+  the fleet stream unchanged and swallows the per-asset completion markers.
+  Once every asset has joined (or dropped out) and every asset stream has
+  completed, it writes a single completion marker to the fleet stream.
+  A producer that dies before writing its marker would keep its stream
+  open forever, so each pipeline reports when its producer job turns
+  terminal (or its task stops): the router then drains what is left of
+  that stream and closes it.
+- Results stay attributed per asset: DNSx and HTTPx take asset_id and
+  scan_job_id from each message. Katana and url-resolver attribute results
+  from their task environment, so they keep per-asset consumers (and HTTPx
+  is only shared when no Katana stage consumes its output).
+- The shared tasks run under the first asset's consumer job; when it
+  reaches a terminal status the fleet copies that status to every other
+  asset's job of the same module, so each pipeline's monitoring completes.
+- The shared groups are handed to the consumer autoscaler like any other.
+
+When the fleet closes, the task/cost/throughput comparison against
+per-asset consumers is recorded through batch_monitoring.
+"""
+import asyncio
+import logging
+import math
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from ..core.config import settings
+from ..core.supabase_client import supabase_client
+from .stream_coordinator import stream_coordinator
+
+logger = logging.getLogger(__name__)
+
+# Consumer group the router reads each asset's producer stream with
+FLEET_ROUTER_GROUP = "fleet-router"
+
+# Consumers that attribute every result from the message (asset_id,
+# scan_job_id), so one task can serve many assets
+SHAREABLE_MODULES = ("dnsx", "httpx")
+
+TERMINAL_STATUSES = ("completed", "failed", "timeout")
+
+
+def shared_modules(modules: List[str]) -> List[str]:
+    """Consumer modules of a pipeline that a fleet can share."""
+    if "subfinder" not in modules:
+        return []
+    # DNSx is auto-included with Subfinder (it persists the subdomains)
+    shared = [m for m in SHAREABLE_MODULES if m in modules or m == "dnsx"]
+    if "katana" in modules:
+        # HTTPx feeds a per-asset Katana stream
+        shared = [m for m in shared if m != "httpx"]
+    return shared
+
+
+def initial_fleet_tasks(asset_count: int) -> int:
+    """Starting task count of each shared consumer group."""
+    tasks = math.ceil(asset_count / max(settings.consumer_fleet_assets_per_task, 1))
+    return max(1, min(tasks, settings.consumer_autoscale_max_tasks_per_group))
+
+
+class FanInRouter:
+    """Copies per-asset producer streams into one fleet stream."""
+
+    def __init__(
+        self,
+        output_key: str,
+        producer_module: str,
+        fleet_id: str,
+        get_redis: Optional[Callable] = None,
+        clock: Callable[[], float] = time.monotonic,
+        batch_size: int = 200,
+        block_ms: int = 2000
+    ):
+        self.output_key = output_key
+        self.fleet_id = fleet_id
+        self.producer_module = producer_module
+        self.get_redis = get_redis or stream_coordinator.get_redis
+        self.clock = clock
+        self.batch_size = batch_size
+        self.block_ms = block_ms
+        self.started_at = clock()
+        # source stream → {"routed": n, "completed_after": seconds or None,
+        #                  "producer_finished": bool}
+        self.sources: Dict[str, Dict[str, Any]] = {}
+        self.sealed = False
+        self.completed = False
+        self._changed = asyncio.Event()
+
+    @property
+    def routed(self) -> int:
+        return sum(source["routed"] for source in self.sources.values())
+
+    async def add_source(self, stream_key: str) -> None:
+        """Start routing an asset's producer stream (from its first entry)."""
+        redis_client = await self.get_redis()
+        try:
+            await redis_client.xgroup_create(stream_key, FLEET_ROUTER_GROUP, id="0", mkstream=True)
+        except Exception as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+        self.sources.setdefault(stream_key, {"routed": 0, "completed_after": None, "producer_finished": False})
+        self._changed.set()
+
+    def producer_finished(self, stream_key: str) -> None:
+        """
+        The source's producer is gone: close the source once it is drained,
+        whether or not its completion marker ever arrives.
+        """
+        source = self.sources.get(stream_key)
+        if source is None or source["completed_after"] is not None:
+            return
+        source["producer_finished"] = True
+        self._changed.set()
+
+    def seal(self) -> None:
+        """No more sources will be added."""
+        self.sealed = True
+        self._changed.set()
+
+    async def route_once(self) -> int:
+        """Route one batch from the open sources; returns entries handled."""
+        open_sources = {key: ">" for key, source in self.sources.items() if source["completed_after"] is None}
+        if not open_sources:
+            return 0
+
+        redis_client = await self.get_redis()
+        response = await redis_client.xreadgroup(
+            FLEET_ROUTER_GROUP, "router", open_sources, count=self.batch_size, block=self.block_ms
+        )
+
+        handled = 0
+        for stream_key, entries in response or []:
+            source = self.sources[stream_key]
+            ids = []
+            for entry_id, fields in entries:
+                ids.append(entry_id)
+                if fields.get("type") == "completion":
+                    source["completed_after"] = self.clock() - self.started_at
+                    logger.info(
+                        f"🔀 {stream_key} completed after {source['routed']} entries "
+                        f"({len(self._open_sources())} source(s) still open)"
+                    )
+                else:
+                    await redis_client.xadd(self.output_key, {**fields, "source_stream": stream_key})
+                    source["routed"] += 1
+            if ids:
+                await redis_client.xack(stream_key, FLEET_ROUTER_GROUP, *ids)
+            handled += len(ids)
+
+        # Nothing left to read from a finished producer: no marker is coming
+        read = {stream_key for stream_key, entries in response or [] if entries}
+        for stream_key in open_sources:
+            source = self.sources[stream_key]
+            if source["producer_finished"] and source["completed_after"] is None and stream_key not in read:
+                source["completed_after"] = self.clock() - self.started_at
+                logger.warning(
+                    f"⚠️  {stream_key} closed without a completion marker after {source['routed']} entries "
+                    f"({len(self._open_sources())} source(s) still open)"
+                )
+        return handled
+
+    def _open_sources(self) -> List[str]:
+        return [key for key, source in self.sources.items() if source["completed_after"] is None]
+
+    async def _complete(self) -> None:
+        redis_client = await self.get_redis()
+        await redis_client.xadd(self.output_key, {
+            "type": "completion",
+            "module": self.producer_module,
+            "scan_job_id": self.fleet_id,
+            "total_results": self.routed,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        })
+        self.completed = True
+        logger.info(f"🏁 Fleet stream {self.output_key} complete: {self.routed} entries from {len(self.sources)} asset(s)")
+
+    async def run(self) -> None:
+        """Route until sealed and every source has completed."""
+        while True:
+            if self.sealed and not self._open_sources():
+                await self._complete()
+                return
+            if not self._open_sources():
+                self._changed.clear()
+                await self._changed.wait()
+                continue
+            try:
+                await self.route_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"⚠️  Fan-in routing into {self.output_key} failed: {str(e)}")
+                await asyncio.sleep(1)
+
+
+@dataclass
+class FleetMember:
+    """One asset pipeline attached to a fleet."""
+    asset_id: str
+    stream_key: str
+    consumer_jobs: Dict[str, Any]
+
+
+@dataclass
+class SharedConsumerFleet:
+    """Shared consumer tasks for the Subfinder stage of many asset pipelines."""
+    scan_id: str
+    modules: List[str]
+    expected_assets: int
+    clock: Callable[[], float] = time.monotonic
+    members: Dict[str, FleetMember] = field(default_factory=dict)
+    withdrawn: List[str] = field(default_factory=list)
+    task_arns: Dict[str, List[str]] = field(default_factory=dict)
+    initial_tasks: int = 1
+
+    def __post_init__(self):
+        self.supabase = supabase_client.async_service_client
+        self.fleet_id = f"fleet-{self.scan_id}"
+        self.stream_key = stream_coordinator.generate_stream_key(self.fleet_id, "subfinder")
+        self.router = FanInRouter(self.stream_key, "subfinder", self.fleet_id, clock=self.clock)
+        self.initial_tasks = initial_fleet_tasks(self.expected_assets)
+        self.scaling = None
+        self.stream_stats: Dict[str, Any] = {}
+        self._lock = asyncio.Lock()
+        self._tasks: List[asyncio.Task] = []
+        self._launched_at: Optional[float] = None
+        # module → seconds from launch until the shared job finished
+        self._finished_after: Dict[str, float] = {}
+
+    @property
+    def carrier_jobs(self) -> Dict[str, Any]:
+        """Jobs the shared tasks run under (the first member's)."""
+        first = next(iter(self.members.values()))
+        return {module: first.consumer_jobs[module] for module in self.modules}
+
+    def _maybe_seal(self) -> None:
+        if len(self.members) + len(self.withdrawn) >= self.expected_assets:
+            self.router.seal()
+
+    async def join(
+        self,
+        asset_id: str,
+        stream_key: str,
+        consumer_jobs: Dict[str, Any],
+        context: Any = None
+    ) -> Dict[str, List[str]]:
+        """
+        Attach an asset pipeline: route its Subfinder stream into the fleet
+        stream, launching the shared consumers on the first join.
+
+        Returns:
+            module → shared consumer task ARNs
+        """
+        async with self._lock:
+            await self.router.add_source(stream_key)
+            self.members[asset_id] = FleetMember(asset_id, stream_key, consumer_jobs)
+            if self._launched_at is None:
+                await self._start(context)
+            self._maybe_seal()
+        logger.info(
+            f"🤝 Asset {asset_id} joined fleet {self.fleet_id} "
+            f"({len(self.members)}/{self.expected_assets} assets)"
+        )
+        return self.task_arns
+
+    def withdraw(self, asset_id: str) -> None:
+        """An asset pipeline ended without joining (no-op once joined)."""
+        if asset_id in self.members or asset_id in self.withdrawn:
+            return
+        self.withdrawn.append(asset_id)
+        logger.warning(f"⚠️  Asset {asset_id} dropped out of fleet {self.fleet_id}")
+        self._maybe_seal()
+
+    def producer_finished(self, asset_id: str) -> None:
+        """An asset's Subfinder job is terminal or its task stopped."""
+        member = self.members.get(asset_id)
+        if member is not None:
+            self.router.producer_finished(member.stream_key)
+
+    async def _start(self, context: Any) -> None:
+        from .batch_workflow_orchestrator import batch_workflow_orchestrator
+        from .consumer_autoscaler import consumer_autoscaler, ScalableGroup, ScanScaling
+
+        self._launched_at = self.clock()
+        self._tasks.append(asyncio.create_task(self.router.run()))
+
+        groups = []
+        for module in self.modules:
+            job = self.carrier_jobs[module]
+            group_name = stream_coordinator.generate_consumer_group_name(module)
+            launched = {"count": 0}
+
+            async def launch(count: int, module=module, job=job, group_name=group_name, launched=launched) -> List[str]:
+                first = launched["count"] + 1
+                launched["count"] += count
+                results = await asyncio.gather(*[
+                    batch_workflow_orchestrator.launch_streaming_consumer(
+                        consumer_job=job,
+                        stream_key=self.stream_key,
+                        consumer_group_name=group_name,
+                        consumer_name=stream_coordinator.generate_consumer_name(module, f"{self.fleet_id[:14]}-{i}"),
+                        context=context
+                    )
+                    for i in range(first, first + count)
+                ], return_exceptions=True)
+                task_arns = []
+                for result in results:
+                    if isinstance(result, BaseException):
+                        logger.error(f"      ❌ Fleet {module} consumer failed to launch: {str(result)}")
+                    else:
+                        task_arns.append(result["task_arn"])
+                self.task_arns.setdefault(module, []).extend(task_arns)
+                return task_arns
+
+            arns = await launch(self.initial_tasks)
+            if not arns:
+                raise RuntimeError(f"Fleet {self.fleet_id}: no {module} consumer could be launched")
+            groups.append(ScalableGroup(
+                module=module,
+                stream_key=self.stream_key,
+                group_name=group_name,
+                launch=launch,
+                tasks=len(arns),
+                min_tasks=len(arns)
+            ))
+            logger.info(f"🚢 Fleet {self.fleet_id}: {len(arns)} shared {module} task(s) on {self.stream_key}")
+
+        if settings.consumer_autoscaling_enabled:
+            self.scaling = ScanScaling(scan_id=self.fleet_id, groups=groups)
+            self._tasks.append(asyncio.create_task(consumer_autoscaler.run(self.scaling)))
+
+        self._tasks.append(asyncio.create_task(stream_coordinator.govern_scan_streams(
+            self.fleet_id,
+            {self.stream_key: [g.group_name for g in groups]},
+            stats=self.stream_stats
+        )))
+        for module in self.modules:
+            self._tasks.append(asyncio.create_task(self._mirror_status(module)))
+
+    async def _mirror_status(self, module: str) -> None:
+        """Copy the shared job's terminal status to every member's job."""
+        from .scan_pipeline import scan_pipeline
+
+        carrier_id = str(self.carrier_jobs[module].id)
+        result = await scan_pipeline._wait_for_jobs_completion(
+            job_ids=[carrier_id],
+            timeout=scan_pipeline.DEFAULT_PIPELINE_TIMEOUT,
+            check_interval=10
+        )
+        self._finished_after[module] = self.clock() - self._launched_at
+        status = result.get("module_statuses", {}).get(module, "failed")
+        if status not in TERMINAL_STATUSES:
+            status = "timeout"
+
+        # Members that joined after the carrier finished are covered too
+        async with self._lock:
+            job_ids = [
+                str(member.consumer_jobs[module].id) for member in self.members.values()
+                if str(member.consumer_jobs[module].id) != carrier_id
+            ]
+            if job_ids:
+                await self.supabase.table("batch_scan_jobs").update({
+                    "status": status,
+                    "completed_at": datetime.utcnow().isoformat()
+                }).in_("id", job_ids).execute()
+        logger.info(f"🪞 Fleet {self.fleet_id}: {module} {status}, mirrored to {len(job_ids)} asset job(s)")
+
+    def comparison(self, task_cpu: int, task_memory: int) -> Dict[str, Any]:
+        """
+        Shared vs per-asset consumer tasks for this fleet.
+
+        Per-asset consumers would have run one task per module per asset,
+        each at least until its asset's producer finished; the shared tasks
+        ran from launch until the shared job finished. Costs use the same
+        task size for both, at the configured Fargate prices.
+        """
+        now = self.clock() - (self._launched_at or self.clock())
+        assets = len(self.members)
+        shared_tasks = {module: len(arns) for module, arns in self.task_arns.items()}
+        shared_seconds = sum(
+            tasks * self._finished_after.get(module, now) for module, tasks in shared_tasks.items()
+        )
+        per_asset_lifetimes = [
+            source["completed_after"] if source["completed_after"] is not None else now
+            for source in self.router.sources.values()
+        ]
+        per_asset_seconds = len(self.modules) * sum(per_asset_lifetimes)
+        task_second_cost = (
+            task_cpu / 1024 * settings.fargate_vcpu_hour_price +
+            task_memory / 1024 * settings.fargate_gb_hour_price
+        ) / 3600
+        routed = self.router.routed
+        return {
+            "fleet_id": self.fleet_id,
+            "assets": assets,
+            "modules": list(self.modules),
+            "messages_routed": routed,
+            "shared_tasks": sum(shared_tasks.values()),
+            "per_asset_tasks": assets * len(self.modules),
+            "shared_task_seconds": round(shared_seconds, 1),
+            "per_asset_task_seconds": round(per_asset_seconds, 1),
+            "shared_cost_usd": round(shared_seconds * task_second_cost, 4),
+            "per_asset_cost_usd": round(per_asset_seconds * task_second_cost, 4),
+            "shared_messages_per_task_second": round(routed * len(self.modules) / shared_seconds, 3) if shared_seconds else 0.0,
+            "per_asset_messages_per_task_second": round(routed * len(self.modules) / per_asset_seconds, 3) if per_asset_seconds else 0.0,
+        }
+
+    async def close(self) -> Dict[str, Any]:
+        """Stop the fleet's background work and record its comparison."""
+        from .batch_monitoring import batch_monitoring, FleetMetrics
+
+        self.router.seal()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+        if not self.members:
+            return {"fleet_id": self.fleet_id, "assets": 0}
+
+        job = next(iter(self.carrier_jobs.values()))
+        summary = self.comparison(job.allocated_cpu, job.allocated_memory)
+        if self.scaling:
+            summary["autoscaling"] = self.scaling.summary()
+        summary["stream_memory"] = dict(self.stream_stats)
+
+        await batch_monitoring.record_fleet_comparison(self.fleet_id, FleetMetrics(**{
+            key: summary[key] for key in FleetMetrics.__dataclass_fields__
+        }))
+        await stream_coordinator.expire_scan_streams(self.fleet_id, [self.stream_key])
+        return summary
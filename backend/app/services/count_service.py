@@ -0,0 +1,158 @@
+"""
+Count Service - Planner Estimates with Lazily Cached Exact Counts
+
+`count="exact"` makes PostgreSQL count the entire match set on every page
+turn, which dominates latency for filtered queries over millions of rows.
+
+Count modes (exposed as `?count=` on list endpoints):
+- exact:   COUNT(*) on the request (slow on huge match sets, always exact)
+- planned: Planner estimate (EXPLAIN) on the request; an exact count for the
+           same filter signature is computed in the background and served
+           (marked exact) on later requests until it expires
+- none:    No total at all (cheapest)
+
+Every response reports `total_is_exact` so the UI can render "~1.2M".
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import time
+from collections import OrderedDict
+from enum import Enum
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CountMode(str, Enum):
+    """How list endpoints compute their `total`."""
+    EXACT = "exact"
+    PLANNED = "planned"
+    NONE = "none"
+
+
+class CountService:
+    """
+    Resolves list totals according to a CountMode.
+
+    Exact counts are cached per filter signature (table + filters) in an
+    in-process LRU with a TTL. At most one background count runs per
+    signature at a time.
+    """
+
+    def __init__(self, ttl_seconds: Optional[int] = None, max_entries: Optional[int] = None):
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.exact_count_cache_ttl
+        self.max_entries = max_entries if max_entries is not None else settings.exact_count_cache_max_entries
+        self._exact_counts: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    # ================================================================
+    # Cache
+    # ================================================================
+
+    @staticmethod
+    def signature(table: str, filters: Dict[str, Any]) -> str:
+        """Stable cache key for a table + filter set (None filters are ignored)."""
+        active = {k: v for k, v in filters.items() if v is not None}
+        payload = json.dumps([table, active], sort_keys=True, default=str)
+        return f"{table}:{hashlib.sha1(payload.encode()).hexdigest()}"
+
+    def get_cached(self, signature: str) -> Optional[int]:
+        """Return a cached exact count if it has not expired."""
+        entry = self._exact_counts.get(signature)
+        if entry is None:
+            return None
+
+        count, stored_at = entry
+        if time.monotonic() - stored_at > self.ttl_seconds:
+            self._exact_counts.pop(signature, None)
+            return None
+
+        self._exact_counts.move_to_end(signature)
+        return count
+
+    def store(self, signature: str, count: Optional[int]) -> None:
+        """Cache an exact count, evicting the least recently used entries."""
+        if count is None:
+            return
+        self._exact_counts[signature] = (count, time.monotonic())
+        self._exact_counts.move_to_end(signature)
+        while len(self._exact_counts) > self.max_entries:
+            self._exact_counts.popitem(last=False)
+
+    # ================================================================
+    # Count Resolution
+    # ================================================================
+
+    def count_method(self, mode: CountMode, signature: str, cursor: Optional[str] = None) -> Optional[str]:
+        """
+        PostgREST `count=` value to send with the page query.
+
+        Cursor pages never count (the seek predicate would skew the total),
+        and a cached exact count makes the planner estimate unnecessary.
+        """
+        if cursor or mode == CountMode.NONE:
+            return None
+        if mode == CountMode.EXACT:
+            return "exact"
+        if self.get_cached(signature) is not None:
+            return None
+        return "planned"
+
+    def resolve(
+        self,
+        mode: CountMode,
+        signature: str,
+        response_count: Optional[int],
+        exact_count_query: Optional[Callable[[], Any]] = None,
+        cursor: Optional[str] = None
+    ) -> Tuple[Optional[int], bool]:
+        """
+        Turn a page response's count into (total, total_is_exact).
+
+        Args:
+            mode: Requested CountMode
+            signature: Filter signature from `signature()`
+            response_count: `response.count` from the page query
+            exact_count_query: Builds a `count="exact", head=True` query for
+                the same filters; scheduled in the background on a cache miss
+                (None disables background counting, e.g. for ILIKE scans)
+            cursor: Pagination cursor of the current request
+        """
+        if mode == CountMode.EXACT and not cursor:
+            self.store(signature, response_count)
+            return response_count, response_count is not None
+
+        cached = self.get_cached(signature)
+        if cached is not None:
+            return cached, True
+
+        if mode == CountMode.NONE:
+            return None, False
+
+        if exact_count_query is not None:
+            self.schedule_exact_count(signature, exact_count_query)
+        return response_count, False
+
+    def schedule_exact_count(self, signature: str, exact_count_query: Callable[[], Any]) -> None:
+        """Run an exact COUNT(*) in the background (one in flight per signature)."""
+        if signature in self._inflight:
+            return
+        task = asyncio.create_task(self._run_exact_count(signature, exact_count_query))
+        self._inflight[signature] = task
+        task.add_done_callback(lambda _: self._inflight.pop(signature, None))
+
+    async def _run_exact_count(self, signature: str, exact_count_query: Callable[[], Any]) -> None:
+        try:
+            response = await exact_count_query().execute()
+            self.store(signature, response.count)
+            logger.debug(f"📊 Cached exact count {response.count} for {signature}")
+        except Exception as e:
+            logger.warning(f"⚠️ Background exact count failed for {signature}: {str(e)}")
+
+
+# Create singleton instance
+count_service = CountService()
@@ -8,13 +8,13 @@ and retrieval of DNS resolution data.
 Key Features:
 - Query DNS records by asset or subdomain
 - Flexible filtering (record type, date ranges, scan metadata)
-- Protected pagination for large datasets (10k+ records)
+- Keyset (cursor) pagination for large datasets (2M+ records)
 - Performance-optimized queries using indexed columns
 
 Design Decisions:
 - Subdomain queries use subdomain_name (string) for better scalability
 - Simple AND filtering only (no OR logic for MVP)
-- Protective limits to prevent performance issues with deep pagination
+- Keyset pagination on (resolved_at, id) so deep pages cost the same as page 1
 - Authorization handled at API layer (follows existing pattern)
 """
 
@@ -23,7 +23,11 @@ from datetime import datetime
 from typing import List, Dict, Any, Optional
 from uuid import UUID
 
+from ..core.config import settings
 from ..core.supabase_client import supabase_client
+from ..utils.pagination import apply_delta, apply_keyset, delta_page, encode_cursor, keyset_page, watermark_ceiling
+from .count_service import CountMode, count_service
+from .single_flight import coalesced
 from ..schemas.dns import DNSRecord, DNSRecordType
 from collections import defaultdict
 
@@ -31,15 +35,14 @@ from collections import defaultdict
 class DNSService:
     """Service for managing DNS records and queries."""
     
-    # Protective pagination constants for performance with 10k+ records
+    # Pagination constants (deep pages use keyset cursors - no offset cap)
     MAX_LIMIT = 1000      # Maximum records per page
     DEFAULT_LIMIT = 50    # Default if not specified
-    MAX_OFFSET = 5000     # Maximum offset to prevent deep pagination
     LARGE_RESULT_THRESHOLD = 10000  # Threshold for warning message
     
     def __init__(self):
         """Initialize DNS service with Supabase client and logging."""
-        self.supabase = supabase_client.service_client  # Use service role for backend operations
+        self.supabase = supabase_client.async_service_client  # Use service role for backend operations
         self.logger = logging.getLogger(__name__)
         self.logger.info("DNSService initialized")
     
@@ -57,9 +60,6 @@ class DNSService:
             
         Returns:
             tuple: (validated_limit, validated_offset)
-            
-        Raises:
-            ValueError: If offset exceeds MAX_OFFSET
         """
         # Validate limit
         if limit is None or limit <= 0:
@@ -70,11 +70,6 @@ class DNSService:
         # Validate offset
         if offset is None or offset < 0:
             offset = 0
-        elif offset > self.MAX_OFFSET:
-            raise ValueError(
-                f"Offset {offset} exceeds maximum allowed offset of {self.MAX_OFFSET}. "
-                f"Please use filters to narrow your query instead of deep pagination."
-            )
             
         return limit, offset
     
@@ -185,10 +180,46 @@ class DNSService:
             
         return query
     
+    async def _execute_paginated(
+        self,
+        query,
+        limit: int,
+        offset: int,
+        cursor: Optional[str],
+        sort_column: str = 'resolved_at',
+        id_column: str = 'id'
+    ) -> tuple:
+        """
+        Execute a DNS list query newest-first with keyset pagination.
+        
+        A cursor (or offset 0) seeks via the (sort_column, id) index, so every
+        page costs the same. A non-zero offset without a cursor is the legacy
+        OFFSET compatibility path.
+        
+        Returns:
+            tuple: (response, rows for this page, next_cursor)
+            
+        Raises:
+            InvalidCursorError: If the cursor is malformed (a ValueError)
+        """
+        if cursor or offset == 0:
+            response = await apply_keyset(query, sort_column, limit, cursor, id_column=id_column).execute()
+            rows, next_cursor = keyset_page(response.data, sort_column, limit, id_column=id_column)
+            return response, rows, next_cursor
+        
+        query = query.order(sort_column, desc=True, nullsfirst=False).order(id_column, desc=True)
+        response = await query.range(offset, offset + limit - 1).execute()
+        rows = response.data or []
+        next_cursor = None
+        if len(rows) == limit:
+            next_cursor = encode_cursor(rows[-1].get(sort_column), rows[-1][id_column])
+        return response, rows, next_cursor
+    
     # ================================================================
     # Core Query Methods
     # ================================================================
     
+    @coalesced("dns_records_by_asset")
     async def get_dns_records_by_asset(
         self,
         asset_id: UUID,
@@ -198,7 +229,10 @@ class DNSService:
         scan_job_id: Optional[UUID] = None,
         batch_scan_id: Optional[UUID] = None,
         limit: Optional[int] = None,
-        offset: Optional[int] = None
+        offset: Optional[int] = None,
+        cursor: Optional[str] = None,
+        count_mode: CountMode = CountMode.PLANNED,
+        since: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Get DNS records for a specific asset with filtering and pagination.
@@ -214,18 +248,25 @@ class DNSService:
             scan_job_id: Filter by specific scan job UUID
             batch_scan_id: Filter by specific batch scan UUID
             limit: Records per page (default: 50, max: 1000)
-            offset: Pagination offset (default: 0, max: 5000)
+            offset: Legacy pagination offset (default: 0; prefer cursor)
+            cursor: Opaque keyset cursor from a previous page's next_cursor
+            count_mode: exact, planned (estimate + cached exact), or none
+            since: Delta watermark - only records added or changed after it,
+                oldest change first (no total is computed)
             
         Returns:
             Dictionary containing:
                 - dns_records: List[DNSRecord] - List of DNS record objects
-                - total_count: int - Total matching records
+                - total_count: Optional[int] - Total matching records (None if unknown)
+                - total_is_exact: bool - False when total_count is a planner estimate
                 - limit: int - Applied limit
                 - offset: int - Applied offset
+                - next_cursor: Optional[str] - Cursor for the next page
+                - next_watermark: Optional[str] - Next `since` value (delta queries only)
                 - warning: Optional[str] - Warning message for large result sets
                 
         Raises:
-            ValueError: If filters or pagination parameters are invalid
+            ValueError: If filters, pagination parameters or the watermark are invalid
             
         Example:
             records = await dns_service.get_dns_records_by_asset(
@@ -255,20 +296,41 @@ class DNSService:
             # Remove None values
             filters = {k: v for k, v in filters.items() if v is not None}
             
+            count_signature = count_service.signature('dns_records', {'asset_id': asset_id, **filters})
+            count_method = None if since else count_service.count_method(count_mode, count_signature, cursor)
+            
             # Build base query (asset_id is indexed)
-            base_query = self.supabase.table('dns_records').select('*', count='exact').eq('asset_id', str(asset_id))
+            base_query = self.supabase.table('dns_records').select(
+                '*', count=count_method
+            ).eq('asset_id', str(asset_id))
             
             # Apply filters using query builder
             query = self._build_dns_query(base_query, filters)
             
-            # Apply pagination and ordering
-            query = query.order('resolved_at', desc=True).range(offset, offset + limit - 1)
-            
-            # Execute query
-            response = query.execute()
-            
-            total_count = response.count if response.count is not None else 0
-            records = [DNSRecord(**record) for record in response.data] if response.data else []
+            next_watermark = None
+            if since:
+                # Delta: records added or changed (updated_at) inside a settled window
+                until = watermark_ceiling(settings.delta_settle_seconds)
+                response = await apply_delta(query, 'updated_at', limit, since, until).execute()
+                rows, next_watermark, _ = delta_page(response.data, 'updated_at', limit, until)
+                next_cursor = None
+                total_count, total_is_exact = None, False
+            else:
+                # Apply ordering + pagination and execute
+                response, rows, next_cursor = await self._execute_paginated(query, limit, offset, cursor)
+                
+                total_count, total_is_exact = count_service.resolve(
+                    count_mode,
+                    count_signature,
+                    response.count,
+                    lambda: self._build_dns_query(
+                        self.supabase.table('dns_records').select('id', count='exact', head=True)
+                        .eq('asset_id', str(asset_id)),
+                        filters
+                    ),
+                    cursor
+                )
+            records = [DNSRecord(**record) for record in rows]
             
             self.logger.info(f"Found {total_count} DNS records for asset {asset_id} (returned {len(records)})")
             
@@ -276,12 +338,15 @@ class DNSService:
             result = {
                 'dns_records': records,
                 'total_count': total_count,
+                'total_is_exact': total_is_exact,
                 'limit': limit,
-                'offset': offset
+                'offset': offset,
+                'next_cursor': next_cursor,
+                'next_watermark': next_watermark
             }
             
             # Add warning for large result sets without filters
-            if total_count > self.LARGE_RESULT_THRESHOLD and not filters:
+            if total_count and total_count > self.LARGE_RESULT_THRESHOLD and not filters:
                 result['warning'] = (
                     f"Large result set ({total_count} records). "
                     f"Consider filtering by record_type or date range for better performance."
@@ -296,6 +361,7 @@ class DNSService:
             self.logger.error(f"Error fetching DNS records for asset {asset_id}: {str(e)}")
             raise
     
+    @coalesced("dns_records_by_subdomain")
     async def get_dns_records_by_subdomain(
         self,
         asset_id: UUID,
@@ -306,7 +372,8 @@ class DNSService:
         scan_job_id: Optional[UUID] = None,
         batch_scan_id: Optional[UUID] = None,
         limit: Optional[int] = None,
-        offset: Optional[int] = None
+        offset: Optional[int] = None,
+        cursor: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Get DNS records for a specific subdomain within an asset.
@@ -323,14 +390,16 @@ class DNSService:
             scan_job_id: Filter by specific scan job UUID
             batch_scan_id: Filter by specific batch scan UUID
             limit: Records per page (default: 50, max: 1000)
-            offset: Pagination offset (default: 0, max: 5000)
+            offset: Legacy pagination offset (default: 0; prefer cursor)
+            cursor: Opaque keyset cursor from a previous page's next_cursor
             
         Returns:
             Dictionary containing:
                 - dns_records: List[DNSRecord] - List of DNS record objects
-                - total_count: int - Total matching records
+                - total_count: Optional[int] - Total matching records (None on cursor pages)
                 - limit: int - Applied limit
                 - offset: int - Applied offset
+                - next_cursor: Optional[str] - Cursor for the next page
                 
         Raises:
             ValueError: If filters or pagination parameters are invalid
@@ -365,29 +434,28 @@ class DNSService:
             
             # Build base query (both asset_id and subdomain are indexed)
             base_query = (self.supabase.table('dns_records')
-                         .select('*', count='exact')
+                         .select('*', count=None if cursor else 'exact')
                          .eq('asset_id', str(asset_id))
                          .eq('subdomain', subdomain_name))
             
             # Apply filters using query builder
             query = self._build_dns_query(base_query, filters)
             
-            # Apply pagination and ordering
-            query = query.order('resolved_at', desc=True).range(offset, offset + limit - 1)
+            # Apply ordering + pagination and execute
+            response, rows, next_cursor = await self._execute_paginated(query, limit, offset, cursor)
             
-            # Execute query
-            response = query.execute()
-            
-            total_count = response.count if response.count is not None else 0
-            records = [DNSRecord(**record) for record in response.data] if response.data else []
+            total_count = None if cursor else (response.count if response.count is not None else 0)
+            records = [DNSRecord(**record) for record in rows]
             
             self.logger.info(f"Found {total_count} DNS records for subdomain '{subdomain_name}' (returned {len(records)})")
             
             return {
                 'dns_records': records,
                 'total_count': total_count,
+                'total_is_exact': total_count is not None,
                 'limit': limit,
-                'offset': offset
+                'offset': offset,
+                'next_cursor': next_cursor
             }
             
         except ValueError:
@@ -422,7 +490,7 @@ class DNSService:
         try:
             self.logger.info(f"Fetching DNS record {record_id}")
             
-            response = (self.supabase.table('dns_records')
+            response = (await self.supabase.table('dns_records')
                        .select('*')
                        .eq('id', str(record_id))
                        .execute())
@@ -438,6 +506,7 @@ class DNSService:
             self.logger.error(f"Error fetching DNS record {record_id}: {str(e)}")
             raise
     
+    @coalesced("dns_records", exclude=("self", "user_id"))
     async def get_user_dns_records_paginated(
         self,
         user_id: UUID = None,  # Kept for API compatibility but ignored (LEAN architecture)
@@ -446,7 +515,9 @@ class DNSService:
         asset_id: Optional[UUID] = None,
         parent_domain: Optional[str] = None,
         record_type: Optional[str] = None,
-        search: Optional[str] = None
+        search: Optional[str] = None,
+        cursor: Optional[str] = None,
+        count_mode: CountMode = CountMode.PLANNED
     ) -> Dict[str, Any]:
         """
         Get all DNS records with pagination and filtering.
@@ -468,11 +539,14 @@ class DNSService:
             parent_domain: Optional filter by parent domain
             record_type: Optional filter by DNS record type
             search: Optional search term (searches subdomain name)
+            cursor: Opaque keyset cursor from a previous page (overrides page)
+            count_mode: exact, planned (estimate + cached exact), or none
             
         Returns:
             Dictionary containing:
                 - dns_records: List[DNSRecordWithAssetInfo] - DNS records with asset names
-                - pagination: Pagination metadata (total, page, per_page, etc.)
+                - pagination: Pagination metadata (total, total_is_exact, page, per_page,
+                  next_cursor, etc.); page/total_pages are None on cursor pages
                 - filters: Applied filters
                 - stats: Statistics (total_assets, filtered_count, record_type_breakdown)
                 
@@ -503,7 +577,7 @@ class DNSService:
             )
             
             # LEAN Architecture: Get ALL assets (no user_id filter)
-            assets_response = (self.supabase.table('assets')
+            assets_response = (await self.supabase.table('assets')
                               .select('id, name')
                               .execute())
             
@@ -538,38 +612,54 @@ class DNSService:
             all_asset_ids = list(asset_map.keys())
             
             # Step 2: Build DNS query for ALL assets
-            query = (self.supabase.table('dns_records')
-                    .select('*', count='exact')
-                    .in_('asset_id', all_asset_ids))
+            def apply_filters(query):
+                query = query.in_('asset_id', all_asset_ids)
+                
+                if asset_id:
+                    query = query.eq('asset_id', str(asset_id))
+                
+                if parent_domain:
+                    query = query.eq('parent_domain', parent_domain)
+                
+                if record_type:
+                    query = query.eq('record_type', record_type)
+                
+                if search:
+                    # Search in subdomain name (case-insensitive)
+                    query = query.ilike('subdomain', f'%{search}%')
+                
+                return query
             
-            # Apply additional filters
-            if asset_id:
-                query = query.eq('asset_id', str(asset_id))
+            count_signature = count_service.signature('dns_records', {
+                'scope': 'all_assets', 'asset_id': asset_id, 'parent_domain': parent_domain,
+                'record_type': record_type, 'search': search
+            })
             
-            if parent_domain:
-                query = query.eq('parent_domain', parent_domain)
+            # Subdomain ILIKE can't use an index - only ever estimate those totals
+            if search and count_mode != CountMode.NONE and not cursor:
+                count_method = 'planned'
+            else:
+                count_method = count_service.count_method(count_mode, count_signature, cursor)
             
-            if record_type:
-                query = query.eq('record_type', record_type)
+            query = apply_filters(self.supabase.table('dns_records').select('*', count=count_method))
             
+            # Step 3: Keyset pagination (count comes back with the same request)
+            response, rows, next_cursor = await self._execute_paginated(query, per_page, offset, cursor)
             if search:
-                # Search in subdomain name (case-insensitive)
-                query = query.ilike('subdomain', f'%{search}%')
-            
-            # Step 3: Get total count (for pagination metadata)
-            count_query = query
-            count_response = count_query.execute()
-            total_count = count_response.count if count_response.count is not None else 0
-            
-            # Step 4: Apply pagination and ordering
-            query = query.order('resolved_at', desc=True).range(offset, offset + per_page - 1)
-            
-            # Execute paginated query
-            response = query.execute()
+                total_count = response.count if count_mode != CountMode.NONE else None
+                total_is_exact = False
+            else:
+                total_count, total_is_exact = count_service.resolve(
+                    count_mode,
+                    count_signature,
+                    response.count,
+                    lambda: apply_filters(self.supabase.table('dns_records').select('id', count='exact', head=True)),
+                    cursor
+                )
             
-            # Step 5: Enrich DNS records with asset names
+            # Step 4: Enrich DNS records with asset names
             dns_records = []
-            for record in response.data:
+            for record in rows:
                 # Add asset_name from our asset_map
                 asset_name = asset_map.get(record['asset_id'], 'Unknown')
                 dns_records.append({
@@ -590,30 +680,35 @@ class DNSService:
                     'asset_name': asset_name
                 })
             
-            # Step 6: Calculate statistics
+            # Step 5: Calculate statistics
             # Determine which assets have DNS records (filtered)
             unique_asset_ids = set()
-            for record in response.data:
+            for record in rows:
                 unique_asset_ids.add(record['asset_id'])
             
             total_assets = len(unique_asset_ids) if asset_id is None else 1
             
             # Get record type breakdown
             record_type_breakdown = {}
-            for record in response.data:
+            for record in rows:
                 rt = record['record_type']
                 record_type_breakdown[rt] = record_type_breakdown.get(rt, 0) + 1
             
             # Build pagination metadata
-            total_pages = (total_count + per_page - 1) // per_page if total_count > 0 else 1
+            if cursor or total_count is None:
+                total_pages = None
+            else:
+                total_pages = (total_count + per_page - 1) // per_page if total_count > 0 else 1
             
             pagination = {
                 'total': total_count,
-                'page': page,
+                'total_is_exact': total_is_exact,
+                'page': None if cursor else page,
                 'per_page': per_page,
                 'total_pages': total_pages,
-                'has_next': page < total_pages,
-                'has_prev': page > 1
+                'has_next': next_cursor is not None,
+                'has_prev': cursor is not None or page > 1,
+                'next_cursor': next_cursor
             }
             
             # Build filters metadata
@@ -649,6 +744,7 @@ class DNSService:
             self.logger.error(f"Error fetching DNS records: {str(e)}")
             raise
     
+    @coalesced("dns_records_grouped", exclude=("self", "user_id"))
     async def get_user_dns_records_paginated_grouped(
         self,
         user_id: UUID = None,  # Kept for API compatibility but ignored (LEAN architecture)
@@ -657,7 +753,8 @@ class DNSService:
         asset_id: Optional[UUID] = None,
         parent_domain: Optional[str] = None,
         record_type: Optional[str] = None,
-        search: Optional[str] = None
+        search: Optional[str] = None,
+        cursor: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Get DNS records grouped by subdomain for elegant UI display.
@@ -670,6 +767,9 @@ class DNSService:
         3. Build response with minimal data transfer
         
         This approach reduces 115 HTTP requests (22s) to just 3 queries (~1-2s).
+        
+        Pagination is keyset-based on (last_resolved_at, subdomain); pass the
+        returned next_cursor as `cursor` to fetch the following page.
         """
         try:
             # Validate pagination
@@ -688,7 +788,7 @@ class DNSService:
             # ================================================================
             # QUERY 1: Get assets for name mapping (fast, ~25 rows)
             # ================================================================
-            assets_response = self.supabase.table('assets').select('id, name').execute()
+            assets_response = await self.supabase.table('assets').select('id, name').execute()
             
             if not assets_response.data:
                 return {
@@ -706,7 +806,7 @@ class DNSService:
             # ================================================================
             view_query = self.supabase.table('subdomain_current_dns').select(
                 'subdomain, parent_domain, asset_id, total_records, last_resolved_at',
-                count='exact'
+                count=None if cursor else 'exact'
             )
             
             # Apply filters
@@ -719,17 +819,21 @@ class DNSService:
             
             # Order and paginate at DATABASE level (not in Python!)
             offset = (page - 1) * per_page
-            view_query = view_query.order('last_resolved_at', desc=True).range(offset, offset + per_page - 1)
-            
-            view_result = view_query.execute()
-            total_subdomains = view_result.count or 0
-            page_subdomains = view_result.data or []
+            view_result, page_subdomains, next_cursor = await self._execute_paginated(
+                view_query, per_page, offset, cursor,
+                sort_column='last_resolved_at', id_column='subdomain'
+            )
+            total_subdomains = None if cursor else (view_result.count or 0)
             
             if not page_subdomains:
                 total_assets = len(asset_map)
                 return {
                     'grouped_records': [],
-                    'pagination': {'total': 0, 'page': 1, 'per_page': per_page, 'total_pages': 1, 'has_next': False, 'has_prev': False},
+                    'pagination': {
+                        'total': total_subdomains, 'page': None if cursor else 1, 'per_page': per_page,
+                        'total_pages': None if cursor else 1, 'has_next': False,
+                        'has_prev': cursor is not None, 'next_cursor': None
+                    },
                     'filters': {'asset_id': str(asset_id) if asset_id else None, 'parent_domain': parent_domain, 'record_type': record_type, 'search': search},
                     'stats': {'total_subdomains': 0, 'total_dns_records': 0, 'total_assets': total_assets, 'record_type_breakdown': {}}
                 }
@@ -749,7 +853,7 @@ class DNSService:
             if record_type:
                 details_query = details_query.eq('record_type', record_type)
             
-            details_result = details_query.order('resolved_at', desc=True).execute()
+            details_result = await details_query.order('resolved_at', desc=True).execute()
             detailed_records = details_result.data or []
             
             # ================================================================
@@ -766,8 +870,11 @@ class DNSService:
             if search:
                 count_query = count_query.ilike('subdomain', f'%{search}%')
             count_query = count_query.limit(1)  # We only need the count, not data
-            count_result = count_query.execute()
-            total_dns_records = count_result.count or 0
+            if cursor:
+                total_dns_records = None  # Totals are only computed on the first page
+            else:
+                count_result = await count_query.execute()
+                total_dns_records = count_result.count or 0
             
             # ================================================================
             # Build grouped response (now using pre-grouped view data + details)
@@ -812,14 +919,18 @@ class DNSService:
                 })
             
             # Build pagination metadata
-            total_pages = (total_subdomains + per_page - 1) // per_page if total_subdomains > 0 else 1
+            if cursor:
+                total_pages = None
+            else:
+                total_pages = (total_subdomains + per_page - 1) // per_page if total_subdomains > 0 else 1
             pagination = {
                 'total': total_subdomains,
-                'page': page,
+                'page': None if cursor else page,
                 'per_page': per_page,
                 'total_pages': total_pages,
-                'has_next': page < total_pages,
-                'has_prev': page > 1
+                'has_next': next_cursor is not None,
+                'has_prev': cursor is not None or page > 1,
+                'next_cursor': next_cursor
             }
             
             self.logger.info(
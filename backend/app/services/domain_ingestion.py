@@ -0,0 +1,62 @@
+"""
+Domain Ingestion Service - Bulk Apex Domain Onboarding
+
+Programs can have thousands of wildcard roots. Instead of one insert per
+domain (or downloading every existing domain to diff in Python), domains
+are normalized and deduped locally in a single pass, then sent in chunks to
+the `bulk_insert_apex_domains` RPC, which inserts each chunk in one
+statement and skips domains the asset already has.
+
+The same RPC is used by `neobotnet programs add` and the ECS orchestrator.
+"""
+import logging
+from typing import Any, Dict, Iterable, Optional
+
+from ..core.supabase_client import supabase_client
+from ..utils.domains import INGEST_CHUNK_SIZE, ingest_domains
+from .result_cache import result_cache
+
+logger = logging.getLogger(__name__)
+
+# Invalid inputs echoed back to the caller (the count covers all of them)
+MAX_REPORTED_INVALID = 50
+
+
+class DomainIngestionService:
+    """
+    Bulk apex domain ingestion for an asset.
+    """
+
+    def __init__(self, chunk_size: Optional[int] = None):
+        self.supabase = supabase_client.async_service_client
+        self.chunk_size = chunk_size or INGEST_CHUNK_SIZE
+
+    async def ingest(self, asset_id: str, domains: Iterable[str]) -> Dict[str, Any]:
+        """
+        Add domains to an asset, skipping ones it already has.
+
+        Args:
+            asset_id: Asset (program) UUID
+            domains: Raw domain strings (any case, optional "*." prefix;
+                blank entries are ignored)
+
+        Returns:
+            Counts: submitted, inserted, skipped (existing or duplicate
+            input), invalid, plus a sample of the invalid inputs
+        """
+        result = await ingest_domains(self.supabase, asset_id, domains, self.chunk_size)
+
+        if result["inserted"]:
+            await result_cache.bump_asset_version(asset_id)
+
+        logger.info(
+            f"📥 Ingested domains for asset {asset_id}: {result['inserted']} inserted, "
+            f"{result['skipped']} skipped, {result['invalid']} invalid"
+        )
+
+        result["invalid_domains"] = result["invalid_domains"][:MAX_REPORTED_INVALID]
+        return result
+
+
+# Create singleton instance
+domain_ingestion_service = DomainIngestionService()
@@ -0,0 +1,228 @@
+"""
+Export Encoders - Batch Serialization for /exports Formats
+
+Each encoder turns a whole batch of rows into bytes at once, instead of
+building a csv.writer / json.dumps call per row:
+
+- csv / json / ndjson: one writer (or one join) per batch
+- csv.gz / ndjson.gz: the same payload through a streaming gzip
+  compressor, flushed once per batch so clients receive data as it is
+  produced
+- parquet: column-oriented Arrow record batches written as Parquet row
+  groups (requires pyarrow; `parquet_available()` reports whether it is
+  installed)
+
+Usage:
+    encoder = create_encoder("ndjson.gz", spec.columns)
+    yield encoder.header()
+    for batch in batches:
+        yield encoder.encode_batch(batch)
+    yield encoder.finish()
+"""
+import csv
+import io
+import json
+import zlib
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Sequence
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+EXPORT_FORMATS = ("csv", "json", "ndjson", "csv.gz", "ndjson.gz", "parquet")
+
+# Parquet column types for non-text export columns (everything else is a string)
+PARQUET_COLUMN_TYPES = {
+    "status_code": "int32",
+    "ttl": "int64",
+    "is_alive": "bool",
+    "has_params": "bool",
+}
+
+GZIP_LEVEL = 6
+
+
+def parquet_available() -> bool:
+    """Whether pyarrow is installed, i.e. format=parquet can be served."""
+    return pa is not None
+
+
+class ExportEncoder(ABC):
+    """Serializes export batches for one format."""
+
+    media_type = "application/octet-stream"
+
+    def __init__(self, columns: Sequence[str]):
+        self.columns = list(columns)
+
+    def header(self) -> bytes:
+        return b""
+
+    @abstractmethod
+    def encode_batch(self, rows: List[Dict[str, Any]]) -> bytes:
+        """Bytes for one batch of rows."""
+
+    def finish(self) -> bytes:
+        return b""
+
+
+class CsvEncoder(ExportEncoder):
+    media_type = "text/csv"
+
+    def header(self) -> bytes:
+        return self._write([self.columns])
+
+    def encode_batch(self, rows: List[Dict[str, Any]]) -> bytes:
+        columns = self.columns
+        return self._write([[row.get(column) for column in columns] for row in rows])
+
+    @staticmethod
+    def _write(values: List[List[Any]]) -> bytes:
+        output = io.StringIO()
+        csv.writer(output, quoting=csv.QUOTE_MINIMAL).writerows(values)
+        return output.getvalue().encode()
+
+
+class JsonArrayEncoder(ExportEncoder):
+    media_type = "application/json"
+
+    def __init__(self, columns: Sequence[str]):
+        super().__init__(columns)
+        self._first = True
+
+    def header(self) -> bytes:
+        return b"["
+
+    def encode_batch(self, rows: List[Dict[str, Any]]) -> bytes:
+        if not rows:
+            return b""
+        # One dumps call per batch; strip the list brackets to splice into the array
+        body = json.dumps(rows)[1:-1]
+        prefix = "" if self._first else ","
+        self._first = False
+        return (prefix + body).encode()
+
+    def finish(self) -> bytes:
+        return b"]"
+
+
+class NdjsonEncoder(ExportEncoder):
+    media_type = "application/x-ndjson"
+
+    def encode_batch(self, rows: List[Dict[str, Any]]) -> bytes:
+        if not rows:
+            return b""
+        return ("\n".join(map(json.dumps, rows)) + "\n").encode()
+
+
+class GzipEncoder(ExportEncoder):
+    """Gzip-compresses another encoder's output as one continuous stream."""
+
+    media_type = "application/gzip"
+
+    def __init__(self, inner: ExportEncoder, level: int = GZIP_LEVEL):
+        super().__init__(inner.columns)
+        self.inner = inner
+        # wbits=31 -> gzip container
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def header(self) -> bytes:
+        return self._compress(self.inner.header())
+
+    def encode_batch(self, rows: List[Dict[str, Any]]) -> bytes:
+        return self._compress(self.inner.encode_batch(rows))
+
+    def finish(self) -> bytes:
+        return self._compressor.compress(self.inner.finish()) + self._compressor.flush(zlib.Z_FINISH)
+
+    def _compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file object that hands written bytes back to the encoder."""
+
+    def __init__(self):
+        self.chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+class ParquetEncoder(ExportEncoder):
+    """Writes each batch as an Arrow record batch (one Parquet row group)."""
+
+    media_type = "application/vnd.apache.parquet"
+
+    def __init__(self, columns: Sequence[str]):
+        if pa is None:
+            raise RuntimeError("Parquet export requires pyarrow")
+        super().__init__(columns)
+        self.schema = pa.schema([
+            (column, getattr(pa, PARQUET_COLUMN_TYPES.get(column, "string"))())
+            for column in self.columns
+        ])
+        self._sink = _ChunkSink()
+        self._writer = pq.ParquetWriter(self._sink, self.schema, compression="snappy")
+
+    def encode_batch(self, rows: List[Dict[str, Any]]) -> bytes:
+        if not rows:
+            return b""
+        arrays = []
+        for field in self.schema:
+            values = [row.get(field.name) for row in rows]
+            if pa.types.is_string(field.type):
+                values = [_as_text(value) for value in values]
+            arrays.append(pa.array(values, type=field.type))
+        self._writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=self.schema))
+        return self._sink.drain()
+
+    def finish(self) -> bytes:
+        self._writer.close()
+        return self._sink.drain()
+
+
+EXPORT_MEDIA_TYPES = {
+    "csv": CsvEncoder.media_type,
+    "json": JsonArrayEncoder.media_type,
+    "ndjson": NdjsonEncoder.media_type,
+    "csv.gz": GzipEncoder.media_type,
+    "ndjson.gz": GzipEncoder.media_type,
+    "parquet": ParquetEncoder.media_type,
+}
+
+
+def _as_text(value: Any):
+    if value is None or isinstance(value, str):
+        return value
+    return json.dumps(value) if isinstance(value, (list, dict)) else str(value)
+
+
+def create_encoder(export_format: str, columns: Sequence[str]) -> ExportEncoder:
+    """Encoder for one of EXPORT_FORMATS."""
+    if export_format == "csv":
+        return CsvEncoder(columns)
+    if export_format == "json":
+        return JsonArrayEncoder(columns)
+    if export_format == "ndjson":
+        return NdjsonEncoder(columns)
+    if export_format == "csv.gz":
+        return GzipEncoder(CsvEncoder(columns))
+    if export_format == "ndjson.gz":
+        return GzipEncoder(NdjsonEncoder(columns))
+    if export_format == "parquet":
+        return ParquetEncoder(columns)
+    raise ValueError(f"Unsupported export format: {export_format}")
@@ -0,0 +1,313 @@
+"""
+Export Job Service - Asynchronous Snapshot Exports
+
+Streaming /exports/* downloads hold an API worker and a DB cursor for as
+long as the client stays connected, and a dropped connection restarts the
+export from zero. Export jobs decouple the two:
+
+1. POST /exports/jobs starts a background task that writes the export
+   (same engine and encoders as the streaming endpoints) to a snapshot
+   file, reporting rows/bytes written as it goes
+2. The finished snapshot is served as a static file with a content ETag
+   and HTTP Range support, so clients can resume or parallelize downloads
+3. An identical request (same dataset, format, filters and `since`)
+   within `export_snapshot_ttl` reuses the running or finished job instead
+   of exporting again
+
+Each job records the `next_watermark` of its snapshot, so a client can
+follow a full snapshot with incremental `since=` jobs.
+
+Snapshots live in `export_jobs_dir` (local disk stand-in for object
+storage), next to a JSON metadata file per job so status survives an API
+restart. Metadata is written off the event loop and only on status
+changes; live row/byte progress is served from memory. Expired snapshots,
+including ones left by a previous process, are removed when new jobs are
+created.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..core.config import settings
+from .export_encoders import ExportEncoder, create_encoder
+from .export_engine import EXPORT_SPECS, ExportFilter, ExportEngine
+from ..utils.pagination import encode_watermark, watermark_ceiling
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_STATUSES = ("pending", "running")
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class ExportJobService:
+    """
+    Runs export jobs in the background and tracks their snapshots.
+    """
+
+    def __init__(
+        self,
+        storage_dir: Optional[str] = None,
+        snapshot_ttl_seconds: Optional[int] = None,
+        max_concurrent: Optional[int] = None,
+        engine: Optional[ExportEngine] = None
+    ):
+        self.storage_dir = Path(storage_dir or settings.export_jobs_dir)
+        self.snapshot_ttl_seconds = snapshot_ttl_seconds if snapshot_ttl_seconds is not None else settings.export_snapshot_ttl
+        self._engine = engine
+        self._semaphore = asyncio.Semaphore(max_concurrent or settings.export_jobs_max_concurrent)
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._by_key: Dict[str, str] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+
+    @property
+    def engine(self) -> ExportEngine:
+        if self._engine is None:
+            from .export_engine import export_engine
+            self._engine = export_engine
+        return self._engine
+
+    # ================================================================
+    # Jobs
+    # ================================================================
+
+    @staticmethod
+    def job_key(
+        export_type: str,
+        export_format: str,
+        filters: List[ExportFilter],
+        since: Optional[str] = None
+    ) -> str:
+        """Identity of an export request: dataset + format + filters + since."""
+        payload = json.dumps([export_type, export_format, sorted(filters), since], default=str)
+        return hashlib.sha1(payload.encode()).hexdigest()
+
+    async def create_job(
+        self,
+        export_type: str,
+        export_format: str,
+        filters: List[ExportFilter],
+        user_id: Optional[str] = None,
+        since: Optional[str] = None
+    ) -> Tuple[Dict[str, Any], bool]:
+        """
+        Start an export job, or return an identical recent one.
+
+        Returns:
+            (job record, reused)
+        """
+        key = self.job_key(export_type, export_format, filters, since)
+        existing = self._reusable_job(key)
+        if existing is not None:
+            logger.info(f"♻️ Reusing export job {existing['job_id']} for {export_type}.{export_format}")
+            return existing, True
+
+        job_id = str(uuid.uuid4())
+        until = watermark_ceiling(settings.delta_settle_seconds)
+        job = {
+            "job_id": job_id,
+            "key": key,
+            "export_type": export_type,
+            "format": export_format,
+            "filters": {column: value for _, column, value in filters},
+            "status": "pending",
+            "rows_written": 0,
+            "bytes_written": 0,
+            "created_by": user_id,
+            "created_at": _now().isoformat(),
+            "started_at": None,
+            "completed_at": None,
+            "expires_at": None,
+            "etag": None,
+            "error": None,
+            "since": since,
+            "until": until,
+            "next_watermark": encode_watermark(until),
+        }
+        # Registered before the first await so concurrent identical requests reuse it
+        self._jobs[job_id] = job
+        self._by_key[key] = job_id
+        await asyncio.to_thread(self._save, job)
+
+        task = asyncio.create_task(self._run(job, list(filters)))
+        self._tasks[job_id] = task
+        task.add_done_callback(lambda _: self._tasks.pop(job_id, None))
+
+        logger.info(f"📦 Started export job {job_id} ({export_type}.{export_format})")
+
+        await asyncio.to_thread(self.cleanup_expired)
+        return job, False
+
+    def _reusable_job(self, key: str) -> Optional[Dict[str, Any]]:
+        job = self._jobs.get(self._by_key.get(key, ""))
+        if job is None:
+            return None
+        if job["status"] in ACTIVE_STATUSES:
+            return job
+        if job["status"] == "completed" and not self._expired(job) and self.snapshot_path(job).exists():
+            return job
+        return None
+
+    def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Job record by ID (loaded from disk if this process did not start it)."""
+        job = self._jobs.get(job_id)
+        if job is not None:
+            return job
+
+        try:
+            uuid.UUID(job_id)
+            job = json.loads(self._metadata_path(job_id).read_text())
+        except (ValueError, OSError):
+            return None
+
+        if job["status"] in ACTIVE_STATUSES:
+            # Its API task is gone (restart or another task's disk); it will never finish
+            job["status"] = "failed"
+            job["error"] = "Export was interrupted; start a new export job"
+            self._save(job)
+        return job
+
+    def snapshot_path(self, job: Dict[str, Any]) -> Path:
+        return self.storage_dir / f"{job['job_id']}.{job['format']}"
+
+    def _metadata_path(self, job_id: str) -> Path:
+        return self.storage_dir / f"{job_id}.json"
+
+    # ================================================================
+    # Materialization
+    # ================================================================
+
+    async def _run(self, job: Dict[str, Any], filters: List[ExportFilter]) -> None:
+        spec = EXPORT_SPECS[job["export_type"]]
+        final_path = self.snapshot_path(job)
+        part_path = final_path.with_name(final_path.name + ".part")
+
+        async with self._semaphore:
+            job["status"] = "running"
+            job["started_at"] = _now().isoformat()
+            await asyncio.to_thread(self._save, job)
+
+            try:
+                encoder = create_encoder(job["format"], spec.columns)
+                digest = hashlib.sha256()
+                with open(part_path, "wb") as output:
+                    self._write(output, digest, job, encoder.header())
+                    batches = self.engine.iter_batches(spec, filters, since=job.get("since"), until=job.get("until"))
+                    async for batch in batches:
+                        # Encode + write off the event loop while the next batch is fetched
+                        await asyncio.to_thread(self._write_batch, output, digest, job, encoder, batch)
+                        job["rows_written"] += len(batch)
+                    self._write(output, digest, job, encoder.finish())
+
+                os.replace(part_path, final_path)
+                completed_at = _now()
+                job.update({
+                    "status": "completed",
+                    "etag": f'"{digest.hexdigest()[:32]}"',
+                    "completed_at": completed_at.isoformat(),
+                    "expires_at": (completed_at + timedelta(seconds=self.snapshot_ttl_seconds)).isoformat(),
+                })
+                logger.info(
+                    f"✅ Export job {job['job_id']} finished: {job['rows_written']} rows, "
+                    f"{job['bytes_written']} bytes"
+                )
+            except asyncio.CancelledError:
+                job.update({"status": "failed", "error": "Export was cancelled"})
+                part_path.unlink(missing_ok=True)
+                raise
+            except Exception as e:
+                logger.error(f"❌ Export job {job['job_id']} failed: {str(e)}")
+                job.update({"status": "failed", "error": str(e)})
+                part_path.unlink(missing_ok=True)
+            finally:
+                await asyncio.to_thread(self._save, job)
+
+    def _write_batch(self, output, digest, job: Dict[str, Any], encoder: ExportEncoder, batch) -> None:
+        self._write(output, digest, job, encoder.encode_batch(batch))
+
+    @staticmethod
+    def _write(output, digest, job: Dict[str, Any], data: bytes) -> None:
+        if data:
+            output.write(data)
+            digest.update(data)
+            job["bytes_written"] += len(data)
+
+    def _save(self, job: Dict[str, Any]) -> None:
+        """Persist job metadata atomically next to the snapshot."""
+        try:
+            self.storage_dir.mkdir(parents=True, exist_ok=True)
+            path = self._metadata_path(job["job_id"])
+            tmp_path = path.with_name(path.name + ".tmp")
+            tmp_path.write_text(json.dumps(job, default=str))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"⚠️ Failed to persist export job {job['job_id']}: {str(e)}")
+
+    # ================================================================
+    # Cleanup
+    # ================================================================
+
+    def _expired(self, job: Dict[str, Any]) -> bool:
+        reference = job.get("expires_at") or job.get("completed_at") or job["created_at"]
+        expires_at = datetime.fromisoformat(reference)
+        if not job.get("expires_at"):
+            expires_at += timedelta(seconds=self.snapshot_ttl_seconds)
+        return expires_at <= _now()
+
+    def cleanup_expired(self) -> int:
+        """
+        Delete expired snapshots and finished job records. Returns jobs removed.
+
+        Scans the metadata files in `storage_dir`, so snapshots written
+        before an API restart expire too. Blocking; run it off the event loop.
+        """
+        job_ids = set(self._jobs)
+        if self.storage_dir.is_dir():
+            job_ids.update(path.stem for path in self.storage_dir.glob("*.json"))
+
+        removed = 0
+        for job_id in job_ids:
+            job = self._jobs.get(job_id)
+            if job is None:
+                try:
+                    uuid.UUID(job_id)
+                    job = json.loads(self._metadata_path(job_id).read_text())
+                except (ValueError, OSError):
+                    continue
+            elif job["status"] in ACTIVE_STATUSES:
+                continue
+            # A job still active on disk was interrupted; it expires by created_at
+            if not self._expired(job):
+                continue
+            snapshot = self.snapshot_path(job)
+            snapshot.unlink(missing_ok=True)
+            snapshot.with_name(snapshot.name + ".part").unlink(missing_ok=True)
+            self._metadata_path(job_id).unlink(missing_ok=True)
+            self._jobs.pop(job_id, None)
+            if self._by_key.get(job["key"]) == job_id:
+                del self._by_key[job["key"]]
+            removed += 1
+
+        if removed:
+            logger.info(f"🧹 Removed {removed} expired export snapshot(s)")
+        return removed
+
+    async def shutdown(self) -> None:
+        """Cancel running export jobs (clients can start them again)."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+
+# Create singleton instance
+export_job_service = ExportJobService()
@@ -0,0 +1,212 @@
+"""
+Job Status Events - Push Notifications for Scan Job Status Changes
+
+Pipelines used to find out that their containers had finished by polling
+`batch_scan_jobs` every 10 seconds each, so 50 running scans meant a
+constant stream of queries and completion was noticed up to 10s late.
+
+Containers still only write their status to the database. Supabase
+Realtime relays those row changes (the tables are in the
+`supabase_realtime` publication, see migration 20260116_07) over one
+websocket per API task, and this service fans them out to the pipelines
+waiting on those job IDs:
+
+    async with job_status_events.subscribe(job_ids) as events:
+        ...  # read current statuses once
+        changes = await events.get(timeout=fallback_interval)
+        # list of {"id", "module", "status", ...} records, [] on timeout,
+        # None when events were missed (reconnect) and statuses must be re-read
+
+Events are a latency optimization, never the source of truth: waiters
+re-read the table on a slow fallback interval, and whenever the channel
+(re)subscribes, since changes made while it was down were not delivered.
+"""
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Set
+
+from ..core.config import settings
+
+try:
+    from realtime import AsyncRealtimeClient
+except ImportError:
+    AsyncRealtimeClient = None
+
+logger = logging.getLogger(__name__)
+
+# Tables whose status changes are relayed
+WATCHED_TABLES = ("batch_scan_jobs", "asset_scan_jobs")
+
+
+class JobSubscription:
+    """Status changes for a fixed set of job IDs, buffered until read."""
+
+    def __init__(self, job_ids: Iterable[str]):
+        self.job_ids: Set[str] = {str(job_id) for job_id in job_ids}
+        self._changes: List[Dict[str, Any]] = []
+        self._resync = False
+        self._wakeup = asyncio.Event()
+
+    def push(self, record: Dict[str, Any]) -> None:
+        self._changes.append(record)
+        self._wakeup.set()
+
+    def resync(self) -> None:
+        """Mark buffered state as incomplete (events may have been missed)."""
+        self._resync = True
+        self._wakeup.set()
+
+    async def get(self, timeout: float) -> Optional[List[Dict[str, Any]]]:
+        """
+        Wait up to `timeout` seconds for status changes.
+
+        Returns:
+            Changed job records, [] on timeout, or None if the caller must
+            re-read statuses because events may have been missed
+        """
+        if not self._wakeup.is_set():
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                return []
+
+        self._wakeup.clear()
+        if self._resync:
+            self._resync = False
+            self._changes.clear()
+            return None
+
+        changes, self._changes = self._changes, []
+        return changes
+
+
+class JobStatusEvents:
+    """
+    Relays scan job status changes from Supabase Realtime to waiting pipelines.
+    """
+
+    def __init__(
+        self,
+        enabled: Optional[bool] = None,
+        realtime_url: Optional[str] = None,
+        api_key: Optional[str] = None
+    ):
+        self.enabled = enabled if enabled is not None else settings.job_events_enabled
+        self.realtime_url = realtime_url or f"{settings.supabase_url.rstrip('/')}/realtime/v1"
+        self.api_key = api_key or settings.supabase_service_role_key
+        self._subscriptions: Dict[str, Set[JobSubscription]] = {}
+        self._client = None
+        self._channel = None
+        self.live = False
+        self.events_received = 0
+
+    # ================================================================
+    # Lifecycle
+    # ================================================================
+
+    async def start(self) -> None:
+        """Connect to Realtime and subscribe to job table updates (non-fatal)."""
+        if not self.enabled:
+            logger.info("ℹ️ Job status events disabled - pipelines will poll job status")
+            return
+        if AsyncRealtimeClient is None:
+            logger.warning("⚠️ realtime package not installed - pipelines will poll job status")
+            return
+
+        try:
+            self._client = AsyncRealtimeClient(self.realtime_url, self.api_key)
+            await self._client.connect()
+
+            channel = self._client.channel("scan-job-status")
+            for table in WATCHED_TABLES:
+                channel = channel.on_postgres_changes(
+                    "UPDATE", schema="public", table=table, callback=self.handle_change
+                )
+            self._channel = await channel.subscribe(self._on_state)
+            logger.info(f"📡 Subscribed to job status events ({', '.join(WATCHED_TABLES)})")
+        except Exception as e:
+            logger.warning(f"⚠️ Job status events unavailable, pipelines will poll: {str(e)}")
+            self.live = False
+
+    async def stop(self) -> None:
+        self.live = False
+        if self._client is not None:
+            try:
+                await self._client.close()
+            except Exception as e:
+                logger.debug(f"Realtime close failed: {str(e)}")
+            self._client = None
+            self._channel = None
+
+    def _on_state(self, state: Any, error: Optional[Exception] = None) -> None:
+        subscribed = str(getattr(state, "value", state)) == "SUBSCRIBED"
+        if subscribed:
+            logger.info("✅ Job status event channel subscribed")
+        else:
+            logger.warning(f"⚠️ Job status event channel {state}: {error}")
+        self.live = subscribed
+        # Whatever happened while the channel was down was not delivered
+        for subscription in self._all_subscriptions():
+            subscription.resync()
+
+    # ================================================================
+    # Fan-out
+    # ================================================================
+
+    def handle_change(self, payload: Dict[str, Any]) -> None:
+        """Realtime postgres_changes callback: route a row change to its waiters."""
+        data = payload.get("data", payload)
+        record = data.get("record") or {}
+        job_id = record.get("id")
+        if job_id is None:
+            return
+
+        # old_record carries status because the job tables use REPLICA IDENTITY FULL
+        old_status = (data.get("old_record") or {}).get("status")
+        if old_status is not None and old_status == record.get("status"):
+            # Progress-only update
+            return
+
+        self.events_received += 1
+        for subscription in self._subscriptions.get(str(job_id), ()):
+            subscription.push(record)
+
+    @asynccontextmanager
+    async def subscribe(self, job_ids: Iterable[str]) -> AsyncIterator[JobSubscription]:
+        """
+        Receive status changes for `job_ids` while the context is open.
+
+        Subscribe before reading the current statuses so no change can
+        slip in between the read and the subscription.
+        """
+        subscription = JobSubscription(job_ids)
+        for job_id in subscription.job_ids:
+            self._subscriptions.setdefault(job_id, set()).add(subscription)
+        try:
+            yield subscription
+        finally:
+            for job_id in subscription.job_ids:
+                waiters = self._subscriptions.get(job_id)
+                if waiters is not None:
+                    waiters.discard(subscription)
+                    if not waiters:
+                        del self._subscriptions[job_id]
+
+    def _all_subscriptions(self) -> Set[JobSubscription]:
+        return {s for waiters in self._subscriptions.values() for s in waiters}
+
+    def poll_interval(self, fallback_interval: float) -> float:
+        """
+        Seconds a waiter should sleep between status reads.
+
+        `fallback_interval` (the old polling cadence) while events are down,
+        the slow safety interval while they are live.
+        """
+        if self.live:
+            return max(fallback_interval, settings.job_events_fallback_poll_interval)
+        return fallback_interval
+
+
+# Create singleton instance
+job_status_events = JobStatusEvents()
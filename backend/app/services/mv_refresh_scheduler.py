@@ -0,0 +1,222 @@
+"""
+Materialized View Refresh Scheduler - Scan-Driven, Debounced MV Refreshes
+
+Dashboards read pre-computed materialized views (asset_overview,
+asset_recon_counts, url_stats, subdomain_current_dns, ...). pg_cron refreshes
+them every 15 minutes, so finished scans could take that long to show up.
+
+This scheduler refreshes views when scans finish instead:
+- Asset-scoped groups (cheap per-asset rollups) refresh right after a
+  short debounce, so a burst of finishing assets triggers one refresh
+- Global groups (heavy DNS / URL views) are coalesced to at most one
+  refresh per `mv_refresh_global_interval` across all API tasks
+
+Every refresh goes through `refresh_view_group()` in the database, which
+holds an advisory lock so two workers (or pg_cron) never refresh the same
+group at once, and records the refresh time used to report staleness.
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Set
+
+from ..core.config import settings
+from ..core.supabase_client import supabase_client
+from .result_cache import result_cache
+
+logger = logging.getLogger(__name__)
+
+
+class MaterializedViewRefreshScheduler:
+    """
+    Debounces MV refreshes triggered by scan completions.
+    """
+
+    # View groups map 1:1 to the refresh_*_views() SQL functions
+    VIEW_GROUPS: Dict[str, List[str]] = {
+        "lightweight": ["asset_overview", "asset_recon_counts", "scan_subdomain_counts"],
+        "dns": ["subdomain_current_dns"],
+        "url": ["url_stats", "url_top_extensions", "url_top_status_codes", "url_top_sources"],
+    }
+    ASSET_GROUPS = ("lightweight",)
+    GLOBAL_GROUPS = ("dns", "url")
+    GLOBAL_SLOT_KEY = "mv_refresh:global_slot"
+
+    def __init__(
+        self,
+        enabled: Optional[bool] = None,
+        debounce_seconds: Optional[float] = None,
+        global_interval_seconds: Optional[float] = None,
+        redis_provider: Optional[Callable[[], Awaitable[Any]]] = None
+    ):
+        self.supabase = supabase_client.async_service_client
+        self.enabled = enabled if enabled is not None else settings.mv_refresh_enabled
+        self.debounce_seconds = debounce_seconds if debounce_seconds is not None else settings.mv_refresh_debounce_seconds
+        self.global_interval_seconds = (
+            global_interval_seconds if global_interval_seconds is not None else settings.mv_refresh_global_interval
+        )
+        self._redis_provider = redis_provider
+        self._pending_assets: Set[str] = set()
+        self._global_dirty = False
+        self._last_global_refresh: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+        self.last_results: Dict[str, Dict[str, Any]] = {}
+
+    # ================================================================
+    # Triggers
+    # ================================================================
+
+    def notify_scan_completed(self, asset_id: Optional[str]) -> None:
+        """Record that an asset's scan reached a terminal status and schedule refreshes."""
+        if not self.enabled:
+            return
+
+        if asset_id:
+            self._pending_assets.add(asset_id)
+        self._global_dirty = True
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        """Background loop: runs until no asset or global refresh is pending."""
+        try:
+            while self._pending_assets or self._global_dirty:
+                # Coalesce assets that finish close together into one refresh
+                await asyncio.sleep(self._next_wait())
+
+                if self._pending_assets:
+                    assets = sorted(self._pending_assets)
+                    self._pending_assets.clear()
+                    logger.info(f"🔄 Refreshing asset views after scans for {len(assets)} asset(s)")
+                    await self.refresh_groups(self.ASSET_GROUPS)
+
+                if self._global_dirty and self._global_due():
+                    if await self._claim_global_slot():
+                        self._global_dirty = False
+                        await self.refresh_groups(self.GLOBAL_GROUPS)
+                    else:
+                        # Another worker refreshed this interval; retry next interval
+                        # so this scan's rows are covered too
+                        logger.info("⏭️ Global view refresh already claimed by another worker")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"❌ Materialized view refresh loop failed: {str(e)}")
+
+    def _global_wait(self) -> float:
+        """Seconds until the global views may be refreshed again."""
+        if self._last_global_refresh is None:
+            return 0.0
+        return max(0.0, self.global_interval_seconds - (time.monotonic() - self._last_global_refresh))
+
+    def _global_due(self) -> bool:
+        return self._global_wait() <= 0
+
+    def _next_wait(self) -> float:
+        if self._pending_assets:
+            return self.debounce_seconds
+        return max(self.debounce_seconds, self._global_wait())
+
+    async def _claim_global_slot(self) -> bool:
+        """
+        Claim the global refresh slot for this interval across all API tasks.
+
+        Falls back to the in-process interval when Redis is unavailable.
+        """
+        self._last_global_refresh = time.monotonic()
+        try:
+            if self._redis_provider is None:
+                from .auth_service import auth_service
+                self._redis_provider = auth_service.get_redis
+
+            redis_client = await self._redis_provider()
+            if redis_client is None:
+                return True
+            claimed = await redis_client.set(
+                self.GLOBAL_SLOT_KEY, "1", nx=True, ex=max(int(self.global_interval_seconds), 1)
+            )
+            return bool(claimed)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not claim global refresh slot in Redis: {str(e)}")
+            return True
+
+    # ================================================================
+    # Refresh
+    # ================================================================
+
+    async def refresh_groups(self, groups: Sequence[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Refresh view groups through the lock-guarded `refresh_view_group` RPC.
+
+        Groups already being refreshed elsewhere are skipped (reported as
+        `refreshed: false`). Cached read results are invalidated when any
+        group was refreshed, since they were computed from the old views.
+        """
+        results = {}
+        for group in groups:
+            try:
+                response = await self.supabase.rpc("refresh_view_group", {"p_group": group}).execute()
+                result = response.data or {}
+            except Exception as e:
+                logger.error(f"❌ Failed to refresh view group '{group}': {str(e)}")
+                result = {"view_group": group, "refreshed": False, "reason": str(e)}
+
+            result["completed_at"] = time.time()
+            results[group] = result
+            self.last_results[group] = result
+
+            if result.get("refreshed"):
+                logger.info(f"✅ Refreshed view group '{group}' in {result.get('duration_ms', 0)}ms")
+            elif result.get("reason") == "locked":
+                logger.info(f"⏭️ View group '{group}' is already being refreshed")
+
+        if any(r.get("refreshed") for r in results.values()):
+            await result_cache.bump_asset_version(None)
+
+        return results
+
+    # ================================================================
+    # Status
+    # ================================================================
+
+    async def get_status(self) -> Dict[str, Any]:
+        """Staleness of each view group plus pending scheduler work."""
+        try:
+            response = await self.supabase.rpc("get_mv_refresh_status", {}).execute()
+            rows = {row["view_group"]: row for row in (response.data or [])}
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to read materialized view refresh status: {str(e)}")
+            rows = {}
+
+        next_global_in = int(self._global_wait()) if self._global_dirty else None
+
+        return {
+            "view_groups": [
+                {
+                    "view_group": group,
+                    "views": views,
+                    "last_refreshed_at": rows.get(group, {}).get("last_refreshed_at"),
+                    "last_duration_ms": rows.get(group, {}).get("last_duration_ms"),
+                    "staleness_seconds": rows.get(group, {}).get("staleness_seconds"),
+                    "scope": "asset" if group in self.ASSET_GROUPS else "global",
+                }
+                for group, views in self.VIEW_GROUPS.items()
+            ],
+            "pending_assets": len(self._pending_assets),
+            "global_refresh_pending": self._global_dirty,
+            "next_global_refresh_in_seconds": next_global_in,
+        }
+
+    async def shutdown(self) -> None:
+        """Cancel the background refresh loop (pending refreshes fall back to pg_cron)."""
+        if self._task and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+
+# Create singleton instance
+mv_refresh_scheduler = MaterializedViewRefreshScheduler()
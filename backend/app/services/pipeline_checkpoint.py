@@ -0,0 +1,304 @@
+"""
+Pipeline Checkpoints - Crash-Safe Streaming Pipelines
+
+`ScanPipeline.execute_pipeline` launches its tasks and then waits on them in
+memory. When the API process running that loop restarted, nothing was
+watching the scan any more: it stayed "running" until someone intervened,
+and rescanning repeated hours of producer and consumer work.
+
+Each running pipeline now keeps a checkpoint next to the streams it
+describes (resuming needs both, so both live in Redis):
+
+    scan:{asset_scan_id}:checkpoint        JSON PipelineCheckpoint
+    scan:{asset_scan_id}:checkpoint:lease  owner of the monitoring loop (expires)
+    pipeline:checkpoints                   zset of active pipelines (by last save)
+    pipeline:parent:{scan_id}              hash asset_scan_id → status per parent scan
+
+The checkpoint holds the job IDs, stream keys, consumer groups, every
+launched task ARN with its consumer name, the latest module statuses and
+each group's last-delivered ID. It is saved on launch, on every module
+status change and every `pipeline_checkpoint_interval` seconds, which also
+renews the owner's lease.
+
+Every API process runs a recovery loop: a checkpoint whose lease expired
+belongs to a process that died, and the first process to take the lease
+calls `scan_pipeline.resume_pipeline()`. That reattaches to tasks that are
+still running, relaunches only dead ones (a dead consumer's pending entries
+are claimed by its replacement, which then continues from the group's
+last-delivered ID) and carries on monitoring, so a restart costs seconds.
+"""
+import asyncio
+import json
+import logging
+import os
+import socket
+import time
+import uuid
+from dataclasses import asdict, dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+ACTIVE_KEY = "pipeline:checkpoints"
+
+TERMINAL_STATUSES = ("completed", "failed", "timeout")
+
+
+@dataclass
+class PipelineCheckpoint:
+    """Durable state of one streaming pipeline (one asset scan)."""
+    asset_scan_id: str
+    asset_id: str
+    user_id: str
+    modules: List[str]
+    started_at: str
+    timeout_seconds: int
+    scale_factor: int = 1
+    parent_scan_id: Optional[str] = None
+    # module → {"job_id", "stream_key", "task_arn"}
+    producers: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    # module → consumer job ID (in launch order)
+    consumer_jobs: Dict[str, str] = field(default_factory=dict)
+    # [{"module", "stream_key", "group_name", "stream_output_key", "consumers": {name: task_arn}}]
+    consumer_groups: List[Dict[str, Any]] = field(default_factory=list)
+    # stream key → consumer groups reading it (stream lifecycle)
+    stream_groups: Dict[str, List[str]] = field(default_factory=dict)
+    module_statuses: Dict[str, str] = field(default_factory=dict)
+    # "stream_key|group" → {"last_delivered_id", "pending"}
+    group_offsets: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    # Consumer modules served by a shared fleet (routing state is in-process)
+    fleet_id: Optional[str] = None
+    resumes: int = 0
+    updated_at: float = 0.0
+
+    def group(self, group_name: str, stream_key: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        for group in self.consumer_groups:
+            if group["group_name"] == group_name and (stream_key is None or group["stream_key"] == stream_key):
+                return group
+        return None
+
+    def consumer_task_arns(self) -> Dict[str, List[str]]:
+        """Module → every consumer task ARN launched for it."""
+        arns: Dict[str, List[str]] = {module: [] for module in self.consumer_jobs}
+        for group in self.consumer_groups:
+            arns.setdefault(group["module"], []).extend(group["consumers"].values())
+        return arns
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def from_json(cls, raw: str) -> "PipelineCheckpoint":
+        return cls(**json.loads(raw))
+
+
+class PipelineCheckpointStore:
+    """Saves checkpoints, owns their leases and resumes orphaned pipelines."""
+
+    def __init__(
+        self,
+        redis_provider: Optional[Callable[[], Awaitable[Any]]] = None,
+        owner: Optional[str] = None,
+        clock: Callable[[], float] = time.time
+    ):
+        self._redis_provider = redis_provider
+        self.owner = owner or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.clock = clock
+        self._task: Optional[asyncio.Task] = None
+        self._resuming: Dict[str, asyncio.Task] = {}
+
+    async def _redis(self):
+        if self._redis_provider is None:
+            from .stream_coordinator import stream_coordinator
+            self._redis_provider = stream_coordinator.get_redis
+        return await self._redis_provider()
+
+    def _key(self, asset_scan_id: str) -> str:
+        return f"scan:{asset_scan_id}:checkpoint"
+
+    def _lease_key(self, asset_scan_id: str) -> str:
+        return f"scan:{asset_scan_id}:checkpoint:lease"
+
+    def _parent_key(self, parent_scan_id: str) -> str:
+        return f"pipeline:parent:{parent_scan_id}"
+
+    # ================================================================
+    # Checkpoints
+    # ================================================================
+
+    async def save(self, checkpoint: PipelineCheckpoint) -> bool:
+        """Persist a checkpoint and mark the pipeline active."""
+        if not settings.pipeline_checkpoint_enabled:
+            return False
+        try:
+            redis_client = await self._redis()
+            checkpoint.updated_at = self.clock()
+            await redis_client.set(self._key(checkpoint.asset_scan_id), checkpoint.to_json())
+            await redis_client.zadd(ACTIVE_KEY, {checkpoint.asset_scan_id: checkpoint.updated_at})
+            if checkpoint.parent_scan_id:
+                await redis_client.hsetnx(self._parent_key(checkpoint.parent_scan_id), checkpoint.asset_scan_id, "running")
+            return True
+        except Exception as e:
+            logger.warning(f"⚠️  Failed to checkpoint pipeline {checkpoint.asset_scan_id}: {str(e)}")
+            return False
+
+    async def load(self, asset_scan_id: str) -> Optional[PipelineCheckpoint]:
+        redis_client = await self._redis()
+        raw = await redis_client.get(self._key(asset_scan_id))
+        return PipelineCheckpoint.from_json(raw) if raw else None
+
+    async def active(self) -> List[str]:
+        """Asset scan IDs of pipelines that have not finished."""
+        redis_client = await self._redis()
+        return list(await redis_client.zrange(ACTIVE_KEY, 0, -1))
+
+    async def finish(self, checkpoint: PipelineCheckpoint, status: str) -> Optional[Dict[str, str]]:
+        """
+        Mark a pipeline finished: it leaves the active set, its checkpoint
+        and lease expire with the scan's streams.
+
+        Returns:
+            asset_scan_id → status of every pipeline of the parent scan once
+            all of them have finished (None while some are still running, or
+            without a parent scan)
+        """
+        if not settings.pipeline_checkpoint_enabled:
+            return None
+        try:
+            redis_client = await self._redis()
+            asset_scan_id = checkpoint.asset_scan_id
+            await redis_client.zrem(ACTIVE_KEY, asset_scan_id)
+            await redis_client.expire(self._key(asset_scan_id), settings.stream_finished_ttl)
+            await redis_client.delete(self._lease_key(asset_scan_id))
+
+            if not checkpoint.parent_scan_id:
+                return None
+            parent_key = self._parent_key(checkpoint.parent_scan_id)
+            await redis_client.hset(parent_key, mapping={asset_scan_id: status})
+            await redis_client.expire(parent_key, settings.stream_finished_ttl)
+            statuses = await redis_client.hgetall(parent_key)
+            if any(value == "running" for value in statuses.values()):
+                return None
+            return statuses
+        except Exception as e:
+            logger.warning(f"⚠️  Failed to finish checkpoint {checkpoint.asset_scan_id}: {str(e)}")
+            return None
+
+    # ================================================================
+    # Leases
+    # ================================================================
+
+    async def acquire_lease(self, asset_scan_id: str) -> bool:
+        """Take over a pipeline whose owner stopped renewing its lease."""
+        redis_client = await self._redis()
+        return bool(await redis_client.set(
+            self._lease_key(asset_scan_id), self.owner, nx=True, ex=settings.pipeline_lease_ttl
+        ))
+
+    async def renew_lease(self, asset_scan_id: str) -> bool:
+        """Extend our lease (False if another process owns the pipeline)."""
+        redis_client = await self._redis()
+        key = self._lease_key(asset_scan_id)
+        owner = await redis_client.get(key)
+        if owner is None:
+            return await self.acquire_lease(asset_scan_id)
+        if owner != self.owner:
+            return False
+        return bool(await redis_client.expire(key, settings.pipeline_lease_ttl))
+
+    async def release_lease(self, asset_scan_id: str) -> None:
+        if not settings.pipeline_checkpoint_enabled:
+            return
+        redis_client = await self._redis()
+        key = self._lease_key(asset_scan_id)
+        if await redis_client.get(key) == self.owner:
+            await redis_client.delete(key)
+
+    async def hold(
+        self,
+        checkpoint: PipelineCheckpoint,
+        refresh: Optional[Callable[[PipelineCheckpoint], Awaitable[None]]] = None,
+        interval: Optional[float] = None
+    ) -> None:
+        """
+        Keep a running pipeline's checkpoint fresh and its lease ours until
+        cancelled.
+
+        Args:
+            checkpoint: The pipeline's checkpoint (mutated by the pipeline)
+            refresh: Optional callback updating the checkpoint before each save
+                (e.g. consumer group offsets)
+            interval: Seconds between saves (default: settings.pipeline_checkpoint_interval)
+        """
+        if not settings.pipeline_checkpoint_enabled:
+            return
+        interval = interval if interval is not None else settings.pipeline_checkpoint_interval
+        while True:
+            try:
+                if not await self.renew_lease(checkpoint.asset_scan_id):
+                    logger.warning(f"⚠️  Lost the lease on pipeline {checkpoint.asset_scan_id} to another process")
+                if refresh is not None:
+                    await refresh(checkpoint)
+                await self.save(checkpoint)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"⚠️  Checkpoint refresh failed for {checkpoint.asset_scan_id}: {str(e)}")
+            await asyncio.sleep(interval)
+
+    # ================================================================
+    # Recovery
+    # ================================================================
+
+    async def recover_orphans(self) -> List[str]:
+        """Resume every active pipeline whose lease has expired."""
+        from .scan_pipeline import scan_pipeline
+
+        resumed = []
+        for asset_scan_id in await self.active():
+            if asset_scan_id in self._resuming or not await self.acquire_lease(asset_scan_id):
+                continue
+            logger.info(f"🩹 Pipeline {asset_scan_id} has no live owner, resuming")
+            task = asyncio.create_task(scan_pipeline.resume_pipeline(asset_scan_id))
+            self._resuming[asset_scan_id] = task
+            task.add_done_callback(lambda _, key=asset_scan_id: self._resuming.pop(key, None))
+            resumed.append(asset_scan_id)
+        return resumed
+
+    async def _run(self) -> None:
+        # Give pipelines of the previous process a lease period to be renewed
+        # by a sibling process before treating them as orphans
+        await asyncio.sleep(settings.pipeline_lease_ttl)
+        while True:
+            try:
+                await self.recover_orphans()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"⚠️  Pipeline recovery pass failed: {str(e)}")
+            await asyncio.sleep(settings.pipeline_recovery_interval)
+
+    def start(self) -> None:
+        if settings.pipeline_checkpoint_enabled and self._task is None:
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"🩹 Pipeline recovery started (owner {self.owner})")
+
+    async def shutdown(self) -> None:
+        tasks = [task for task in [self._task, *self._resuming.values()] if task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "enabled": settings.pipeline_checkpoint_enabled,
+            "owner": self.owner,
+            "resuming": sorted(self._resuming),
+        }
+
+
+# Create singleton instance
+pipeline_checkpoints = PipelineCheckpointStore()
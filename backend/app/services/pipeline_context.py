@@ -0,0 +1,106 @@
+"""
+Pipeline Context - Per-Scan Snapshot of Asset, Domains and Module Profiles
+
+A streaming pipeline used to look the same things up over and over:
+execute_pipeline read the asset and its active apex domains, then
+_create_batch_scan_job read both again for every producer and consumer
+module, and every task launch asked the module registry for the module's
+profile (container environment) and again for its task role. A five-module
+pipeline made more than ten redundant round trips before any task started.
+
+PipelineContext is loaded once per scan and handed to everything that
+needs those values:
+
+    context = await PipelineContext.load(supabase, asset_id, user_id, modules, execution_order)
+    context.apex_domains          # active apex domains, read once
+    context.module_profile("dnsx")  # ModuleProfile or None, read once
+
+The snapshot is only valid for the scan it was loaded for; domains added
+mid-scan are picked up by the next scan, exactly as before.
+"""
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from ..schemas.batch import ModuleProfile
+from .module_registry import module_registry
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PipelineContext:
+    """Everything a pipeline reads about its asset and modules, loaded once."""
+    asset_id: str
+    user_id: str
+    asset: Dict[str, Any]
+    apex_domains: List[str]
+    modules: List[str]
+    execution_order: List[str]
+    module_profiles: Dict[str, Optional[ModuleProfile]] = field(default_factory=dict)
+    asset_scan_id: Optional[str] = None
+
+    @classmethod
+    async def load(
+        cls,
+        supabase: Any,
+        asset_id: str,
+        user_id: str,
+        modules: List[str],
+        execution_order: Optional[List[str]] = None
+    ) -> "PipelineContext":
+        """
+        Read the asset, its active apex domains and the module profiles.
+
+        The asset and domain queries run concurrently.
+
+        Raises:
+            ValueError: If the asset does not exist
+        """
+        asset_response, apex_response = await asyncio.gather(
+            supabase.table("assets").select("*").eq("id", asset_id).execute(),
+            supabase.table("apex_domains")
+                .select("domain")
+                .eq("asset_id", asset_id)
+                .eq("is_active", True)
+                .execute()
+        )
+
+        if not asset_response.data:
+            raise ValueError(f"Asset not found: {asset_id}")
+
+        module_profiles = {}
+        for module in dict.fromkeys(modules):
+            module_profiles[module] = await module_registry.get_module(module)
+
+        context = cls(
+            asset_id=asset_id,
+            user_id=user_id,
+            asset=asset_response.data[0],
+            apex_domains=[record["domain"] for record in apex_response.data],
+            modules=list(modules),
+            execution_order=list(execution_order or modules),
+            module_profiles=module_profiles
+        )
+        logger.info(
+            f"📍 Pipeline context loaded: {len(context.apex_domains)} active apex domains, "
+            f"{len(module_profiles)} module profile(s) for asset {asset_id}"
+        )
+        return context
+
+    def module_profile(self, module: str) -> Optional[ModuleProfile]:
+        return self.module_profiles.get(module)
+
+    def module_hints(self, module: str) -> Dict[str, Any]:
+        """optimization_hints of a module ({} if it has no profile)."""
+        profile = self.module_profile(module)
+        return (profile.optimization_hints or {}) if profile else {}
+
+    @property
+    def invalid_modules(self) -> List[str]:
+        """Requested modules that are missing or inactive in the registry."""
+        return [
+            module for module in self.modules
+            if not self.module_profiles.get(module) or not self.module_profiles[module].is_active
+        ]
@@ -22,6 +22,7 @@ import logging
 from ..core.supabase_client import supabase_client
 from ..schemas.batch import ResourceProfile, ModuleProfile
 from .module_registry import module_registry
+from .resource_model import resource_model, SizeRecommendation
 
 logger = logging.getLogger(__name__)
 
@@ -161,6 +162,12 @@ class ModuleResourceCalculator:
         try:
             logger.info(f"Calculating resources for {module_name} with {domain_count} domains")
             
+            # Sizes learned from finished jobs replace the static profile once
+            # the module has enough history
+            recommendation = resource_model.recommend(module_name, domain_count, priority=priority)
+            if recommendation:
+                return self._model_allocation(recommendation, domain_count)
+            
             # Get base resource profile from database
             base_profile = await self._get_base_resource_profile(module_name, domain_count)
             
@@ -344,6 +351,27 @@ class ModuleResourceCalculator:
             }
         )
     
+    def _model_allocation(self, recommendation: SizeRecommendation, domain_count: int) -> ResourceAllocation:
+        """Allocation from a resource model recommendation."""
+        
+        duration = recommendation.estimated_duration_minutes
+        allocation = ResourceAllocation(
+            cpu=recommendation.cpu,
+            memory=recommendation.memory,
+            estimated_duration_minutes=duration,
+            cost_estimate=self._calculate_cost_estimate(recommendation.cpu, recommendation.memory, duration),
+            scaling_reasoning=(
+                f"History model ({recommendation.samples} jobs): cheapest observed size "
+                f"{'meeting' if recommendation.meets_target else 'closest to'} the "
+                f"{int(recommendation.target_seconds // 60)} min target"
+            ),
+            module_name=recommendation.module,
+            domain_count=domain_count,
+            optimization_applied="history_model"
+        )
+        logger.info(f"Resource allocation from history model: {allocation.cpu} CPU, {allocation.memory}MB RAM, ~{duration} min")
+        return allocation
+    
     def _get_fallback_allocation(self, module_name: str, domain_count: int) -> ResourceAllocation:
         """Get fallback resource allocation when calculation fails."""
         
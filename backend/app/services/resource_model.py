@@ -0,0 +1,435 @@
+"""
+Resource Model - Task Sizing and Durations Learned from Completed Jobs
+
+Task sizes came from the static `calculate_module_resources` SQL function
+plus hand-tuned multipliers (ModuleResourceCalculator, BatchOptimizer), and
+streaming pipelines launched every task at 1 vCPU / 2 GB with a fixed
+timeout per module. None of it looked at how long jobs actually took.
+
+This model is fitted on finished `batch_scan_jobs` rows. Per module it
+regresses the log of the job duration on the log of its input size (domains,
+subdomains) and of its allocation (vCPU, memory GB):
+
+    log(seconds) = b0 + b1·log1p(domains) + b2·log1p(subdomains) + b3·log2(vCPU) + b4·log2(GB)
+
+The fit is a small vectorized NumPy ridge regression, refitted in the background
+every `resource_model_refit_interval` seconds and cached in memory, so
+launch-time lookups never touch the database:
+
+    resource_model.predict_duration("dnsx", domains=40)      # seconds or None
+    resource_model.recommend("dnsx", domains=40)             # cheapest size meeting the target
+    resource_model.timeout_seconds("katana", domains=40, cpu=1024, memory=2048)
+
+Only sizes the module has already run at (often enough, and successfully
+enough) are recommended: the model interpolates durations, it does not
+guess how an untried size behaves. Modules without enough history return
+None and callers keep their static sizing.
+
+`backtest()` refits on the older part of the history and reports predicted
+vs actual durations on the newest part, next to the static estimate
+(`scripts/resource-model-backtest.py` prints it).
+"""
+import asyncio
+import logging
+import math
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..core.config import settings
+from ..core.supabase_client import supabase_client
+
+logger = logging.getLogger(__name__)
+
+# One-sided z for the duration upper bound used by timeouts (~95th percentile)
+UPPER_Z = 1.645
+
+# Allocation bounds of BatchScanJob / ResourceProfile
+MAX_CPU_UNITS = 4096
+MAX_MEMORY_MB = 8192
+
+HISTORY_COLUMNS = (
+    "module, status, total_domains, allocated_cpu, allocated_memory, "
+    "estimated_duration_minutes, started_at, completed_at, metadata"
+)
+
+
+@dataclass
+class JobSample:
+    """One finished batch scan job, as the model sees it."""
+    module: str
+    domains: int
+    subdomains: int
+    cpu: int
+    memory: int
+    seconds: float
+    success: bool
+    completed_at: datetime
+    static_estimate_seconds: Optional[float] = None
+
+    def features(self) -> List[float]:
+        return _features(self.domains, self.subdomains, self.cpu, self.memory)
+
+
+@dataclass
+class ModuleFit:
+    """Fitted duration model of one module."""
+    module: str
+    coefficients: List[float]
+    residual_std: float
+    samples: int
+    # "cpu/memory" → {"runs": int, "completed": int}
+    sizes: Dict[str, Dict[str, int]] = field(default_factory=dict)
+
+    def log_seconds(self, domains: int, subdomains: int, cpu: int, memory: int) -> float:
+        features = _features(domains, subdomains, cpu, memory)
+        return sum(b * x for b, x in zip(self.coefficients, features))
+
+    def predict(self, domains: int, subdomains: int, cpu: int, memory: int) -> float:
+        return math.exp(self.log_seconds(domains, subdomains, cpu, memory))
+
+    def upper(self, domains: int, subdomains: int, cpu: int, memory: int) -> float:
+        return math.exp(self.log_seconds(domains, subdomains, cpu, memory) + UPPER_Z * self.residual_std)
+
+    def candidate_sizes(self) -> List[Tuple[int, int]]:
+        """Sizes the module ran at often and reliably enough to recommend."""
+        candidates = []
+        for size, stats in self.sizes.items():
+            cpu, memory = (int(part) for part in size.split("/"))
+            if cpu > MAX_CPU_UNITS or memory > MAX_MEMORY_MB:
+                continue
+            if stats["runs"] < settings.resource_model_min_size_runs:
+                continue
+            if stats["completed"] / stats["runs"] < settings.resource_model_min_success_rate:
+                continue
+            candidates.append((cpu, memory))
+        return sorted(candidates)
+
+
+@dataclass
+class SizeRecommendation:
+    """Cheapest observed Fargate size for a job, by predicted duration."""
+    module: str
+    cpu: int
+    memory: int
+    predicted_seconds: float
+    estimated_cost: float
+    target_seconds: float
+    meets_target: bool
+    samples: int
+
+    @property
+    def estimated_duration_minutes(self) -> int:
+        return max(1, math.ceil(self.predicted_seconds / 60))
+
+    def dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _features(domains: int, subdomains: int, cpu: int, memory: int) -> List[float]:
+    return [
+        1.0,
+        math.log1p(max(domains, 0)),
+        math.log1p(max(subdomains, 0)),
+        math.log2(cpu / 1024),
+        math.log2(memory / 1024),
+    ]
+
+
+def _parse_time(value: Any) -> Optional[datetime]:
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value.replace(tzinfo=None)
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).replace(tzinfo=None)
+    except ValueError:
+        return None
+
+
+def sample_from_row(row: Dict[str, Any]) -> Optional[JobSample]:
+    """Build a sample from a batch_scan_jobs row (None if it has no usable duration)."""
+    started_at = _parse_time(row.get("started_at"))
+    completed_at = _parse_time(row.get("completed_at"))
+    if started_at is None or completed_at is None:
+        return None
+    seconds = (completed_at - started_at).total_seconds()
+    if seconds <= 0:
+        return None
+    metadata = row.get("metadata") or {}
+    estimate = row.get("estimated_duration_minutes")
+    return JobSample(
+        module=row["module"],
+        domains=int(row.get("total_domains") or 0),
+        subdomains=int(metadata.get("subdomain_count") or 0),
+        cpu=int(row.get("allocated_cpu") or 1024),
+        memory=int(row.get("allocated_memory") or 2048),
+        seconds=seconds,
+        success=row.get("status") == "completed",
+        completed_at=completed_at,
+        static_estimate_seconds=float(estimate) * 60 if estimate else None
+    )
+
+
+def _solve_ridge(rows: Sequence[Sequence[float]], targets: Sequence[float], ridge: float) -> List[float]:
+    """
+    Solve (XᵀX + λI)β = Xᵀy (intercept not penalized).
+
+    The ridge term keeps the solve well-posed when a module always ran at
+    the same size (its vCPU/memory columns are then constant).
+    """
+    X = np.asarray(rows, dtype=float)
+    y = np.asarray(targets, dtype=float)
+    penalty = ridge * np.eye(X.shape[1])
+    penalty[0, 0] = 0.0
+    return np.linalg.solve(X.T @ X + penalty, X.T @ y).tolist()
+
+
+def _residual_std(rows: Sequence[Sequence[float]], targets: Sequence[float], beta: Sequence[float]) -> float:
+    residuals = np.asarray(targets, dtype=float) - np.asarray(rows, dtype=float) @ np.asarray(beta, dtype=float)
+    return float(np.sqrt(np.mean(residuals ** 2)))
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class ResourceModel:
+    """In-memory per-module duration models, refitted from job history."""
+
+    def __init__(self, supabase: Any = None, clock=time.time):
+        self.supabase = supabase or supabase_client.async_service_client
+        self.clock = clock
+        self.fits: Dict[str, ModuleFit] = {}
+        self.fitted_at: Optional[float] = None
+        self.last_backtest: Optional[Dict[str, Any]] = None
+        self._task: Optional[asyncio.Task] = None
+
+    # ================================================================
+    # Fitting
+    # ================================================================
+
+    def fit(self, samples: Iterable[JobSample]) -> Dict[str, ModuleFit]:
+        """Fit every module with at least `resource_model_min_samples` completed jobs."""
+        by_module: Dict[str, List[JobSample]] = {}
+        for sample in samples:
+            by_module.setdefault(sample.module, []).append(sample)
+
+        fits = {}
+        for module, module_samples in by_module.items():
+            completed = [s for s in module_samples if s.success]
+            if len(completed) < settings.resource_model_min_samples:
+                continue
+            rows = [s.features() for s in completed]
+            targets = [math.log(s.seconds) for s in completed]
+            beta = _solve_ridge(rows, targets, settings.resource_model_ridge)
+
+            sizes: Dict[str, Dict[str, int]] = {}
+            for s in module_samples:
+                stats = sizes.setdefault(f"{s.cpu}/{s.memory}", {"runs": 0, "completed": 0})
+                stats["runs"] += 1
+                stats["completed"] += int(s.success)
+
+            fits[module] = ModuleFit(
+                module=module,
+                coefficients=beta,
+                residual_std=_residual_std(rows, targets, beta),
+                samples=len(completed),
+                sizes=sizes
+            )
+        return fits
+
+    async def load_history(self) -> List[JobSample]:
+        """Most recent finished batch scan jobs (`resource_model_history_limit` rows)."""
+        response = await self.supabase.table("batch_scan_jobs").select(HISTORY_COLUMNS).in_(
+            "status", ["completed", "failed"]
+        ).order("completed_at", desc=True).limit(settings.resource_model_history_limit).execute()
+        samples = [sample_from_row(row) for row in response.data or []]
+        return [sample for sample in samples if sample is not None]
+
+    async def refit(self) -> Dict[str, Any]:
+        """Reload history, backtest, and swap in freshly fitted models."""
+        started = time.perf_counter()
+        samples = await self.load_history()
+        self.last_backtest = self.backtest(samples)
+        self.fits = self.fit(samples)
+        self.fitted_at = self.clock()
+        logger.info(
+            f"📐 Resource model refitted on {len(samples)} jobs in {time.perf_counter() - started:.2f}s "
+            f"({', '.join(sorted(self.fits)) or 'no module has enough history yet'})"
+        )
+        return self.get_status()
+
+    # ================================================================
+    # Predictions
+    # ================================================================
+
+    def _fit_for(self, module: str) -> Optional[ModuleFit]:
+        if not settings.resource_model_enabled:
+            return None
+        return self.fits.get(module)
+
+    def predict_duration(
+        self, module: str, domains: int, subdomains: int = 0, cpu: int = 1024, memory: int = 2048
+    ) -> Optional[float]:
+        """Predicted duration in seconds (None without a fitted model)."""
+        fit = self._fit_for(module)
+        return fit.predict(domains, subdomains, cpu, memory) if fit else None
+
+    def timeout_seconds(
+        self, module: str, domains: int, subdomains: int = 0, cpu: int = 1024, memory: int = 2048
+    ) -> Optional[int]:
+        """Timeout covering the ~95th percentile duration with headroom (None without a model)."""
+        fit = self._fit_for(module)
+        if fit is None:
+            return None
+        return int(fit.upper(domains, subdomains, cpu, memory) * settings.resource_model_timeout_factor)
+
+    def target_seconds(self, module: str, priority: Optional[int] = None) -> float:
+        """
+        Duration a job should finish within: a fraction of the module's
+        timeout, tighter for high priority and looser for low priority
+        (the same ±20% the static strategies apply to durations).
+        """
+        from .scan_pipeline import ScanPipeline
+
+        target = ScanPipeline.MODULE_TIMEOUTS.get(module, 1800) * settings.resource_model_target_fraction
+        if priority is not None and priority <= 2:
+            target *= 0.8
+        elif priority is not None and priority >= 4:
+            target *= 1.2
+        return target
+
+    def recommend(
+        self,
+        module: str,
+        domains: int,
+        subdomains: int = 0,
+        target_seconds: Optional[float] = None,
+        priority: Optional[int] = None
+    ) -> Optional[SizeRecommendation]:
+        """
+        Cheapest candidate size whose predicted duration meets the target.
+
+        When no candidate meets it, the fastest candidate is returned with
+        meets_target=False. None without a fitted model or candidate sizes.
+        """
+        fit = self._fit_for(module)
+        if fit is None:
+            return None
+        target = target_seconds if target_seconds is not None else self.target_seconds(module, priority)
+
+        options = []
+        for cpu, memory in fit.candidate_sizes():
+            seconds = fit.predict(domains, subdomains, cpu, memory)
+            hourly = cpu / 1024 * settings.fargate_vcpu_hour_price + memory / 1024 * settings.fargate_gb_hour_price
+            options.append((seconds, hourly * seconds / 3600, cpu, memory))
+        if not options:
+            return None
+
+        meeting = [option for option in options if option[0] <= target]
+        seconds, cost, cpu, memory = (
+            min(meeting, key=lambda o: (o[1], o[0])) if meeting else min(options, key=lambda o: (o[0], o[1]))
+        )
+        return SizeRecommendation(
+            module=module,
+            cpu=cpu,
+            memory=memory,
+            predicted_seconds=seconds,
+            estimated_cost=cost,
+            target_seconds=target,
+            meets_target=bool(meeting),
+            samples=fit.samples
+        )
+
+    # ================================================================
+    # Backtest
+    # ================================================================
+
+    def backtest(self, samples: Sequence[JobSample], holdout_fraction: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Fit on the older jobs and compare predicted vs actual durations of the
+        newest `holdout_fraction` of completed jobs, per module.
+
+        Errors are absolute percentage errors; `static_mape` is the same
+        metric for the estimate stored on the job at creation.
+        """
+        holdout_fraction = holdout_fraction if holdout_fraction is not None else settings.resource_model_holdout_fraction
+        completed = sorted((s for s in samples if s.success), key=lambda s: s.completed_at)
+        split = int(len(completed) * (1 - holdout_fraction))
+        if not completed or split == len(completed):
+            return {"train_jobs": len(completed), "test_jobs": 0, "modules": {}}
+        cutoff = completed[split].completed_at
+        train = [s for s in samples if s.completed_at < cutoff]
+        test = completed[split:]
+        fits = self.fit(train)
+
+        modules: Dict[str, Any] = {}
+        for module in sorted({s.module for s in test}):
+            fit = fits.get(module)
+            module_test = [s for s in test if s.module == module]
+            if fit is None:
+                modules[module] = {"test_jobs": len(module_test), "fitted": False}
+                continue
+            errors, covered, static_errors = [], 0, []
+            for s in module_test:
+                predicted = fit.predict(s.domains, s.subdomains, s.cpu, s.memory)
+                errors.append(abs(predicted - s.seconds) / s.seconds)
+                covered += int(s.seconds <= fit.upper(s.domains, s.subdomains, s.cpu, s.memory))
+                if s.static_estimate_seconds:
+                    static_errors.append(abs(s.static_estimate_seconds - s.seconds) / s.seconds)
+            modules[module] = {
+                "fitted": True,
+                "train_jobs": fit.samples,
+                "test_jobs": len(module_test),
+                "mape": round(sum(errors) / len(errors), 4),
+                "median_ape": round(_percentile(errors, 0.5), 4),
+                "p90_ape": round(_percentile(errors, 0.9), 4),
+                "upper_bound_coverage": round(covered / len(module_test), 4),
+                "static_mape": round(sum(static_errors) / len(static_errors), 4) if static_errors else None,
+            }
+        return {"train_jobs": len(train), "test_jobs": len(test), "cutoff": cutoff.isoformat(), "modules": modules}
+
+    # ================================================================
+    # Background Refit
+    # ================================================================
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refit()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"⚠️  Resource model refit failed: {str(e)}")
+            await asyncio.sleep(settings.resource_model_refit_interval)
+
+    def start(self) -> None:
+        if settings.resource_model_enabled and self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def shutdown(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "enabled": settings.resource_model_enabled,
+            "fitted_at": self.fitted_at,
+            "modules": {
+                module: {"samples": fit.samples, "residual_std": round(fit.residual_std, 4),
+                         "candidate_sizes": [f"{cpu}/{memory}" for cpu, memory in fit.candidate_sizes()]}
+                for module, fit in sorted(self.fits.items())
+            },
+            "backtest": self.last_backtest,
+        }
+
+
+# Create singleton instance
+resource_model = ResourceModel()
@@ -0,0 +1,281 @@
+"""
+Result Cache - Shared Redis Cache for LEAN Read Endpoints
+
+In the LEAN model every authenticated user sees the same data, so read
+endpoints like /programs, /usage/recon-data and the stats summaries compute
+identical results for every caller. This module caches those results in
+Redis (shared by all API tasks) instead of recomputing them per request.
+
+Invalidation is version based rather than key based:
+- Every asset has a data version (`rc:ver:<asset_id>`), plus a global
+  version (`rc:ver:global`) for cross-asset views
+- Cache keys embed the version, so bumping it (when a scan job for the
+  asset reaches a terminal status) makes old entries unreachable; they
+  simply age out via their TTL
+
+Entries are served stale-while-revalidate: after `ttl` seconds an entry is
+still returned for up to `stale_ttl` more seconds while a single background
+task recomputes it. Oversized results are not cached, the number of cached
+keys is capped, and hit/miss/stale counters are kept per namespace.
+
+Redis problems never fail a request: the cache falls through to computing
+the result directly.
+"""
+import asyncio
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import time
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from ..core.config import settings
+from .single_flight import single_flight
+
+logger = logging.getLogger(__name__)
+
+
+class ResultCache:
+    """
+    Versioned, stale-while-revalidate result cache on top of the shared
+    async Redis client.
+    """
+
+    KEY_PREFIX = "rc"
+    GLOBAL_SCOPE = "global"
+    LOCK_SECONDS = 30
+    RECONNECT_BACKOFF_SECONDS = 30
+
+    def __init__(
+        self,
+        redis_provider: Optional[Callable[[], Awaitable[Any]]] = None,
+        enabled: Optional[bool] = None,
+        ttl_seconds: Optional[int] = None,
+        stale_ttl_seconds: Optional[int] = None,
+        max_entry_bytes: Optional[int] = None,
+        max_entries: Optional[int] = None
+    ):
+        self._redis_provider = redis_provider
+        self.enabled = enabled if enabled is not None else settings.result_cache_enabled
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.result_cache_ttl
+        self.stale_ttl_seconds = stale_ttl_seconds if stale_ttl_seconds is not None else settings.result_cache_stale_ttl
+        self.max_entry_bytes = max_entry_bytes if max_entry_bytes is not None else settings.result_cache_max_entry_bytes
+        self.max_entries = max_entries if max_entries is not None else settings.result_cache_max_entries
+        self.counters: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self._refreshing: Dict[str, asyncio.Task] = {}
+        self._unavailable_until = 0.0
+
+    # ================================================================
+    # Redis Access
+    # ================================================================
+
+    async def _redis(self):
+        """Shared Redis client, or None (with a reconnect backoff) when unavailable."""
+        if not self.enabled or time.monotonic() < self._unavailable_until:
+            return None
+
+        if self._redis_provider is None:
+            # Reuse the auth service's client (same connection settings, decode_responses=True)
+            from .auth_service import auth_service
+            self._redis_provider = auth_service.get_redis
+
+        client = await self._redis_provider()
+        if client is None:
+            self._mark_unavailable()
+        return client
+
+    def _mark_unavailable(self) -> None:
+        self._unavailable_until = time.monotonic() + self.RECONNECT_BACKOFF_SECONDS
+
+    # ================================================================
+    # Versions
+    # ================================================================
+
+    def _version_key(self, asset_id: Optional[str]) -> str:
+        return f"{self.KEY_PREFIX}:ver:{asset_id or self.GLOBAL_SCOPE}"
+
+    async def get_version(self, redis_client, asset_id: Optional[str] = None) -> int:
+        """Current data version for an asset (or the global scope)."""
+        value = await redis_client.get(self._version_key(asset_id))
+        return int(value) if value else 0
+
+    async def bump_asset_version(self, asset_id: Optional[str]) -> None:
+        """
+        Invalidate cached results for an asset.
+
+        Also bumps the global version, since cross-asset views (program
+        lists, dashboard totals) include the asset's data.
+        """
+        try:
+            redis_client = await self._redis()
+            if redis_client is None:
+                return
+
+            pipe = redis_client.pipeline(transaction=False)
+            if asset_id:
+                pipe.incr(self._version_key(asset_id))
+            pipe.incr(self._version_key(None))
+            await pipe.execute()
+            logger.info(f"🧹 Result cache invalidated for asset {asset_id or '*'}")
+        except Exception as e:
+            logger.warning(f"⚠️ Failed to bump result cache version for {asset_id}: {str(e)}")
+
+    # ================================================================
+    # Read-Through API
+    # ================================================================
+
+    def cache_key(self, namespace: str, params: Dict[str, Any], version: int, asset_id: Optional[str] = None) -> str:
+        """Key for a namespace + parameter set at a data version (None params are ignored)."""
+        active = {k: v for k, v in params.items() if v is not None}
+        digest = hashlib.sha1(json.dumps(active, sort_keys=True, default=str).encode()).hexdigest()
+        return f"{self.KEY_PREFIX}:{namespace}:{asset_id or self.GLOBAL_SCOPE}:v{version}:{digest}"
+
+    async def get_or_compute(
+        self,
+        namespace: str,
+        params: Dict[str, Any],
+        compute: Callable[[], Awaitable[Any]],
+        asset_id: Optional[str] = None,
+        ttl: Optional[int] = None
+    ) -> Any:
+        """
+        Return the cached result for (namespace, params), computing it on a miss.
+
+        Args:
+            namespace: Logical result family (e.g. "url_stats")
+            params: Everything the result depends on (must be JSON-serializable)
+            compute: Coroutine factory producing the JSON-serializable result
+            asset_id: Scope the entry to this asset's data version
+                (None = global version, invalidated by any asset)
+            ttl: Fresh lifetime override in seconds
+
+        A hit returns the JSON-decoded result, so callers should return plain
+        dicts/lists (or rebuild response models from them).
+        """
+        counters = self.counters[namespace]
+        ttl = ttl if ttl is not None else self.ttl_seconds
+
+        try:
+            redis_client = await self._redis()
+            if redis_client is not None:
+                version = await self.get_version(redis_client, asset_id)
+                key = self.cache_key(namespace, params, version, asset_id)
+                raw = await redis_client.get(key)
+        except Exception as e:
+            logger.warning(f"⚠️ Result cache read failed for {namespace}: {str(e)}")
+            self._mark_unavailable()
+            counters["errors"] += 1
+            redis_client = None
+
+        if redis_client is None:
+            counters["bypass"] += 1
+            return await compute()
+
+        if raw is not None:
+            try:
+                entry = json.loads(raw)
+                if entry["fresh_until"] >= time.time():
+                    counters["hits"] += 1
+                    return entry["value"]
+
+                # Stale: serve it now, recompute once in the background
+                counters["stale"] += 1
+                self._schedule_refresh(redis_client, key, compute, ttl)
+                return entry["value"]
+            except (ValueError, KeyError, TypeError):
+                logger.warning(f"⚠️ Discarding malformed result cache entry {key}")
+
+        # Miss: concurrent identical misses (in this process and across API
+        # tasks) share one computation
+        counters["misses"] += 1
+        return await single_flight.do(
+            namespace, {"key": key}, lambda: self._fill(redis_client, key, compute, ttl), redis_client=redis_client
+        )
+
+    async def _fill(self, redis_client, key: str, compute: Callable[[], Awaitable[Any]], ttl: int) -> Any:
+        value = await compute()
+        await self._store(redis_client, key, value, ttl)
+        return value
+
+    def _schedule_refresh(self, redis_client, key: str, compute: Callable[[], Awaitable[Any]], ttl: int) -> None:
+        """Recompute a stale entry in the background (one refresh per key per task)."""
+        if key in self._refreshing:
+            return
+        task = asyncio.create_task(self._refresh(redis_client, key, compute, ttl))
+        self._refreshing[key] = task
+        task.add_done_callback(lambda _: self._refreshing.pop(key, None))
+
+    async def _refresh(self, redis_client, key: str, compute: Callable[[], Awaitable[Any]], ttl: int) -> None:
+        lock_key = f"{key}:lock"
+        try:
+            # Only one API task across the fleet refreshes a given key
+            if not await redis_client.set(lock_key, "1", nx=True, ex=self.LOCK_SECONDS):
+                return
+            try:
+                value = await compute()
+                await self._store(redis_client, key, value, ttl)
+                logger.debug(f"🔄 Refreshed stale result cache entry {key}")
+            finally:
+                await redis_client.delete(lock_key)
+        except Exception as e:
+            logger.warning(f"⚠️ Background result cache refresh failed for {key}: {str(e)}")
+
+    async def _store(self, redis_client, key: str, value: Any, ttl: int) -> None:
+        """Write an entry, skipping oversized results and trimming the oldest keys."""
+        namespace = key.split(":", 2)[1]
+        try:
+            payload = json.dumps({"fresh_until": time.time() + ttl, "value": value}, default=str)
+            if len(payload) > self.max_entry_bytes:
+                self.counters[namespace]["oversize"] += 1
+                logger.debug(f"📦 Result for {key} is {len(payload)} bytes; not cached")
+                return
+
+            index_key = f"{self.KEY_PREFIX}:index"
+            pipe = redis_client.pipeline(transaction=False)
+            pipe.set(key, payload, ex=ttl + self.stale_ttl_seconds)
+            pipe.zadd(index_key, {key: time.time()})
+            pipe.zcard(index_key)
+            results = await pipe.execute()
+
+            overflow = results[-1] - self.max_entries
+            if overflow > 0:
+                evicted = [member for member, _ in await redis_client.zpopmin(index_key, overflow)]
+                if evicted:
+                    await redis_client.delete(*evicted)
+        except Exception as e:
+            logger.warning(f"⚠️ Result cache write failed for {key}: {str(e)}")
+            self.counters[namespace]["errors"] += 1
+
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        """Per-namespace hit/miss/stale/bypass/oversize/error counters for this process."""
+        return {namespace: dict(counts) for namespace, counts in self.counters.items()}
+
+
+def cached_result(namespace: str, asset_arg: Optional[str] = "asset_id", ttl: Optional[int] = None,
+                  exclude: tuple = ("self", "user_id", "current_user")):
+    """
+    Decorator form of `ResultCache.get_or_compute` for async functions.
+
+    The bound arguments (minus `exclude`) form the cache params; the value
+    of `asset_arg`, when given, scopes the entry to that asset's data version.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            params = {k: v for k, v in bound.arguments.items() if k not in exclude}
+            asset_id = bound.arguments.get(asset_arg) if asset_arg else None
+            return await result_cache.get_or_compute(
+                namespace, params, lambda: func(*args, **kwargs), asset_id=asset_id, ttl=ttl
+            )
+        return wrapper
+    return decorator
+
+
+# Create singleton instance
+result_cache = ResultCache()
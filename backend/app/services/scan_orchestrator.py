@@ -29,8 +29,12 @@ from typing import Dict, Any, List, Optional
 from fastapi import HTTPException, status
 
 from ..schemas.assets import EnhancedAssetScanRequest
+from ..core.config import settings
 from ..core.supabase_client import supabase_client
+from .consumer_fleet import SharedConsumerFleet, shared_modules
 from .scan_pipeline import scan_pipeline
+from .result_cache import result_cache
+from .mv_refresh_scheduler import mv_refresh_scheduler
 
 
 logger = logging.getLogger(__name__)
@@ -53,7 +57,7 @@ class ScanOrchestrator:
     
     def __init__(self):
         self.logger = logging.getLogger(__name__)
-        self.supabase = supabase_client.service_client
+        self.supabase = supabase_client.async_service_client
     
     async def execute_scan(
         self,
@@ -239,7 +243,7 @@ class ScanOrchestrator:
             self.logger.info(f"[{correlation_id}] 🔍 Validating asset: {asset_id}")
             
             # Fetch asset from database
-            asset_response = self.supabase.table("assets").select(
+            asset_response = await self.supabase.table("assets").select(
                 "id, name, user_id"
             ).eq("id", asset_id).eq("user_id", user_id).execute()
             
@@ -262,7 +266,7 @@ class ScanOrchestrator:
             if config.active_domains_only:
                 domains_query = domains_query.eq("is_active", True)
             
-            domains_response = domains_query.execute()
+            domains_response = await domains_query.execute()
             
             if not domains_response.data:
                 self.logger.warning(
@@ -344,7 +348,7 @@ class ScanOrchestrator:
             }
         }
         
-        response = self.supabase.table("scans").insert(scan_record).execute()
+        response = await self.supabase.table("scans").insert(scan_record).execute()
         
         if not response.data:
             raise HTTPException(
@@ -390,14 +394,18 @@ class ScanOrchestrator:
                 f"[{correlation_id}] ⚡ Launching {len(prepared_assets)} parallel pipelines"
             )
             
+            fleets = self._plan_fleets(scan_id, prepared_assets, correlation_id)
+            
             pipeline_tasks = []
             for asset_id, asset_data in prepared_assets.items():
                 modules = asset_data["modules"]
                 config = asset_data["config"]
+                fleet = fleets.get(asset_id)
                 
                 self.logger.info(
                     f"[{correlation_id}] 🚀 Asset {asset_data['asset_name']}: "
-                    f"Streaming pipeline (parallel execution)"
+                    f"Streaming pipeline (parallel execution"
+                    f"{', shared fleet ' + fleet.fleet_id if fleet else ''})"
                 )
                 
                 # Execute streaming pipeline (single execution path)
@@ -406,18 +414,29 @@ class ScanOrchestrator:
                     modules=modules,
                     scan_request=config,
                     user_id=user_id,
-                    scan_job_id=scan_id
+                    scan_job_id=scan_id,
+                    fleet=fleet
                 )
+                if fleet is not None:
+                    task = self._run_in_fleet(fleet, asset_id, task)
                 
                 pipeline_tasks.append((asset_id, asset_data["asset_name"], task))
             
             # Execute all pipelines in parallel
             self.logger.info(f"[{correlation_id}] ⏳ Waiting for pipelines to complete...")
             
-            results = await asyncio.gather(
-                *[task for _, _, task in pipeline_tasks],
-                return_exceptions=True
-            )
+            try:
+                results = await asyncio.gather(
+                    *[task for _, _, task in pipeline_tasks],
+                    return_exceptions=True
+                )
+            finally:
+                fleet_summaries = []
+                for fleet in {id(f): f for f in fleets.values()}.values():
+                    try:
+                        fleet_summaries.append(await fleet.close())
+                    except Exception as e:
+                        self.logger.warning(f"[{correlation_id}] ⚠️  Closing fleet {fleet.fleet_id} failed: {str(e)}")
             
             # ============================================================
             # Process Results
@@ -458,7 +477,8 @@ class ScanOrchestrator:
                     "successful_assets": successful_assets,
                     "failed_assets": failed_assets,
                     "total_subdomains": total_subdomains,
-                    "duration_seconds": duration
+                    "duration_seconds": duration,
+                    "consumer_fleets": fleet_summaries
                 }
             })
             
@@ -480,6 +500,61 @@ class ScanOrchestrator:
                 "completed_at": datetime.utcnow().isoformat(),
                 "error": str(e)
             })
+        
+        finally:
+            # Scan reached a terminal status: invalidate cached read results
+            # and schedule the debounced materialized view refresh
+            for asset_id in prepared_assets:
+                await result_cache.bump_asset_version(asset_id)
+                mv_refresh_scheduler.notify_scan_completed(asset_id)
+    
+    def _plan_fleets(
+        self,
+        scan_id: str,
+        prepared_assets: Dict[str, Dict[str, Any]],
+        correlation_id: str
+    ) -> Dict[str, SharedConsumerFleet]:
+        """
+        Group assets that can share Subfinder-stage consumers.
+        
+        Assets with the same module set share one fleet when there are at
+        least consumer_fleet_min_assets of them.
+        
+        Returns:
+            asset_id → fleet (assets running their own consumers are absent)
+        """
+        if not settings.consumer_fleet_enabled:
+            return {}
+        
+        by_modules: Dict[tuple, List[str]] = {}
+        for asset_id, asset_data in prepared_assets.items():
+            by_modules.setdefault(tuple(sorted(asset_data["modules"])), []).append(asset_id)
+        
+        fleets = {}
+        for modules, asset_ids in by_modules.items():
+            fleet_modules = shared_modules(list(modules))
+            if len(asset_ids) < settings.consumer_fleet_min_assets or not fleet_modules:
+                continue
+            fleet_scan_id = scan_id if len(by_modules) == 1 else f"{scan_id}-{len(fleets) + 1}"
+            fleet = SharedConsumerFleet(
+                scan_id=fleet_scan_id,
+                modules=fleet_modules,
+                expected_assets=len(asset_ids)
+            )
+            self.logger.info(
+                f"[{correlation_id}] 🚢 Fleet {fleet.fleet_id}: {len(asset_ids)} assets share "
+                f"{', '.join(fleet_modules)} ({fleet.initial_tasks} task(s) each to start)"
+            )
+            fleets.update({asset_id: fleet for asset_id in asset_ids})
+        
+        return fleets
+    
+    async def _run_in_fleet(self, fleet: SharedConsumerFleet, asset_id: str, pipeline) -> Dict[str, Any]:
+        """Run an asset pipeline; if it ends before joining, the fleet stops waiting for it."""
+        try:
+            return await pipeline
+        finally:
+            fleet.withdraw(asset_id)
     
     async def _update_scan_status(
         self,
@@ -498,7 +573,7 @@ class ScanOrchestrator:
         update_data = {"status": status, **additional_data}
         
         try:
-            self.supabase.table("scans").update(update_data).eq("id", scan_id).execute()
+            await self.supabase.table("scans").update(update_data).eq("id", scan_id).execute()
         except Exception as e:
             self.logger.error(f"Failed to update scan status {scan_id}: {e}")
     
@@ -516,7 +591,7 @@ class ScanOrchestrator:
         Raises:
             HTTPException: 404 if scan not found or access denied
         """
-        response = self.supabase.table("scans").select("*").eq(
+        response = await self.supabase.table("scans").select("*").eq(
             "id", scan_id
         ).eq("user_id", user_id).execute()
         
@@ -31,18 +31,25 @@ Breaking Change: Sequential pipeline removed, streaming-only architecture
 Update: Removed duplicate execution paths, fixed Bug 4 (missing await)
 """
 
-from typing import List, Dict, Any, Optional, Set
+from typing import List, Dict, Any, Optional, Set, Callable, Awaitable
 from datetime import datetime, timedelta
 import asyncio
 import logging
 from uuid import UUID
 
-from ..core.supabase_client import SupabaseClient
+from ..core.config import settings
+from ..core.supabase_client import supabase_client
 from ..schemas.assets import EnhancedAssetScanRequest
 from ..schemas.recon import ReconModule
 from ..schemas.batch import BatchScanJob
 from .module_registry import module_registry
 from .module_config_loader import get_module_config
+from .result_cache import result_cache
+from .mv_refresh_scheduler import mv_refresh_scheduler
+from .job_events import job_status_events
+from .pipeline_context import PipelineContext
+from .pipeline_checkpoint import PipelineCheckpoint, pipeline_checkpoints, TERMINAL_STATUSES
+from .resource_model import resource_model
 
 logger = logging.getLogger(__name__)
 
@@ -63,7 +70,7 @@ class ScanPipeline:
     
     Features:
     - Automatic dependency resolution (topological sort)
-    - Sequential execution with polling
+    - Completion tracking via job status events (polling fallback)
     - Timeout handling
     - Error propagation
     - Progress tracking
@@ -84,7 +91,8 @@ class ScanPipeline:
     # See: backend/app/services/module_config_loader.py
     # This eliminates Layer 4 of the 7-layer issue
     
-    # Timeout per module (seconds)
+    # Timeout per module (seconds). A floor: jobs the resource model predicts
+    # to run longer get a longer timeout (see _module_timeout)
     MODULE_TIMEOUTS = {
         "subfinder": 600,       # 10 minutes
         "dnsx": 1800,           # 30 minutes (increased for large assets with 400+ subdomains)
@@ -99,7 +107,8 @@ class ScanPipeline:
     # These modules take apex domains as input and produce different outputs
     PARALLEL_PRODUCERS = {"subfinder", "waymore"}
     
-    # Polling interval for checking scan completion (seconds)
+    # Polling interval for checking scan completion while job status
+    # events are unavailable (seconds)
     POLL_INTERVAL = 5
     
     # Default pipeline timeout (seconds) - can be overridden per-scan
@@ -107,9 +116,29 @@ class ScanPipeline:
     DEFAULT_PIPELINE_TIMEOUT = 10800  # 3 hours
     
     def __init__(self):
-        self.supabase = SupabaseClient().service_client
+        self.supabase = supabase_client.async_service_client
         self.logger = logging.getLogger(__name__)
     
+    def _module_timeout(self, job: BatchScanJob) -> int:
+        """
+        Timeout of one module job: its static MODULE_TIMEOUTS entry, raised to
+        the resource model's upper duration estimate (with headroom) when the
+        job is predicted to run longer.
+        """
+        static = self.MODULE_TIMEOUTS.get(job.module, self.DEFAULT_PIPELINE_TIMEOUT)
+        predicted = resource_model.timeout_seconds(
+            job.module,
+            domains=job.total_domains,
+            subdomains=job.metadata.get("subdomain_count", 0),
+            cpu=job.allocated_cpu,
+            memory=job.allocated_memory
+        )
+        return max(static, predicted or 0)
+    
+    def _pipeline_timeout(self, jobs) -> int:
+        """Default pipeline timeout, extended for jobs predicted to outlast it."""
+        return max([self.DEFAULT_PIPELINE_TIMEOUT, *(self._module_timeout(job) for job in jobs)])
+    
     def _resolve_execution_order(self, modules: List[str]) -> List[str]:
         """
         Topological sort of modules based on dependencies.
@@ -230,7 +259,7 @@ class ScanPipeline:
         self.logger.info(f"🚀 Launching {module} scan for asset {asset_id}")
         
         # Step 1: Fetch asset data
-        asset_response = self.supabase.table('assets').select('*').eq(
+        asset_response = await self.supabase.table('assets').select('*').eq(
             'id', asset_id
         ).eq('user_id', user_id).single().execute()
         
@@ -240,7 +269,7 @@ class ScanPipeline:
         asset = asset_response.data
         
         # Step 2: Fetch domains for this asset
-        domains_result = self.supabase.table('apex_domains').select(
+        domains_result = await self.supabase.table('apex_domains').select(
             'id, domain, is_active'
         ).eq('asset_id', asset_id).execute()
         
@@ -266,7 +295,7 @@ class ScanPipeline:
         if module == "dnsx":
             # DNSX scans discovered subdomains, not apex domains
             # Check subdomain count
-            subdomain_count_query = self.supabase.table('subdomains').select(
+            subdomain_count_query = await self.supabase.table('subdomains').select(
                 'id', count='exact'
             ).eq('asset_id', asset_id).execute()
             
@@ -331,7 +360,7 @@ class ScanPipeline:
             }
             
             # Insert asset_scan_job record
-            self.supabase.table("asset_scan_jobs").insert(asset_scan_record).execute()
+            await self.supabase.table("asset_scan_jobs").insert(asset_scan_record).execute()
             self.logger.info(f"✅ Created asset_scan_job record: {asset_scan_id}")
         else:
             self.logger.info(f"♻️  Reusing existing asset_scan_job record: {asset_scan_id}")
@@ -363,7 +392,7 @@ class ScanPipeline:
         }
         
         # Insert batch_scan_job record
-        self.supabase.table("batch_scan_jobs").insert(batch_job_record).execute()
+        await self.supabase.table("batch_scan_jobs").insert(batch_job_record).execute()
         
         # Step 6: Launch ECS task via workflow orchestrator (DIRECT CALL - NO RECURSION)
         self.logger.info(f"🚀 Launching {module} batch via workflow orchestrator (batch_id: {batch_id})")
@@ -396,12 +425,12 @@ class ScanPipeline:
             self.logger.error(f"❌ Failed to launch {module} batch: {e}")
             
             # Update records to failed status
-            self.supabase.table("asset_scan_jobs").update({
+            await self.supabase.table("asset_scan_jobs").update({
                 "status": "failed",
                 "metadata": {**asset_scan_record["metadata"], "error": str(e)}
             }).eq("id", asset_scan_id).execute()
             
-            self.supabase.table("batch_scan_jobs").update({
+            await self.supabase.table("batch_scan_jobs").update({
                 "status": "failed",
                 "metadata": {**batch_job_record["metadata"], "error": str(e)}
             }).eq("id", batch_id).execute()
@@ -415,7 +444,10 @@ class ScanPipeline:
         timeout: int
     ) -> str:
         """
-        Poll scan job until completion or timeout.
+        Wait for a scan job to finish, woken by its status change events.
+        
+        Falls back to polling every POLL_INTERVAL seconds while events are
+        unavailable.
         
         Args:
             asset_scan_id: Asset scan job UUID
@@ -431,46 +463,47 @@ class ScanPipeline:
         start_time = datetime.utcnow()
         elapsed = 0
         
-        while elapsed < timeout:
-            try:
-                # Query scan job status
-                response = self.supabase.table("asset_scan_jobs") \
-                    .select("status") \
-                    .eq("id", asset_scan_id) \
-                    .single() \
-                    .execute()
-                
-                if not response.data:
-                    self.logger.error(f"❌ Scan job {asset_scan_id} not found")
-                    return "failed"
-                
-                status = response.data.get("status", "").lower()
-                
-                # Terminal statuses
-                if status in ["completed", "success"]:
-                    return "completed"
-                elif status in ["failed", "error", "cancelled"]:
-                    return status
-                elif status in ["pending", "running", "in_progress"]:
-                    # Still running, continue polling
-                    pass
-                else:
-                    self.logger.warning(f"⚠️  Unknown status '{status}' for {module} scan")
-                
-                # Log progress every 30 seconds
-                if elapsed % 30 == 0 and elapsed > 0:
+        # Subscribe before the first read so no transition is missed in between
+        async with job_status_events.subscribe([asset_scan_id]) as events:
+            while elapsed < timeout:
+                try:
+                    # Query scan job status
+                    response = await self.supabase.table("asset_scan_jobs") \
+                        .select("status") \
+                        .eq("id", asset_scan_id) \
+                        .single() \
+                        .execute()
+                    
+                    if not response.data:
+                        self.logger.error(f"❌ Scan job {asset_scan_id} not found")
+                        return "failed"
+                    
+                    status = response.data.get("status", "").lower()
+                    
+                    # Terminal statuses
+                    if status in ["completed", "success"]:
+                        return "completed"
+                    elif status in ["failed", "error", "cancelled"]:
+                        return status
+                    elif status in ["pending", "running", "in_progress"]:
+                        # Still running, keep waiting
+                        pass
+                    else:
+                        self.logger.warning(f"⚠️  Unknown status '{status}' for {module} scan")
+                    
                     self.logger.info(
                         f"⏳ {module} still running... "
-                        f"({elapsed}s / {timeout}s, status: {status})"
+                        f"({int(elapsed)}s / {timeout}s, status: {status})"
                     )
+                    
+                except Exception as e:
+                    self.logger.error(f"❌ Error checking {module} status: {e}")
+                    # Continue polling despite errors
                 
-            except Exception as e:
-                self.logger.error(f"❌ Error checking {module} status: {e}")
-                # Continue polling despite errors
-            
-            # Wait before next poll
-            await asyncio.sleep(self.POLL_INTERVAL)
-            elapsed = (datetime.utcnow() - start_time).total_seconds()
+                # Wait for a status change event (or the next fallback read)
+                wait = min(job_status_events.poll_interval(self.POLL_INTERVAL), max(timeout - elapsed, 0))
+                await events.get(timeout=wait)
+                elapsed = (datetime.utcnow() - start_time).total_seconds()
         
         # Timeout exceeded
         self.logger.error(
@@ -481,22 +514,27 @@ class ScanPipeline:
             f"Module {module} exceeded timeout of {timeout} seconds"
         )
     
-    async def _validate_modules(self, modules: List[str]):
+    async def _validate_modules(self, modules: List[str], context: Optional[PipelineContext] = None):
         """
         Validate all modules are active and available.
         
         Args:
             modules: List of module names to validate
+            context: Optional PipelineContext whose module profiles are
+                     checked instead of querying the registry again
             
         Raises:
             ValueError: If any module is invalid or inactive
         """
-        validation_results = await module_registry.validate_modules(modules)
-        
-        invalid_modules = [
-            name for name, is_valid in validation_results.items()
-            if not is_valid
-        ]
+        if context is not None:
+            invalid_modules = context.invalid_modules
+        else:
+            validation_results = await module_registry.validate_modules(modules)
+            
+            invalid_modules = [
+                name for name, is_valid in validation_results.items()
+                if not is_valid
+            ]
         
         if invalid_modules:
             raise ValueError(
@@ -537,12 +575,18 @@ class ScanPipeline:
         self,
         job_ids: List[str],
         timeout: int = 3600,
-        check_interval: int = 10
+        check_interval: int = 10,
+        on_progress: Optional[Callable[[Dict[str, str]], Awaitable[None]]] = None
     ) -> Dict[str, Any]:
         """
         Monitor batch_scan_jobs until all reach terminal status.
         
-        Polls database every {check_interval}s to check job statuses.
+        Statuses are read from the database once, then kept current from job
+        status events (see services/job_events.py), so completion is noticed
+        as soon as the last container writes its status. The table is
+        re-read only on the slow fallback interval while events are live,
+        every {check_interval}s while they are not, and after any gap in
+        the event stream.
         Returns when all jobs are "completed", "failed", or "timeout".
         
         This is the CANONICAL way to determine when containers have actually
@@ -551,7 +595,10 @@ class ScanPipeline:
         Args:
             job_ids: List of batch_scan_job UUIDs to monitor
             timeout: Maximum wait time in seconds (default: 3600 = 1 hour)
-            check_interval: Seconds between database checks (default: 10s)
+            check_interval: Seconds between database checks when events are
+                unavailable (default: 10s)
+            on_progress: Optional callback awaited with the module statuses
+                whenever they change (e.g. to checkpoint the pipeline)
             
         Returns:
             {
@@ -560,119 +607,140 @@ class ScanPipeline:
                 "successful_modules": 3,
                 "total_modules": 3,
                 "elapsed_seconds": 3603.5,
-                "checks_performed": 360
+                "checks_performed": 2,
+                "events_received": 6
             }
         """
-        import asyncio
-        
         start_time = datetime.utcnow()
-        max_wait_seconds = timeout
         checks_performed = 0
+        events_received = 0
         terminal_statuses = {"completed", "failed", "timeout"}
         
+        # job_id -> {"module", "status"}; None until the first read succeeds
+        jobs: Optional[Dict[str, Dict[str, Any]]] = None
+        needs_read = True
+        
         self.logger.info(f"📊 Starting job completion monitoring...")
         self.logger.info(f"   Jobs to monitor: {len(job_ids)}")
-        self.logger.info(f"   Check interval: {check_interval}s")
+        self.logger.info(f"   Status events: {'live' if job_status_events.live else 'unavailable - polling'}")
         self.logger.info(f"   Timeout: {timeout}s")
         
-        while True:
-            checks_performed += 1
-            elapsed = (datetime.utcnow() - start_time).total_seconds()
-            
-            # Check timeout
-            if elapsed > max_wait_seconds:
-                self.logger.warning(f"⚠️  Job monitoring timeout ({timeout}s) exceeded")
-                
-                # Get final statuses for timeout case
-                try:
-                    jobs_response = self.supabase.table("batch_scan_jobs")\
-                        .select("id, module, status")\
-                        .in_("id", job_ids)\
-                        .execute()
-                    
-                    module_statuses = {job["module"]: job["status"] for job in jobs_response.data}
-                except Exception as e:
-                    self.logger.error(f"Failed to fetch final job statuses: {e}")
-                    module_statuses = {}
-                
-                return {
-                    "status": "timeout",
-                    "module_statuses": module_statuses,
-                    "successful_modules": sum(1 for s in module_statuses.values() if s == "completed"),
-                    "total_modules": len(job_ids),
-                    "elapsed_seconds": elapsed,
-                    "checks_performed": checks_performed
-                }
-            
-            # Query all job statuses
-            try:
-                jobs_response = self.supabase.table("batch_scan_jobs")\
-                    .select("id, module, status, completed_at")\
-                    .in_("id", job_ids)\
-                    .execute()
-                
-                if not jobs_response.data:
-                    self.logger.warning(f"No jobs found for IDs: {job_ids}")
-                    await asyncio.sleep(check_interval)
-                    continue
-                
-                # Build status map
-                module_statuses = {}
-                for job in jobs_response.data:
-                    module_statuses[job["module"]] = job["status"]
-                
-                # Count statuses
-                completed_count = sum(1 for s in module_statuses.values() if s in terminal_statuses)
-                successful_count = sum(1 for s in module_statuses.values() if s == "completed")
-                
-                # Log progress
-                self.logger.info(
-                    f"📊 Job progress check #{checks_performed}: "
-                    f"{completed_count}/{len(job_ids)} jobs terminal, "
-                    f"{successful_count} completed, "
-                    f"elapsed={int(elapsed)}s"
-                )
+        def module_statuses() -> Dict[str, str]:
+            return {job["module"]: job["status"] for job in (jobs or {}).values()}
+        
+        reported_statuses: Optional[Dict[str, str]] = None
+        
+        # Subscribe before the first read so no transition is missed in between
+        async with job_status_events.subscribe(job_ids) as events:
+            while True:
+                elapsed = (datetime.utcnow() - start_time).total_seconds()
                 
-                # Log individual module statuses
-                for module, status in sorted(module_statuses.items()):
-                    if status == "completed":
-                        self.logger.info(f"   ✅ {module}: {status}")
-                    elif status == "running":
-                        self.logger.info(f"   🔄 {module}: {status}")
-                    elif status == "failed":
-                        self.logger.warning(f"   ❌ {module}: {status}")
-                    else:
-                        self.logger.info(f"   ⏳ {module}: {status}")
+                if needs_read:
+                    checks_performed += 1
+                    try:
+                        jobs_response = await self.supabase.table("batch_scan_jobs")\
+                            .select("id, module, status, completed_at")\
+                            .in_("id", job_ids)\
+                            .execute()
+                        
+                        if jobs_response.data:
+                            jobs = {
+                                str(job["id"]): {"module": job["module"], "status": job["status"]}
+                                for job in jobs_response.data
+                            }
+                            needs_read = False
+                        else:
+                            self.logger.warning(f"No jobs found for IDs: {job_ids}")
+                    except Exception as e:
+                        self.logger.error(f"Error checking job statuses: {e}")
+                        # Don't fail immediately, retry on next iteration
                 
-                # Check if all jobs reached terminal status
-                if completed_count == len(job_ids):
-                    # Determine final status
-                    if successful_count == len(job_ids):
-                        final_status = "completed"
-                        self.logger.info(f"✅ All {len(job_ids)} jobs completed successfully!")
-                    else:
-                        final_status = "partial_failure"
-                        failed_count = len(job_ids) - successful_count
-                        self.logger.warning(
-                            f"⚠️  Jobs finished with failures: "
-                            f"{successful_count} succeeded, {failed_count} failed"
-                        )
+                if jobs:
+                    statuses = module_statuses()
+                    completed_count = sum(1 for job in jobs.values() if job["status"] in terminal_statuses)
+                    successful_count = sum(1 for job in jobs.values() if job["status"] == "completed")
                     
+                    self.logger.info(
+                        f"📊 Job progress: "
+                        f"{completed_count}/{len(job_ids)} jobs terminal, "
+                        f"{successful_count} completed, "
+                        f"elapsed={int(elapsed)}s"
+                    )
+                    
+                    # Log individual module statuses
+                    for module, status in sorted(statuses.items()):
+                        if status == "completed":
+                            self.logger.info(f"   ✅ {module}: {status}")
+                        elif status == "running":
+                            self.logger.info(f"   🔄 {module}: {status}")
+                        elif status == "failed":
+                            self.logger.warning(f"   ❌ {module}: {status}")
+                        else:
+                            self.logger.info(f"   ⏳ {module}: {status}")
+                    
+                    if on_progress is not None and statuses != reported_statuses:
+                        reported_statuses = statuses
+                        try:
+                            await on_progress(statuses)
+                        except Exception as e:
+                            self.logger.warning(f"⚠️  Progress callback failed: {str(e)}")
+                    
+                    # Check if all jobs reached terminal status
+                    if completed_count == len(job_ids):
+                        # Determine final status
+                        if successful_count == len(job_ids):
+                            final_status = "completed"
+                            self.logger.info(f"✅ All {len(job_ids)} jobs completed successfully!")
+                        else:
+                            final_status = "partial_failure"
+                            failed_count = len(job_ids) - successful_count
+                            self.logger.warning(
+                                f"⚠️  Jobs finished with failures: "
+                                f"{successful_count} succeeded, {failed_count} failed"
+                            )
+                        
+                        return {
+                            "status": final_status,
+                            "module_statuses": statuses,
+                            "successful_modules": successful_count,
+                            "total_modules": len(job_ids),
+                            "elapsed_seconds": elapsed,
+                            "checks_performed": checks_performed,
+                            "events_received": events_received
+                        }
+                
+                # Check timeout
+                remaining = timeout - elapsed
+                if remaining <= 0:
+                    self.logger.warning(f"⚠️  Job monitoring timeout ({timeout}s) exceeded")
+                    statuses = module_statuses()
                     return {
-                        "status": final_status,
-                        "module_statuses": module_statuses,
-                        "successful_modules": successful_count,
+                        "status": "timeout",
+                        "module_statuses": statuses,
+                        "successful_modules": sum(1 for s in statuses.values() if s == "completed"),
                         "total_modules": len(job_ids),
                         "elapsed_seconds": elapsed,
-                        "checks_performed": checks_performed
+                        "checks_performed": checks_performed,
+                        "events_received": events_received
                     }
                 
-            except Exception as e:
-                self.logger.error(f"Error checking job statuses: {e}")
-                # Don't fail immediately, retry on next iteration
-            
-            # Wait before next check
-            await asyncio.sleep(check_interval)
+                # Sleep until a status changes, or until the next safety read
+                wait = min(job_status_events.poll_interval(check_interval), remaining)
+                changes = await events.get(timeout=wait)
+                
+                if not changes:
+                    # Timed out (safety re-read) or events were missed (resync)
+                    needs_read = True
+                    continue
+                
+                events_received += len(changes)
+                for record in changes:
+                    job = (jobs or {}).get(str(record.get("id")))
+                    if job is None:
+                        # Arrived before the first successful read
+                        needs_read = True
+                        continue
+                    job["status"] = record.get("status", job["status"])
     
     async def execute_pipeline(
         self,
@@ -682,7 +750,8 @@ class ScanPipeline:
         user_id: str,
         scan_job_id: str = None,
         scale_factor: int = 1,
-        timeout_seconds: int = None
+        timeout_seconds: int = None,
+        fleet: Optional["SharedConsumerFleet"] = None
     ) -> Dict[str, Any]:
         """
         Execute modules using Redis Streams for parallel real-time processing.
@@ -701,6 +770,9 @@ class ScanPipeline:
             user_id: User UUID
             scan_job_id: Optional scan job ID for progress tracking (parent scan ID from scans table)
             scale_factor: Number of parallel tasks per consumer module (1-10, default 1)
+            fleet: Optional SharedConsumerFleet of a multi-asset scan; its modules
+                   read this asset's Subfinder stream through the fleet's shared
+                   consumers instead of launching their own
             
         Returns:
             Dict with pipeline results in same format as execute_pipeline
@@ -710,6 +782,7 @@ class ScanPipeline:
         """
         from ..services.batch_workflow_orchestrator import batch_workflow_orchestrator
         from ..services.stream_coordinator import stream_coordinator
+        from ..services.consumer_autoscaler import consumer_autoscaler, ScanScaling
         from ..schemas.batch import BatchScanJob, BatchType
         import uuid
         
@@ -732,8 +805,18 @@ class ScanPipeline:
         # Streaming-only architecture: All modules support streaming
         # No capability check needed - DNSx is auto-included above if needed
         
+        # Load the asset, its apex domains and the module profiles once;
+        # job creation, validation and every task launch below reuse them
+        context = await PipelineContext.load(
+            self.supabase,
+            asset_id=asset_id,
+            user_id=user_id,
+            modules=modules,
+            execution_order=self._resolve_execution_order(modules)
+        )
+        
         # Validate modules
-        await self._validate_modules(modules)
+        await self._validate_modules(modules, context=context)
         
         pipeline_start = datetime.utcnow()
         
@@ -745,25 +828,10 @@ class ScanPipeline:
         
         # Generate asset_scan_job ID
         asset_scan_id = str(uuid.uuid4())
+        context.asset_scan_id = asset_scan_id
         
-        # Get asset details
-        asset_response = self.supabase.table("assets").select("*").eq("id", asset_id).execute()
-        
-        if not asset_response.data:
-            raise ValueError(f"Asset not found: {asset_id}")
-        
-        asset = asset_response.data[0]
-        
-        # Query apex_domains table to get actual domains
-        apex_response = self.supabase.table("apex_domains")\
-            .select("domain")\
-            .eq("asset_id", asset_id)\
-            .eq("is_active", True)\
-            .execute()
-        
-        parent_domains = [record["domain"] for record in apex_response.data]
-        
-        self.logger.info(f"📍 Retrieved {len(parent_domains)} active apex domains for asset {asset_id}")
+        asset = context.asset
+        parent_domains = context.apex_domains
         
         # Create asset_scan_jobs record
         asset_scan_record = {
@@ -785,7 +853,7 @@ class ScanPipeline:
         }
         
         # Insert asset_scan_job record
-        self.supabase.table("asset_scan_jobs").insert(asset_scan_record).execute()
+        await self.supabase.table("asset_scan_jobs").insert(asset_scan_record).execute()
         self.logger.info(f"✅ Created asset_scan_jobs record: {asset_scan_id}")
         
         # ============================================================
@@ -803,21 +871,28 @@ class ScanPipeline:
         # ============================================================
         
         # Identify which parallel producers are requested
-        requested_producers = [m for m in modules if m in self.PARALLEL_PRODUCERS]
-        self.logger.info(f"📋 Creating {len(requested_producers)} producer job(s): {requested_producers}")
+        requested_producers = [m for m in context.execution_order if m in self.PARALLEL_PRODUCERS]
+        
+        # Determine which consumers to launch (exclude all parallel producers)
+        consumer_modules = [m for m in context.execution_order if m not in self.PARALLEL_PRODUCERS]
+        
+        # Create every producer and consumer batch job in one insert
+        self.logger.info(
+            f"📋 Creating {len(requested_producers)} producer job(s) {requested_producers} and "
+            f"{len(consumer_modules)} consumer job(s) {consumer_modules}"
+        )
+        batch_jobs = await self._create_batch_scan_jobs(
+            context=context,
+            modules=requested_producers + consumer_modules,
+            scan_request=scan_request,
+            parent_scan_job_id=asset_scan_id
+        )
         
         producer_jobs = {}
         producer_stream_keys = {}
         
         for producer_module in requested_producers:
-            self.logger.info(f"   Creating {producer_module} producer job...")
-            job = await self._create_batch_scan_job(
-            asset_id=asset_id,
-                module=producer_module,
-            scan_request=scan_request,
-            user_id=user_id,
-                parent_scan_job_id=asset_scan_id
-            )
+            job = batch_jobs[producer_module]
             producer_jobs[producer_module] = job
             
             # Generate unique stream key for each producer
@@ -837,23 +912,10 @@ class ScanPipeline:
         # STEP 2: Prepare Consumer Jobs (DNSx, HTTPx, URL Resolver, etc.)
         # ============================================================
         
-        # Determine which consumers to launch (exclude all parallel producers)
-        consumer_modules = [m for m in modules if m not in self.PARALLEL_PRODUCERS]
         consumer_jobs = {}
-        
-        self.logger.info(f"📋 Creating {len(consumer_modules)} consumer job(s): {consumer_modules}")
-        
         for module in consumer_modules:
-            self.logger.info(f"   Creating {module} consumer job...")
-            job = await self._create_batch_scan_job(
-                asset_id=asset_id,
-                module=module,
-                scan_request=scan_request,
-                user_id=user_id,
-                parent_scan_job_id=asset_scan_id
-            )
-            consumer_jobs[module] = job
-            self.logger.info(f"   ✅ {module} job created: {job.id}")
+            consumer_jobs[module] = batch_jobs[module]
+            self.logger.info(f"   ✅ {module} job created: {batch_jobs[module].id}")
         
         # ============================================================
         # STEP 3: Log Stream Configuration
@@ -925,24 +987,32 @@ class ScanPipeline:
         if stage3_consumers:
             self.logger.info(f"   Stage 3 consumers: {stage3_consumers} ({scale_factor}x each, chained from Katana/Waymore)")
         
-        # Launch ALL producers in parallel
-        producer_task_arns = {}
+        # Collect every producer and consumer launch, then run them concurrently.
+        # Launches are independent (consumer groups read their stream from ID 0,
+        # so start order does not matter); ecs_launcher bounds and rate limits
+        # the underlying RunTask calls.
+        launches = []  # (role, module, label, coroutine)
+        # Launch index → (consumer group, input stream, consumer name), for the checkpoint
+        launch_consumers = {}
+        # Consumer groups handed to the autoscaler once the initial tasks run:
+        # (module, stream_key, consumer_group_name, stream_output_key, consumer name prefix)
+        scalable_groups = []
+        
         for producer_module in requested_producers:
             self.logger.info(f"   📤 Launching producer ({producer_module})...")
-            producer_launch = await batch_workflow_orchestrator.launch_streaming_producer(
+            launches.append(("producer", producer_module, producer_module, batch_workflow_orchestrator.launch_streaming_producer(
                 producer_job=producer_jobs[producer_module],
-                stream_key=producer_stream_keys[producer_module]
-            )
-            producer_task_arns[producer_module] = producer_launch["task_arn"]
-            self.logger.info(f"      ✅ Task: {producer_launch['task_arn']}")
-        
-        # For backward compatibility, keep reference to primary producer task ARN
-        producer_task_arn = producer_task_arns.get("subfinder") or list(producer_task_arns.values())[0]
+                stream_key=producer_stream_keys[producer_module],
+                context=context
+            )))
         
-        # Launch Stage 1 consumers (read from Subfinder stream)
+        # Stage 1 consumers (read from Subfinder stream)
         # With scale_factor > 1, launch multiple tasks per module (same consumer group)
-        consumer_task_arns = {}
         for module in stage1_consumers:
+            if fleet is not None and module in fleet.modules:
+                self.logger.info(f"   🚢 Stage 1 consumer ({module}): shared fleet {fleet.fleet_id}")
+                continue
+            
             consumer_group_name = stream_coordinator.generate_consumer_group_name(module)
             
             self.logger.info(f"   📥 Launching Stage 1 consumer ({module}) - {scale_factor} task(s)...")
@@ -954,33 +1024,24 @@ class ScanPipeline:
                 stream_output_key = httpx_to_katana_stream_key
                 self.logger.info(f"      Output: {stream_output_key} (→ Katana)")
             
-            # Launch scale_factor tasks for this module (all share the same consumer group)
-            module_task_arns = []
             for i in range(scale_factor):
                 # Each task gets a unique consumer name (e.g., dnsx-worker-1, dnsx-worker-2)
                 consumer_name = stream_coordinator.generate_consumer_name(
                     module, 
                     f"{str(consumer_jobs[module].id)[:8]}-{i+1}"
                 )
-            
-                consumer_launch = await batch_workflow_orchestrator.launch_streaming_consumer(
+                launches.append(("consumer", module, f"{module} {i+1}/{scale_factor}", batch_workflow_orchestrator.launch_streaming_consumer(
                     consumer_job=consumer_jobs[module],
                     stream_key=stream_key,
                     consumer_group_name=consumer_group_name,
                     consumer_name=consumer_name,
-                    stream_output_key=stream_output_key
-                )
-                module_task_arns.append(consumer_launch["task_arn"])
-                if scale_factor > 1:
-                    self.logger.info(f"      ✅ Task {i+1}/{scale_factor}: {consumer_launch['task_arn']}")
-                else:
-                    self.logger.info(f"      ✅ Task: {consumer_launch['task_arn']}")
-            
-            # Store all task ARNs for this module
-            consumer_task_arns[module] = module_task_arns
+                    stream_output_key=stream_output_key,
+                    context=context
+                )))
+                launch_consumers[len(launches) - 1] = (consumer_group_name, stream_key, consumer_name)
+            scalable_groups.append((module, stream_key, consumer_group_name, stream_output_key, str(consumer_jobs[module].id)[:8]))
         
-        # Launch Stage 2 consumers (read from HTTPx stream - chained)
-        # With scale_factor > 1, launch multiple tasks per module (same consumer group)
+        # Stage 2 consumers (read from HTTPx stream - chained)
         for module in stage2_consumers:
             consumer_group_name = stream_coordinator.generate_consumer_group_name(module)
             
@@ -994,37 +1055,27 @@ class ScanPipeline:
                 stream_output_key = katana_to_resolver_stream_key
                 self.logger.info(f"      Output: {stream_output_key} (→ url-resolver)")
             
-            # Launch scale_factor tasks for this module (all share the same consumer group)
-            module_task_arns = []
             for i in range(scale_factor):
                 consumer_name = stream_coordinator.generate_consumer_name(
                     module,
                     f"{str(consumer_jobs[module].id)[:8]}-{i+1}"
                 )
-                
-                consumer_launch = await batch_workflow_orchestrator.launch_streaming_consumer(
+                launches.append(("consumer", module, f"{module} {i+1}/{scale_factor}", batch_workflow_orchestrator.launch_streaming_consumer(
                     consumer_job=consumer_jobs[module],
                     stream_key=httpx_to_katana_stream_key,  # Katana reads from HTTPx output!
                     consumer_group_name=consumer_group_name,
                     consumer_name=consumer_name,
-                    stream_output_key=stream_output_key
-                )
-                module_task_arns.append(consumer_launch["task_arn"])
-                if scale_factor > 1:
-                    self.logger.info(f"      ✅ Task {i+1}/{scale_factor}: {consumer_launch['task_arn']}")
-                else:
-                    self.logger.info(f"      ✅ Task: {consumer_launch['task_arn']}")
-            
-            # Store all task ARNs for this module
-            consumer_task_arns[module] = module_task_arns
+                    stream_output_key=stream_output_key,
+                    context=context
+                )))
+                launch_consumers[len(launches) - 1] = (consumer_group_name, httpx_to_katana_stream_key, consumer_name)
+            scalable_groups.append((module, httpx_to_katana_stream_key, consumer_group_name, stream_output_key, str(consumer_jobs[module].id)[:8]))
         
-        # Launch Stage 3 consumers (read from Katana AND/OR Waymore streams)
+        # Stage 3 consumers (read from Katana AND/OR Waymore streams)
         # URL Resolver consumes URLs from multiple sources:
         # - Katana: crawled URLs from live endpoints
         # - Waymore: historical URLs from archive sources
         for module in stage3_consumers:
-            module_task_arns = []
-            
             # Determine which streams this consumer should read from
             input_streams = []
             if katana_to_resolver_stream_key:
@@ -1040,34 +1091,98 @@ class ScanPipeline:
             # Each gets its own consumer group to process independently
             for source_name, input_stream_key in input_streams:
                 consumer_group_name = stream_coordinator.generate_consumer_group_name(f"{module}-{source_name}")
-            
+                
                 self.logger.info(f"   📥 Launching Stage 3 consumer ({module}) for {source_name} - {scale_factor} task(s)...")
                 self.logger.info(f"      Input: {input_stream_key} (from {source_name})")
-            self.logger.info(f"      Group: {consumer_group_name}")
-            
-                # Launch scale_factor tasks for this stream
-            for i in range(scale_factor):
-                consumer_name = stream_coordinator.generate_consumer_name(
-                    module,
-                        f"{source_name}-{str(consumer_jobs[module].id)[:8]}-{i+1}"
-                )
+                self.logger.info(f"      Group: {consumer_group_name}")
                 
-                consumer_launch = await batch_workflow_orchestrator.launch_streaming_consumer(
-                    consumer_job=consumer_jobs[module],
+                for i in range(scale_factor):
+                    consumer_name = stream_coordinator.generate_consumer_name(
+                        module,
+                        f"{source_name}-{str(consumer_jobs[module].id)[:8]}-{i+1}"
+                    )
+                    launches.append(("consumer", module, f"{module} ({source_name}) {i+1}/{scale_factor}", batch_workflow_orchestrator.launch_streaming_consumer(
+                        consumer_job=consumer_jobs[module],
                         stream_key=input_stream_key,
-                    consumer_group_name=consumer_group_name,
-                    consumer_name=consumer_name
-                )
-                module_task_arns.append(consumer_launch["task_arn"])
-                if scale_factor > 1 or len(input_streams) > 1:
-                    self.logger.info(f"      ✅ Task ({source_name}) {i+1}/{scale_factor}: {consumer_launch['task_arn']}")
-                else:
-                    self.logger.info(f"      ✅ Task: {consumer_launch['task_arn']}")
-            
-            # Store all task ARNs for this module
-            consumer_task_arns[module] = module_task_arns
+                        consumer_group_name=consumer_group_name,
+                        consumer_name=consumer_name,
+                        context=context
+                    )))
+                    launch_consumers[len(launches) - 1] = (consumer_group_name, input_stream_key, consumer_name)
+                scalable_groups.append((module, input_stream_key, consumer_group_name, None, f"{source_name}-{str(consumer_jobs[module].id)[:8]}"))
+        
+        launch_start = datetime.utcnow()
+        launch_results = await asyncio.gather(
+            *[coroutine for _, _, _, coroutine in launches],
+            return_exceptions=True
+        )
+        launch_seconds = (datetime.utcnow() - launch_start).total_seconds()
         
-        self.logger.info(f"✅ All {total_producer_tasks + total_consumer_tasks} tasks launched successfully!")
+        # Durable pipeline state: everything needed to resume monitoring (and
+        # relaunch dead tasks) from another process if this one dies
+        checkpoint = PipelineCheckpoint(
+            asset_scan_id=asset_scan_id,
+            asset_id=asset_id,
+            user_id=user_id,
+            modules=modules,
+            started_at=pipeline_start.isoformat(),
+            timeout_seconds=timeout_seconds if timeout_seconds else self._pipeline_timeout(batch_jobs.values()),
+            scale_factor=scale_factor,
+            parent_scan_id=scan_job_id,
+            consumer_jobs={module: str(consumer_jobs[module].id) for module in consumer_modules},
+            consumer_groups=[
+                {"module": module, "stream_key": group_stream_key, "group_name": group_name,
+                 "stream_output_key": output_key, "name_prefix": name_prefix, "consumers": {}}
+                for module, group_stream_key, group_name, output_key, name_prefix in scalable_groups
+            ],
+            fleet_id=fleet.fleet_id if fleet is not None else None
+        )
+        
+        producer_task_arns = {}
+        consumer_task_arns = {module: [] for module in stage1_consumers + stage2_consumers + stage3_consumers}
+        launch_errors = []
+        for index, ((role, module, label, _), result) in enumerate(zip(launches, launch_results)):
+            if isinstance(result, BaseException):
+                self.logger.error(f"      ❌ {role} {label} failed to launch: {str(result)}")
+                launch_errors.append(result)
+            elif role == "producer":
+                producer_task_arns[module] = result["task_arn"]
+                self.logger.info(f"      ✅ Producer {label}: {result['task_arn']}")
+            else:
+                consumer_task_arns[module].append(result["task_arn"])
+                group_name, group_stream_key, consumer_name = launch_consumers[index]
+                checkpoint.group(group_name, group_stream_key)["consumers"][consumer_name] = result["task_arn"]
+                self.logger.info(f"      ✅ Consumer {label}: {result['task_arn']}")
+        
+        if launch_errors:
+            raise launch_errors[0]
+        
+        # Shared consumers: route this asset's Subfinder stream into the fleet
+        if fleet is not None:
+            fleet_task_arns = await fleet.join(
+                asset_id,
+                stream_key,
+                {module: consumer_jobs[module] for module in fleet.modules},
+                context=context
+            )
+            for module in fleet.modules:
+                consumer_task_arns[module] = list(fleet_task_arns.get(module, []))
+        
+        self.logger.info(f"⚡ Launched {len(launches)} tasks concurrently in {launch_seconds:.2f}s")
+        
+        checkpoint.producers = {
+            module: {
+                "job_id": str(job.id),
+                "stream_key": producer_stream_keys[module],
+                "task_arn": producer_task_arns.get(module)
+            }
+            for module, job in producer_jobs.items()
+        }
+        
+        # For backward compatibility, keep reference to primary producer task ARN
+        producer_task_arn = producer_task_arns.get("subfinder") or list(producer_task_arns.values())[0]
+        
+        self.logger.info(f"✅ All {len(launches)} tasks launched successfully!")
         producers_summary = ", ".join([f"{m} (1 task)" for m in requested_producers])
         self.logger.info(f"   Producers: {producers_summary}")
         if stage1_consumers:
@@ -1085,6 +1200,127 @@ class ScanPipeline:
             stage3_summary = ", ".join([f"{m} ({scale_factor}x)" for m in stage3_consumers])
             self.logger.info(f"   Stage 3: {stage3_summary} (from {'/'.join(stage3_sources)})")
         
+        # Lag-driven autoscaling: scale_factor tasks per group are the floor,
+        # more join the same consumer group while its backlog grows
+        autoscaling_task = None
+        scan_scaling = None
+        if settings.consumer_autoscaling_enabled and scalable_groups:
+            scan_scaling = ScanScaling(
+                scan_id=str(asset_scan_id),
+                groups=[
+                    self._scalable_group(
+                        module, consumer_jobs[module], group_stream_key, group_name, output_key,
+                        name_prefix, scale_factor, consumer_task_arns, context, checkpoint
+                    )
+                    for module, group_stream_key, group_name, output_key, name_prefix in scalable_groups
+                ]
+            )
+            autoscaling_task = asyncio.create_task(consumer_autoscaler.run(scan_scaling))
+        
+        # Stream lifecycle: trim acknowledged entries and apply backpressure
+        # while the scan's streams are over their memory budget
+        stream_groups = {
+            key: [] for key in [*producer_stream_keys.values(), httpx_to_katana_stream_key, katana_to_resolver_stream_key]
+            if key
+        }
+        for _, group_stream_key, group_name, _, _ in scalable_groups:
+            stream_groups.setdefault(group_stream_key, []).append(group_name)
+        if fleet is not None:
+            from .consumer_fleet import FLEET_ROUTER_GROUP
+            stream_groups[stream_key].append(FLEET_ROUTER_GROUP)
+        checkpoint.stream_groups = stream_groups
+        
+        return await self._monitor_pipeline(
+            checkpoint,
+            producer_task_arns=producer_task_arns,
+            consumer_task_arns=consumer_task_arns,
+            background_tasks=[autoscaling_task] if autoscaling_task else [],
+            scan_scaling=scan_scaling,
+            fleet=fleet
+        )
+    
+    async def _watch_fleet_producer(self, fleet: "SharedConsumerFleet", asset_id: str, task_arn: Optional[str]) -> None:
+        """Tell the fleet once this asset's Subfinder task has stopped."""
+        from ..services.batch_workflow_orchestrator import batch_workflow_orchestrator
+        
+        if not task_arn:
+            return
+        while True:
+            await asyncio.sleep(settings.consumer_fleet_producer_check_interval)
+            status = await batch_workflow_orchestrator.get_task_status(task_arn)
+            # ERROR means the lookup failed, not the task: keep watching
+            if status.get("status") in ("STOPPED", "NOT_FOUND"):
+                self.logger.info(f"🛑 Subfinder task of asset {asset_id} stopped: closing its fleet stream")
+                fleet.producer_finished(asset_id)
+                return
+    
+    async def _monitor_pipeline(
+        self,
+        checkpoint: PipelineCheckpoint,
+        producer_task_arns: Dict[str, Optional[str]],
+        consumer_task_arns: Dict[str, List[str]],
+        background_tasks: Optional[List[asyncio.Task]] = None,
+        scan_scaling: Optional["ScanScaling"] = None,
+        resumed: bool = False,
+        fleet: Optional["SharedConsumerFleet"] = None
+    ) -> Dict[str, Any]:
+        """
+        Monitor a launched (or resumed) streaming pipeline until its jobs are
+        terminal, then clean up its streams and build the pipeline result.
+        
+        The checkpoint is saved on every module status change and refreshed
+        (with its lease) while monitoring runs; it is finished only when the
+        pipeline is - a cancelled monitor leaves it for another process to
+        resume.
+        
+        Args:
+            checkpoint: The pipeline's checkpoint
+            producer_task_arns: Producer module → task ARN
+            consumer_task_arns: Consumer module → task ARNs
+            background_tasks: Tasks to cancel once monitoring ends (autoscaler)
+            scan_scaling: Autoscaled groups, for the result summary
+            resumed: Whether this process took the pipeline over after a restart
+            fleet: Shared consumer fleet routing this asset's Subfinder stream,
+                   told when the Subfinder producer is done (even without a
+                   completion marker)
+        """
+        from ..services.stream_coordinator import stream_coordinator
+        
+        asset_id = checkpoint.asset_id
+        asset_scan_id = checkpoint.asset_scan_id
+        stream_groups = checkpoint.stream_groups
+        producer_modules = list(checkpoint.producers)
+        consumer_modules = list(checkpoint.consumer_jobs)
+        pipeline_start = datetime.fromisoformat(checkpoint.started_at)
+        
+        # Stream lifecycle: trim acknowledged entries and apply backpressure
+        # while the scan's streams are over their memory budget
+        stream_stats = {}
+        background_tasks = list(background_tasks or [])
+        background_tasks.append(asyncio.create_task(
+            stream_coordinator.govern_scan_streams(asset_scan_id, stream_groups, stats=stream_stats)
+        ))
+        
+        async def refresh_checkpoint(checkpoint: PipelineCheckpoint) -> None:
+            for stream_key in stream_groups:
+                for group_name, offset in (await stream_coordinator.get_group_offsets(stream_key)).items():
+                    checkpoint.group_offsets[f"{stream_key}|{group_name}"] = offset
+        
+        async def on_progress(statuses: Dict[str, str]) -> None:
+            if fleet is not None and statuses.get("subfinder") in TERMINAL_STATUSES:
+                fleet.producer_finished(asset_id)
+            checkpoint.module_statuses = statuses
+            await pipeline_checkpoints.save(checkpoint)
+        
+        await pipeline_checkpoints.save(checkpoint)
+        background_tasks.append(asyncio.create_task(
+            pipeline_checkpoints.hold(checkpoint, refresh=refresh_checkpoint)
+        ))
+        if fleet is not None:
+            background_tasks.append(asyncio.create_task(
+                self._watch_fleet_producer(fleet, asset_id, producer_task_arns.get("subfinder"))
+            ))
+        
         # ============================================================
         # STEP 5: Monitor Job Completion (NEW: Polling batch_scan_jobs)
         # ============================================================
@@ -1098,35 +1334,40 @@ class ScanPipeline:
         #   - Problem: Returned before containers finished writing to DB
         #
         # NEW APPROACH (implemented):
-        #   - _wait_for_jobs_completion() → polls batch_scan_jobs.status
+        #   - _wait_for_jobs_completion() → waits on batch_scan_jobs.status
+        #     change events, re-reading the table on a slow fallback interval
         #   - Returns ONLY when containers update status = "completed"
         #   - Single source of truth: batch_scan_jobs table
         #
         # ============================================================
         
-        self.logger.info(f"🔍 Monitoring {len(consumer_modules)} consumers + 1 producer...")
-        self.logger.info(f"   Method: Sequential job status polling (batch_scan_jobs table)")
+        self.logger.info(f"🔍 Monitoring {len(consumer_modules)} consumers + {len(producer_modules)} producer(s)...")
+        self.logger.info(f"   Method: Job status events + fallback reads (batch_scan_jobs table)")
         
         # Collect all batch job IDs (all producers + all consumers)
-        batch_ids = [str(job.id) for job in producer_jobs.values()]  # All producers
-        batch_ids.extend([str(job.id) for job in consumer_jobs.values()])  # All consumers
+        batch_ids = [producer["job_id"] for producer in checkpoint.producers.values()]  # All producers
+        batch_ids.extend(checkpoint.consumer_jobs.values())  # All consumers
         
         self.logger.info(f"   Monitoring {len(batch_ids)} batch jobs:")
-        for module, job in producer_jobs.items():
-            self.logger.info(f"     • Producer: {job.id} ({module})")
-        for module, job in consumer_jobs.items():
-            self.logger.info(f"     • Consumer: {job.id} ({module})")
+        for module, producer in checkpoint.producers.items():
+            self.logger.info(f"     • Producer: {producer['job_id']} ({module})")
+        for module, job_id in checkpoint.consumer_jobs.items():
+            self.logger.info(f"     • Consumer: {job_id} ({module})")
         
         # Wait for ALL jobs to reach terminal status (completed/failed/timeout)
-        # Use provided timeout or default (3 hours)
-        pipeline_timeout = timeout_seconds if timeout_seconds else self.DEFAULT_PIPELINE_TIMEOUT
+        # within what is left of the pipeline timeout (default 3 hours)
+        pipeline_timeout = checkpoint.timeout_seconds
+        remaining_timeout = max(int(pipeline_timeout - (datetime.utcnow() - pipeline_start).total_seconds()), 0)
         self.logger.info(f"⏱️  Pipeline timeout set to: {pipeline_timeout}s ({pipeline_timeout // 3600}h {(pipeline_timeout % 3600) // 60}m)")
+        if resumed:
+            self.logger.info(f"   Resumed with {remaining_timeout}s remaining")
         
         try:
             job_completion_result = await self._wait_for_jobs_completion(
                 job_ids=batch_ids,
-                timeout=pipeline_timeout,
-                check_interval=10  # Check every 10 seconds
+                timeout=remaining_timeout,
+                check_interval=10,  # Poll every 10 seconds only if status events are down
+                on_progress=on_progress
             )
             
             # Map result to match old format for backwards compatibility
@@ -1136,9 +1377,15 @@ class ScanPipeline:
                 "successful_modules": job_completion_result["successful_modules"],
                 "total_modules": job_completion_result["total_modules"],
                 "elapsed_seconds": job_completion_result["elapsed_seconds"],
-                "checks_performed": job_completion_result["checks_performed"]
+                "checks_performed": job_completion_result["checks_performed"],
+                "events_received": job_completion_result["events_received"]
             }
             
+        except asyncio.CancelledError:
+            # Shutting down mid-scan: hand the pipeline to another process now
+            # instead of after the lease expires
+            await pipeline_checkpoints.release_lease(asset_scan_id)
+            raise
         except Exception as e:
             self.logger.error(f"❌ Job monitoring error: {str(e)}")
             monitor_result = {
@@ -1148,6 +1395,10 @@ class ScanPipeline:
                 "successful_modules": 0,
                 "total_modules": len(batch_ids)
             }
+        finally:
+            for task in background_tasks:
+                task.cancel()
+            await asyncio.gather(*background_tasks, return_exceptions=True)
         
         pipeline_duration = (datetime.utcnow() - pipeline_start).total_seconds()
         
@@ -1163,23 +1414,40 @@ class ScanPipeline:
         if failed_modules:
             self.logger.warning(f"⚠️  Failed/timeout modules: {', '.join(failed_modules)}")
         
+        # Jobs are terminal: cached read results for this asset are now stale,
+        # and the dashboard MVs need a (debounced) refresh
+        await result_cache.bump_asset_version(asset_id)
+        mv_refresh_scheduler.notify_scan_completed(asset_id)
+        
         # ============================================================
         # STEP 6: Cleanup and Results
         # ============================================================
         
-        # Optional: Clean up stream (keep for debugging by default)
-        # await stream_coordinator.cleanup_stream(stream_key, delete_stream=False)
+        # Report the scan's stream memory, then let Redis delete the streams
+        # after a debugging window (stream_finished_ttl)
+        try:
+            stream_memory = await stream_coordinator.get_scan_memory_report(asset_scan_id, list(stream_groups))
+            stream_memory.update(stream_stats)
+            self.logger.info(
+                f"🧠 Stream memory: {stream_memory['total_bytes'] / 1048576:.1f} MB now, "
+                f"peak {stream_stats.get('peak_bytes', 0) / 1048576:.1f} MB, "
+                f"{stream_stats.get('trimmed_entries', 0)} acknowledged entries trimmed"
+            )
+        except Exception as e:
+            self.logger.warning(f"⚠️  Stream memory report failed: {str(e)}")
+            stream_memory = None
+        await stream_coordinator.expire_scan_streams(asset_scan_id, list(stream_groups))
         
         # Build results in same format as execute_pipeline (all producers + all consumers)
         results = []
         
         # All producer results
-        for producer_module, job in producer_jobs.items():
+        for producer_module, producer in checkpoint.producers.items():
             producer_status = monitor_result.get("module_statuses", {}).get(producer_module, "unknown")
         results.append({
                 "module": producer_module,
             "status": producer_status,
-                "scan_job_id": str(job.id),
+                "scan_job_id": producer["job_id"],
                 "task_arn": producer_task_arns.get(producer_module),
             "role": "producer",
             "started_at": pipeline_start.isoformat(),
@@ -1192,35 +1460,45 @@ class ScanPipeline:
             results.append({
                 "module": module,
                 "status": consumer_status,
-                "scan_job_id": str(consumer_jobs[module].id),
-                "task_arn": consumer_task_arns[module],
+                "scan_job_id": checkpoint.consumer_jobs[module],
+                "task_arn": consumer_task_arns.get(module, []),
                 "role": "consumer",
                 "started_at": pipeline_start.isoformat(),
                 "completed_at": datetime.utcnow().isoformat()
             })
         
         successful_modules = sum(1 for r in results if r["status"] == "completed")
+        pipeline_status = "completed" if successful_modules == len(results) else "partial_failure"
         
         self.logger.info(f"✅ Streaming pipeline completed")
-        self.logger.info(f"   Producers: {', '.join(producer_jobs.keys())}")
+        self.logger.info(f"   Producers: {', '.join(producer_modules)}")
         self.logger.info(f"   Consumers: {', '.join(consumer_modules)}")
         self.logger.info(f"   Successful: {successful_modules}/{len(results)} modules")
         self.logger.info(f"   Duration: {pipeline_duration:.1f}s")
         
+        checkpoint.module_statuses = monitor_result.get("module_statuses", {})
+        parent_statuses = await pipeline_checkpoints.finish(checkpoint, pipeline_status)
+        if resumed and parent_statuses:
+            # The process that ran the parent scan is gone: close it here
+            await self._complete_resumed_scan(checkpoint.parent_scan_id, parent_statuses)
+        
         return {
             "pipeline_type": "streaming",
-            "pipeline": list(producer_jobs.keys()) + consumer_modules,
-            "producers": list(producer_jobs.keys()),
+            "pipeline": producer_modules + consumer_modules,
+            "producers": producer_modules,
             "consumers": consumer_modules,
             "results": results,
             "total_modules": len(results),
             "successful_modules": successful_modules,
             "failed_modules": len(results) - successful_modules,
             "duration_seconds": pipeline_duration,
-            "status": "completed" if successful_modules == len(results) else "partial_failure",
-            "stream_keys": producer_stream_keys,
+            "status": pipeline_status,
+            "stream_keys": {module: producer["stream_key"] for module, producer in checkpoint.producers.items()},
             "stream_length": monitor_result.get("stream_length", 0),
             "monitor_result": monitor_result,
+            "autoscaling": scan_scaling.summary() if scan_scaling else None,
+            "stream_memory": stream_memory,
+            "resumes": checkpoint.resumes,
             "job_monitoring": {
                 "method": "sequential_job_polling",
                 "module_statuses": monitor_result.get("module_statuses", {}),
@@ -1229,82 +1507,295 @@ class ScanPipeline:
             }
         }
     
-    async def _create_batch_scan_job(
+    async def resume_pipeline(self, asset_scan_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Take over a streaming pipeline whose process died, from its checkpoint.
+        
+        Tasks that are still running are reattached as they are. A dead
+        producer whose job has not finished is relaunched (it starts its
+        enumeration over; consumers upsert, so repeats are harmless). A dead
+        consumer is replaced by a consumer with a new name in the same group:
+        its delivered-but-unacknowledged entries are claimed for the
+        replacement, which reads them first and then continues from the
+        group's last-delivered ID. Monitoring then carries on with what is
+        left of the pipeline timeout.
+        
+        Args:
+            asset_scan_id: Asset scan job ID of the pipeline
+            
+        Returns:
+            Pipeline result (as execute_pipeline), or None without a checkpoint
+        """
+        from ..services.batch_workflow_orchestrator import batch_workflow_orchestrator
+        from ..services.stream_coordinator import stream_coordinator
+        from ..services.consumer_autoscaler import consumer_autoscaler, ScanScaling
+        
+        checkpoint = await pipeline_checkpoints.load(asset_scan_id)
+        if checkpoint is None:
+            self.logger.warning(f"⚠️  No checkpoint for pipeline {asset_scan_id}, nothing to resume")
+            return None
+        
+        checkpoint.resumes += 1
+        self.logger.info(f"🩹 Resuming streaming pipeline {asset_scan_id} (asset {checkpoint.asset_id}, resume #{checkpoint.resumes})")
+        
+        job_ids = [producer["job_id"] for producer in checkpoint.producers.values()] + list(checkpoint.consumer_jobs.values())
+        response = await self.supabase.table("batch_scan_jobs").select("*").in_("id", job_ids).execute()
+        jobs = {str(row["id"]): BatchScanJob(**row) for row in response.data or []}
+        
+        context = await PipelineContext.load(
+            self.supabase,
+            asset_id=checkpoint.asset_id,
+            user_id=checkpoint.user_id,
+            modules=checkpoint.modules,
+            execution_order=self._resolve_execution_order(checkpoint.modules)
+        )
+        context.asset_scan_id = asset_scan_id
+        
+        def finished(job_id: str) -> bool:
+            job = jobs.get(job_id)
+            return job is None or job.status in TERMINAL_STATUSES
+        
+        async def dead(task_arn: Optional[str]) -> bool:
+            if not task_arn:
+                return True
+            status = await batch_workflow_orchestrator.get_task_status(task_arn)
+            # ERROR means the lookup failed, not the task: leave it be
+            return status.get("status") in ("STOPPED", "NOT_FOUND")
+        
+        # Fleet routing ran in the dead process: the shared consumers will
+        # never see their completion marker, so those jobs cannot finish
+        grouped_modules = {group["module"] for group in checkpoint.consumer_groups}
+        fleet_job_ids = [
+            job_id for module, job_id in checkpoint.consumer_jobs.items()
+            if module not in grouped_modules and not finished(job_id)
+        ]
+        if fleet_job_ids:
+            self.logger.warning(
+                f"   ⚠️  {len(fleet_job_ids)} consumer job(s) were served by fleet {checkpoint.fleet_id}, "
+                f"whose routing cannot be resumed: marking them failed"
+            )
+            await self.supabase.table("batch_scan_jobs").update({
+                "status": "failed",
+                "completed_at": datetime.utcnow().isoformat()
+            }).in_("id", fleet_job_ids).execute()
+        
+        relaunched = 0
+        for module, producer in checkpoint.producers.items():
+            if finished(producer["job_id"]) or not await dead(producer["task_arn"]):
+                continue
+            result = await batch_workflow_orchestrator.launch_streaming_producer(
+                producer_job=jobs[producer["job_id"]],
+                stream_key=producer["stream_key"],
+                context=context
+            )
+            self.logger.info(f"   🔁 Producer {module} relaunched: {result['task_arn']}")
+            producer["task_arn"] = result["task_arn"]
+            relaunched += 1
+        
+        for group in checkpoint.consumer_groups:
+            job_id = checkpoint.consumer_jobs[group["module"]]
+            if finished(job_id):
+                continue
+            for consumer_name, task_arn in list(group["consumers"].items()):
+                if not await dead(task_arn):
+                    continue
+                replacement = f"{consumer_name}-r{checkpoint.resumes}"
+                await stream_coordinator.reassign_pending(
+                    group["stream_key"], group["group_name"], consumer_name, replacement
+                )
+                result = await batch_workflow_orchestrator.launch_streaming_consumer(
+                    consumer_job=jobs[job_id],
+                    stream_key=group["stream_key"],
+                    consumer_group_name=group["group_name"],
+                    consumer_name=replacement,
+                    stream_output_key=group["stream_output_key"],
+                    context=context
+                )
+                del group["consumers"][consumer_name]
+                group["consumers"][replacement] = result["task_arn"]
+                self.logger.info(f"   🔁 Consumer {consumer_name} → {replacement}: {result['task_arn']}")
+                relaunched += 1
+        
+        live_tasks = len(checkpoint.producers) + sum(len(group["consumers"]) for group in checkpoint.consumer_groups)
+        self.logger.info(f"   Reattached {live_tasks - relaunched} running task(s), relaunched {relaunched}")
+        
+        consumer_task_arns = checkpoint.consumer_task_arns()
+        
+        # Autoscaling picks up from the current task counts
+        autoscaling_task = None
+        scan_scaling = None
+        active_groups = [g for g in checkpoint.consumer_groups if not finished(checkpoint.consumer_jobs[g["module"]])]
+        if settings.consumer_autoscaling_enabled and active_groups:
+            scan_scaling = ScanScaling(
+                scan_id=asset_scan_id,
+                groups=[
+                    self._scalable_group(
+                        group["module"], jobs[checkpoint.consumer_jobs[group["module"]]], group["stream_key"],
+                        group["group_name"], group["stream_output_key"],
+                        f"{group['name_prefix']}-r{checkpoint.resumes}", len(group["consumers"]),
+                        consumer_task_arns, context, checkpoint
+                    )
+                    for group in active_groups
+                ]
+            )
+            autoscaling_task = asyncio.create_task(consumer_autoscaler.run(scan_scaling))
+        
+        return await self._monitor_pipeline(
+            checkpoint,
+            producer_task_arns={module: producer["task_arn"] for module, producer in checkpoint.producers.items()},
+            consumer_task_arns=consumer_task_arns,
+            background_tasks=[autoscaling_task] if autoscaling_task else [],
+            scan_scaling=scan_scaling,
+            resumed=True
+        )
+    
+    async def _complete_resumed_scan(self, scan_id: str, statuses: Dict[str, str]) -> None:
+        """Set the final status of a parent scan whose pipelines were resumed."""
+        completed = sum(1 for status in statuses.values() if status == "completed")
+        failed = len(statuses) - completed
+        try:
+            await self.supabase.table("scans").update({
+                "status": "completed" if failed == 0 else "partial_failure",
+                "completed_at": datetime.utcnow().isoformat(),
+                "completed_assets": completed,
+                "failed_assets": failed
+            }).eq("id", scan_id).execute()
+            self.logger.info(f"✅ Resumed scan {scan_id} closed: {completed}/{len(statuses)} assets completed")
+        except Exception as e:
+            self.logger.error(f"Failed to close resumed scan {scan_id}: {e}")
+    
+    def _scalable_group(
         self,
-        asset_id: str,
         module: str,
+        consumer_job: BatchScanJob,
+        stream_key: str,
+        consumer_group_name: str,
+        stream_output_key: Optional[str],
+        name_prefix: str,
+        scale_factor: int,
+        consumer_task_arns: Dict[str, List[str]],
+        context: PipelineContext,
+        checkpoint: Optional[PipelineCheckpoint] = None
+    ) -> "ScalableGroup":
+        """
+        Wrap a launched consumer group for the autoscaler.
+        
+        The group's launch callback starts more consumers in the same group,
+        numbering their consumer names on from the initial scale_factor tasks,
+        and records them in the pipeline checkpoint.
+        """
+        from .batch_workflow_orchestrator import batch_workflow_orchestrator
+        from .consumer_autoscaler import ScalableGroup
+        from .stream_coordinator import stream_coordinator
+        
+        launched = {"count": scale_factor}
+        
+        async def launch(count: int) -> List[str]:
+            first = launched["count"] + 1
+            launched["count"] += count
+            consumer_names = [
+                stream_coordinator.generate_consumer_name(module, f"{name_prefix}-{i}")
+                for i in range(first, first + count)
+            ]
+            results = await asyncio.gather(*[
+                batch_workflow_orchestrator.launch_streaming_consumer(
+                    consumer_job=consumer_job,
+                    stream_key=stream_key,
+                    consumer_group_name=consumer_group_name,
+                    consumer_name=consumer_name,
+                    stream_output_key=stream_output_key,
+                    context=context
+                )
+                for consumer_name in consumer_names
+            ], return_exceptions=True)
+            
+            task_arns = []
+            for consumer_name, result in zip(consumer_names, results):
+                if isinstance(result, BaseException):
+                    self.logger.error(f"      ❌ Autoscaled {module} consumer failed to launch: {str(result)}")
+                else:
+                    task_arns.append(result["task_arn"])
+                    if checkpoint is not None:
+                        checkpoint.group(consumer_group_name, stream_key)["consumers"][consumer_name] = result["task_arn"]
+            consumer_task_arns[module].extend(task_arns)
+            return task_arns
+        
+        return ScalableGroup(
+            module=module,
+            stream_key=stream_key,
+            group_name=consumer_group_name,
+            launch=launch,
+            tasks=scale_factor,
+            min_tasks=scale_factor
+        )
+    
+    async def _create_batch_scan_jobs(
+        self,
+        context: PipelineContext,
+        modules: List[str],
         scan_request: EnhancedAssetScanRequest,
-        user_id: str,
         parent_scan_job_id: str = None
-    ) -> "BatchScanJob":
+    ) -> Dict[str, "BatchScanJob"]:
         """
-        Create a BatchScanJob record for a module.
+        Create the BatchScanJob records for a streaming pipeline's modules.
         
-        This is used by streaming pipeline to create separate jobs for
-        producer and consumer modules.
+        All rows go to the database in a single insert, built from the
+        pipeline context's apex domains (every module of a streaming
+        pipeline works on the same domain list).
         
         Args:
-            asset_id: Asset UUID
-            module: Module name (e.g., "subfinder", "dnsx")
+            context: PipelineContext of the scan
+            modules: Module names (producers and consumers)
             scan_request: Original scan request
-            user_id: User UUID
             parent_scan_job_id: Optional parent scan job ID
             
         Returns:
-            BatchScanJob Pydantic model
+            Dict of module name -> BatchScanJob Pydantic model
         """
         from ..schemas.batch import BatchScanJob, BatchType
         import uuid
         
-        # Get asset domains for this module
-        # For streaming, we use the same domain list for both producer and consumer
-        asset_response = self.supabase.table("assets").select("*").eq("id", asset_id).execute()
-        
-        if not asset_response.data:
-            raise ValueError(f"Asset not found: {asset_id}")
-        
-        asset = asset_response.data[0]
+        parent_domains = context.apex_domains
+        priority = scan_request.priority if scan_request else 3
         
-        # Query apex_domains table to get actual domains
-        # Note: parent_domains doesn't exist on assets table - domains are in apex_domains table
-        apex_response = self.supabase.table("apex_domains")\
-            .select("domain")\
-            .eq("asset_id", asset_id)\
-            .eq("is_active", True)\
-            .execute()
-        
-        parent_domains = [record["domain"] for record in apex_response.data]
-        
-        self.logger.info(f"📍 Retrieved {len(parent_domains)} active apex domains for asset {asset_id}")
-        
-        # Create batch job record
-        batch_job_data = {
-            "id": str(uuid.uuid4()),
-            "module": module,
-            "status": "pending",
-            "user_id": user_id,
-            "batch_domains": parent_domains,  # Fixed: Use batch_domains (text[]) instead of parent_domains
-            "total_domains": len(parent_domains),
-            "batch_type": BatchType.SINGLE_ASSET.value,  # Fixed: SINGLE_MODULE doesn't exist in enum
-            "allocated_cpu": 1024,  # Default CPU units
-            "allocated_memory": 2048,  # Default memory in MB
-            "asset_scan_mapping": {domain: parent_scan_job_id for domain in parent_domains},  # 🔧 FIX: Map each domain to the asset_scan_id
-            "metadata": {  # Store additional context in metadata instead
-                "asset_id": asset_id,
-                "parent_scan_job_id": parent_scan_job_id,  # Fixed: Use correct parameter name
-                "priority": scan_request.priority if scan_request else 3,
-                "streaming_mode": True
+        batch_job_rows = []
+        for module in modules:
+            # Learned size once the module has enough history, defaults otherwise
+            recommendation = resource_model.recommend(module, len(parent_domains), priority=priority)
+            sizing = {
+                "allocated_cpu": recommendation.cpu,
+                "allocated_memory": recommendation.memory,
+                "estimated_duration_minutes": recommendation.estimated_duration_minutes
+            } if recommendation else {
+                "allocated_cpu": 1024,  # Default CPU units
+                "allocated_memory": 2048  # Default memory in MB
             }
-        }
+            batch_job_rows.append({
+                "id": str(uuid.uuid4()),
+                "module": module,
+                "status": "pending",
+                "user_id": context.user_id,
+                "batch_domains": parent_domains,  # Fixed: Use batch_domains (text[]) instead of parent_domains
+                "total_domains": len(parent_domains),
+                "batch_type": BatchType.SINGLE_ASSET.value,  # Fixed: SINGLE_MODULE doesn't exist in enum
+                **sizing,
+                "asset_scan_mapping": {domain: parent_scan_job_id for domain in parent_domains},  # 🔧 FIX: Map each domain to the asset_scan_id
+                "metadata": {  # Store additional context in metadata instead
+                    "asset_id": context.asset_id,
+                    "parent_scan_job_id": parent_scan_job_id,  # Fixed: Use correct parameter name
+                    "priority": priority,
+                    "streaming_mode": True
+                }
+            })
         
-        # Insert into database
-        insert_response = self.supabase.table("batch_scan_jobs").insert(batch_job_data).execute()
+        # Insert all rows in one round trip
+        insert_response = await self.supabase.table("batch_scan_jobs").insert(batch_job_rows).execute()
         
-        if not insert_response.data:
-            raise Exception(f"Failed to create batch scan job for {module}")
+        if not insert_response.data or len(insert_response.data) != len(batch_job_rows):
+            raise Exception(f"Failed to create batch scan jobs for {', '.join(modules)}")
         
-        # Return as Pydantic model
-        return BatchScanJob(**insert_response.data[0])
+        # Return as Pydantic models
+        return {row["module"]: BatchScanJob(**row) for row in insert_response.data}
 
 
 # Global singleton
@@ -0,0 +1,186 @@
+"""
+Single-Flight - Coalesce Identical Concurrent Reads
+
+When a scan completes, many dashboard tabs refresh at once and fire the
+same queries. Single-flight lets concurrent callers with the same key
+(namespace + normalized params) share one in-flight DB call:
+
+- In-process: the first caller (leader) runs the call as a task; callers
+  arriving while it runs await the same task instead of querying again
+- Cross-worker (optional): the leader also takes a Redis lock and
+  publishes its JSON result briefly; leaders in other API tasks that find
+  the lock held wait for that result instead of querying
+
+Per-namespace counters report how many calls were executed vs coalesced.
+"""
+import asyncio
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import time
+import uuid
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from ..core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent calls that share a key.
+    """
+
+    KEY_PREFIX = "sf"
+    MAX_POLL_INTERVAL = 0.5
+
+    def __init__(
+        self,
+        lock_ttl_seconds: Optional[float] = None,
+        wait_timeout_seconds: Optional[float] = None,
+        result_ttl_seconds: Optional[float] = None,
+        poll_interval_seconds: float = 0.05
+    ):
+        self.lock_ttl_seconds = lock_ttl_seconds if lock_ttl_seconds is not None else settings.single_flight_lock_ttl
+        self.wait_timeout_seconds = (
+            wait_timeout_seconds if wait_timeout_seconds is not None else settings.single_flight_wait_timeout
+        )
+        self.result_ttl_seconds = (
+            result_ttl_seconds if result_ttl_seconds is not None else settings.single_flight_result_ttl
+        )
+        self.poll_interval_seconds = poll_interval_seconds
+        self.counters: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    @staticmethod
+    def key(namespace: str, params: Dict[str, Any]) -> str:
+        """Normalized key for a namespace + params (None params ignored, order-insensitive)."""
+        active = {k: v for k, v in params.items() if v is not None}
+        digest = hashlib.sha1(json.dumps(active, sort_keys=True, default=str).encode()).hexdigest()
+        return f"{namespace}:{digest}"
+
+    async def do(
+        self,
+        namespace: str,
+        params: Dict[str, Any],
+        fn: Callable[[], Awaitable[Any]],
+        redis_client=None
+    ) -> Any:
+        """
+        Run `fn` once for all concurrent callers with the same key.
+
+        Args:
+            namespace: Logical call family, used for counters
+            params: Everything the result depends on
+            fn: Coroutine factory performing the call
+            redis_client: Shared async Redis client; when given, calls are
+                also coalesced across API tasks (results must be
+                JSON-serializable, and remote waiters get the decoded JSON)
+
+        The call runs as its own task, so a cancelled caller (e.g. a client
+        disconnect) does not cancel the work other callers are waiting on.
+        """
+        key = self.key(namespace, params)
+        counters = self.counters[namespace]
+
+        task = self._inflight.get(key)
+        if task is not None:
+            counters["coalesced"] += 1
+        else:
+            counters["executed"] += 1
+            if redis_client is not None:
+                task = asyncio.ensure_future(self._run_distributed(namespace, key, fn, redis_client))
+            else:
+                task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(functools.partial(self._finish, key))
+
+        return await asyncio.shield(task)
+
+    def _finish(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the exception as retrieved if every waiter went away
+        if not task.cancelled():
+            task.exception()
+
+    async def _run_distributed(self, namespace: str, key: str, fn: Callable[[], Awaitable[Any]], redis_client) -> Any:
+        """Leader across API tasks runs `fn`; others wait for its published result."""
+        lock_key = f"{self.KEY_PREFIX}:lock:{key}"
+        result_key = f"{self.KEY_PREFIX}:result:{key}"
+        token = uuid.uuid4().hex
+
+        try:
+            acquired = await redis_client.set(lock_key, token, nx=True, ex=max(int(self.lock_ttl_seconds), 1))
+        except Exception as e:
+            logger.warning(f"⚠️ Single-flight lock unavailable for {namespace}: {str(e)}")
+            return await fn()
+
+        if acquired:
+            try:
+                result = await fn()
+                try:
+                    await redis_client.set(
+                        result_key, json.dumps(result, default=str), ex=max(int(self.result_ttl_seconds), 1)
+                    )
+                except Exception as e:
+                    logger.warning(f"⚠️ Failed to publish single-flight result for {namespace}: {str(e)}")
+                return result
+            finally:
+                try:
+                    # Only release our own lock (it may have expired and been re-taken)
+                    if await redis_client.get(lock_key) == token:
+                        await redis_client.delete(lock_key)
+                except Exception:
+                    pass
+
+        # Another API task is running the same call: wait for its result
+        self.counters[namespace]["coalesced_remote"] += 1
+        deadline = time.monotonic() + self.wait_timeout_seconds
+        delay = self.poll_interval_seconds
+        try:
+            while time.monotonic() < deadline:
+                await asyncio.sleep(delay)
+                raw = await redis_client.get(result_key)
+                if raw is not None:
+                    return json.loads(raw)
+                if not await redis_client.exists(lock_key):
+                    break
+                delay = min(delay * 2, self.MAX_POLL_INTERVAL)
+        except Exception as e:
+            logger.warning(f"⚠️ Single-flight wait failed for {namespace}: {str(e)}")
+
+        # Leader failed, vanished or is too slow: run the call ourselves
+        self.counters[namespace]["remote_fallbacks"] += 1
+        return await fn()
+
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        """Per-namespace executed/coalesced counters for this process."""
+        return {namespace: dict(counts) for namespace, counts in self.counters.items()}
+
+
+def coalesced(namespace: str, exclude: tuple = ("self",)):
+    """
+    Decorator form of `SingleFlight.do` (in-process) for async functions.
+
+    The bound arguments (minus `exclude`) form the key. Concurrent callers
+    receive the same result object.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            params = {k: v for k, v in bound.arguments.items() if k not in exclude}
+            return await single_flight.do(namespace, params, lambda: func(*args, **kwargs))
+        return wrapper
+    return decorator
+
+
+# Create singleton instance
+single_flight = SingleFlight()
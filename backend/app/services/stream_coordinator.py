@@ -10,6 +10,7 @@ Date: November 8, 2025
 """
 
 import asyncio
+import json
 import logging
 import uuid
 from typing import Dict, List, Optional, Any
@@ -22,6 +23,12 @@ from app.schemas.batch import BatchScanJob
 logger = logging.getLogger(__name__)
 
 
+def _parse_stream_id(stream_id: str) -> tuple:
+    """'1700000000000-3' → (1700000000000, 3) for ordering stream IDs."""
+    ms, _, seq = str(stream_id).partition("-")
+    return int(ms), int(seq or 0)
+
+
 class StreamCoordinator:
     """
     Coordinates Redis Streams-based scan pipelines.
@@ -267,6 +274,128 @@ class StreamCoordinator:
             logger.error(f"❌ Failed to get pending count: {str(e)}")
             return None
     
+    async def get_group_backlog(
+        self,
+        stream_key: str,
+        consumer_group_name: str
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Sample a consumer group's backlog (XINFO STREAM / XINFO GROUPS).
+
+        Args:
+            stream_key: Redis Stream key
+            consumer_group_name: Consumer group name
+
+        Returns:
+            Dictionary with backlog sample, or None if error:
+            {
+                "length": int,          # entries currently in the stream
+                "entries_added": int,   # entries ever added (growth counter)
+                "entries_read": int,    # entries delivered to the group
+                "lag": int,             # entries not yet delivered to the group
+                "pending": int,         # delivered but not acknowledged
+                "consumers": int,
+                "completed": bool       # completion marker is the last entry
+            }
+        """
+        try:
+            redis_client = await self.get_redis()
+
+            stream = await redis_client.xinfo_stream(stream_key)
+            groups = await redis_client.xinfo_groups(stream_key)
+            group = next((g for g in groups if g.get("name") == consumer_group_name), None)
+            if group is None:
+                return None
+
+            length = stream.get("length", 0)
+            # Redis < 7 reports neither entries-added nor lag; fall back to
+            # the current length so growth and backlog are still estimated
+            entries_added = stream.get("entries-added")
+            entries_read = group.get("entries-read")
+            lag = group.get("lag")
+            if lag is None:
+                lag = max(0, (entries_added or length) - (entries_read or 0)) if entries_read is not None else length
+
+            last_entry = stream.get("last-entry")
+            completed = bool(last_entry) and (last_entry[1] or {}).get("type") == "completion"
+
+            return {
+                "length": length,
+                "entries_added": entries_added if entries_added is not None else length,
+                "entries_read": entries_read,
+                "lag": lag,
+                "pending": group.get("pending", 0),
+                "consumers": group.get("consumers", 0),
+                "completed": completed
+            }
+
+        except Exception as e:
+            logger.error(f"❌ Failed to sample backlog of {consumer_group_name}: {str(e)}")
+            return None
+
+    async def get_group_offsets(self, stream_key: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Read position of every consumer group on a stream (XINFO GROUPS).
+
+        Returns:
+            Group name → {"last_delivered_id": str, "pending": int}
+            ({} if the stream does not exist)
+        """
+        try:
+            redis_client = await self.get_redis()
+            groups = await redis_client.xinfo_groups(stream_key)
+            return {
+                group["name"]: {
+                    "last_delivered_id": group.get("last-delivered-id"),
+                    "pending": group.get("pending", 0)
+                }
+                for group in groups
+            }
+        except Exception as e:
+            logger.warning(f"⚠️  Failed to read group offsets of {stream_key}: {str(e)}")
+            return {}
+
+    async def reassign_pending(
+        self,
+        stream_key: str,
+        consumer_group_name: str,
+        from_consumer: str,
+        to_consumer: str,
+        batch_size: int = 1000
+    ) -> int:
+        """
+        Hand a dead consumer's delivered-but-unacknowledged entries to its
+        replacement (XPENDING + XCLAIM), then drop the dead consumer.
+
+        Consumers read their own pending list before new messages, so the
+        replacement processes these first and then continues from the
+        group's last-delivered ID.
+
+        Returns:
+            Number of entries reassigned
+        """
+        redis_client = await self.get_redis()
+        reassigned = 0
+        while True:
+            pending = await redis_client.xpending_range(
+                stream_key, consumer_group_name, min="-", max="+",
+                count=batch_size, consumername=from_consumer
+            )
+            if not pending:
+                break
+            claimed = await redis_client.xclaim(
+                stream_key, consumer_group_name, to_consumer, min_idle_time=0,
+                message_ids=[entry["message_id"] for entry in pending], justid=True
+            )
+            reassigned += len(claimed)
+            if not claimed or len(pending) < batch_size:
+                break
+
+        await redis_client.xgroup_delconsumer(stream_key, consumer_group_name, from_consumer)
+        if reassigned:
+            logger.info(f"♻️  Reassigned {reassigned} pending entries of {from_consumer} to {to_consumer} ({stream_key})")
+        return reassigned
+
     async def monitor_stream_progress(
         self,
         stream_key: str,
@@ -372,7 +501,255 @@ class StreamCoordinator:
         except Exception as e:
             logger.error(f"❌ Failed to cleanup stream: {str(e)}")
             return False
-    
+
+    # ============================================================
+    # STREAM LIFECYCLE: trimming, memory budget, finished-stream TTL
+    # ============================================================
+
+    def generate_backpressure_key(self, scan_job_id: str) -> str:
+        """
+        Key producers poll before writing; it exists while the scan's
+        streams are over their memory budget.
+
+        Format: scan:{scan_job_id}:backpressure
+        """
+        return f"scan:{scan_job_id}:backpressure"
+
+    def _scan_streams_key(self, scan_job_id: str) -> str:
+        """Registry of a scan's stream keys → consumer groups (hash)."""
+        return f"scan:{scan_job_id}:streams"
+
+    async def register_scan_streams(
+        self,
+        scan_job_id: str,
+        stream_groups: Dict[str, List[str]]
+    ) -> bool:
+        """
+        Record which streams (and consumer groups) belong to a scan, so
+        memory reports and cleanup work from any API process.
+
+        Args:
+            scan_job_id: Asset scan job ID the streams belong to
+            stream_groups: Stream key → consumer group names reading it
+        """
+        try:
+            redis_client = await self.get_redis()
+            await redis_client.hset(
+                self._scan_streams_key(scan_job_id),
+                mapping={key: json.dumps(groups) for key, groups in stream_groups.items()}
+            )
+            return True
+        except Exception as e:
+            logger.error(f"❌ Failed to register streams for scan {scan_job_id}: {str(e)}")
+            return False
+
+    async def get_scan_streams(self, scan_job_id: str) -> Dict[str, List[str]]:
+        """Stream key → consumer groups registered for a scan."""
+        redis_client = await self.get_redis()
+        registered = await redis_client.hgetall(self._scan_streams_key(scan_job_id))
+        return {key: json.loads(groups) for key, groups in registered.items()}
+
+    async def trim_acknowledged(
+        self,
+        stream_key: str,
+        consumer_groups: Optional[List[str]] = None
+    ) -> int:
+        """
+        Trim entries every consumer group has acknowledged (XTRIM MINID).
+
+        The trim point is the oldest entry any group still needs: its oldest
+        pending (delivered, unacknowledged) entry, or the entry after its
+        last-delivered ID. The stream's last entry is always kept so the
+        completion marker stays visible.
+
+        Args:
+            stream_key: Redis Stream key
+            consumer_groups: Groups expected to read the stream; nothing is
+                trimmed until all of them exist
+
+        Returns:
+            Number of entries trimmed (0 on error)
+        """
+        try:
+            redis_client = await self.get_redis()
+
+            groups = await redis_client.xinfo_groups(stream_key)
+            if not groups:
+                return 0
+            present = {group["name"] for group in groups}
+            if consumer_groups and not set(consumer_groups) <= present:
+                return 0
+
+            boundaries = []
+            for group in groups:
+                if group.get("pending", 0) > 0:
+                    pending = await redis_client.xpending(stream_key, group["name"])
+                    boundaries.append(_parse_stream_id(pending["min"]))
+                else:
+                    ms, seq = _parse_stream_id(group["last-delivered-id"])
+                    boundaries.append((ms, seq + 1))
+
+            stream = await redis_client.xinfo_stream(stream_key)
+            last_entry = stream.get("last-entry")
+            if last_entry:
+                boundaries.append(_parse_stream_id(last_entry[0]))
+
+            ms, seq = min(boundaries)
+            trimmed = await redis_client.xtrim(stream_key, minid=f"{ms}-{seq}", approximate=True)
+            if trimmed:
+                logger.debug(f"✂️  Trimmed {trimmed} acknowledged entries from {stream_key}")
+            return trimmed
+
+        except Exception as e:
+            logger.error(f"❌ Failed to trim stream {stream_key}: {str(e)}")
+            return 0
+
+    async def get_scan_memory_report(
+        self,
+        scan_job_id: str,
+        stream_keys: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Redis memory used by a scan's streams (MEMORY USAGE per stream).
+
+        Args:
+            scan_job_id: Asset scan job ID
+            stream_keys: Streams to measure (default: the scan's registered streams)
+
+        Returns:
+            {
+                "scan_job_id": str,
+                "streams": {stream_key: {"bytes": int, "length": int}},
+                "total_bytes": int,
+                "backpressure": bool
+            }
+        """
+        redis_client = await self.get_redis()
+        if stream_keys is None:
+            stream_keys = list(await self.get_scan_streams(scan_job_id))
+
+        streams = {}
+        for stream_key in stream_keys:
+            streams[stream_key] = {
+                "bytes": await redis_client.memory_usage(stream_key) or 0,
+                "length": await redis_client.xlen(stream_key),
+            }
+
+        return {
+            "scan_job_id": scan_job_id,
+            "streams": streams,
+            "total_bytes": sum(stream["bytes"] for stream in streams.values()),
+            "backpressure": bool(await redis_client.exists(self.generate_backpressure_key(scan_job_id))),
+        }
+
+    async def update_backpressure(self, scan_job_id: str, used_bytes: int) -> bool:
+        """
+        Raise or release the scan's backpressure signal.
+
+        Raised at the memory budget, released below budget × resume ratio
+        (hysteresis keeps producers from flapping). The key carries a TTL and
+        is refreshed while it applies, so producers resume if the API stops.
+
+        Returns:
+            True while backpressure applies
+        """
+        redis_client = await self.get_redis()
+        key = self.generate_backpressure_key(scan_job_id)
+        budget = settings.stream_scan_memory_budget_mb * 1024 * 1024
+
+        if used_bytes >= budget:
+            if await redis_client.set(key, used_bytes, ex=settings.stream_backpressure_ttl, get=True) is None:
+                logger.warning(
+                    f"⏸️  Backpressure ON for scan {scan_job_id}: streams use "
+                    f"{used_bytes / 1048576:.1f} MB (budget {settings.stream_scan_memory_budget_mb} MB)"
+                )
+            return True
+
+        if used_bytes < budget * settings.stream_backpressure_resume_ratio:
+            if await redis_client.delete(key):
+                logger.info(f"▶️  Backpressure OFF for scan {scan_job_id}: streams use {used_bytes / 1048576:.1f} MB")
+            return False
+
+        # Between the watermarks: keep the current state
+        return bool(await redis_client.expire(key, settings.stream_backpressure_ttl))
+
+    async def govern_scan_streams(
+        self,
+        scan_job_id: str,
+        stream_groups: Dict[str, List[str]],
+        stats: Optional[Dict[str, Any]] = None,
+        interval: Optional[float] = None
+    ) -> None:
+        """
+        Keep a running scan's streams within budget until cancelled.
+
+        Every interval: trim acknowledged entries from each stream, measure
+        the scan's stream memory and update the backpressure signal.
+
+        Args:
+            scan_job_id: Asset scan job ID
+            stream_groups: Stream key → consumer group names reading it
+            stats: Optional dict updated in place (trimmed_entries,
+                peak_bytes, backpressure_passes)
+            interval: Seconds between passes (default: settings.stream_trim_interval)
+        """
+        interval = interval if interval is not None else settings.stream_trim_interval
+        stats = stats if stats is not None else {}
+        stats.setdefault("trimmed_entries", 0)
+        stats.setdefault("peak_bytes", 0)
+        stats.setdefault("backpressure_passes", 0)
+
+        await self.register_scan_streams(scan_job_id, stream_groups)
+        logger.info(
+            f"🧭 Governing {len(stream_groups)} stream(s) for scan {scan_job_id} "
+            f"(budget {settings.stream_scan_memory_budget_mb} MB, every {interval:.0f}s)"
+        )
+
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                for stream_key, groups in stream_groups.items():
+                    stats["trimmed_entries"] += await self.trim_acknowledged(stream_key, groups)
+
+                report = await self.get_scan_memory_report(scan_job_id, list(stream_groups))
+                stats["peak_bytes"] = max(stats["peak_bytes"], report["total_bytes"])
+                if await self.update_backpressure(scan_job_id, report["total_bytes"]):
+                    stats["backpressure_passes"] += 1
+            except Exception as e:
+                logger.warning(f"⚠️  Stream governance pass failed for scan {scan_job_id}: {str(e)}")
+
+    async def expire_scan_streams(
+        self,
+        scan_job_id: str,
+        stream_keys: Optional[List[str]] = None,
+        ttl: Optional[int] = None
+    ) -> int:
+        """
+        Schedule a finished scan's streams for deletion (EXPIRE) and drop
+        its backpressure signal. Streams stay readable for debugging until
+        the TTL passes.
+
+        Returns:
+            Number of keys given a TTL
+        """
+        ttl = ttl if ttl is not None else settings.stream_finished_ttl
+        try:
+            redis_client = await self.get_redis()
+            if stream_keys is None:
+                stream_keys = list(await self.get_scan_streams(scan_job_id))
+
+            await redis_client.delete(self.generate_backpressure_key(scan_job_id))
+            expired = 0
+            for key in list(stream_keys) + [self._scan_streams_key(scan_job_id)]:
+                expired += int(await redis_client.expire(key, ttl))
+
+            logger.info(f"⏳ {expired} stream key(s) of scan {scan_job_id} expire in {ttl}s")
+            return expired
+
+        except Exception as e:
+            logger.error(f"❌ Failed to expire streams for scan {scan_job_id}: {str(e)}")
+            return 0
+
     async def close(self):
         """Close Redis connection."""
         if self.redis_client:
@@ -0,0 +1,346 @@
+"""
+Task Runners - Where Scan Module Tasks Actually Run
+
+BatchWorkflowOrchestrator used to hardwire ECS: with no ECS client it
+returned made-up ARNs, so nothing ran and pipeline throughput could not be
+measured without AWS. The orchestrator now builds the task (module,
+container environment, resources) and hands it to a TaskRunner:
+
+- EcsTaskRunner: Fargate RunTask/DescribeTasks through ecs_launcher
+  (cloud deployments)
+- LocalTaskRunner: starts the Go module binaries (subfinder-go, dnsx-go,
+  httpx-go, katana-go, url-resolver, ...) as subprocesses, or their images
+  as local containers, with exactly the environment the ECS task would
+  get. Pointed at a local Redis and a local Supabase/PostgREST, a whole
+  streaming pipeline runs on one Linux box (scripts/benchmark-local-pipeline.py)
+- MockTaskRunner: the previous behaviour without ECS - fake ARNs, tasks
+  always RUNNING
+
+Selected by `settings.task_runner` ("auto" = ECS when a client is
+available, mock otherwise; "ecs"; "local").
+"""
+import asyncio
+import logging
+import os
+import shutil
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ..core.config import settings
+from .ecs_launcher import ecs_launcher
+
+logger = logging.getLogger(__name__)
+
+# Module name -> Go module directory under backend/containers (also the
+# local binary name and, with the configured prefix, the local image name)
+MODULE_BINARIES = {
+    "subfinder": "subfinder-go",
+    "dnsx": "dnsx-go",
+    "httpx": "httpx-go",
+    "katana": "katana-go",
+    "url-resolver": "url-resolver",
+    "waymore": "waymore-go",
+    "tyvt": "tyvt-go",
+}
+
+
+@dataclass
+class TaskSpec:
+    """One scan module task, independent of where it runs."""
+    module: str
+    # Unique, human-readable task name (e.g. "consumer-<batch_id>")
+    name: str
+    environment: List[Dict[str, str]]
+    cpu: int
+    memory: int
+    tags: List[Dict[str, str]] = field(default_factory=list)
+    # ECS only (filled in when the runner requires_task_definition)
+    task_definition: str = ""
+    container_name: str = ""
+    task_role_arn: str = ""
+    execution_role_arn: str = ""
+    # Local only: binary/image name when it is not the module's (e.g. "dnsx-go-warm")
+    binary: str = ""
+
+    @property
+    def env(self) -> Dict[str, str]:
+        return {item["name"]: str(item["value"]) for item in self.environment}
+
+
+def _status_result(task_arn: str, last_status: str, desired_status: str, health_status: str = "UNKNOWN") -> Dict[str, Any]:
+    """Task status in the shape BatchWorkflowOrchestrator.get_task_status returns."""
+    return {
+        "task_arn": task_arn,
+        "status": last_status,
+        "last_status": last_status,
+        "desired_status": desired_status,
+        "health_status": health_status,
+        "is_healthy": (
+            last_status == "RUNNING" and
+            desired_status == "RUNNING" and
+            health_status in ["HEALTHY", "UNKNOWN"]
+        )
+    }
+
+
+class TaskRunner(ABC):
+    """Launches scan module tasks and reports their status."""
+
+    # Status reported for a successful launch
+    launched_status = "launched"
+    # Whether launches need ECS task definition/container/role names
+    requires_task_definition = False
+
+    @abstractmethod
+    async def run(self, spec: TaskSpec, count: int = 1) -> List[str]:
+        """Start `count` copies of the task; returns their task ARNs/IDs."""
+
+    @abstractmethod
+    async def describe(self, task_arn: str, cluster_name: Optional[str] = None) -> Dict[str, Any]:
+        """Current status of a task (see _status_result)."""
+
+    async def stop(self, task_arn: str) -> None:
+        """Stop a task (no-op where not supported)."""
+
+    async def aclose(self) -> None:
+        """Release runner resources."""
+
+
+class EcsTaskRunner(TaskRunner):
+    """Fargate tasks via RunTask/DescribeTasks (concurrent, rate limited)."""
+
+    requires_task_definition = True
+
+    def __init__(self, ecs_client: Any, cluster: str, subnets: List[str], security_groups: List[str]):
+        self.ecs_client = ecs_client
+        self.cluster = cluster
+        self.subnets = subnets
+        self.security_groups = security_groups
+
+    async def run(self, spec: TaskSpec, count: int = 1) -> List[str]:
+        return await ecs_launcher.run_task(
+            self.ecs_client,
+            count=count,
+            cluster=self.cluster,
+            taskDefinition=spec.task_definition,
+            launchType='FARGATE',
+            networkConfiguration={
+                'awsvpcConfiguration': {
+                    'subnets': self.subnets,
+                    'securityGroups': self.security_groups,
+                    'assignPublicIp': 'ENABLED'
+                }
+            },
+            overrides={
+                'taskRoleArn': spec.task_role_arn,
+                'executionRoleArn': spec.execution_role_arn,
+                'cpu': str(spec.cpu),
+                'memory': str(spec.memory),
+                'containerOverrides': [{
+                    'name': spec.container_name,
+                    'environment': spec.environment,
+                    # No 'command' key - containers use environment variables only ✅
+                }]
+            },
+            tags=spec.tags
+        )
+
+    async def describe(self, task_arn: str, cluster_name: Optional[str] = None) -> Dict[str, Any]:
+        response = await ecs_launcher.call(
+            self.ecs_client,
+            "describe_tasks",
+            cluster=cluster_name or self.cluster,
+            tasks=[task_arn]
+        )
+
+        if not response.get('tasks'):
+            logger.error(f"Task not found: {task_arn}")
+            return {
+                "task_arn": task_arn,
+                "status": "NOT_FOUND",
+                "is_healthy": False,
+                "error": "Task not found in ECS"
+            }
+
+        task = response['tasks'][0]
+        result = _status_result(
+            task_arn,
+            task.get('lastStatus', 'UNKNOWN'),
+            task.get('desiredStatus', 'UNKNOWN'),
+            task.get('healthStatus', 'UNKNOWN')
+        )
+
+        # If task stopped, get stop details
+        if result["last_status"] == 'STOPPED':
+            result["stop_code"] = task.get('stopCode', 'UNKNOWN')
+            result["stopped_reason"] = task.get('stoppedReason', 'Unknown reason')
+
+            # Get container exit code
+            containers = task.get('containers', [])
+            if containers:
+                result["exit_code"] = containers[0].get('exitCode')
+
+            result["is_healthy"] = False
+
+        return result
+
+    async def stop(self, task_arn: str) -> None:
+        await ecs_launcher.call(
+            self.ecs_client,
+            "stop_task",
+            cluster=self.cluster,
+            task=task_arn,
+            reason="Stopped by NeoBot-Net"
+        )
+
+
+class MockTaskRunner(TaskRunner):
+    """No-op runner used when ECS is unavailable: fake ARNs, always RUNNING."""
+
+    launched_status = "mock_launched"
+
+    async def run(self, spec: TaskSpec, count: int = 1) -> List[str]:
+        return [
+            f"arn:aws:ecs:us-east-1:123456789012:task/mock-{spec.name}" + (f"-{i + 1}" if count > 1 else "")
+            for i in range(count)
+        ]
+
+    async def describe(self, task_arn: str, cluster_name: Optional[str] = None) -> Dict[str, Any]:
+        result = _status_result(task_arn, "RUNNING", "RUNNING", "HEALTHY")
+        result["mock"] = True
+        return result
+
+
+class LocalTaskRunner(TaskRunner):
+    """
+    Runs module tasks on this machine.
+
+    mode="subprocess": `<bin_dir>/<binary>` (build with
+        `go build -o <bin_dir>/dnsx-go ./backend/containers/dnsx-go`, etc.)
+    mode="docker": `docker run --network host <image_prefix><binary>`
+        (images built from the module Dockerfiles)
+
+    Each task gets the environment the ECS container would get; output goes
+    to `<log_dir>/<task name>.log`.
+    """
+
+    def __init__(
+        self,
+        mode: Optional[str] = None,
+        bin_dir: Optional[str] = None,
+        image_prefix: Optional[str] = None,
+        log_dir: Optional[str] = None
+    ):
+        self.mode = mode or settings.local_runner_mode
+        if self.mode not in ("subprocess", "docker"):
+            raise ValueError(f"Unknown local runner mode: {self.mode}")
+        self.bin_dir = Path(bin_dir or settings.local_runner_bin_dir)
+        self.image_prefix = image_prefix if image_prefix is not None else settings.local_runner_image_prefix
+        self.log_dir = Path(log_dir or settings.local_runner_log_dir)
+        self._processes: Dict[str, asyncio.subprocess.Process] = {}
+
+    def _binary(self, spec: TaskSpec) -> str:
+        if spec.binary:
+            return spec.binary
+        if spec.module not in MODULE_BINARIES:
+            raise ValueError(f"No local binary known for module '{spec.module}'")
+        return MODULE_BINARIES[spec.module]
+
+    def command(self, spec: TaskSpec, task_name: str) -> List[str]:
+        """Command line that starts one copy of the task."""
+        binary = self._binary(spec)
+        if self.mode == "docker":
+            command = [
+                "docker", "run", "--rm", "--network", "host",
+                "--name", task_name,
+                "--cpus", f"{spec.cpu / 1024:g}",
+                "--memory", f"{spec.memory}m",
+            ]
+            for name in spec.env:
+                # Values are passed through the docker client's environment
+                command += ["-e", name]
+            return command + [f"{self.image_prefix}{binary}"]
+
+        path = self.bin_dir / binary
+        if not path.exists():
+            raise FileNotFoundError(
+                f"Local binary not found: {path} "
+                f"(go build -o {path} ./backend/containers/{binary})"
+            )
+        return [str(path)]
+
+    def environment(self, spec: TaskSpec) -> Dict[str, str]:
+        """Process environment: the task's container environment plus PATH/HOME."""
+        env = {name: os.environ[name] for name in ("PATH", "HOME", "TMPDIR") if name in os.environ}
+        if self.mode == "docker":
+            # docker CLI config (DOCKER_HOST, contexts)
+            env.update({name: value for name, value in os.environ.items() if name.startswith("DOCKER_")})
+        env.update(spec.env)
+        return env
+
+    async def run(self, spec: TaskSpec, count: int = 1) -> List[str]:
+        if self.mode == "docker" and shutil.which("docker") is None:
+            raise FileNotFoundError("docker CLI not found for local task runner")
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+
+        task_arns = []
+        for _ in range(count):
+            task_name = f"{spec.module}-{spec.name}-{uuid.uuid4().hex[:8]}"
+            with open(self.log_dir / f"{task_name}.log", "wb") as log_file:
+                process = await asyncio.create_subprocess_exec(
+                    *self.command(spec, task_name),
+                    env=self.environment(spec),
+                    stdin=asyncio.subprocess.DEVNULL,
+                    stdout=log_file,
+                    stderr=asyncio.subprocess.STDOUT
+                )
+            task_arn = f"local:{self.mode}/{task_name}"
+            self._processes[task_arn] = process
+            task_arns.append(task_arn)
+            logger.info(f"🖥️ Started local {spec.module} task {task_arn} (pid {process.pid})")
+
+        return task_arns
+
+    async def describe(self, task_arn: str, cluster_name: Optional[str] = None) -> Dict[str, Any]:
+        process = self._processes.get(task_arn)
+        if process is None:
+            return {"task_arn": task_arn, "status": "NOT_FOUND", "is_healthy": False, "error": "Unknown local task"}
+
+        if process.returncode is None:
+            return _status_result(task_arn, "RUNNING", "RUNNING")
+
+        result = _status_result(task_arn, "STOPPED", "STOPPED")
+        result["stop_code"] = "EssentialContainerExited"
+        result["stopped_reason"] = f"Process exited with code {process.returncode}"
+        result["exit_code"] = process.returncode
+        return result
+
+    async def stop(self, task_arn: str) -> None:
+        process = self._processes.get(task_arn)
+        if process is None or process.returncode is not None:
+            return
+        if self.mode == "docker":
+            # Stopping the CLI does not stop the container
+            stopper = await asyncio.create_subprocess_exec(
+                "docker", "stop", task_arn.split("/", 1)[1],
+                stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.DEVNULL
+            )
+            await stopper.wait()
+        else:
+            process.terminate()
+        await process.wait()
+
+    async def wait(self, task_arn: str) -> int:
+        """Wait for a local task to exit; returns its exit code."""
+        return await self._processes[task_arn].wait()
+
+    async def aclose(self) -> None:
+        for task_arn in list(self._processes):
+            await self.stop(task_arn)
+
+
+# Create singleton instance
+mock_task_runner = MockTaskRunner()
@@ -0,0 +1,348 @@
+"""
+Warm Consumer Pool - Long-Lived Consumer Workers Instead of Per-Scan Cold Starts
+
+Every streaming pipeline used to start fresh Fargate tasks for its
+consumers (DNSx, HTTPx, Katana, URL Resolver). For small programs the
+30-90s of image pull and boot dominated the scan. In warm-pool mode each
+module keeps a few long-lived workers (containers/warm-worker, built on
+top of the module image) that wait on an assignment stream:
+
+    warmpool:{module}:assignments:{worker_id}
+                                    stream of {assignment_id, environment}
+                                    read only by that worker
+    warmpool:{module}:idle          zset worker_id -> last idle heartbeat
+    warmpool:{module}:workers       zset worker_id -> last heartbeat
+    warmpool:{module}:target        pool size workers reap themselves down to
+    warmpool:{module}:demand        hash minute -> consumer tasks requested
+    warmpool:assignment:{id}        hash status/worker/exit_code of one assignment
+
+`BatchWorkflowOrchestrator.launch_streaming_consumer` builds the consumer's
+environment as before, then hands it to `warm_pool.assign()`. If an idle
+worker can be claimed (ZPOPMAX on the idle set, atomic across API
+processes), the assignment is posted to that worker's own stream and it
+runs the module binary with that environment within seconds; otherwise
+the caller falls back to an on-demand task launch.
+
+Pool sizing follows recent demand: the target is the busiest minute of
+consumer requests in `warm_pool_demand_window`, clamped to
+[warm_pool_min_size, warm_pool_max_size]. A reconcile loop (one API
+process per interval) launches workers up to the target; workers above
+the target exit on their own after `warm_pool_idle_timeout` idle, so a
+busy worker is never stopped.
+"""
+import asyncio
+import json
+import logging
+import math
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from ..core.config import settings
+from ..schemas.batch import BatchScanJob
+
+logger = logging.getLogger(__name__)
+
+# Pseudo task ARN prefix for assignments run by warm workers
+WARM_ARN_PREFIX = "warm:"
+
+# Assignment records outlive the scan for status lookups
+ASSIGNMENT_TTL = 86400
+
+# Workers are live while their heartbeat is this many intervals old at most
+HEARTBEAT_MISSES = 3
+
+
+class WarmPool:
+    """
+    Hands consumer assignments to warm workers and keeps each module's pool sized.
+    """
+
+    RECONCILE_SLOT_KEY = "warmpool:reconcile_slot"
+
+    def __init__(
+        self,
+        enabled: Optional[bool] = None,
+        modules: Optional[List[str]] = None,
+        redis_provider: Optional[Callable[[], Awaitable[Any]]] = None,
+        clock: Callable[[], float] = time.time
+    ):
+        self.enabled = enabled if enabled is not None else settings.warm_pool_enabled
+        self.modules = modules if modules is not None else [
+            module.strip() for module in settings.warm_pool_modules.split(",") if module.strip()
+        ]
+        self._redis_provider = redis_provider
+        self.clock = clock
+        self._task: Optional[asyncio.Task] = None
+
+    async def _redis(self):
+        if self._redis_provider is None:
+            from .stream_coordinator import stream_coordinator
+            self._redis_provider = stream_coordinator.get_redis
+        return await self._redis_provider()
+
+    def _key(self, module: str, name: str) -> str:
+        return f"warmpool:{module}:{name}"
+
+    def _assignment_stream(self, module: str, worker_id: str) -> str:
+        return self._key(module, f"assignments:{worker_id}")
+
+    def _live_since(self) -> float:
+        return self.clock() - HEARTBEAT_MISSES * settings.warm_pool_heartbeat_seconds
+
+    def serves(self, module: str) -> bool:
+        return self.enabled and module in self.modules
+
+    # ================================================================
+    # Assignments
+    # ================================================================
+
+    async def claim_worker(self, module: str) -> Optional[str]:
+        """
+        Reserve the most recently active idle worker of a module.
+
+        ZPOPMAX is atomic, so two pipelines never claim the same worker. A
+        popped worker whose heartbeat is stale is dropped (every other idle
+        entry is older still, so the idle set is cleared).
+        """
+        redis_client = await self._redis()
+        popped = await redis_client.zpopmax(self._key(module, "idle"))
+        if not popped:
+            return None
+
+        worker_id, heartbeat = popped[0]
+        if heartbeat < self._live_since():
+            await redis_client.delete(self._key(module, "idle"))
+            return None
+        return worker_id
+
+    async def assign(
+        self,
+        batch_job: BatchScanJob,
+        environment: List[Dict[str, str]]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Run a consumer on a warm worker.
+
+        Args:
+            batch_job: Consumer BatchScanJob
+            environment: The consumer's full container environment
+
+        Returns:
+            Launch result shaped like _launch_streaming_task's (task_arn is a
+            "warm:{module}:{assignment_id}" pseudo ARN), or None when the
+            module is not pooled or no idle worker is available - the
+            caller then launches a task on demand.
+        """
+        module = batch_job.module
+        if not self.serves(module):
+            return None
+
+        try:
+            await self.record_demand(module)
+
+            worker_id = await self.claim_worker(module)
+            if worker_id is None:
+                logger.info(f"🧊 No idle warm {module} worker - launching on demand")
+                return None
+
+            redis_client = await self._redis()
+            assignment_id = uuid.uuid4().hex[:12]
+            assignment_key = f"warmpool:assignment:{assignment_id}"
+            await redis_client.hset(assignment_key, mapping={
+                "module": module,
+                "batch_id": str(batch_job.id),
+                "claimed_worker": worker_id,
+                "status": "ASSIGNED",
+                "assigned_at": self.clock(),
+            })
+            await redis_client.expire(assignment_key, ASSIGNMENT_TTL)
+            # Only the claimed worker reads this stream, so it gets the job
+            assignment_stream = self._assignment_stream(module, worker_id)
+            await redis_client.xadd(assignment_stream, {
+                "assignment_id": assignment_id,
+                "environment": json.dumps(environment),
+            })
+            # A worker that dies idle leaves its stream behind
+            await redis_client.expire(assignment_stream, ASSIGNMENT_TTL)
+
+            if not await self._picked_up(assignment_key):
+                logger.warning(f"⏱️ Warm {module} worker {worker_id} did not pick up {assignment_id} - launching on demand")
+                return None
+
+            task_arn = f"{WARM_ARN_PREFIX}{module}:{assignment_id}"
+            logger.info(f"🔥 Assigned {module} consumer to warm worker {worker_id}: {task_arn}")
+            return {
+                "batch_id": str(batch_job.id),
+                "task_arn": task_arn,
+                "task_arns": [task_arn],
+                "status": "assigned",
+                "role": "consumer",
+                "cpu": batch_job.allocated_cpu,
+                "memory": batch_job.allocated_memory,
+            }
+
+        except Exception as e:
+            logger.warning(f"⚠️ Warm pool assignment failed for {module}, launching on demand: {str(e)}")
+            return None
+
+    async def _picked_up(self, assignment_key: str) -> bool:
+        """
+        Wait for a worker to take the assignment (it sets "taken" first).
+
+        An idle worker is blocked reading the assignment stream, so this is
+        normally immediate. If none takes it within warm_pool_pickup_timeout
+        (e.g. the claimed worker just died), the API takes "taken" itself,
+        which withdraws the assignment, and the caller launches on demand.
+        """
+        redis_client = await self._redis()
+        deadline = time.monotonic() + settings.warm_pool_pickup_timeout
+        while time.monotonic() < deadline:
+            if await redis_client.hexists(assignment_key, "taken"):
+                return True
+            await asyncio.sleep(0.2)
+        # Lost the race to a worker that took it just now: it runs
+        return not await redis_client.hsetnx(assignment_key, "taken", "api")
+
+    async def describe(self, task_arn: str) -> Dict[str, Any]:
+        """Status of a warm assignment in BatchWorkflowOrchestrator.get_task_status's shape."""
+        assignment_id = task_arn.rsplit(":", 1)[-1]
+        redis_client = await self._redis()
+        record = await redis_client.hgetall(f"warmpool:assignment:{assignment_id}")
+
+        # ASSIGNED (not yet picked up) reads as PENDING, like a provisioning task
+        status = {"ASSIGNED": "PENDING"}.get(record.get("status"), record.get("status", "STOPPED"))
+        exit_code = int(record["exit_code"]) if record.get("exit_code") not in (None, "") else None
+        return {
+            "task_arn": task_arn,
+            "status": status,
+            "last_status": status,
+            "desired_status": "STOPPED" if status == "STOPPED" else "RUNNING",
+            "health_status": "UNKNOWN",
+            "is_healthy": status in ("PENDING", "RUNNING") or (status == "STOPPED" and exit_code == 0),
+            "exit_code": exit_code,
+            "worker": record.get("worker") or record.get("claimed_worker"),
+        }
+
+    # ================================================================
+    # Sizing
+    # ================================================================
+
+    async def record_demand(self, module: str, tasks: int = 1) -> None:
+        """Count consumer tasks requested this minute."""
+        redis_client = await self._redis()
+        key = self._key(module, "demand")
+        await redis_client.hincrby(key, str(int(self.clock() // 60)), tasks)
+        await redis_client.expire(key, int(settings.warm_pool_demand_window) + 120)
+
+    async def target_size(self, module: str) -> int:
+        """Busiest minute of recent demand, clamped to the configured pool size range."""
+        redis_client = await self._redis()
+        demand = await redis_client.hgetall(self._key(module, "demand"))
+        oldest_minute = (self.clock() - settings.warm_pool_demand_window) // 60
+        peak = max([int(count) for minute, count in demand.items() if int(minute) >= oldest_minute], default=0)
+        return max(settings.warm_pool_min_size, min(settings.warm_pool_max_size, math.ceil(peak)))
+
+    async def live_workers(self, module: str) -> int:
+        redis_client = await self._redis()
+        return await redis_client.zcount(self._key(module, "workers"), self._live_since(), "+inf")
+
+    async def reconcile(
+        self,
+        launcher: Optional[Callable[[str, int], Awaitable[List[str]]]] = None
+    ) -> Dict[str, Dict[str, int]]:
+        """
+        Publish each module's target size and launch workers up to it.
+
+        Workers launched within the last `warm_pool_start_grace` seconds
+        count as live, so slow boots are not launched twice.
+
+        Args:
+            launcher: Launches `count` warm workers for a module
+                (default: BatchWorkflowOrchestrator.launch_warm_workers)
+
+        Returns:
+            module -> {"target", "live", "starting", "launched"}
+        """
+        if launcher is None:
+            from .batch_workflow_orchestrator import batch_workflow_orchestrator
+            launcher = batch_workflow_orchestrator.launch_warm_workers
+
+        redis_client = await self._redis()
+        now = self.clock()
+        report = {}
+        for module in self.modules:
+            target = await self.target_size(module)
+            await redis_client.set(self._key(module, "target"), target)
+
+            starting_key = self._key(module, "starting")
+            await redis_client.zremrangebyscore(starting_key, "-inf", now - settings.warm_pool_start_grace)
+            await redis_client.zremrangebyscore(self._key(module, "workers"), "-inf", self._live_since())
+            live = await self.live_workers(module)
+            starting = await redis_client.zcard(starting_key)
+
+            launched = 0
+            missing = target - live - starting
+            if missing > 0:
+                try:
+                    task_arns = await launcher(module, missing)
+                except Exception as e:
+                    logger.error(f"❌ Failed to launch warm {module} workers: {str(e)}")
+                    task_arns = []
+                if task_arns:
+                    await redis_client.zadd(starting_key, {task_arn: now for task_arn in task_arns})
+                launched = len(task_arns)
+                logger.info(f"🔥 Warm pool {module}: {live} live + {starting} starting, target {target} → launched {launched}")
+
+            report[module] = {"target": target, "live": live, "starting": starting, "launched": launched}
+        return report
+
+    # ================================================================
+    # Lifecycle
+    # ================================================================
+
+    async def start(self) -> None:
+        """Start the reconcile loop (no-op when the pool is disabled)."""
+        if not self.enabled or (self._task is not None and not self._task.done()):
+            return
+        logger.info(f"🔥 Warm consumer pool enabled for {', '.join(self.modules)}")
+        self._task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                # One API process reconciles per interval
+                redis_client = await self._redis()
+                if await redis_client.set(
+                    self.RECONCILE_SLOT_KEY, "1", nx=True,
+                    ex=max(int(settings.warm_pool_reconcile_interval), 1)
+                ):
+                    await self.reconcile()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"⚠️ Warm pool reconcile failed: {str(e)}")
+            await asyncio.sleep(settings.warm_pool_reconcile_interval)
+
+    async def shutdown(self) -> None:
+        """Stop reconciling; warm workers reap themselves once idle."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def get_status(self) -> Dict[str, Any]:
+        """Pool size, idle workers and target per module."""
+        redis_client = await self._redis()
+        modules = {}
+        for module in self.modules:
+            modules[module] = {
+                "live": await self.live_workers(module),
+                "idle": await redis_client.zcount(self._key(module, "idle"), self._live_since(), "+inf"),
+                "target": int(await redis_client.get(self._key(module, "target")) or 0),
+            }
+        return {"enabled": self.enabled, "modules": modules}
+
+
+# Create singleton instance
+warm_pool = WarmPool()
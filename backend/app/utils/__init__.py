@@ -3,9 +3,39 @@ Utility modules for the application.
 """
 
 from .json_encoder import ApplicationJSONEncoder, safe_json_dumps, safe_json_loads
+from .pagination import (
+    InvalidCursorError,
+    encode_cursor,
+    decode_cursor,
+    apply_keyset,
+    keyset_page,
+    InvalidWatermarkError,
+    encode_watermark,
+    decode_watermark,
+    watermark_ceiling,
+    apply_delta,
+    delta_page,
+)
+from .domains import NormalizedDomains, normalize_domain, normalize_domains, chunked, ingest_domains
 
 __all__ = [
     'ApplicationJSONEncoder',
     'safe_json_dumps', 
-    'safe_json_loads'
+    'safe_json_loads',
+    'InvalidCursorError',
+    'encode_cursor',
+    'decode_cursor',
+    'apply_keyset',
+    'keyset_page',
+    'InvalidWatermarkError',
+    'encode_watermark',
+    'decode_watermark',
+    'watermark_ceiling',
+    'apply_delta',
+    'delta_page',
+    'NormalizedDomains',
+    'normalize_domain',
+    'normalize_domains',
+    'chunked',
+    'ingest_domains'
 ]
@@ -0,0 +1,112 @@
+"""
+Apex domain normalization for bulk ingestion.
+
+Mirrors the normalization in the `bulk_insert_apex_domains` RPC (and the
+`valid_domain` CHECK on apex_domains) so callers can dedupe and reject
+invalid input before it crosses the network:
+
+    " *.Example.COM. "  ->  "example.com"
+
+`ingest_domains` is the one chunk-and-insert loop shared by the API, the
+`neobotnet programs add` CLI and the ECS orchestrator. Kept free of
+settings/client imports so all three can use it.
+"""
+import inspect
+import re
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple
+
+# Same pattern as the apex_domains.valid_domain CHECK, applied after lowercasing
+DOMAIN_PATTERN = re.compile(r"^[a-z0-9]([a-z0-9\-]{0,61}[a-z0-9])?(\.[a-z0-9]([a-z0-9\-]{0,61}[a-z0-9])?)*$")
+
+# Domains sent per bulk_insert_apex_domains call
+INGEST_CHUNK_SIZE = 1000
+
+
+class NormalizedDomains(NamedTuple):
+    """Result of normalizing a batch of raw domain strings."""
+    valid: List[str]
+    invalid: List[str]
+    duplicates: int
+
+
+def normalize_domain(domain: str) -> str:
+    """Trim, lowercase and strip a leading wildcard label and trailing dot."""
+    domain = domain.strip().lower()
+    if domain.startswith("*."):
+        domain = domain[2:]
+    return domain.rstrip(".")
+
+
+def normalize_domains(domains: Iterable[str]) -> NormalizedDomains:
+    """
+    Normalize, validate and dedupe domains in one pass.
+
+    Valid domains keep their first-seen order; blank entries are ignored.
+    """
+    seen = set()
+    valid: List[str] = []
+    invalid: List[str] = []
+    duplicates = 0
+
+    for raw in domains:
+        if not raw or not raw.strip():
+            continue
+        domain = normalize_domain(raw)
+        if domain in seen:
+            duplicates += 1
+            continue
+        seen.add(domain)
+        if DOMAIN_PATTERN.match(domain):
+            valid.append(domain)
+        else:
+            invalid.append(raw.strip())
+
+    return NormalizedDomains(valid, invalid, duplicates)
+
+
+def chunked(items: List[str], size: int = INGEST_CHUNK_SIZE) -> Iterator[List[str]]:
+    """Yield consecutive slices of at most `size` items."""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+async def ingest_domains(
+    client: Any,
+    asset_id: str,
+    domains: Iterable[str],
+    chunk_size: int = INGEST_CHUNK_SIZE,
+) -> Dict[str, Any]:
+    """
+    Normalize domains and insert them in chunks via `bulk_insert_apex_domains`.
+
+    Works with both the sync and async supabase clients: the RPC's
+    `execute()` result is awaited only when it is awaitable.
+
+    Returns:
+        Counts: submitted, inserted, skipped (already on the asset or
+        duplicate input), invalid (rejected locally or by the RPC), plus
+        every invalid input in `invalid_domains`
+    """
+    normalized = normalize_domains(domains)
+    inserted = 0
+    skipped = normalized.duplicates
+    invalid = len(normalized.invalid)
+
+    for chunk in chunked(normalized.valid, chunk_size):
+        response = client.rpc(
+            "bulk_insert_apex_domains", {"p_asset_id": asset_id, "p_domains": chunk}
+        ).execute()
+        if inspect.isawaitable(response):
+            response = await response
+        result = response.data or {}
+        inserted += result.get("inserted", 0)
+        skipped += result.get("skipped", 0)
+        invalid += result.get("invalid", 0)
+
+    return {
+        "submitted": len(normalized.valid) + len(normalized.invalid) + normalized.duplicates,
+        "inserted": inserted,
+        "skipped": skipped,
+        "invalid": invalid,
+        "invalid_domains": normalized.invalid,
+    }
@@ -0,0 +1,247 @@
+"""
+Keyset (cursor) pagination helpers for PostgREST list queries.
+
+OFFSET pagination makes PostgreSQL walk and discard every skipped row, so
+page N costs O(N * per_page). Keyset pagination instead seeks directly to
+the last row of the previous page using an index on (sort_column, id):
+
+    ORDER BY sort_column DESC NULLS LAST, id DESC
+    WHERE sort_column < :v OR (sort_column = :v AND id < :id)
+
+which makes every page cost the same as page 1.
+
+Cursors are opaque to clients: URL-safe base64 of the last row's sort key
+plus its `id` tiebreaker. Pass a page's `next_cursor` back as `cursor=`.
+"""
+import base64
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a client supplies a malformed or tampered cursor."""
+
+
+def encode_cursor(sort_value: Any, row_id: Any) -> str:
+    """Encode the (sort key, id) of the last row on a page into an opaque cursor."""
+    payload = json.dumps({"v": sort_value, "id": str(row_id)}, separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[Optional[Any], str]:
+    """
+    Decode an opaque cursor back into (sort value, id).
+
+    Raises:
+        InvalidCursorError: If the cursor is not one we issued
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        return payload["v"], str(payload["id"])
+    except Exception:
+        raise InvalidCursorError("Invalid pagination cursor. Use the next_cursor value from a previous page.")
+
+
+def _quote(value: Any) -> str:
+    """Quote a filter value for PostgREST logic trees (timestamps contain reserved ':' and '.')."""
+    escaped = str(value).replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{escaped}"'
+
+
+def apply_keyset(
+    query,
+    sort_column: str,
+    limit: int,
+    cursor: Optional[str] = None,
+    desc: bool = True,
+    id_column: str = "id"
+):
+    """
+    Order a query by (sort_column, id), seek past `cursor`, and fetch one extra row.
+
+    The extra row tells `keyset_page` whether another page exists without a
+    COUNT. NULL sort values are ordered last so the seek predicate stays total.
+
+    Args:
+        query: PostgREST select query with all filters already applied
+        sort_column: Timestamp column to sort by (e.g. "resolved_at")
+        limit: Page size
+        cursor: Opaque cursor from a previous page (None for the first page)
+        desc: Sort newest first (default True)
+        id_column: Unique tiebreaker column (default "id")
+
+    Raises:
+        InvalidCursorError: If the cursor cannot be decoded
+    """
+    query = query.order(sort_column, desc=desc, nullsfirst=False).order(id_column, desc=desc)
+
+    if cursor:
+        sort_value, last_id = decode_cursor(cursor)
+        op = "lt" if desc else "gt"
+
+        if sort_value is None:
+            # Already inside the NULL tail - only the id tiebreaker remains
+            query = query.is_(sort_column, "null").filter(id_column, op, last_id)
+        else:
+            query = query.or_(
+                f"{sort_column}.{op}.{_quote(sort_value)},"
+                f"and({sort_column}.eq.{_quote(sort_value)},{id_column}.{op}.{_quote(last_id)}),"
+                f"{sort_column}.is.null"
+            )
+
+    return query.limit(limit + 1)
+
+
+def keyset_page(
+    rows: List[Dict[str, Any]],
+    sort_column: str,
+    limit: int,
+    id_column: str = "id"
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Trim the look-ahead row from a keyset query result and build the next cursor.
+
+    Returns:
+        (rows for this page, next_cursor or None when this is the last page)
+    """
+    rows = rows or []
+    if len(rows) <= limit:
+        return rows, None
+
+    page = rows[:limit]
+    last = page[-1]
+    return page, encode_cursor(last.get(sort_column), last[id_column])
+
+
+# =============================================================================
+# Delta (since=) watermarks
+# =============================================================================
+#
+# Delta queries return rows whose change column (discovered_at, updated_at,
+# created_at) moved past a watermark, oldest change first:
+#
+#     ORDER BY change_column ASC, id ASC
+#     WHERE (change_column, id) > (:ts, :id) AND change_column <= :until
+#
+# `until` is "now minus delta_settle_seconds": rows stamped just before a
+# query can still be in uncommitted transactions, so the window stops short
+# of them and they are picked up by the next sync instead of being skipped.
+# Every page returns `next_watermark`, a high-water mark meaning "every row
+# up to here has been delivered": the last row of a full page, or `until`
+# once the window is drained. Pass it back as `since=` next time.
+
+
+class InvalidWatermarkError(ValueError):
+    """Raised when a client supplies a malformed `since` watermark."""
+
+
+def encode_watermark(timestamp: Any, row_id: Any = None) -> str:
+    """Encode a high-water mark (change timestamp, optional id tiebreaker) into an opaque token."""
+    payload = json.dumps(
+        {"w": timestamp, "id": None if row_id is None else str(row_id)},
+        separators=(",", ":"),
+        default=str
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_watermark(watermark: str) -> Tuple[str, Optional[str]]:
+    """
+    Decode a `since` watermark into (timestamp, id or None).
+
+    Accepts tokens from `next_watermark` or a plain ISO-8601 timestamp
+    (e.g. `2026-01-01T00:00:00Z` to start a first sync).
+
+    Raises:
+        InvalidWatermarkError: If the watermark is neither
+    """
+    try:
+        return _parse_timestamp(watermark), None
+    except ValueError:
+        pass
+
+    try:
+        padded = watermark + "=" * (-len(watermark) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        row_id = payload.get("id")
+        return _parse_timestamp(payload["w"]), None if row_id is None else str(row_id)
+    except Exception:
+        raise InvalidWatermarkError(
+            "Invalid since watermark. Use the next_watermark value from a previous response "
+            "or an ISO-8601 timestamp."
+        )
+
+
+def _parse_timestamp(value: str) -> str:
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.isoformat()
+
+
+def watermark_ceiling(settle_seconds: int) -> str:
+    """Upper bound of a delta window: now minus the settle lag, as an ISO timestamp."""
+    return (datetime.now(timezone.utc) - timedelta(seconds=settle_seconds)).isoformat()
+
+
+def apply_delta(
+    query,
+    change_column: str,
+    limit: int,
+    since: str,
+    until: str,
+    id_column: str = "id"
+):
+    """
+    Restrict a query to rows changed after `since` and up to `until`, oldest first.
+
+    Fetches one extra row so `delta_page` knows whether the window has more.
+
+    Args:
+        query: PostgREST select query with all filters already applied
+        change_column: Timestamp column bumped when a row is added or changed
+        limit: Page size
+        since: Watermark token (or ISO timestamp) from the previous sync
+        until: Window upper bound from `watermark_ceiling`
+        id_column: Unique tiebreaker column (default "id")
+
+    Raises:
+        InvalidWatermarkError: If `since` cannot be decoded
+    """
+    timestamp, last_id = decode_watermark(since)
+
+    if last_id is None:
+        query = query.gt(change_column, timestamp)
+    else:
+        query = query.or_(
+            f"{change_column}.gt.{_quote(timestamp)},"
+            f"and({change_column}.eq.{_quote(timestamp)},{id_column}.gt.{_quote(last_id)})"
+        )
+
+    query = query.lte(change_column, until)
+    query = query.order(change_column, desc=False).order(id_column, desc=False)
+    return query.limit(limit + 1)
+
+
+def delta_page(
+    rows: List[Dict[str, Any]],
+    change_column: str,
+    limit: int,
+    until: str,
+    id_column: str = "id"
+) -> Tuple[List[Dict[str, Any]], str, bool]:
+    """
+    Trim the look-ahead row from a delta query and build the next watermark.
+
+    Returns:
+        (rows for this page, next_watermark, has_more)
+    """
+    rows = rows or []
+    if len(rows) <= limit:
+        return rows, encode_watermark(until), False
+
+    page = rows[:limit]
+    last = page[-1]
+    return page, encode_watermark(last.get(change_column), last[id_column]), True
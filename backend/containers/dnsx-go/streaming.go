@@ -221,6 +221,10 @@ func consumeStream(client *redis.Client, ctx context.Context, config *StreamingC
 
 	processedCount := 0
 	completionReceived := false
+	// Entries claimed from a crashed consumer when the pipeline resumes wait
+	// in this consumer's pending list: read those first ("0" onwards), then
+	// only new messages (">", from the group's last-delivered ID)
+	readID := "0"
 	startTime := time.Now()
 
 	log.Printf("\n🔄 Starting stream consumption loop...")
@@ -244,11 +248,17 @@ func consumeStream(client *redis.Client, ctx context.Context, config *StreamingC
 		streams, err := client.XReadGroup(ctx, &redis.XReadGroupArgs{
 			Group:    config.ConsumerGroupName,
 			Consumer: config.ConsumerName,
-			Streams:  []string{config.StreamInputKey, ">"}, // ">" means only new messages
+			Streams:  []string{config.StreamInputKey, readID},
 			Count:    config.BatchSize,
 			Block:    time.Duration(config.BlockMilliseconds) * time.Millisecond,
 		}).Result()
 
+		// Claimed entries exhausted: switch to new messages
+		if readID != ">" && (err == redis.Nil || (err == nil && (len(streams) == 0 || len(streams[0].Messages) == 0))) {
+			readID = ">"
+			continue
+		}
+
 		if err != nil {
 			if err == redis.Nil {
 				// No messages available, continue waiting
@@ -256,6 +266,10 @@ func consumeStream(client *redis.Client, ctx context.Context, config *StreamingC
 			}
 			return fmt.Errorf("XREADGROUP failed: %w", err)
 		}
+		if readID != ">" {
+			messages := streams[0].Messages
+			readID = messages[len(messages)-1].ID
+		}
 
 		// Process messages from all streams (should only be one in our case)
 		for _, stream := range streams {
@@ -103,6 +103,10 @@ func (c *Consumer) EnsureConsumerGroup() error {
 func (c *Consumer) Consume() (*ConsumerResult, error) {
 	result := &ConsumerResult{}
 	completionReceived := false
+	// Entries claimed from a crashed consumer when the pipeline resumes wait
+	// in this consumer's pending list: read those first ("0" onwards), then
+	// only new messages (">", from the group's last-delivered ID)
+	readID := "0"
 	startTime := time.Now()
 
 	// Configurable values
@@ -131,11 +135,17 @@ func (c *Consumer) Consume() (*ConsumerResult, error) {
 		streams, err := c.redisClient.XReadGroup(c.ctx, &redis.XReadGroupArgs{
 			Group:    c.cfg.ConsumerGroup,
 			Consumer: c.cfg.ConsumerName,
-			Streams:  []string{c.cfg.StreamInputKey, ">"}, // ">" means only new messages
+			Streams:  []string{c.cfg.StreamInputKey, readID},
 			Count:    batchSize,
 			Block:    blockTimeout,
 		}).Result()
 
+		// Claimed entries exhausted: switch to new messages
+		if readID != ">" && (err == redis.Nil || (err == nil && (len(streams) == 0 || len(streams[0].Messages) == 0))) {
+			readID = ">"
+			continue
+		}
+
 		if err != nil {
 			if err == redis.Nil {
 				// No messages available, continue waiting
@@ -143,6 +153,10 @@ func (c *Consumer) Consume() (*ConsumerResult, error) {
 			}
 			return result, fmt.Errorf("XREADGROUP failed: %w", err)
 		}
+		if readID != ">" {
+			messages := streams[0].Messages
+			readID = messages[len(messages)-1].ID
+		}
 
 		// Process messages from all streams
 		for _, stream := range streams {
@@ -29,8 +29,9 @@ type Config struct {
 	Workers          int // Number of concurrent workers
 
 	// Streaming mode configuration (Phase 2)
-	StreamingMode   bool   // Enable Redis Streams output
-	StreamOutputKey string // Redis Stream key for output (e.g., "scan:{job_id}:subfinder:output")
+	StreamingMode         bool   // Enable Redis Streams output
+	StreamOutputKey       string // Redis Stream key for output (e.g., "scan:{job_id}:subfinder:output")
+	StreamBackpressureKey string // Set by the API while the scan's streams are over their memory budget
 }
 
 // Scanner represents the main subfinder scanner
@@ -373,8 +374,9 @@ func main() {
 		Workers:   getEnvInt("WORKERS", 10),      // 10 concurrent workers
 
 		// Streaming mode configuration
-		StreamingMode:   os.Getenv("STREAMING_MODE") == "true",
-		StreamOutputKey: getEnv("STREAM_OUTPUT_KEY", ""),
+		StreamingMode:         os.Getenv("STREAMING_MODE") == "true",
+		StreamOutputKey:       getEnv("STREAM_OUTPUT_KEY", ""),
+		StreamBackpressureKey: getEnv("STREAM_BACKPRESSURE_KEY", ""),
 	}
 
 	// Parse optional ASSET_SCAN_MAPPING (domain → scan_job_id mapping)
@@ -463,6 +463,8 @@ func (s *Scanner) streamSubdomainsToRedis(result *DomainScanResult) error {
 		return nil // No subdomains to stream
 	}
 
+	s.waitForBackpressure()
+
 	s.logger.Infof("📤 Streaming %d subdomains to Redis: %s", len(result.Subdomains), s.config.StreamOutputKey)
 
 	// Stream each subdomain individually for real-time consumption
@@ -532,6 +534,42 @@ func (s *Scanner) streamSubdomainsToRedis(result *DomainScanResult) error {
 	return nil
 }
 
+// Backpressure polling: streaming pauses while the key exists, but never
+// for longer than maxBackpressureWait (the key also expires on its own)
+const (
+	backpressurePollInterval = 2 * time.Second
+	maxBackpressureWait      = 10 * time.Minute
+)
+
+// waitForBackpressure blocks while the scan's backpressure key is set
+func (s *Scanner) waitForBackpressure() {
+	if s.config.StreamBackpressureKey == "" {
+		return
+	}
+
+	start := time.Now()
+	paused := false
+	for time.Since(start) < maxBackpressureWait {
+		exists, err := s.redisClient.Exists(s.ctx, s.config.StreamBackpressureKey).Result()
+		if err != nil || exists == 0 {
+			break
+		}
+		if !paused {
+			s.logger.Infof("⏸️  Backpressure: scan streams over memory budget, pausing output to %s", s.config.StreamOutputKey)
+			paused = true
+		}
+		select {
+		case <-s.ctx.Done():
+			return
+		case <-time.After(backpressurePollInterval):
+		}
+	}
+
+	if paused {
+		s.logger.Infof("▶️  Backpressure released after %s", time.Since(start).Round(time.Second))
+	}
+}
+
 // sendCompletionMarker sends a completion marker to Redis Stream to signal end of scan
 // Consumers use this to know when all subdomains have been processed
 func (s *Scanner) sendCompletionMarker(totalSubdomains int) error {
@@ -187,6 +187,10 @@ func consumeStream(client *redis.Client, ctx context.Context, config *StreamingC
 
 	result := &ConsumeStreamResult{}
 	completionReceived := false
+	// Entries claimed from a crashed consumer when the pipeline resumes wait
+	// in this consumer's pending list: read those first ("0" onwards), then
+	// only new messages (">", from the group's last-delivered ID)
+	readID := "0"
 	startTime := time.Now()
 
 	log.Printf("\n🔄 Starting stream consumption loop...")
@@ -210,17 +214,27 @@ func consumeStream(client *redis.Client, ctx context.Context, config *StreamingC
 		streams, err := client.XReadGroup(ctx, &redis.XReadGroupArgs{
 			Group:    config.ConsumerGroupName,
 			Consumer: config.ConsumerName,
-			Streams:  []string{config.StreamInputKey, ">"},
+			Streams:  []string{config.StreamInputKey, readID},
 			Count:    config.BatchSize,
 			Block:    time.Duration(config.BlockMilliseconds) * time.Millisecond,
 		}).Result()
 
+		// Claimed entries exhausted: switch to new messages
+		if readID != ">" && (err == redis.Nil || (err == nil && (len(streams) == 0 || len(streams[0].Messages) == 0))) {
+			readID = ">"
+			continue
+		}
+
 		if err != nil {
 			if err == redis.Nil {
 				continue
 			}
 			return result, fmt.Errorf("XREADGROUP failed: %w", err)
 		}
+		if readID != ">" {
+			messages := streams[0].Messages
+			readID = messages[len(messages)-1].ID
+		}
 
 		// Process messages from all streams
 		for _, stream := range streams {
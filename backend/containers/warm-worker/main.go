@@ -0,0 +1,307 @@
+package main
+
+// Warm pool worker: a long-lived consumer task that runs scan assignments
+// for one module instead of a fresh Fargate task per scan.
+//
+// The API (app/services/warm_pool.py) claims an idle worker, then posts the
+// consumer's full container environment to that worker's own stream,
+// warmpool:{module}:assignments:{worker_id}, so only the claimed worker
+// ever sees the assignment. The worker runs the module binary with that environment (exactly what a
+// freshly launched task would see), records the outcome, and goes back to
+// idle. Workers above the pool's target size exit after WARM_POOL_IDLE_TIMEOUT
+// seconds idle; a busy worker never exits.
+
+import (
+	"context"
+	"encoding/json"
+	"fmt"
+	"log"
+	"math/rand"
+	"os"
+	"os/exec"
+	"os/signal"
+	"path/filepath"
+	"strconv"
+	"strings"
+	"sync/atomic"
+	"syscall"
+	"time"
+
+	"github.com/go-redis/redis/v8"
+)
+
+const assignmentTTL = 24 * time.Hour
+
+// Module name -> binary name when MODULE_BINARY is not set (local runs:
+// the module binary sits next to this one, e.g. bin/dnsx-go)
+var moduleBinaries = map[string]string{
+	"dnsx":         "dnsx-go",
+	"httpx":        "httpx-go",
+	"katana":       "katana-go",
+	"url-resolver": "url-resolver",
+	"tyvt":         "tyvt-go",
+}
+
+// reapScript removes the worker from the pool only while the pool stays at
+// or above its target without it, so concurrent idle workers never reap
+// the pool below target.
+var reapScript = redis.NewScript(`
+local live = redis.call('ZCOUNT', KEYS[1], ARGV[2], '+inf')
+local target = tonumber(redis.call('GET', KEYS[3]) or '0')
+if live - 1 < target then
+	return 0
+end
+redis.call('ZREM', KEYS[1], ARGV[1])
+redis.call('ZREM', KEYS[2], ARGV[1])
+return 1
+`)
+
+type Worker struct {
+	client *redis.Client
+	// ctx is for pool bookkeeping (survives shutdown); stop ends the loop
+	// and the running module binary on SIGTERM
+	ctx         context.Context
+	stop        context.Context
+	module      string
+	id          string
+	binary      string
+	heartbeat   time.Duration
+	idleTimeout time.Duration
+	idle        atomic.Bool
+	idleSince   time.Time
+	// lastID is the last assignment read from this worker's stream
+	lastID string
+}
+
+func (w *Worker) key(name string) string {
+	return fmt.Sprintf("warmpool:%s:%s", w.module, name)
+}
+
+// assignments is the stream the API posts this worker's assignments to
+func (w *Worker) assignments() string {
+	return w.key("assignments:" + w.id)
+}
+
+func (w *Worker) liveSince() string {
+	return strconv.FormatInt(time.Now().Add(-3*w.heartbeat).Unix(), 10)
+}
+
+// beat records the worker as live, and as claimable while idle
+func (w *Worker) beat() {
+	now := float64(time.Now().Unix())
+	w.client.ZAdd(w.ctx, w.key("workers"), &redis.Z{Score: now, Member: w.id})
+	if w.idle.Load() {
+		w.client.ZAdd(w.ctx, w.key("idle"), &redis.Z{Score: now, Member: w.id})
+	}
+}
+
+// markIdle records the worker as idle; idleSince only moves when it was
+// busy, so waiting out one empty read after another keeps the idle clock
+func (w *Worker) markIdle(now time.Time) bool {
+	if w.idle.Swap(true) {
+		return false
+	}
+	w.idleSince = now
+	return true
+}
+
+// idleExpired reports whether the worker has been idle for idleTimeout
+func (w *Worker) idleExpired(now time.Time) bool {
+	return w.idle.Load() && now.Sub(w.idleSince) >= w.idleTimeout
+}
+
+func (w *Worker) setIdle(idle bool) {
+	if idle {
+		if w.markIdle(time.Now()) {
+			w.beat()
+		}
+		return
+	}
+	w.idle.Store(false)
+	w.client.ZRem(w.ctx, w.key("idle"), w.id)
+}
+
+func (w *Worker) leave() {
+	w.client.ZRem(w.ctx, w.key("workers"), w.id)
+	w.client.ZRem(w.ctx, w.key("idle"), w.id)
+	w.client.Del(w.ctx, w.assignments())
+}
+
+// shouldReap reports whether this idle worker may exit
+func (w *Worker) shouldReap() bool {
+	if !w.idleExpired(time.Now()) {
+		return false
+	}
+	keys := []string{w.key("workers"), w.key("idle"), w.key("target")}
+	reaped, err := reapScript.Run(w.ctx, w.client, keys, w.id, w.liveSince()).Int()
+	return err == nil && reaped == 1
+}
+
+// run executes one assignment with the module binary
+func (w *Worker) run(msg redis.XMessage) {
+	assignmentID, _ := msg.Values["assignment_id"].(string)
+	rawEnv, _ := msg.Values["environment"].(string)
+	assignmentKey := "warmpool:assignment:" + assignmentID
+
+	var environment []struct {
+		Name  string `json:"name"`
+		Value string `json:"value"`
+	}
+	// The API gives up on assignments nobody picks up in time and launches
+	// a task instead; whoever sets "taken" first owns the assignment
+	taken, err := w.client.HSetNX(w.ctx, assignmentKey, "taken", w.id).Result()
+	if err != nil || !taken {
+		log.Printf("⏭️  Assignment %s was withdrawn, skipping", assignmentID)
+		return
+	}
+
+	exitCode := -1
+	if err := json.Unmarshal([]byte(rawEnv), &environment); err != nil {
+		log.Printf("❌ Assignment %s has an invalid environment: %v", assignmentID, err)
+	} else {
+		w.client.HSet(w.ctx, assignmentKey, "status", "RUNNING", "worker", w.id, "started_at", time.Now().Unix())
+		log.Printf("▶️  Running assignment %s", assignmentID)
+
+		// Same environment a fresh task would get; assignment values win
+		env := os.Environ()
+		for _, item := range environment {
+			env = append(env, item.Name+"="+item.Value)
+		}
+		cmd := exec.CommandContext(w.stop, w.binary)
+		cmd.Env = env
+		cmd.Stdout = os.Stdout
+		cmd.Stderr = os.Stderr
+
+		start := time.Now()
+		err := cmd.Run()
+		exitCode = 0
+		if err != nil {
+			exitCode = 1
+			if exitErr, ok := err.(*exec.ExitError); ok {
+				exitCode = exitErr.ExitCode()
+			}
+		}
+		log.Printf("⏹️  Assignment %s finished in %s (exit %d)", assignmentID, time.Since(start).Round(time.Second), exitCode)
+	}
+
+	w.client.HSet(w.ctx, assignmentKey, "status", "STOPPED", "exit_code", exitCode, "stopped_at", time.Now().Unix())
+	w.client.Expire(w.ctx, assignmentKey, assignmentTTL)
+}
+
+func (w *Worker) loop() {
+	for w.stop.Err() == nil {
+		w.setIdle(true)
+
+		streams, err := w.client.XRead(w.stop, &redis.XReadArgs{
+			Streams: []string{w.assignments(), w.lastID},
+			Count:   1,
+			Block:   w.heartbeat,
+		}).Result()
+
+		if err == redis.Nil || (err == nil && len(streams) == 0) {
+			if w.shouldReap() {
+				log.Printf("💤 Idle for %s above target pool size, exiting", time.Since(w.idleSince).Round(time.Second))
+				return
+			}
+			continue
+		}
+		if err != nil {
+			if w.stop.Err() != nil {
+				return
+			}
+			log.Printf("⚠️  Reading assignments failed: %v", err)
+			time.Sleep(w.heartbeat)
+			continue
+		}
+
+		for _, msg := range streams[0].Messages {
+			w.lastID = msg.ID
+			w.setIdle(false)
+			w.run(msg)
+		}
+	}
+}
+
+func getEnvSeconds(name string, fallback int) time.Duration {
+	if value, err := strconv.Atoi(os.Getenv(name)); err == nil && value > 0 {
+		return time.Duration(value) * time.Second
+	}
+	return time.Duration(fallback) * time.Second
+}
+
+func resolveBinary(module string) (string, error) {
+	if binary := os.Getenv("MODULE_BINARY"); binary != "" {
+		return binary, nil
+	}
+	name, ok := moduleBinaries[module]
+	if !ok {
+		return "", fmt.Errorf("no binary known for module %q (set MODULE_BINARY)", module)
+	}
+	self, err := os.Executable()
+	if err != nil {
+		return "", err
+	}
+	return filepath.Join(filepath.Dir(self), name), nil
+}
+
+func main() {
+	module := os.Getenv("WARM_POOL_MODULE")
+	if module == "" {
+		log.Fatal("❌ WARM_POOL_MODULE is required")
+	}
+	binary, err := resolveBinary(module)
+	if err != nil {
+		log.Fatalf("❌ %v", err)
+	}
+
+	hostname, _ := os.Hostname()
+	workerID := os.Getenv("WARM_WORKER_ID")
+	if workerID == "" {
+		workerID = fmt.Sprintf("%s-%s-%06x", module, strings.Split(hostname, ".")[0], rand.New(rand.NewSource(time.Now().UnixNano())).Intn(1<<24))
+	}
+
+	ctx := context.Background()
+	stop, cancel := signal.NotifyContext(ctx, syscall.SIGTERM, syscall.SIGINT)
+	defer cancel()
+
+	client := redis.NewClient(&redis.Options{
+		Addr:     fmt.Sprintf("%s:%s", os.Getenv("REDIS_HOST"), os.Getenv("REDIS_PORT")),
+		Password: os.Getenv("REDIS_PASSWORD"),
+	})
+	if err := client.Ping(ctx).Err(); err != nil {
+		log.Fatalf("❌ Redis connection failed: %v", err)
+	}
+
+	w := &Worker{
+		client:      client,
+		ctx:         ctx,
+		stop:        stop,
+		module:      module,
+		id:          workerID,
+		binary:      binary,
+		heartbeat:   getEnvSeconds("WARM_POOL_HEARTBEAT", 10),
+		idleTimeout: getEnvSeconds("WARM_POOL_IDLE_TIMEOUT", 600),
+		// The stream is this worker's alone, so it starts from its first
+		// entry ("$" would miss one posted between two reads)
+		lastID: "0",
+	}
+
+	go func() {
+		ticker := time.NewTicker(w.heartbeat)
+		defer ticker.Stop()
+		for {
+			select {
+			case <-stop.Done():
+				return
+			case <-ticker.C:
+				w.beat()
+			}
+		}
+	}()
+
+	log.Printf("🔥 Warm %s worker %s ready (binary %s)", module, workerID, binary)
+	w.loop()
+
+	w.leave()
+	log.Printf("👋 Warm %s worker %s stopped", module, workerID)
+}
@@ -0,0 +1,58 @@
+package main
+
+import (
+	"testing"
+	"time"
+)
+
+// TestIdleClockSurvivesEmptyReads simulates the loop of an idle worker:
+// every XREADGROUP times out after one heartbeat and the loop marks the
+// worker idle again, which must not restart its idle clock
+func TestIdleClockSurvivesEmptyReads(t *testing.T) {
+	w := &Worker{heartbeat: 10 * time.Second, idleTimeout: 600 * time.Second}
+	start := time.Date(2026, 1, 16, 0, 0, 0, 0, time.UTC)
+
+	if !w.markIdle(start) {
+		t.Fatal("first markIdle should start the idle clock")
+	}
+	now := start
+	for i := 0; i < 59; i++ {
+		now = now.Add(w.heartbeat)
+		if w.markIdle(now) {
+			t.Fatalf("markIdle restarted the idle clock after %s", now.Sub(start))
+		}
+		if w.idleExpired(now) {
+			t.Fatalf("reaped after only %s idle", now.Sub(start))
+		}
+	}
+
+	now = now.Add(w.heartbeat)
+	w.markIdle(now)
+	if !w.idleExpired(now) {
+		t.Fatalf("worker idle for %s was not reaped", now.Sub(start))
+	}
+}
+
+// TestIdleClockRestartsAfterAssignment checks that running an assignment
+// resets the idle clock
+func TestIdleClockRestartsAfterAssignment(t *testing.T) {
+	w := &Worker{heartbeat: 10 * time.Second, idleTimeout: 600 * time.Second}
+	start := time.Date(2026, 1, 16, 0, 0, 0, 0, time.UTC)
+
+	w.markIdle(start)
+	w.idle.Store(false) // busy with an assignment
+	if w.idleExpired(start.Add(time.Hour)) {
+		t.Fatal("a busy worker must never be reaped")
+	}
+
+	back := start.Add(time.Hour)
+	if !w.markIdle(back) {
+		t.Fatal("going idle after an assignment should restart the idle clock")
+	}
+	if w.idleExpired(back.Add(599 * time.Second)) {
+		t.Fatal("reaped before idleTimeout since the last assignment")
+	}
+	if !w.idleExpired(back.Add(600 * time.Second)) {
+		t.Fatal("not reaped after idleTimeout since the last assignment")
+	}
+}
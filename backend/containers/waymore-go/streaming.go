@@ -12,12 +12,20 @@ import (
 
 // RedisStreamProducer handles streaming URLs to Redis
 type RedisStreamProducer struct {
-	client        *redis.Client
-	streamKey     string
-	ctx           context.Context
-	streamedCount int
+	client          *redis.Client
+	streamKey       string
+	backpressureKey string // Set by the API while the scan's streams are over their memory budget
+	ctx             context.Context
+	streamedCount   int
 }
 
+// Backpressure polling: producers pause while the key exists, but never
+// for longer than maxBackpressureWait (the key also expires on its own)
+const (
+	backpressurePollInterval = 2 * time.Second
+	maxBackpressureWait      = 10 * time.Minute
+)
+
 // NewRedisStreamProducer creates a new Redis stream producer
 func NewRedisStreamProducer() (*RedisStreamProducer, error) {
 	redisHost := os.Getenv("REDIS_HOST")
@@ -54,9 +62,10 @@ func NewRedisStreamProducer() (*RedisStreamProducer, error) {
 	log.Printf("✅ Redis connection established: %s", redisAddr)
 
 	return &RedisStreamProducer{
-		client:    client,
-		streamKey: streamKey,
-		ctx:       ctx,
+		client:          client,
+		streamKey:       streamKey,
+		backpressureKey: os.Getenv("STREAM_BACKPRESSURE_KEY"),
+		ctx:             ctx,
 	}, nil
 }
 
@@ -64,6 +73,8 @@ func NewRedisStreamProducer() (*RedisStreamProducer, error) {
 func (p *RedisStreamProducer) StreamURLs(urls []DiscoveredURL) (int, error) {
 	streamed := 0
 
+	p.waitForBackpressure()
+
 	for _, url := range urls {
 		if err := p.StreamURL(url); err != nil {
 			log.Printf("⚠️  Failed to stream URL %s: %v", url.URL, err)
@@ -88,11 +99,11 @@ func (p *RedisStreamProducer) StreamURL(url DiscoveredURL) error {
 		"type":          "url", // Distinguish from completion markers
 	}
 
-	// XADD to stream with maxlen for memory management
+	// XADD to stream. No MAXLEN cap: it would drop URLs the resolver has not
+	// read yet. The API trims acknowledged entries (XTRIM MINID) and raises
+	// backpressure when the scan's streams exceed their memory budget.
 	_, err := p.client.XAdd(p.ctx, &redis.XAddArgs{
 		Stream: p.streamKey,
-		MaxLen: 100000, // Cap stream at 100k messages
-		Approx: true,   // Use ~ for performance
 		Values: values,
 	}).Result()
 
@@ -127,6 +138,31 @@ func (p *RedisStreamProducer) SendCompletionMarker(totalURLs int) error {
 	return nil
 }
 
+// waitForBackpressure blocks while the scan's backpressure key is set
+func (p *RedisStreamProducer) waitForBackpressure() {
+	if p.backpressureKey == "" {
+		return
+	}
+
+	start := time.Now()
+	paused := false
+	for time.Since(start) < maxBackpressureWait {
+		exists, err := p.client.Exists(p.ctx, p.backpressureKey).Result()
+		if err != nil || exists == 0 {
+			break
+		}
+		if !paused {
+			log.Printf("⏸️  Backpressure: scan streams over memory budget, pausing output to %s", p.streamKey)
+			paused = true
+		}
+		time.Sleep(backpressurePollInterval)
+	}
+
+	if paused {
+		log.Printf("▶️  Backpressure released after %s", time.Since(start).Round(time.Second))
+	}
+}
+
 // GetStreamedCount returns the number of URLs streamed
 func (p *RedisStreamProducer) GetStreamedCount() int {
 	return p.streamedCount
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Async Data-Access Benchmark for NeoBot-Net v2
+Compares p50/p99 request latency of the legacy blocking PostgREST client
+against the pooled async client under N concurrent in-flight requests.
+
+Runs against a local PostgREST stand-in (asyncio HTTP server in a child
+process with a fixed per-request latency), so no Supabase project or credentials are needed.
+
+Usage:
+    python scripts/benchmark-async-db.py [--concurrency 200] [--latency-ms 20]
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import statistics
+import sys
+import time
+from typing import Dict, List, Tuple
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _serve_stub(latency_seconds: float, port_queue) -> None:
+    """PostgREST stand-in: answers every request after a fixed non-blocking delay."""
+    body = json.dumps([{"id": 1, "total_urls": 0}]).encode()
+    response = (
+        b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+        b"Content-Length: " + str(len(body)).encode() + b"\r\n\r\n" + body
+    )
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while await reader.readuntil(b"\r\n\r\n"):
+                await asyncio.sleep(latency_seconds)
+                writer.write(response)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve() -> None:
+        server = await asyncio.start_server(handle, "127.0.0.1", 0, backlog=1024)
+        port_queue.put(server.sockets[0].getsockname()[1])
+        await server.serve_forever()
+
+    asyncio.run(serve())
+
+
+def start_stub_postgrest(latency_seconds: float) -> Tuple[multiprocessing.Process, int]:
+    """
+    Start the PostgREST stand-in in its own process (so it never competes with
+    the benchmarked event loop for the GIL). Returns the process and bound port.
+    """
+    port_queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_serve_stub, args=(latency_seconds, port_queue), daemon=True)
+    process.start()
+    return process, port_queue.get(timeout=10)
+
+
+def summarize(label: str, latencies: List[float], wall: float) -> Dict[str, float]:
+    """Print and return latency percentiles (milliseconds)."""
+    ordered = sorted(latencies)
+    p50 = statistics.median(ordered) * 1000
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] * 1000
+    print(f"{label:<28} p50={p50:8.1f}ms  p99={p99:8.1f}ms  wall={wall * 1000:8.1f}ms")
+    return {"p50_ms": p50, "p99_ms": p99, "wall_ms": wall * 1000}
+
+
+async def run_blocking(rest_url: str, key: str, concurrency: int) -> Dict[str, float]:
+    """Legacy path: synchronous `.execute()` called directly inside async handlers."""
+    from postgrest import SyncPostgrestClient
+
+    client = SyncPostgrestClient(rest_url, headers={"apiKey": key, "Authorization": f"Bearer {key}"})
+    start = time.perf_counter()
+
+    async def handler() -> float:
+        await asyncio.sleep(0)
+        client.table("url_stats").select("total_urls").execute()
+        return time.perf_counter() - start
+
+    latencies = await asyncio.gather(*[handler() for _ in range(concurrency)])
+    wall = time.perf_counter() - start
+    client.session.close()
+    return summarize("blocking (before)", latencies, wall)
+
+
+async def run_async(concurrency: int) -> Dict[str, float]:
+    """New path: awaitable `.execute()` on the pooled keep-alive client."""
+    from app.core.supabase_client import supabase_client
+
+    db = supabase_client.async_service_client
+    # Warm the pool so both runs measure steady-state keep-alive traffic
+    await asyncio.gather(*[db.table("url_stats").select("total_urls").execute() for _ in range(concurrency)])
+    start = time.perf_counter()
+
+    async def handler() -> float:
+        await db.table("url_stats").select("total_urls").execute()
+        return time.perf_counter() - start
+
+    latencies = await asyncio.gather(*[handler() for _ in range(concurrency)])
+    wall = time.perf_counter() - start
+    await supabase_client.aclose()
+    return summarize("async pooled (after)", latencies, wall)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    args = parser.parse_args()
+
+    stub, port = start_stub_postgrest(args.latency_ms / 1000)
+    base_url = f"http://127.0.0.1:{port}"
+
+    # Point the application settings at the stub before anything imports them
+    os.environ["SUPABASE_URL"] = base_url
+    os.environ.setdefault("SUPABASE_ANON_KEY", "benchmark")
+    os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "benchmark")
+    os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+
+    print("🏁 Async Data-Access Benchmark")
+    print("=" * 50)
+    print(f"📊 Concurrency: {args.concurrency}  |  Stub latency: {args.latency_ms}ms")
+
+    before = await run_blocking(f"{base_url}/rest/v1", "benchmark", args.concurrency)
+    after = await run_async(args.concurrency)
+
+    print("=" * 50)
+    print(f"🚀 p99 improvement: {before['p99_ms'] / max(after['p99_ms'], 0.001):.1f}x")
+    stub.terminate()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+ECS Launch Benchmark for NeoBot-Net v2
+Compares the wall-clock time to launch one streaming pipeline's tasks with
+sequential blocking RunTask calls against the concurrent, rate-limited
+ecs_launcher.
+
+Runs against a mock ECS client whose run_task blocks for a fixed latency
+(and can answer a fraction of calls with ThrottlingException), so no AWS
+account or credentials are needed.
+
+Usage:
+    python scripts/benchmark-ecs-launch.py [--tasks 20] [--latency-ms 300] [--throttle-rate 0.1]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import threading
+import time
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_ANON_KEY", "benchmark")
+os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "benchmark")
+os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+
+
+class ThrottlingError(Exception):
+    """Shaped like botocore's ClientError for a throttled call."""
+
+    def __init__(self):
+        super().__init__("Rate exceeded")
+        self.response = {"Error": {"Code": "ThrottlingException", "Message": "Rate exceeded"}}
+
+
+class MockEcsClient:
+    """ECS stand-in: run_task blocks like boto3 and returns `count` fake tasks."""
+
+    def __init__(self, latency_seconds: float, throttle_rate: float):
+        self.latency_seconds = latency_seconds
+        self.throttle_rate = throttle_rate
+        self.calls = 0
+        self._lock = threading.Lock()
+        self._next_id = 0
+
+    def run_task(self, count: int = 1, **kwargs):
+        time.sleep(self.latency_seconds)
+        with self._lock:
+            self.calls += 1
+            if random.random() < self.throttle_rate:
+                raise ThrottlingError()
+            first, self._next_id = self._next_id, self._next_id + count
+        return {
+            "tasks": [{"taskArn": f"arn:aws:ecs:us-east-1:123456789012:task/mock/{i}"} for i in range(first, first + count)],
+            "failures": []
+        }
+
+
+def launch_request(index: int) -> dict:
+    """RunTask parameters for one consumer replica (unique CONSUMER_NAME)."""
+    return {
+        "cluster": "neobotnet-v2-dev-cluster",
+        "taskDefinition": "neobotnet-v2-dev-dnsx",
+        "launchType": "FARGATE",
+        "overrides": {"containerOverrides": [{"name": "dnsx", "environment": [
+            {"name": "CONSUMER_NAME", "value": f"dnsx-worker-{index}"}
+        ]}]},
+    }
+
+
+def run_sequential(ecs_client: MockEcsClient, tasks: int) -> float:
+    """Old path: one blocking run_task per task, back to back (retrying throttles)."""
+    start = time.perf_counter()
+    for i in range(tasks):
+        while True:
+            try:
+                ecs_client.run_task(**launch_request(i))
+                break
+            except ThrottlingError:
+                time.sleep(0.5)
+    return time.perf_counter() - start
+
+
+async def run_concurrent(ecs_client: MockEcsClient, tasks: int) -> float:
+    """New path: ecs_launcher, concurrent and rate limited."""
+    from app.services.ecs_launcher import EcsLaunchScheduler
+
+    launcher = EcsLaunchScheduler()
+    start = time.perf_counter()
+    results = await launcher.launch_many(ecs_client, [launch_request(i) for i in range(tasks)])
+    elapsed = time.perf_counter() - start
+    failed = sum(1 for result in results if isinstance(result, Exception))
+    print(f"   throttled calls retried: {launcher.throttled_calls}  |  failed launches: {failed}")
+    launcher.shutdown()
+    return elapsed
+
+
+async def run_identical(ecs_client: MockEcsClient, tasks: int) -> float:
+    """Identical replicas: coalesced into RunTask calls with count."""
+    from app.services.ecs_launcher import EcsLaunchScheduler
+
+    launcher = EcsLaunchScheduler()
+    calls_before = ecs_client.calls
+    start = time.perf_counter()
+    await launcher.launch_many(ecs_client, [launch_request(0) for _ in range(tasks)])
+    elapsed = time.perf_counter() - start
+    print(f"   RunTask calls for {tasks} identical tasks: {ecs_client.calls - calls_before}")
+    launcher.shutdown()
+    return elapsed
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--tasks", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=300.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    ecs_client = MockEcsClient(args.latency_ms / 1000, args.throttle_rate)
+
+    print("🏁 ECS Launch Benchmark")
+    print("=" * 50)
+    print(f"📊 Tasks: {args.tasks}  |  RunTask latency: {args.latency_ms}ms  |  Throttle rate: {args.throttle_rate:.0%}")
+
+    sequential = run_sequential(ecs_client, args.tasks)
+    print(f"{'sequential (before)':<28} wall={sequential * 1000:8.1f}ms")
+    concurrent = await run_concurrent(ecs_client, args.tasks)
+    print(f"{'concurrent (after)':<28} wall={concurrent * 1000:8.1f}ms")
+    identical = await run_identical(ecs_client, args.tasks)
+    print(f"{'identical, count (after)':<28} wall={identical * 1000:8.1f}ms")
+
+    print("=" * 50)
+    print(f"🚀 Launch speedup: {sequential / max(concurrent, 0.001):.1f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Export Format Benchmark for NeoBot-Net v2
+Measures encoder throughput (rows/sec) and bytes on the wire for every
+/exports format, against the legacy per-row encoders (a new StringIO +
+csv.writer per CSV row, one json.dumps per JSON row).
+
+Rows are synthetic but shaped like the real URL and DNS exports and are fed
+to the encoders in export-engine sized batches, so the numbers reflect
+serialization and compression cost only (no database or network time).
+
+Usage:
+    python scripts/benchmark-export-formats.py [--table urls|dns] [--rows 200000] [--batch-size 2000]
+"""
+
+import argparse
+import csv
+import io
+import json
+import os
+import random
+import sys
+import time
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.export_encoders import EXPORT_FORMATS, create_encoder, parquet_available  # noqa: E402
+
+URL_COLUMNS = ["url", "domain", "path", "status_code", "is_alive", "content_type",
+               "title", "has_params", "first_discovered_at"]
+DNS_COLUMNS = ["subdomain", "parent_domain", "record_type", "record_value", "ttl", "resolved_at"]
+
+
+# ================================================================
+# Synthetic Rows
+# ================================================================
+
+def build_rows(table: str, rows: int, seed: int = 7) -> Tuple[List[str], List[Dict[str, Any]]]:
+    """Deterministic rows with realistic repetition (shared domains, paths, titles)."""
+    rng = random.Random(seed)
+    domains = [f"app{d}.corp{d % 40}.example.com" for d in range(max(10, rows // 200))]
+    paths = ["/", "/login", "/api/v1/users", "/static/js/main.js", "/search", "/assets/logo.png", "/admin"]
+    titles = ["Login", "Dashboard", "404 Not Found", "Welcome to nginx!", None]
+
+    data = []
+    for i in range(rows):
+        domain = rng.choice(domains)
+        ts = f"2026-01-{1 + i % 28:02d}T{i % 24:02d}:{i % 60:02d}:{(i * 7) % 60:02d}.{i % 1000:03d}+00:00"
+        if table == "dns":
+            record_type = rng.choice(["A", "A", "AAAA", "CNAME", "TXT"])
+            value = f"10.{i % 256}.{(i // 256) % 256}.{rng.randint(1, 254)}" if record_type == "A" else f"edge{i % 50}.cdn.net"
+            data.append({"subdomain": domain, "parent_domain": domain.split(".", 1)[1], "record_type": record_type,
+                         "record_value": value, "ttl": rng.choice([60, 300, 3600]), "resolved_at": ts})
+        else:
+            path = rng.choice(paths)
+            query = f"?id={i}&ref=x" if rng.random() < 0.3 else ""
+            alive = rng.random() < 0.7
+            data.append({"url": f"https://{domain}{path}{query}", "domain": domain, "path": path,
+                         "status_code": rng.choice([200, 200, 301, 403, 404]) if alive else None,
+                         "is_alive": alive, "content_type": "text/html; charset=utf-8" if alive else None,
+                         "title": rng.choice(titles) if alive else None, "has_params": bool(query),
+                         "first_discovered_at": ts})
+    return (DNS_COLUMNS if table == "dns" else URL_COLUMNS), data
+
+
+def batches(rows: List[Dict[str, Any]], size: int) -> Iterable[List[Dict[str, Any]]]:
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+# ================================================================
+# Legacy Encoders (per row, as /exports worked before batch encoders)
+# ================================================================
+
+def legacy_csv(columns: List[str], rows: List[Dict[str, Any]], batch_size: int) -> Iterable[bytes]:
+    def format_csv_row(row: list) -> str:
+        output = io.StringIO()
+        writer = csv.writer(output, quoting=csv.QUOTE_MINIMAL)
+        writer.writerow(row)
+        return output.getvalue()
+
+    yield format_csv_row(columns).encode()
+    for row in rows:
+        yield format_csv_row([row.get(c, "") for c in columns]).encode()
+
+
+def legacy_json(columns: List[str], rows: List[Dict[str, Any]], batch_size: int) -> Iterable[bytes]:
+    yield b"["
+    for i, row in enumerate(rows):
+        if i:
+            yield b","
+        yield json.dumps(row).encode()
+    yield b"]"
+
+
+def batch_encoder(export_format: str) -> Callable:
+    def run(columns: List[str], rows: List[Dict[str, Any]], batch_size: int) -> Iterable[bytes]:
+        encoder = create_encoder(export_format, columns)
+        yield encoder.header()
+        for batch in batches(rows, batch_size):
+            yield encoder.encode_batch(batch)
+        yield encoder.finish()
+    return run
+
+
+# ================================================================
+# Measurement
+# ================================================================
+
+def measure(run: Callable, columns: List[str], rows: List[Dict[str, Any]], batch_size: int) -> Tuple[float, int, int]:
+    """(seconds, bytes on the wire, chunks)"""
+    start = time.perf_counter()
+    total = chunks = 0
+    for chunk in run(columns, rows, batch_size):
+        total += len(chunk)
+        chunks += 1
+    return time.perf_counter() - start, total, chunks
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--table", choices=["urls", "dns"], default="urls")
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--batch-size", type=int, default=2000, help="Rows per export batch")
+    args = parser.parse_args()
+
+    columns, rows = build_rows(args.table, args.rows)
+
+    print("🏁 Export Format Benchmark")
+    print("=" * 72)
+    print(f"Table: {args.table}  |  rows: {args.rows}  |  batch size: {args.batch_size}")
+
+    candidates = [("csv (legacy per-row)", legacy_csv), ("json (legacy per-row)", legacy_json)]
+    for export_format in EXPORT_FORMATS:
+        if export_format == "parquet" and not parquet_available():
+            print("⚠️  pyarrow not installed - skipping parquet")
+            continue
+        candidates.append((export_format, batch_encoder(export_format)))
+
+    baseline = None
+    print(f"\n{'format':<24}{'rows/sec':>14}{'MB on wire':>14}{'bytes/row':>12}{'vs csv':>10}")
+    for label, run in candidates:
+        seconds, size, _ = measure(run, columns, rows, args.batch_size)
+        if label == "csv":
+            baseline = size
+        ratio = f"{size / baseline:.2f}x" if baseline else "-"
+        print(f"{label:<24}{args.rows / seconds:>14,.0f}{size / 1_048_576:>14.2f}{size / args.rows:>12.1f}{ratio:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Local End-to-End Streaming Pipeline Benchmark for NeoBot-Net v2
+Runs the real streaming pipeline (ScanPipeline.execute_pipeline) with the
+Go module binaries started on this machine by LocalTaskRunner, and reports
+wall-clock time and rows written per second.
+
+Everything runs on one Linux box:
+- Redis on REDIS_HOST:REDIS_PORT (e.g. `docker run -p 6379:6379 redis:7`)
+- A local Supabase stack (`supabase start`, PostgREST included) with
+  schema.sql and the migrations applied, and an asset with apex domains
+- The module binaries, built with --build (needs Go) or beforehand:
+      go build -o bin/dnsx-go ./backend/containers/dnsx-go
+
+Usage:
+    SUPABASE_URL=http://127.0.0.1:54321 SUPABASE_SERVICE_ROLE_KEY=... \\
+    python scripts/benchmark-local-pipeline.py --asset-id <uuid> --user-id <uuid> \\
+        [--modules subfinder,dnsx,httpx] [--scale-factor 2] [--runs 3] [--build]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+# Add parent directory to path for imports
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(BACKEND_DIR))
+
+RESULT_TABLES = ["subdomains", "dns_records", "http_probes", "urls"]
+
+
+def build_binaries(modules: List[str], bin_dir: Path) -> None:
+    """go build each module's container source into bin_dir."""
+    from app.services.task_runner import MODULE_BINARIES
+
+    bin_dir.mkdir(parents=True, exist_ok=True)
+    for module in modules:
+        binary = MODULE_BINARIES[module]
+        print(f"🔨 Building {binary}...")
+        subprocess.run(
+            ["go", "build", "-o", str(bin_dir.resolve() / binary), "."],
+            cwd=BACKEND_DIR / "containers" / binary,
+            check=True
+        )
+
+
+async def count_rows(asset_id: str) -> Dict[str, int]:
+    from app.core.supabase_client import supabase_client
+
+    db = supabase_client.async_service_client
+    counts = {}
+    for table in RESULT_TABLES:
+        response = await db.table(table).select("id", count="exact").eq("asset_id", asset_id).limit(1).execute()
+        counts[table] = response.count or 0
+    return counts
+
+
+async def run_once(asset_id: str, user_id: str, modules: List[str], scale_factor: int, timeout: int) -> Dict[str, float]:
+    from app.services.scan_pipeline import scan_pipeline
+
+    before = await count_rows(asset_id)
+    start = time.perf_counter()
+    result = await scan_pipeline.execute_pipeline(
+        asset_id=asset_id,
+        modules=modules,
+        scan_request=None,
+        user_id=user_id,
+        scale_factor=scale_factor,
+        timeout_seconds=timeout
+    )
+    wall = time.perf_counter() - start
+    after = await count_rows(asset_id)
+
+    written = {table: after[table] - before[table] for table in RESULT_TABLES}
+    total = sum(written.values())
+    print(
+        f"   {result['status']:<16} wall={wall:8.1f}s  rows={total:7d}  "
+        f"({', '.join(f'{t}={n}' for t, n in written.items())})  {total / max(wall, 0.001):8.1f} rows/s"
+    )
+    return {"wall": wall, "rows": total}
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--asset-id", required=True)
+    parser.add_argument("--user-id", required=True)
+    parser.add_argument("--modules", default="subfinder,dnsx,httpx")
+    parser.add_argument("--scale-factor", type=int, default=1)
+    parser.add_argument("--runs", type=int, default=1)
+    parser.add_argument("--timeout", type=int, default=3600)
+    parser.add_argument("--mode", choices=["subprocess", "docker"], default="subprocess")
+    parser.add_argument("--bin-dir", default=str(BACKEND_DIR / "bin"))
+    parser.add_argument("--build", action="store_true", help="go build the module binaries first")
+    args = parser.parse_args()
+
+    modules = [m.strip() for m in args.modules.split(",") if m.strip()]
+
+    # Point the application at the local runner before anything imports settings
+    os.environ["TASK_RUNNER"] = "local"
+    os.environ["LOCAL_RUNNER_MODE"] = args.mode
+    os.environ["LOCAL_RUNNER_BIN_DIR"] = args.bin_dir
+    os.environ.setdefault("SUPABASE_ANON_KEY", "benchmark")
+    os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+
+    if args.build:
+        # dnsx is added automatically whenever subfinder runs
+        build_binaries(sorted(set(modules) | ({"dnsx"} if "subfinder" in modules else set())), Path(args.bin_dir))
+
+    from app.core.supabase_client import supabase_client
+    from app.services.batch_workflow_orchestrator import batch_workflow_orchestrator
+    from app.services.module_config_loader import initialize_module_config
+
+    await initialize_module_config(supabase_client.service_client)
+
+    print("🏁 Local Streaming Pipeline Benchmark")
+    print("=" * 50)
+    print(f"📊 Modules: {modules}  |  Scale: {args.scale_factor}x  |  Runner: local/{args.mode}  |  Runs: {args.runs}")
+
+    runs = []
+    try:
+        for run in range(args.runs):
+            print(f"▶️  Run {run + 1}/{args.runs}")
+            runs.append(await run_once(args.asset_id, args.user_id, modules, args.scale_factor, args.timeout))
+    finally:
+        if batch_workflow_orchestrator.task_runner is not None:
+            await batch_workflow_orchestrator.task_runner.aclose()
+        await supabase_client.aclose()
+
+    print("=" * 50)
+    walls = [r["wall"] for r in runs]
+    print(f"⏱️  Wall time: median={statistics.median(walls):.1f}s  min={min(walls):.1f}s  max={max(walls):.1f}s")
+    print(f"🚀 Throughput: {sum(r['rows'] for r in runs) / max(sum(walls), 0.001):.1f} rows/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
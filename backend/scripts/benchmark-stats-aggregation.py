@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+Stats Aggregation Benchmark for NeoBot-Net v2
+Compares the legacy filtered /urls/stats and /http-probes/stats/summary path
+(multiple count queries + 1000-row Python samples) against the single-pass
+SQL aggregation RPCs, for both latency and accuracy.
+
+Synthetic mode (default) runs against a PostgREST stand-in in a child
+process. It serves a deterministic skewed dataset for one asset, answers
+count/sample queries like PostgREST, and answers the RPCs with the exact
+aggregate, so it measures round trips, payload transfer, and sampling error.
+Database execution time of the SQL function is not simulated - use --live
+for that.
+
+Live mode runs both paths against the configured Supabase project.
+
+Usage:
+    python scripts/benchmark-stats-aggregation.py [--rows 50000] [--latency-ms 20] [--runs 5]
+    python scripts/benchmark-stats-aggregation.py --live --asset-id <uuid> [--runs 5]
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import statistics
+import sys
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, List, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+ASSET_ID = "00000000-0000-0000-0000-00000000a55e"
+
+
+# ================================================================
+# Synthetic Dataset (insertion order correlates with subdomain, like real scans)
+# ================================================================
+
+def build_dataset(rows: int, seed: int = 7) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """Generate URL and HTTP probe rows whose first pages are unrepresentative."""
+    rng = random.Random(seed)
+    techs = [f"tech-{i}" for i in range(60)]
+    servers = ["nginx", "Apache", "cloudflare", "Microsoft-IIS/10.0", "envoy", "gws", "AmazonS3"]
+    cdns = ["cloudflare", "akamai", "fastly", "cloudfront", None, None, None]
+    extensions = ["js", "php", "html", "json", "css", "png", None, None]
+    sources = ["katana", "waymore", "gau", "tyvt"]
+
+    urls, probes = [], []
+    domain_count = max(10, rows // 25)
+    for d in range(domain_count):
+        domain = f"d{d}.example.com"
+        # Each subdomain has its own stack, so a head-of-table sample sees few stacks
+        stack = rng.sample(techs, 3)
+        server = servers[d % len(servers)]
+        cdn = cdns[d % len(cdns)]
+        for _ in range(rows // domain_count):
+            alive = rng.random() < 0.6
+            urls.append({
+                "domain": domain,
+                "is_alive": alive if rng.random() > 0.1 else None,
+                "resolved_at": None if rng.random() < 0.1 else "2026-01-01T00:00:00Z",
+                "has_params": rng.random() < 0.3,
+                "status_code": rng.choice([200, 200, 200, 301, 403, 404, 500]) if alive else None,
+                "file_extension": rng.choice(extensions),
+                "sources": rng.sample(sources, rng.randint(1, 2)),
+                "technologies": stack[: rng.randint(0, 3)],
+            })
+        probes.append({
+            "status_code": rng.choice([200, 200, 301, 302, 403, 404, 500, 502]),
+            "webserver": server,
+            "technologies": stack,
+            "cdn_name": cdn,
+            "chain_status_codes": [301, 200] if rng.random() < 0.2 else [],
+        })
+    return urls, probes
+
+
+def _top(counter: Counter, n: int, key: str) -> List[Dict[str, Any]]:
+    return [{key: k, "count": c} for k, c in sorted(counter.items(), key=lambda x: (-x[1], str(x[0])))[:n]]
+
+
+def exact_url_stats(urls: List[Dict[str, Any]], top_n: int = 10) -> Dict[str, Any]:
+    """Python mirror of get_url_stats_aggregate."""
+    return {
+        "total_urls": len(urls),
+        "alive_urls": sum(1 for u in urls if u["is_alive"] is True),
+        "dead_urls": sum(1 for u in urls if u["is_alive"] is False),
+        "pending_urls": sum(1 for u in urls if u["resolved_at"] is None),
+        "urls_with_params": sum(1 for u in urls if u["has_params"]),
+        "unique_domains": len({u["domain"] for u in urls}),
+        "top_sources": _top(Counter(s for u in urls for s in u["sources"]), top_n, "source"),
+        "top_status_codes": _top(Counter(u["status_code"] for u in urls if u["status_code"]), top_n, "status_code"),
+        "top_technologies": _top(Counter(t for u in urls for t in u["technologies"]), top_n, "name"),
+        "top_file_extensions": _top(Counter(u["file_extension"] for u in urls if u["file_extension"]), top_n, "extension"),
+    }
+
+
+def exact_probe_stats(probes: List[Dict[str, Any]], top_n: int = 10) -> Dict[str, Any]:
+    """Python mirror of get_http_probe_stats_aggregate."""
+    return {
+        "total_probes": len(probes),
+        "redirect_chains_count": sum(1 for p in probes if p["chain_status_codes"]),
+        "status_code_distribution": {str(k): v for k, v in Counter(p["status_code"] for p in probes if p["status_code"]).items()},
+        "top_technologies": _top(Counter(t for p in probes for t in p["technologies"]), top_n, "name"),
+        "top_servers": _top(Counter(p["webserver"] for p in probes if p["webserver"]), top_n, "name"),
+        "cdn_usage": dict(Counter(p["cdn_name"] for p in probes if p["cdn_name"])),
+    }
+
+
+# ================================================================
+# PostgREST Stand-in
+# ================================================================
+
+def _matches(row: Dict[str, Any], params: List[Tuple[str, str]]) -> bool:
+    """Evaluate the eq./is. filters the legacy path uses."""
+    for column, expr in params:
+        if column in ("select", "limit", "offset", "order", "asset_id", "scan_job_id"):
+            continue
+        op, _, value = expr.partition(".")
+        if op == "is" and value == "null":
+            if row.get(column) is not None:
+                return False
+        elif op == "eq":
+            expected = {"true": True, "false": False}.get(value, value)
+            if str(row.get(column)) != str(expected) and row.get(column) != expected:
+                return False
+    return True
+
+
+def _serve_stub(rows: int, latency_seconds: float, port_queue) -> None:
+    urls, probes = build_dataset(rows)
+    tables = {"urls": urls, "http_probes": probes}
+    rpcs = {
+        "get_url_stats_aggregate": exact_url_stats(urls),
+        "get_http_probe_stats_aggregate": exact_probe_stats(probes),
+    }
+
+    # Memoized so the stand-in's own Python filtering isn't billed to the legacy path
+    responses: Dict[Tuple[str, str, str], Tuple[bytes, Dict[str, str]]] = {}
+
+    def respond(path: str, query: str, headers: Dict[str, str]) -> Tuple[bytes, Dict[str, str]]:
+        key = (path, query, headers.get("prefer", ""))
+        if key not in responses:
+            responses[key] = _respond(path, query, headers)
+        return responses[key]
+
+    def _respond(path: str, query: str, headers: Dict[str, str]) -> Tuple[bytes, Dict[str, str]]:
+        name = path.rsplit("/", 1)[-1]
+        if "/rpc/" in path:
+            return json.dumps(rpcs[name]).encode(), {}
+
+        params = parse_qsl(query)
+        selected = [r for r in tables[name] if _matches(r, params)]
+        limit = int(dict(params).get("limit", len(selected)))
+        columns = [c.strip() for c in dict(params).get("select", "*").split(",")]
+        page = [{c: r.get(c) for c in columns} for r in selected[:limit]] if columns != ["*"] else selected[:limit]
+        extra = {}
+        if "count=exact" in headers.get("prefer", ""):
+            extra["Content-Range"] = f"0-{max(len(page) - 1, 0)}/{len(selected)}"
+        return json.dumps(page).encode(), extra
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                lines = head.decode().split("\r\n")
+                _, target, _ = lines[0].split(" ", 2)
+                headers = {k.lower(): v.strip() for k, _, v in (l.partition(":") for l in lines[1:] if l)}
+                if int(headers.get("content-length", 0)):
+                    await reader.readexactly(int(headers["content-length"]))
+                await asyncio.sleep(latency_seconds)
+                url = urlsplit(target)
+                body, extra = respond(url.path, url.query, headers)
+                extra_headers = "".join(f"{k}: {v}\r\n" for k, v in extra.items())
+                writer.write(
+                    f"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n{extra_headers}"
+                    f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve() -> None:
+        server = await asyncio.start_server(handle, "127.0.0.1", 0, backlog=1024)
+        port_queue.put(server.sockets[0].getsockname()[1])
+        await server.serve_forever()
+
+    asyncio.run(serve())
+
+
+def start_stub_postgrest(rows: int, latency_seconds: float) -> Tuple[multiprocessing.Process, int]:
+    """Start the PostgREST stand-in in its own process. Returns the process and bound port."""
+    port_queue = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_serve_stub, args=(rows, latency_seconds, port_queue), daemon=True)
+    process.start()
+    return process, port_queue.get(timeout=60)
+
+
+# ================================================================
+# Legacy (sampling) paths - as the endpoints worked before the RPCs
+# ================================================================
+
+def _tally(rows: List[Dict[str, Any]], column: str, is_list: bool = False) -> Counter:
+    counts = Counter()
+    for row in rows:
+        value = row.get(column)
+        if is_list:
+            counts.update(value if isinstance(value, list) else [])
+        elif value:
+            counts[value] += 1
+    return counts
+
+
+async def legacy_url_stats(db, asset_id: str) -> Dict[str, Any]:
+    def base(columns: str = "id", count: str = "exact"):
+        return db.table("urls").select(columns, count=count).eq("asset_id", asset_id)
+
+    total = await base().limit(1).execute()
+    alive = await base().eq("is_alive", True).limit(1).execute()
+    dead = await base().eq("is_alive", False).limit(1).execute()
+    pending = await base().is_("resolved_at", "null").limit(1).execute()
+    params = await base().eq("has_params", True).limit(1).execute()
+    domains = await base("domain", None).limit(10000).execute()
+    sample = (await base("sources, status_code, technologies, file_extension", None).limit(1000).execute()).data or []
+
+    return {
+        "total_urls": total.count or 0,
+        "alive_urls": alive.count or 0,
+        "dead_urls": dead.count or 0,
+        "pending_urls": pending.count or 0,
+        "urls_with_params": params.count or 0,
+        "unique_domains": len({d.get("domain") for d in (domains.data or []) if d.get("domain")}),
+        "top_sources": _top(_tally(sample, "sources", True), 5, "source"),
+        "top_status_codes": _top(_tally(sample, "status_code"), 5, "status_code"),
+        "top_technologies": _top(_tally(sample, "technologies", True), 10, "name"),
+        "top_file_extensions": _top(_tally(sample, "file_extension"), 10, "extension"),
+    }
+
+
+async def legacy_probe_stats(db, asset_id: str) -> Dict[str, Any]:
+    total = await db.table("http_probes").select("id", count="exact").eq("asset_id", asset_id).limit(1).execute()
+    probes = (await db.table("http_probes").select(
+        "status_code, webserver, technologies, cdn_name, chain_status_codes"
+    ).eq("asset_id", asset_id).limit(1000).execute()).data or []
+
+    return {
+        "total_probes": total.count or 0,
+        "redirect_chains_count": sum(1 for p in probes if p.get("chain_status_codes")),
+        "status_code_distribution": {str(k): v for k, v in _tally(probes, "status_code").items()},
+        "top_technologies": _top(_tally(probes, "technologies", True), 10, "name"),
+        "top_servers": _top(_tally(probes, "webserver"), 10, "name"),
+        "cdn_usage": dict(_tally(probes, "cdn_name")),
+    }
+
+
+async def rpc_stats(db, function: str, asset_id: str) -> Dict[str, Any]:
+    result = await db.rpc(function, {"p_asset_id": asset_id, "p_scan_job_id": None, "p_top_n": 10}).execute()
+    return result.data or {}
+
+
+# ================================================================
+# Measurement
+# ================================================================
+
+async def time_runs(fn: Callable, runs: int) -> Tuple[float, Dict[str, Any]]:
+    """Median latency (ms) over `runs` plus the last result."""
+    latencies, result = [], {}
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = await fn()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return statistics.median(latencies), result
+
+
+def distribution_error(legacy: List[Dict[str, Any]], exact: List[Dict[str, Any]], key: str) -> Tuple[float, float]:
+    """(top-N overlap %, mean relative count error % over the exact top-N)."""
+    legacy_counts = {item[key]: item["count"] for item in legacy}
+    exact_counts = {item[key]: item["count"] for item in exact}
+    if not exact_counts:
+        return 100.0, 0.0
+    overlap = len(set(legacy_counts) & set(exact_counts)) / len(exact_counts) * 100
+    errors = [abs(legacy_counts.get(k, 0) - v) / v * 100 for k, v in exact_counts.items()]
+    return overlap, statistics.mean(errors)
+
+
+def report(label: str, legacy_ms: float, rpc_ms: float, legacy: Dict[str, Any], exact: Dict[str, Any],
+           scalars: List[str], distributions: List[Tuple[str, str]]) -> None:
+    print(f"\n📊 {label}")
+    print(f"   latency  legacy={legacy_ms:8.1f}ms  rpc={rpc_ms:8.1f}ms  ({legacy_ms / max(rpc_ms, 0.001):.1f}x)")
+    for name in scalars:
+        marker = "✅" if legacy.get(name) == exact.get(name) else "❌"
+        print(f"   {marker} {name:<24} legacy={legacy.get(name)!s:>10}  exact={exact.get(name)!s:>10}")
+    for name, key in distributions:
+        overlap, error = distribution_error(legacy.get(name, []), exact.get(name, []), key)
+        marker = "✅" if overlap == 100 and error == 0 else "❌"
+        print(f"   {marker} {name:<24} top-N overlap={overlap:5.1f}%  mean count error={error:6.1f}%")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--rows", type=int, default=50000, help="Synthetic URL rows (probes = rows / 25)")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="Synthetic per-request latency")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--live", action="store_true", help="Benchmark the configured Supabase project")
+    parser.add_argument("--asset-id", default=ASSET_ID)
+    args = parser.parse_args()
+
+    stub = None
+    if not args.live:
+        stub, port = start_stub_postgrest(args.rows, args.latency_ms / 1000)
+        # Point the application settings at the stub before anything imports them
+        os.environ["SUPABASE_URL"] = f"http://127.0.0.1:{port}"
+        os.environ.setdefault("SUPABASE_ANON_KEY", "benchmark")
+        os.environ.setdefault("SUPABASE_SERVICE_ROLE_KEY", "benchmark")
+        os.environ.setdefault("JWT_SECRET_KEY", "benchmark")
+
+    from app.core.supabase_client import supabase_client
+    db = supabase_client.async_service_client
+
+    print("🏁 Stats Aggregation Benchmark")
+    print("=" * 60)
+    mode = "live Supabase" if args.live else f"synthetic ({args.rows} urls, {args.latency_ms}ms/request)"
+    print(f"Mode: {mode}  |  asset_id: {args.asset_id}  |  runs: {args.runs}")
+
+    if stub:
+        # Warm the stand-in's response memo so only transfer + round trips are timed
+        await legacy_url_stats(db, args.asset_id)
+        await legacy_probe_stats(db, args.asset_id)
+
+    legacy_ms, legacy = await time_runs(lambda: legacy_url_stats(db, args.asset_id), args.runs)
+    rpc_ms, exact = await time_runs(lambda: rpc_stats(db, "get_url_stats_aggregate", args.asset_id), args.runs)
+    exact = {**exact, "top_sources": exact.get("top_sources", [])[:5], "top_status_codes": exact.get("top_status_codes", [])[:5]}
+    report("/urls/stats", legacy_ms, rpc_ms, legacy, exact,
+           ["total_urls", "alive_urls", "dead_urls", "pending_urls", "urls_with_params", "unique_domains"],
+           [("top_sources", "source"), ("top_status_codes", "status_code"),
+            ("top_technologies", "name"), ("top_file_extensions", "extension")])
+
+    legacy_ms, legacy = await time_runs(lambda: legacy_probe_stats(db, args.asset_id), args.runs)
+    rpc_ms, exact = await time_runs(lambda: rpc_stats(db, "get_http_probe_stats_aggregate", args.asset_id), args.runs)
+    report("/http-probes/stats/summary", legacy_ms, rpc_ms, legacy, exact,
+           ["total_probes", "redirect_chains_count"],
+           [("top_technologies", "name"), ("top_servers", "name")])
+    for name in ("status_code_distribution", "cdn_usage"):
+        marker = "✅" if legacy.get(name) == exact.get(name) else "❌"
+        print(f"   {marker} {name:<24} legacy sum={sum(legacy.get(name, {}).values()):>8}  "
+              f"exact sum={sum(exact.get(name, {}).values()):>8}")
+
+    await supabase_client.aclose()
+    if stub:
+        stub.terminate()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
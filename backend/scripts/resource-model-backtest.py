@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Resource Model Backtest for NeoBot-Net v2
+Fits the history-trained resource model on the older finished batch scan
+jobs and reports predicted vs actual durations of the newest ones, per
+module, next to the static estimate stored on each job. Then prints the
+size the full model would pick for a few workload sizes.
+
+Usage:
+    python scripts/resource-model-backtest.py [--holdout 0.2] [--limit 5000] [--domains 1,10,100]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _pct(value) -> str:
+    return "    -" if value is None else f"{value * 100:5.1f}%"
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--holdout", type=float, default=0.2, help="newest share of completed jobs to test on")
+    parser.add_argument("--limit", type=int, default=5000, help="most recent finished jobs to load")
+    parser.add_argument("--domains", default="1,10,100", help="workload sizes to print recommendations for")
+    args = parser.parse_args()
+
+    from app.core.config import settings
+    from app.core.supabase_client import supabase_client
+    from app.services.resource_model import resource_model
+
+    settings.resource_model_history_limit = args.limit
+
+    print("📐 Resource Model Backtest")
+    print("=" * 78)
+    try:
+        samples = await resource_model.load_history()
+        report = resource_model.backtest(samples, holdout_fraction=args.holdout)
+        resource_model.fits = resource_model.fit(samples)
+    finally:
+        await supabase_client.aclose()
+
+    print(f"📊 {len(samples)} finished jobs  |  train={report['train_jobs']}  test={report['test_jobs']}  "
+          f"|  cutoff={report.get('cutoff', '-')}")
+    print()
+    print(f"{'module':<14}{'train':>7}{'test':>6}{'MAPE':>8}{'median':>8}{'p90':>8}{'p95 cov':>9}{'static':>9}")
+    for module, row in report["modules"].items():
+        if not row["fitted"]:
+            print(f"{module:<14}{'-':>7}{row['test_jobs']:>6}   not enough history")
+            continue
+        print(
+            f"{module:<14}{row['train_jobs']:>7}{row['test_jobs']:>6}  {_pct(row['mape'])}  {_pct(row['median_ape'])}  "
+            f"{_pct(row['p90_ape'])}   {_pct(row['upper_bound_coverage'])}   {_pct(row['static_mape'])}"
+        )
+
+    print()
+    print("🎯 Recommendations (full history)")
+    for module in sorted(resource_model.fits):
+        for domains in (int(d) for d in args.domains.split(",") if d.strip()):
+            rec = resource_model.recommend(module, domains)
+            if rec is None:
+                print(f"   {module:<14} {domains:>5} domains: no candidate size")
+                continue
+            print(
+                f"   {module:<14} {domains:>5} domains: {rec.cpu:>4} CPU / {rec.memory:>5} MB  "
+                f"~{rec.predicted_seconds / 60:6.1f} min  ${rec.estimated_cost:.4f}"
+                f"{'' if rec.meets_target else '  (misses target)'}"
+            )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,30 @@
+"""
+Shared fixtures for backend tests.
+"""
+import httpx
+import pytest_asyncio
+
+from app.core.supabase_client import SupabaseClient
+
+
+@pytest_asyncio.fixture
+async def mock_postgrest():
+    """
+    Factory for SupabaseClients whose PostgREST requests go to a handler
+    (an httpx.MockTransport handler, sync or async). Clients are closed
+    when the test ends.
+
+        client = mock_postgrest(handler)
+        service.supabase = client.async_service_client
+    """
+    clients = []
+
+    def build(handler) -> SupabaseClient:
+        client = SupabaseClient()
+        client._http_pool = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        clients.append(client)
+        return client
+
+    yield build
+    for client in clients:
+        await client.aclose()
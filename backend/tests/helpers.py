@@ -0,0 +1,6 @@
+"""
+Shared values for backend tests.
+"""
+
+# Asset (program) UUID used by tests that don't care which asset they hit
+ASSET_ID = "c1806931-57d0-4f91-9398-e0978d89fb2f"
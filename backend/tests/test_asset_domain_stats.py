@@ -0,0 +1,71 @@
+"""
+Tests for batched apex domain statistics on asset domain pages.
+"""
+import json
+
+import httpx
+import pytest
+
+from app.services.asset_service import AssetService
+from tests.helpers import ASSET_ID
+
+
+def _service_with_db(mock_postgrest, per_page: int):
+    """Build an AssetService backed by a mock PostgREST that records every request."""
+    calls = []
+    domains = [f"d{i}.example.com" for i in range(per_page)]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        path = request.url.path
+
+        if path.endswith("/apex_domains"):
+            rows = [
+                {"id": str(i), "asset_id": ASSET_ID, "domain": d, "is_active": True,
+                 "assets": {"name": "Example"}}
+                for i, d in enumerate(domains)
+            ]
+            return httpx.Response(200, headers={"Content-Range": f"0-{per_page - 1}/500"},
+                                  content=json.dumps(rows))
+
+        if path.endswith("/rpc/get_subdomain_counts_by_parent_domain"):
+            requested = json.loads(request.content)["p_domains"]
+            rows = [{"parent_domain": d, "subdomain_count": i}
+                    for i, d in enumerate(requested) if i % 2]
+            return httpx.Response(200, content=json.dumps(rows))
+
+        if path.endswith("/rpc/get_asset_scan_status_rollup"):
+            rows = [{"asset_id": ASSET_ID, "total_scans": 7, "completed_scans": 5, "running_scans": 1}]
+            return httpx.Response(200, content=json.dumps(rows))
+
+        return httpx.Response(404, content="{}")
+
+    service = AssetService()
+    service.supabase = mock_postgrest(handler).async_service_client
+    return service, calls
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("per_page", [1, 20, 100])
+async def test_domain_page_uses_constant_db_calls(mock_postgrest, per_page):
+    service, calls = _service_with_db(mock_postgrest, per_page)
+
+    result = await service.get_paginated_asset_domains("user", ASSET_ID, page=1, per_page=per_page)
+
+    assert len(result["domains"]) == per_page
+    assert len(calls) == 3
+    assert result["pagination"]["total"] == 500
+
+
+@pytest.mark.asyncio
+async def test_domain_stats_are_mapped_from_grouped_queries(mock_postgrest):
+    service, _ = _service_with_db(mock_postgrest, 4)
+
+    result = await service.get_paginated_asset_domains("user", ASSET_ID, page=1, per_page=4)
+
+    by_domain = {d["domain"]: d for d in result["domains"]}
+    assert by_domain["d0.example.com"]["total_subdomains"] == 0
+    assert by_domain["d3.example.com"]["total_subdomains"] == 3
+    assert all(d["total_scans"] == 7 for d in result["domains"])
+    assert all(d["completed_scans"] == 5 and d["running_scans"] == 1 for d in result["domains"])
+    assert all(d["asset_name"] == "Example" for d in result["domains"])
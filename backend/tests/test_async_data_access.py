@@ -0,0 +1,72 @@
+"""
+Tests for the async Supabase/PostgREST service client.
+"""
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.core.supabase_client import SupabaseClient
+
+
+@pytest.mark.asyncio
+async def test_async_service_client_is_lazy_and_shared():
+    client = SupabaseClient()
+    assert client._async_service_client is None
+
+    first = client.async_service_client
+    second = client.async_service_client
+
+    assert first is second
+    assert first.session is client._http_pool
+
+    await client.aclose()
+    assert client._http_pool is None
+    assert client._async_service_client is None
+
+
+@pytest.mark.asyncio
+async def test_execute_is_awaitable_and_uses_service_role(mock_postgrest):
+    captured = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        captured["url"] = request.url
+        captured["headers"] = request.headers
+        return httpx.Response(
+            200,
+            headers={"Content-Range": "0-0/42"},
+            content=json.dumps([{"id": "abc"}]),
+        )
+
+    client = mock_postgrest(handler)
+    response = await client.async_service_client.table("urls").select(
+        "id", count="exact"
+    ).eq("id", "abc").execute()
+
+    assert response.data == [{"id": "abc"}]
+    assert response.count == 42
+    assert captured["url"].path.endswith("/rest/v1/urls")
+    assert captured["url"].params["id"] == "eq.abc"
+    assert captured["headers"]["apikey"] == settings.supabase_service_role_key
+
+
+@pytest.mark.asyncio
+async def test_concurrent_queries_do_not_serialize(mock_postgrest):
+    latency = 0.05
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(latency)
+        return httpx.Response(200, content="[]")
+
+    client = mock_postgrest(handler)
+    db = client.async_service_client
+
+    start = time.perf_counter()
+    await asyncio.gather(*[db.table("urls").select("id").execute() for _ in range(20)])
+    elapsed = time.perf_counter() - start
+
+    # Blocking execution would take 20 * latency; overlapped takes ~1 * latency
+    assert elapsed < latency * 5
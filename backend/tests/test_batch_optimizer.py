@@ -17,7 +17,7 @@ from app.schemas.batch import (
     BatchType, BatchStatus, ResourceProfile, ModuleProfile,
     ModuleResourceScaling, ResourceRange
 )
-from app.services.batch_optimizer import BatchOptimizer
+from app.services.batch_optimizer import BatchOptimizer, pack_by_work
 
 class TestBatchOptimizer:
     """Test suite for BatchOptimizer service."""
@@ -356,5 +356,79 @@ class TestBatchOptimizer:
         # Verify database was only called once
         batch_optimizer.supabase.table.assert_called_once()
 
+    def test_pack_by_work_separates_heavy_domains(self):
+        """Huge domains are spread over batches instead of stacking in one chunk."""
+        
+        domains = ["huge1.com", "huge2.com"] + [f"small{i}.com" for i in range(198)]
+        work = {"huge1.com": 40001.0, "huge2.com": 30001.0, **{f"small{i}.com": 11.0 for i in range(198)}}
+        
+        batches = pack_by_work(domains, work, max_batch_size=100)
+        
+        # Same task count as fixed-size chunking
+        assert len(batches) == 2
+        assert sorted(d for batch in batches for d in batch) == sorted(domains)
+        assert all(len(batch) <= 100 for batch in batches)
+        assert "huge1.com" in batches[0] and "huge2.com" in batches[1]
+        
+        # Chunking puts both huge domains in the first batch
+        chunked = [domains[i:i + 100] for i in range(0, len(domains), 100)]
+        makespan = max(sum(work[d] for d in batch) for batch in batches)
+        assert makespan == 40001.0 + 99 * 11.0
+        assert max(sum(work[d] for d in batch) for batch in chunked) == 70002.0 + 98 * 11.0
+    
+    def test_pack_by_work_balances_skewed_loads(self):
+        """Batches end up with similar predicted work; unknown domains weigh 1."""
+        
+        domains = [f"d{i}.com" for i in range(12)]
+        work = {"d0.com": 50.0, "d1.com": 40.0, "d2.com": 30.0, "d3.com": 30.0, "d4.com": 20.0}
+        
+        batches = pack_by_work(domains, work, max_batch_size=4)
+        loads = [sum(work.get(d, 1.0) for d in batch) for batch in batches]
+        
+        assert len(batches) == 3 and all(len(batch) == 4 for batch in batches)
+        assert max(loads) - min(loads) <= 20
+        assert loads == sorted(loads, reverse=True)
+        # Request order is kept within a batch
+        assert all(batch == sorted(batch, key=domains.index) for batch in batches)
+        assert pack_by_work([], work, max_batch_size=4) == []
+    
+    @pytest.mark.asyncio
+    async def test_optimized_batches_use_domain_work(self, batch_optimizer, sample_subfinder_profile):
+        """Known subdomain counts drive the packing and are recorded per batch."""
+        
+        sample_subfinder_profile.max_batch_size = 2
+        batch_optimizer._get_module_profile = AsyncMock(return_value=sample_subfinder_profile)
+        batch_optimizer._calculate_batch_resources = AsyncMock(return_value=ResourceProfile(
+            cpu=512, memory=1024, estimated_duration_minutes=8,
+            description="Test profile", domain_count=2, module_name="subfinder"
+        ))
+        response = Mock()
+        response.data = [
+            {"parent_domain": "a.com", "subdomain_count": 900, "url_count": 5},
+            {"parent_domain": "b.com", "subdomain_count": 800, "url_count": 0},
+        ]
+        batch_optimizer.supabase.rpc.return_value.execute.return_value = response
+        
+        asset_scan_id = str(uuid.uuid4())
+        request = BatchOptimizationRequest(
+            asset_scan_requests=[{
+                "asset_id": str(uuid.uuid4()),
+                "domains": ["a.com", "b.com", "c.com", "d.com"],
+                "asset_scan_id": asset_scan_id
+            }],
+            modules=["subfinder"],
+            priority=1,
+            user_id=uuid.uuid4()
+        )
+        result = await batch_optimizer.optimize_scans(request)
+        
+        # Chunking would have put a.com and b.com (the two heavy ones) together
+        assert [job.batch_domains for job in result.batch_jobs] == [["a.com", "d.com"], ["b.com", "c.com"]]
+        assert [job.metadata["predicted_work"] for job in result.batch_jobs] == [902.0, 802.0]
+        assert result.batch_jobs[0].metadata["batch_strategy"] == "work_balanced"
+        batch_optimizer.supabase.rpc.assert_called_once_with(
+            "get_domain_workload_counts", {"p_domains": ["a.com", "b.com", "c.com", "d.com"]}
+        )
+
 if __name__ == "__main__":
     pytest.main([__file__])
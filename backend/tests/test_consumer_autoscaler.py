@@ -0,0 +1,185 @@
+"""
+Tests for backlog-driven consumer autoscaling.
+"""
+import pytest
+
+from app.services.consumer_autoscaler import (
+    ConsumerAutoscaler,
+    ScalableGroup,
+    ScalingPolicy,
+    ScanScaling,
+)
+
+INTERVAL = 15.0
+
+# Cumulative entries added per sample (recorded subfinder → dnsx streams)
+BURST_CURVE = [0, 400, 3200, 9800, 16500, 21000, 23800, 24900, 25200, 25200, 25200, 25200]
+STEADY_CURVE = [0, 300, 600, 900, 1200, 1500, 1800, 2100, 2400, 2400]
+
+
+def _policy(**overrides):
+    values = dict(
+        target_backlog_per_task=500,
+        drain_seconds=120.0,
+        cooldown_seconds=30.0,
+        max_step=3,
+        max_tasks_per_group=10,
+        max_tasks_per_scan=30,
+        global_max_extra_tasks=100,
+    )
+    values.update(overrides)
+    return ScalingPolicy(**values)
+
+
+class SimulatedGroup:
+    """A consumer group fed by a recorded arrival curve."""
+
+    def __init__(self, curve, per_task_rate, tasks):
+        self.curve = curve
+        self.per_task_rate = per_task_rate
+        self.tasks = tasks
+        self.read = 0
+        self.tick = 0
+        self.launch_calls = []
+
+    def advance(self):
+        """Move the simulation one sample interval forward."""
+        self.tick = min(self.tick + 1, len(self.curve) - 1)
+        added = self.curve[self.tick]
+        self.read = min(added, self.read + int(self.tasks * self.per_task_rate * INTERVAL))
+
+    def sample(self):
+        added = self.curve[self.tick]
+        return {
+            "length": added,
+            "entries_added": added,
+            "entries_read": self.read,
+            "lag": added - self.read,
+            "pending": 0,
+            "consumers": self.tasks,
+            "completed": self.tick == len(self.curve) - 1,
+        }
+
+    async def launch(self, count):
+        self.launch_calls.append(count)
+        self.tasks += count
+        return [f"arn:task/{self.tasks - i}" for i in range(count)]
+
+
+async def _replay(groups, policy):
+    """Run the controller over every sample of the curves; returns the autoscaler."""
+    clock = {"now": 0.0}
+    by_key = {name: sim for name, sim in groups.items()}
+
+    async def sampler(stream_key, group_name):
+        return by_key[group_name].sample()
+
+    autoscaler = ConsumerAutoscaler(policy=policy, sampler=sampler, clock=lambda: clock["now"])
+    scan = ScanScaling(
+        scan_id="scan-1",
+        groups=[
+            ScalableGroup(module=name, stream_key=f"stream:{name}", group_name=name,
+                          launch=sim.launch, tasks=sim.tasks, min_tasks=sim.tasks)
+            for name, sim in groups.items()
+        ],
+    )
+
+    for _ in range(max(len(sim.curve) for sim in groups.values()) + 5):
+        await autoscaler.step(scan)
+        if all(group.done for group in scan.groups):
+            break
+        clock["now"] += INTERVAL
+        for sim in groups.values():
+            sim.advance()
+    return autoscaler, scan
+
+
+@pytest.mark.asyncio
+async def test_burst_scales_up_within_caps_and_cooldown():
+    dnsx = SimulatedGroup(BURST_CURVE, per_task_rate=40, tasks=1)
+    autoscaler, scan = await _replay({"dnsx": dnsx}, _policy())
+
+    group = scan.groups[0]
+    assert dnsx.launch_calls, "burst should trigger a scale-up"
+    assert all(count <= 3 for count in dnsx.launch_calls)
+    assert group.tasks == dnsx.tasks <= 10
+    assert group.added_tasks == sum(dnsx.launch_calls)
+    assert group.done
+
+    scale_ups = [i for i, d in enumerate(scan.decisions) if d["action"] == "scale_up"]
+    # Samples are 15s apart and the cooldown is 30s
+    assert all(b - a >= 2 for a, b in zip(scale_ups, scale_ups[1:]))
+
+    # Once the burst passes, the extra tasks drain rather than being stopped
+    assert any(d["action"] == "drain" for d in scan.decisions[scale_ups[-1]:])
+    assert scan.summary()["tasks_added"] == group.added_tasks
+
+
+@pytest.mark.asyncio
+async def test_steady_stream_within_capacity_does_not_scale():
+    dnsx = SimulatedGroup(STEADY_CURVE, per_task_rate=40, tasks=2)
+    _, scan = await _replay({"dnsx": dnsx}, _policy())
+
+    assert dnsx.launch_calls == []
+    assert scan.groups[0].tasks == 2 and scan.groups[0].done
+
+
+@pytest.mark.asyncio
+async def test_per_scan_and_global_caps():
+    groups = {
+        "dnsx": SimulatedGroup(BURST_CURVE, per_task_rate=20, tasks=2),
+        "httpx": SimulatedGroup(BURST_CURVE, per_task_rate=10, tasks=2),
+    }
+    _, scan = await _replay(groups, _policy(max_tasks_per_scan=9, cooldown_seconds=0))
+    assert scan.total_tasks == 9
+
+    groups = {"dnsx": SimulatedGroup(BURST_CURVE, per_task_rate=20, tasks=1)}
+    autoscaler, scan = await _replay(groups, _policy(global_max_extra_tasks=2, cooldown_seconds=0))
+    assert scan.groups[0].added_tasks == 2
+    assert autoscaler.extra_tasks == 2
+
+
+@pytest.mark.asyncio
+async def test_run_releases_global_capacity():
+    dnsx = SimulatedGroup(BURST_CURVE, per_task_rate=40, tasks=1)
+    clock = {"now": 0.0}
+
+    async def sampler(stream_key, group_name):
+        clock["now"] += INTERVAL
+        dnsx.advance()
+        return dnsx.sample()
+
+    autoscaler = ConsumerAutoscaler(policy=_policy(), sampler=sampler, clock=lambda: clock["now"])
+    scan = ScanScaling(scan_id="scan-1", groups=[
+        ScalableGroup(module="dnsx", stream_key="s", group_name="g", launch=dnsx.launch, tasks=1, min_tasks=1)
+    ])
+
+    summary = await autoscaler.run(scan, interval=0)
+    assert summary["tasks_added"] > 0
+    assert summary["groups"]["g"]["tasks"] == dnsx.tasks
+    assert autoscaler.extra_tasks == 0
+
+
+@pytest.mark.asyncio
+async def test_stream_coordinator_group_backlog():
+    from app.services.stream_coordinator import StreamCoordinator
+
+    class FakeRedis:
+        async def xinfo_stream(self, key):
+            return {"length": 120, "entries-added": 150, "last-entry": ("150-0", {"type": "completion"})}
+
+        async def xinfo_groups(self, key):
+            return [{"name": "dnsx-consumers", "entries-read": 100, "lag": 50, "pending": 7, "consumers": 3}]
+
+    coordinator = StreamCoordinator()
+
+    async def get_redis():
+        return FakeRedis()
+
+    coordinator.get_redis = get_redis
+    sample = await coordinator.get_group_backlog("scan:1:subfinder", "dnsx-consumers")
+    assert sample == {
+        "length": 120, "entries_added": 150, "entries_read": 100,
+        "lag": 50, "pending": 7, "consumers": 3, "completed": True,
+    }
+    assert await coordinator.get_group_backlog("scan:1:subfinder", "other") is None
@@ -0,0 +1,233 @@
+"""
+Tests for the shared consumer fleet and fan-in router.
+"""
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.schemas.batch import BatchScanJob
+from app.services.consumer_fleet import FanInRouter, FleetMember, SharedConsumerFleet, shared_modules
+
+
+class FakeFanInRedis:
+    """In-memory stand-in for the consumer-group stream commands the router uses."""
+
+    def __init__(self):
+        self.streams = {}  # key -> [(id, fields)]
+        self.delivered = {}  # (key, group) -> index of next undelivered entry
+        self.acked = []
+
+    def add(self, key, fields):
+        entries = self.streams.setdefault(key, [])
+        entries.append((f"{len(entries) + 1}-0", dict(fields)))
+
+    async def xgroup_create(self, key, group, id="0", mkstream=False):
+        if (key, group) in self.delivered:
+            raise Exception("BUSYGROUP Consumer Group name already exists")
+        self.streams.setdefault(key, [])
+        self.delivered[(key, group)] = 0
+
+    async def xreadgroup(self, group, consumer, streams, count=None, block=None):
+        response = []
+        for key in streams:
+            start = self.delivered[(key, group)]
+            entries = self.streams[key][start:start + count]
+            self.delivered[(key, group)] = start + len(entries)
+            if entries:
+                response.append([key, entries])
+        if not response:
+            await asyncio.sleep(0)
+        return response
+
+    async def xadd(self, key, fields):
+        self.add(key, fields)
+
+    async def xack(self, key, group, *ids):
+        self.acked.extend((key, entry_id) for entry_id in ids)
+
+
+def _subdomains(fake, key, asset_id, count):
+    for i in range(count):
+        fake.add(key, {"subdomain": f"h{i}.{asset_id}.com", "asset_id": asset_id, "scan_job_id": f"job-{asset_id}"})
+
+
+def _job(job_id, module="dnsx"):
+    return BatchScanJob(
+        id=f"00000000-0000-0000-0000-{job_id:012d}", user_id="00000000-0000-0000-0000-0000000000b1",
+        module=module, created_at="2026-01-16T00:00:00Z"
+    )
+
+
+def test_shared_modules():
+    assert shared_modules(["subfinder", "dnsx", "httpx"]) == ["dnsx", "httpx"]
+    assert shared_modules(["subfinder", "httpx"]) == ["dnsx", "httpx"]
+    assert shared_modules(["subfinder", "httpx", "katana", "url-resolver"]) == ["dnsx"]
+    assert shared_modules(["waymore", "url-resolver"]) == []
+
+
+@pytest.mark.asyncio
+async def test_router_fans_in_and_completes_once():
+    fake = FakeFanInRedis()
+
+    async def get_redis():
+        return fake
+
+    router = FanInRouter("scan:fleet-1:subfinder:output", "subfinder", "fleet-1", get_redis=get_redis)
+    for asset in ("a", "b"):
+        await router.add_source(f"scan:{asset}:subfinder:output")
+    _subdomains(fake, "scan:a:subfinder:output", "a", 3)
+    _subdomains(fake, "scan:b:subfinder:output", "b", 2)
+    fake.add("scan:a:subfinder:output", {"type": "completion", "module": "subfinder"})
+
+    run = asyncio.create_task(router.run())
+    await asyncio.sleep(0.05)
+
+    # Asset a is done, b still streaming and c may still join: no marker yet
+    output = fake.streams["scan:fleet-1:subfinder:output"]
+    assert len(output) == 5 and not router.completed
+    assert {fields["asset_id"] for _, fields in output} == {"a", "b"}
+    assert output[0][1]["source_stream"] == "scan:a:subfinder:output"
+
+    await router.add_source("scan:c:subfinder:output")
+    router.seal()
+    _subdomains(fake, "scan:c:subfinder:output", "c", 4)
+    for asset in ("b", "c"):
+        fake.add(f"scan:{asset}:subfinder:output", {"type": "completion", "module": "subfinder"})
+    await asyncio.wait_for(run, timeout=1)
+
+    markers = [fields for _, fields in output if fields.get("type") == "completion"]
+    assert markers == [{**markers[0], "total_results": 9, "scan_job_id": "fleet-1"}]
+    assert output[-1][1]["type"] == "completion" and len(output) == 10
+    # Every source entry is acknowledged, so the asset streams can be trimmed
+    assert len(fake.acked) == 12
+
+
+@pytest.mark.asyncio
+async def test_fleet_completes_when_a_producer_dies_without_marker():
+    fake = FakeFanInRedis()
+
+    async def get_redis():
+        return fake
+
+    fleet = SharedConsumerFleet(scan_id="scan-2", modules=["dnsx"], expected_assets=2)
+    fleet.router.get_redis = get_redis
+    for asset in ("a", "b"):
+        key = f"scan:{asset}:subfinder:output"
+        await fleet.router.add_source(key)
+        fleet.members[asset] = FleetMember(asset, key, {"dnsx": _job(1)})
+    fleet.router.seal()
+    _subdomains(fake, "scan:a:subfinder:output", "a", 2)
+    fake.add("scan:a:subfinder:output", {"type": "completion", "module": "subfinder"})
+    # b's producer crashed mid-enumeration: its entries arrive, its marker never does
+    _subdomains(fake, "scan:b:subfinder:output", "b", 3)
+
+    run = asyncio.create_task(fleet.router.run())
+    await asyncio.sleep(0.05)
+    assert not run.done() and not fleet.router.completed
+
+    fleet.producer_finished("b")
+    fleet.producer_finished("unknown")  # not a member: ignored
+    await asyncio.wait_for(run, timeout=1)
+
+    output = fake.streams["scan:fleet-scan-2:subfinder:output"]
+    assert [fields["total_results"] for _, fields in output if fields.get("type") == "completion"] == [5]
+    assert fleet.router.sources["scan:b:subfinder:output"]["completed_after"] is not None
+
+
+@pytest.mark.asyncio
+async def test_router_drains_a_finished_source_before_closing_it():
+    fake = FakeFanInRedis()
+
+    async def get_redis():
+        return fake
+
+    router = FanInRouter("scan:fleet-3:subfinder:output", "subfinder", "fleet-3", get_redis=get_redis, batch_size=2)
+    await router.add_source("scan:a:subfinder:output")
+    router.seal()
+    _subdomains(fake, "scan:a:subfinder:output", "a", 5)
+    # Job status can turn terminal before the router read the last entries
+    router.producer_finished("scan:a:subfinder:output")
+
+    await asyncio.wait_for(router.run(), timeout=1)
+
+    output = fake.streams["scan:fleet-3:subfinder:output"]
+    assert len(output) == 6 and output[-1][1]["total_results"] == 5
+
+
+@pytest.mark.asyncio
+async def test_fleet_launches_once_and_mirrors_status(monkeypatch, mock_postgrest):
+    from app.services.batch_monitoring import batch_monitoring
+    from app.services.batch_workflow_orchestrator import batch_workflow_orchestrator
+    from app.services.scan_pipeline import scan_pipeline
+    from app.services.stream_coordinator import stream_coordinator
+
+    fake = FakeFanInRedis()
+
+    async def get_redis():
+        return fake
+
+    launched = []
+
+    async def launch_streaming_consumer(consumer_job, stream_key, consumer_group_name, consumer_name, context=None, **kwargs):
+        launched.append((str(consumer_job.id), stream_key, consumer_name))
+        return {"task_arn": f"arn:task/{consumer_name}"}
+
+    async def wait_for_jobs(job_ids, timeout, check_interval):
+        await finished.wait()
+        return {"module_statuses": {"dnsx": "completed"}}
+
+    async def govern(*args, **kwargs):
+        await asyncio.Event().wait()
+
+    async def expire(*args, **kwargs):
+        return 0
+
+    recorded = []
+
+    async def record(fleet_id, metrics):
+        recorded.append(metrics)
+
+    finished = asyncio.Event()
+    monkeypatch.setattr(settings, "consumer_autoscaling_enabled", False)
+    monkeypatch.setattr(settings, "consumer_fleet_assets_per_task", 2)
+    monkeypatch.setattr(batch_workflow_orchestrator, "launch_streaming_consumer", launch_streaming_consumer)
+    monkeypatch.setattr(scan_pipeline, "_wait_for_jobs_completion", wait_for_jobs)
+    monkeypatch.setattr(stream_coordinator, "get_redis", get_redis)
+    monkeypatch.setattr(stream_coordinator, "govern_scan_streams", govern)
+    monkeypatch.setattr(stream_coordinator, "expire_scan_streams", expire)
+    monkeypatch.setattr(batch_monitoring, "record_fleet_comparison", record)
+
+    updates = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        updates.append((request.method, str(request.url), json.loads(request.content)))
+        return httpx.Response(200, content="[]")
+
+    fleet = SharedConsumerFleet(scan_id="scan-1", modules=["dnsx"], expected_assets=3)
+    fleet.supabase = mock_postgrest(handler).async_service_client
+    fleet.router.get_redis = get_redis
+    assert fleet.initial_tasks == 2
+
+    first = await fleet.join("a", "scan:a:subfinder:output", {"dnsx": _job(1)})
+    await fleet.join("b", "scan:b:subfinder:output", {"dnsx": _job(2)})
+    fleet.withdraw("c")
+    fleet.withdraw("a")  # already joined: ignored
+
+    # Two shared tasks, launched once, under asset a's job, on the fleet stream
+    assert first == {"dnsx": ["arn:task/dnsx-fleet-scan-1-1", "arn:task/dnsx-fleet-scan-1-2"]}
+    assert {(job_id, key) for job_id, key, _ in launched} == {(str(_job(1).id), "scan:fleet-scan-1:subfinder:output")}
+    assert fleet.router.sealed
+
+    finished.set()
+    await asyncio.sleep(0.05)
+    [(method, url, body)] = updates
+    assert method == "PATCH" and str(_job(2).id) in url and str(_job(1).id) not in url
+    assert body["status"] == "completed"
+
+    summary = await fleet.close()
+    assert summary["shared_tasks"] == 2 and summary["per_asset_tasks"] == 2
+    [metrics] = recorded
+    assert metrics.fleet_id == "fleet-scan-1" and metrics.assets == 2
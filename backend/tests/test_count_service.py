@@ -0,0 +1,99 @@
+"""
+Tests for planned/exact/no-count modes in the count service.
+"""
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.count_service import CountMode, CountService
+
+
+class _CountQuery:
+    """Stand-in for a `count="exact", head=True` PostgREST query."""
+
+    def __init__(self, count: int, calls: list):
+        self.count = count
+        self.calls = calls
+
+    async def execute(self):
+        self.calls.append(self.count)
+        await asyncio.sleep(0)
+        return SimpleNamespace(count=self.count, data=[])
+
+
+def test_signature_ignores_none_and_key_order():
+    a = CountService.signature("urls", {"asset_id": "x", "is_alive": True, "search": None})
+    b = CountService.signature("urls", {"is_alive": True, "asset_id": "x"})
+
+    assert a == b
+    assert a != CountService.signature("urls", {"asset_id": "y", "is_alive": True})
+    assert a != CountService.signature("http_probes", {"asset_id": "x", "is_alive": True})
+
+
+@pytest.mark.asyncio
+async def test_planned_returns_estimate_then_cached_exact():
+    service = CountService(ttl_seconds=60, max_entries=10)
+    sig = service.signature("urls", {"asset_id": "a"})
+    calls = []
+
+    assert service.count_method(CountMode.PLANNED, sig) == "planned"
+    total, is_exact = service.resolve(CountMode.PLANNED, sig, 1_200_000, lambda: _CountQuery(1_187_342, calls))
+    assert (total, is_exact) == (1_200_000, False)
+
+    await asyncio.gather(*service._inflight.values())
+
+    # Next request needs no count at all and reports the exact total
+    assert service.count_method(CountMode.PLANNED, sig) is None
+    assert service.resolve(CountMode.PLANNED, sig, None, lambda: _CountQuery(0, calls)) == (1_187_342, True)
+    assert calls == [1_187_342]
+
+
+@pytest.mark.asyncio
+async def test_one_background_count_per_signature():
+    service = CountService(ttl_seconds=60, max_entries=10)
+    sig = service.signature("dns_records", {"record_type": "A"})
+    calls = []
+
+    for _ in range(5):
+        service.resolve(CountMode.PLANNED, sig, 10, lambda: _CountQuery(12, calls))
+    await asyncio.gather(*service._inflight.values())
+
+    assert calls == [12]
+    assert service._inflight == {}
+
+
+def test_exact_and_none_modes():
+    service = CountService(ttl_seconds=60, max_entries=10)
+    sig = service.signature("http_probes", {"status_code": 200})
+
+    assert service.count_method(CountMode.EXACT, sig) == "exact"
+    assert service.resolve(CountMode.EXACT, sig, 42) == (42, True)
+
+    assert service.count_method(CountMode.NONE, sig) is None
+    # A cached exact count is free, so "none" still reports it
+    assert service.resolve(CountMode.NONE, sig, None) == (42, True)
+    assert service.resolve(CountMode.NONE, service.signature("x", {}), None) == (None, False)
+
+
+def test_cursor_pages_never_count():
+    service = CountService(ttl_seconds=60, max_entries=10)
+    sig = service.signature("urls", {})
+
+    assert service.count_method(CountMode.EXACT, sig, cursor="abc") is None
+    assert service.resolve(CountMode.EXACT, sig, None, None, cursor="abc") == (None, False)
+
+
+def test_cache_ttl_and_eviction():
+    expired = CountService(ttl_seconds=-1, max_entries=2)
+    expired.store("a", 1)
+    assert expired.get_cached("a") is None
+
+    service = CountService(ttl_seconds=60, max_entries=2)
+    service.store("a", 1)
+    service.store("b", 2)
+    service.store("c", 3)
+
+    assert service.get_cached("a") is None
+    assert service.get_cached("b") == 2
+    assert service.get_cached("c") == 3
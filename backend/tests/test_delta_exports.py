@@ -0,0 +1,171 @@
+"""
+Tests for watermark-based delta exports.
+"""
+import json
+import re
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.v1 import exports, http_probes
+from app.core.dependencies import get_current_user
+from app.schemas.auth import UserResponse
+from app.services.export_engine import EXPORT_SPECS, ExportEngine
+from app.utils.pagination import (
+    InvalidWatermarkError,
+    decode_watermark,
+    delta_page,
+    encode_watermark,
+)
+
+_TIE = re.compile(r'and\((\w+)\.eq\."([^"]+)",id\.gt\."([^"]+)"\)')
+
+
+def _ts(second: int) -> str:
+    return f"2026-01-01T00:{second // 60:02d}:{second % 60:02d}+00:00"
+
+
+def _url(i: int, second: int) -> dict:
+    return {"id": f"{i:05d}", "url": f"https://example.com/{i}", "updated_at": _ts(second)}
+
+
+def _table_handler(rows, column, requests):
+    """Mock PostgREST table applying the delta predicates used by apply_delta."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        params = request.url.params
+        requests.append(params)
+        selected = list(rows)
+        for condition in params.get_list(column):
+            op, value = condition.split(".", 1)
+            if op == "gt":
+                selected = [r for r in selected if r[column] > value]
+            elif op == "lte":
+                selected = [r for r in selected if r[column] <= value]
+        tie = _TIE.search(params.get("or", ""))
+        if tie:
+            _, ts, last_id = tie.groups()
+            selected = [r for r in selected if r[column] > ts or (r[column] == ts and r["id"] > last_id)]
+        selected.sort(key=lambda r: (r[column], r["id"]))
+        return httpx.Response(200, content=json.dumps(selected[:int(params["limit"])]))
+
+    return handler
+
+
+def _engine(mock_postgrest, rows, requests):
+    engine = ExportEngine(batch_size=4, min_batch_size=4, max_batch_size=4, target_batch_bytes=1)
+    engine.supabase = mock_postgrest(_table_handler(rows, "updated_at", requests)).async_service_client
+    return engine
+
+
+async def _sync(engine, since, until):
+    seen = []
+    async for batch in engine.iter_batches(EXPORT_SPECS["urls"], [], since=since, until=until):
+        seen.extend(batch)
+    return seen
+
+
+def test_watermark_round_trip_and_validation():
+    token = encode_watermark("2026-01-01T00:00:05.250000+00:00", "00042")
+    assert decode_watermark(token) == ("2026-01-01T00:00:05.250000+00:00", "00042")
+    assert decode_watermark(encode_watermark(_ts(3))) == (_ts(3), None)
+    # Plain timestamps start a first sync
+    assert decode_watermark("2026-01-01T00:00:00Z") == ("2026-01-01T00:00:00+00:00", None)
+    assert decode_watermark("2026-01-01T00:00:00") == ("2026-01-01T00:00:00+00:00", None)
+
+    with pytest.raises(InvalidWatermarkError):
+        decode_watermark("not-a-watermark")
+    with pytest.raises(ValueError):
+        decode_watermark(encode_watermark("yesterday"))
+
+
+def test_delta_page_high_water_mark():
+    rows = [_url(i, i) for i in range(5)]
+
+    page, watermark, has_more = delta_page(rows, "updated_at", 4, _ts(30))
+    assert len(page) == 4 and has_more is True
+    # A full page hands back its last row; the next page resumes right after it
+    assert decode_watermark(watermark) == (_ts(3), "00003")
+
+    page, watermark, has_more = delta_page(rows[:2], "updated_at", 4, _ts(30))
+    assert has_more is False
+    # A drained window hands back its upper bound
+    assert decode_watermark(watermark) == (_ts(30), None)
+
+
+@pytest.mark.asyncio
+async def test_delta_export_walks_window_oldest_first(mock_postgrest):
+    # Six rows share second 10, so a batch boundary falls inside the tie
+    rows = [_url(i, 5) for i in range(3)] + [_url(i, 10) for i in range(3, 9)] + [_url(i, 50) for i in range(9, 11)]
+    requests = []
+    engine = _engine(mock_postgrest, rows, requests)
+
+    seen = await _sync(engine, since=encode_watermark(_ts(5)), until=_ts(40))
+
+    assert [r["url"] for r in seen] == [f"https://example.com/{i}" for i in range(3, 9)]
+    assert set(seen[0]) == {"url"}
+    assert all(p["order"] == "updated_at.asc,id.asc" for p in requests)
+    assert all("offset" not in p for p in requests)
+
+
+@pytest.mark.asyncio
+async def test_chained_syncs_see_each_change_once(mock_postgrest):
+    rows = [_url(i, i) for i in range(10)]
+    engine = _engine(mock_postgrest, rows, [])
+
+    first = await _sync(engine, since="2025-12-31T00:00:00Z", until=_ts(7))
+    # A row stamped inside the settle lag of the first sync, plus newer changes
+    rows.extend([_url(100, 8), _url(101, 20)])
+    second = await _sync(engine, since=encode_watermark(_ts(7)), until=_ts(30))
+
+    first_urls = {r["url"] for r in first}
+    second_urls = {r["url"] for r in second}
+    assert len(first) == 8 and len(second) == 4
+    assert not first_urls & second_urls
+    assert first_urls | second_urls == {r["url"] for r in rows}
+
+
+def _app(router, prefix):
+    app = FastAPI()
+    app.include_router(router, prefix=prefix)
+    app.dependency_overrides[get_current_user] = lambda: UserResponse(id="u1", email="u@example.com", created_at="now")
+    return TestClient(app)
+
+
+def test_export_endpoint_returns_next_watermark(monkeypatch, mock_postgrest):
+    rows = [
+        {"id": f"{i:05d}", "subdomain": f"s{i}.example.com", "parent_domain": "example.com", "discovered_at": _ts(i)}
+        for i in range(6)
+    ]
+    engine = ExportEngine(batch_size=100)
+    engine.supabase = mock_postgrest(_table_handler(rows, "discovered_at", [])).async_service_client
+    monkeypatch.setattr(exports, "export_engine", engine)
+    api = _app(exports.router, "/exports")
+
+    response = api.get("/exports/subdomains", params={"format": "ndjson", "since": encode_watermark(_ts(3))})
+
+    assert response.status_code == 200
+    assert [json.loads(line)["subdomain"] for line in response.text.splitlines()] == ["s4.example.com", "s5.example.com"]
+    watermark, last_id = decode_watermark(response.headers["x-next-watermark"])
+    assert last_id is None and watermark > _ts(5)
+
+    assert api.get("/exports/subdomains", params={"since": "garbage"}).status_code == 400
+
+
+def test_list_endpoint_pages_through_delta(monkeypatch, mock_postgrest):
+    rows = [{"id": f"{i:05d}", "url": f"https://example.com/{i}", "created_at": _ts(i)} for i in range(5)]
+    requests = []
+    monkeypatch.setattr(http_probes, "supabase_client", mock_postgrest(_table_handler(rows, "created_at", requests)))
+    api = _app(http_probes.router, "/http-probes")
+
+    first = api.get("/http-probes", params={"since": "2026-01-01T00:00:00Z", "limit": 3}).json()
+    second = api.get("/http-probes", params={"since": first["next_watermark"], "limit": 3}).json()
+
+    assert [p["url"] for p in first["probes"]] == [f"https://example.com/{i}" for i in (1, 2, 3)]
+    assert first["has_more"] is True and first["next_cursor"] is None
+    assert [p["url"] for p in second["probes"]] == ["https://example.com/4"]
+    assert second["has_more"] is False and second["total"] is None
+
+    assert api.get("/http-probes", params={"since": "garbage"}).status_code == 400
@@ -0,0 +1,103 @@
+"""
+Tests for apex domain normalization and bulk ingestion.
+"""
+import json
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from app.services import domain_ingestion as ingestion_module
+from app.services.domain_ingestion import DomainIngestionService
+from app.services.result_cache import ResultCache
+from app.utils.domains import chunked, ingest_domains, normalize_domains
+from tests.helpers import ASSET_ID
+
+
+def test_normalize_domains_single_pass():
+    result = normalize_domains([
+        " *.Example.COM. ", "example.com", "api.example.com", "", "bad_domain.com", "-x.io", "API.example.com"
+    ])
+
+    assert result.valid == ["example.com", "api.example.com"]
+    assert result.invalid == ["bad_domain.com", "-x.io"]
+    assert result.duplicates == 2
+
+
+def test_chunked_preserves_order(mock_postgrest):
+    assert list(chunked(["a", "b", "c", "d", "e"], 2)) == [["a", "b"], ["c", "d"], ["e"]]
+
+
+def _service(mock_postgrest, monkeypatch, existing, chunk_size):
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content)
+        requests.append(body)
+        new = [d for d in body["p_domains"] if d not in existing]
+        existing.update(new)
+        result = {"submitted": len(body["p_domains"]), "inserted": len(new),
+                  "skipped": len(body["p_domains"]) - len(new), "invalid": 0}
+        return httpx.Response(200, content=json.dumps(result))
+
+    monkeypatch.setattr(ingestion_module, "result_cache", ResultCache(enabled=False))
+
+    service = DomainIngestionService(chunk_size=chunk_size)
+    service.supabase = mock_postgrest(handler).async_service_client
+    return service, requests
+
+
+@pytest.mark.asyncio
+async def test_ingest_chunks_and_counts(monkeypatch, mock_postgrest):
+    existing = {"example.com"}
+    service, requests = _service(mock_postgrest, monkeypatch, existing, chunk_size=2)
+
+    result = await service.ingest(ASSET_ID, ["Example.com", "a.example.com", "*.b.example.com", "a.example.com", "c.example.com", "bad_one.com"])
+
+    assert [r["p_domains"] for r in requests] == [["example.com", "a.example.com"], ["b.example.com", "c.example.com"]]
+    assert all(r["p_asset_id"] == ASSET_ID for r in requests)
+    assert result == {
+        "submitted": 6,
+        "inserted": 3,
+        "skipped": 2,
+        "invalid": 1,
+        "invalid_domains": ["bad_one.com"],
+    }
+
+
+@pytest.mark.asyncio
+async def test_ingest_without_valid_domains_makes_no_calls(monkeypatch, mock_postgrest):
+    service, requests = _service(mock_postgrest, monkeypatch, set(), chunk_size=1000)
+
+    result = await service.ingest(ASSET_ID, ["", "not a domain"])
+
+    assert requests == []
+    assert result["inserted"] == 0
+    assert result["invalid"] == 1
+
+
+class _SyncClient:
+    """Stand-in for the sync supabase client the CLI and orchestrator use."""
+
+    def __init__(self, result):
+        self.result = result
+        self.calls = []
+
+    def rpc(self, name, params):
+        self.calls.append((name, params))
+        return self
+
+    def execute(self):
+        return SimpleNamespace(data=self.result)
+
+
+@pytest.mark.asyncio
+async def test_ingest_domains_accepts_sync_client():
+    client = _SyncClient({"inserted": 0, "skipped": 1, "invalid": 1})
+
+    result = await ingest_domains(client, ASSET_ID, ["example.com", "bad_one.com", "x--.io"])
+
+    assert client.calls == [("bulk_insert_apex_domains", {"p_asset_id": ASSET_ID, "p_domains": ["example.com"]})]
+    assert result["inserted"] == 0
+    assert result["skipped"] == 1
+    assert result["invalid"] == 3
@@ -0,0 +1,83 @@
+"""
+Tests for export batch encoders (CSV, JSON, NDJSON, gzip, Parquet).
+"""
+import csv
+import gzip
+import io
+import json
+import zlib
+
+import pytest
+
+from app.services.export_encoders import EXPORT_FORMATS, ExportEncoder, create_encoder
+
+COLUMNS = ["url", "status_code", "is_alive", "title"]
+
+
+def _rows(start: int, count: int) -> list:
+    return [
+        {"url": f"https://s{i}.example.com/a?b=1", "status_code": 200 if i % 2 else None,
+         "is_alive": i % 3 == 0, "title": f'Title "{i}", with comma'}
+        for i in range(start, start + count)
+    ]
+
+
+def _encode(export_format: str, batches) -> list:
+    encoder = create_encoder(export_format, COLUMNS)
+    return [encoder.header()] + [encoder.encode_batch(batch) for batch in batches] + [encoder.finish()]
+
+
+BATCHES = [_rows(0, 3), _rows(3, 4), []]
+ALL_ROWS = _rows(0, 7)
+
+
+def test_csv_round_trip():
+    text = b"".join(_encode("csv", BATCHES)).decode()
+    parsed = list(csv.DictReader(io.StringIO(text)))
+
+    assert [r["url"] for r in parsed] == [r["url"] for r in ALL_ROWS]
+    assert parsed[0]["title"] == 'Title "0", with comma'
+    assert parsed[0]["status_code"] == ""
+
+
+def test_json_array_and_ndjson_round_trip():
+    assert json.loads(b"".join(_encode("json", BATCHES))) == ALL_ROWS
+
+    lines = b"".join(_encode("ndjson", BATCHES)).decode().splitlines()
+    assert [json.loads(line) for line in lines] == ALL_ROWS
+
+
+@pytest.mark.parametrize("export_format,plain", [("csv.gz", "csv"), ("ndjson.gz", "ndjson")])
+def test_gzip_formats_stream_one_member(export_format, plain):
+    chunks = _encode(export_format, BATCHES)
+
+    assert gzip.decompress(b"".join(chunks)) == b"".join(_encode(plain, BATCHES))
+
+    # Each batch is flushed, so a client can decode it before the export finishes
+    decompressor = zlib.decompressobj(31)
+    partial = decompressor.decompress(b"".join(chunks[:2]))
+    assert ALL_ROWS[2]["url"].encode() in partial
+
+
+def test_parquet_record_batches():
+    pq = pytest.importorskip("pyarrow.parquet")
+
+    table = pq.read_table(io.BytesIO(b"".join(_encode("parquet", BATCHES))))
+
+    assert table.num_rows == 7
+    assert str(table.schema.field("status_code").type) == "int32"
+    assert table.column("url").to_pylist() == [r["url"] for r in ALL_ROWS]
+
+
+def test_unknown_format_rejected():
+    assert "parquet" in EXPORT_FORMATS
+    with pytest.raises(ValueError):
+        create_encoder("xml", COLUMNS)
+
+
+def test_encoder_without_encode_batch_cannot_be_created():
+    class _Incomplete(ExportEncoder):
+        pass
+
+    with pytest.raises(TypeError):
+        _Incomplete(COLUMNS)
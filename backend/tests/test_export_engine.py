@@ -0,0 +1,107 @@
+"""
+Tests for the keyset export engine.
+"""
+import asyncio
+import json
+import re
+
+import httpx
+import pytest
+
+from app.api.v1 import exports
+from app.services.export_encoders import create_encoder
+from app.services.export_engine import EXPORT_SPECS, ExportEngine
+
+_CURSOR_ID = re.compile(r'id\.lt\."(\d+)"')
+
+
+def _row(i: int) -> dict:
+    return {
+        "id": f"{i:07d}", "subdomain": f"s{i}.example.com", "parent_domain": "example.com",
+        "discovered_at": f"2026-01-01T00:{i // 60 % 60:02d}:{i % 60:02d}",
+    }
+
+
+def _engine(mock_postgrest, rows, requests, **kwargs):
+    """ExportEngine over a mock PostgREST table ordered (discovered_at DESC, id DESC)."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        params = request.url.params
+        requests.append(params)
+        ordered = sorted(rows, key=lambda r: r["id"], reverse=True)
+        match = _CURSOR_ID.search(params.get("or", ""))
+        if match:
+            ordered = [r for r in ordered if r["id"] < match.group(1)]
+        page = ordered[:int(params["limit"])]
+        return httpx.Response(200, content=json.dumps(page))
+
+    options = dict(batch_size=100, min_batch_size=10, max_batch_size=1000, target_batch_bytes=10_000_000)
+    options.update(kwargs)
+    engine = ExportEngine(**options)
+    engine.supabase = mock_postgrest(handler).async_service_client
+    return engine
+
+
+@pytest.mark.asyncio
+async def test_keyset_export_yields_each_row_once_despite_inserts(mock_postgrest):
+    rows = [_row(i) for i in range(1000, 1350)]
+    requests = []
+    engine = _engine(mock_postgrest, rows, requests, max_batch_size=100)
+
+    seen = []
+    async for batch in engine.iter_batches(EXPORT_SPECS["subdomains"], [("eq", "asset_id", "a1")]):
+        seen.extend(batch)
+        # Newer rows arriving mid-export sort before the cursor
+        rows.append(_row(5000 + len(seen)))
+
+    assert len(seen) == 350
+    assert len({r["subdomain"] for r in seen}) == 350
+    assert set(seen[0]) == {"subdomain", "parent_domain", "discovered_at"}
+    assert all("offset" not in p for p in requests)
+    assert all(p["asset_id"] == "eq.a1" for p in requests)
+    assert "or" not in requests[0] and all("or" in p for p in requests[1:])
+
+
+@pytest.mark.asyncio
+async def test_next_batch_is_prefetched_while_consuming(mock_postgrest):
+    requests = []
+    engine = _engine(mock_postgrest, [_row(i) for i in range(1000, 1250)], requests, max_batch_size=100)
+
+    batches = engine.iter_batches(EXPORT_SPECS["subdomains"])
+    await batches.__anext__()
+    await asyncio.sleep(0.01)
+
+    # The second batch was requested before the consumer asked for it
+    assert len(requests) == 2
+
+    await batches.aclose()
+
+
+def test_batch_size_adapts_to_row_width():
+    engine = ExportEngine(batch_size=1000, min_batch_size=50, max_batch_size=5000, target_batch_bytes=1_000_000)
+
+    narrow = engine.next_batch_size([{"subdomain": "a.example.com"}] * 10)
+    wide = engine.next_batch_size([{"title": "x" * 5000}] * 10)
+    huge = engine.next_batch_size([{"title": "x" * 1_000_000}] * 10)
+
+    assert narrow == 5000
+    assert 50 < wide < 1000
+    assert huge == 50
+
+
+@pytest.mark.asyncio
+async def test_csv_and_json_output(monkeypatch, mock_postgrest):
+    requests = []
+    engine = _engine(mock_postgrest, [_row(i) for i in range(1000, 1025)], requests, batch_size=10, max_batch_size=10)
+    monkeypatch.setattr(exports, "export_engine", engine)
+    spec = EXPORT_SPECS["subdomains"]
+    filters = exports.subdomain_filters("a1")
+
+    csv_chunks = [c async for c in exports.stream_export(spec, filters, create_encoder("csv", spec.columns))]
+    json_chunks = [c async for c in exports.stream_export(spec, filters, create_encoder("json", spec.columns))]
+
+    lines = b"".join(csv_chunks).decode().strip().split("\r\n")
+    assert lines[0] == "subdomain,parent_domain,discovered_at"
+    assert len(lines) == 26
+    rows = json.loads(b"".join(json_chunks))
+    assert [r["subdomain"] for r in rows] == [f"s{i}.example.com" for i in range(1024, 999, -1)]
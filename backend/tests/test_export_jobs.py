@@ -0,0 +1,164 @@
+"""
+Tests for background export jobs and snapshot downloads.
+"""
+import asyncio
+import gzip
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.v1 import exports
+from app.core.dependencies import get_current_user
+from app.schemas.auth import UserResponse
+from app.services.export_jobs import ExportJobService
+
+FILTERS = [("eq", "asset_id", "a1")]
+
+
+class _FakeEngine:
+    def __init__(self, batches, delay=0.0):
+        self.batches = batches
+        self.delay = delay
+        self.runs = 0
+
+    async def iter_batches(self, spec, filters, since=None, until=None):
+        self.runs += 1
+        for batch in self.batches:
+            await asyncio.sleep(self.delay)
+            yield [dict(row) for row in batch]
+
+
+def _rows(start, count):
+    return [{"subdomain": f"s{i}.example.com", "parent_domain": "example.com",
+             "discovered_at": "2026-01-01T00:00:00"} for i in range(start, start + count)]
+
+
+def _service(tmp_path, engine, **kwargs):
+    return ExportJobService(storage_dir=str(tmp_path), snapshot_ttl_seconds=60, max_concurrent=2, engine=engine, **kwargs)
+
+
+async def _finish(service, job):
+    task = service._tasks.get(job["job_id"])
+    if task:
+        await task
+
+
+@pytest.mark.asyncio
+async def test_job_writes_snapshot_and_is_reused(tmp_path):
+    engine = _FakeEngine([_rows(0, 3), _rows(3, 2)])
+    service = _service(tmp_path, engine)
+
+    job, reused = await service.create_job("subdomains", "ndjson.gz", FILTERS, "user-1")
+    assert reused is False
+    again, reused_while_running = await service.create_job("subdomains", "ndjson.gz", list(reversed(FILTERS)), "user-2")
+    await _finish(service, job)
+
+    assert reused_while_running is True and again["job_id"] == job["job_id"]
+    assert job["status"] == "completed"
+    assert job["rows_written"] == 5
+    assert job["etag"].startswith('"')
+    path = service.snapshot_path(job)
+    assert job["bytes_written"] == path.stat().st_size
+    lines = gzip.decompress(path.read_bytes()).decode().splitlines()
+    assert [json.loads(line)["subdomain"] for line in lines] == [f"s{i}.example.com" for i in range(5)]
+
+    # Finished and fresh: reused without exporting again
+    cached, reused = await service.create_job("subdomains", "ndjson.gz", FILTERS)
+    other, other_reused = await service.create_job("subdomains", "csv", FILTERS)
+    await _finish(service, other)
+    assert reused is True and cached["job_id"] == job["job_id"]
+    assert other_reused is False
+    assert engine.runs == 2
+
+
+@pytest.mark.asyncio
+async def test_expired_snapshots_are_removed(tmp_path):
+    service = _service(tmp_path, _FakeEngine([_rows(0, 1)]))
+    job, _ = await service.create_job("subdomains", "csv", FILTERS)
+    await _finish(service, job)
+
+    job["expires_at"] = (datetime.now(timezone.utc) - timedelta(seconds=1)).isoformat()
+
+    assert service.cleanup_expired() == 1
+    assert not service.snapshot_path(job).exists()
+    assert service.get_job(job["job_id"]) is None
+
+
+@pytest.mark.asyncio
+async def test_snapshots_from_before_restart_expire(tmp_path):
+    service = _service(tmp_path, _FakeEngine([_rows(0, 1)]))
+    job, _ = await service.create_job("subdomains", "csv", FILTERS)
+    await _finish(service, job)
+    service._save(dict(job, expires_at=(datetime.now(timezone.utc) - timedelta(seconds=1)).isoformat()))
+
+    # A new process only knows the job from its metadata file
+    restarted = _service(tmp_path, _FakeEngine([_rows(0, 1)]))
+    other, _ = await restarted.create_job("dns", "csv", FILTERS)
+    await _finish(restarted, other)
+
+    assert not restarted.snapshot_path(job).exists()
+    assert restarted.get_job(job["job_id"]) is None
+    assert restarted.snapshot_path(other).exists()
+
+
+@pytest.mark.asyncio
+async def test_failed_and_orphaned_jobs(tmp_path):
+    class _Broken:
+        async def iter_batches(self, spec, filters, since=None, until=None):
+            raise RuntimeError("db down")
+            yield
+
+    service = _service(tmp_path, _Broken())
+    job, _ = await service.create_job("dns", "csv", FILTERS)
+    await _finish(service, job)
+    assert job["status"] == "failed" and "db down" in job["error"]
+    assert not list(tmp_path.glob("*.part"))
+
+    # A job left running by a previous process is reported as interrupted
+    running = dict(job, job_id="5f0c8f5e-8d43-4b7e-9a55-1c3a0f9e2b11", status="running", error=None)
+    service._save(running)
+    restarted = _service(tmp_path, _FakeEngine([]))
+    assert restarted.get_job(running["job_id"])["status"] == "failed"
+
+
+@pytest.mark.asyncio
+async def test_download_supports_etag_and_range(tmp_path, monkeypatch):
+    service = _service(tmp_path, _FakeEngine([_rows(0, 50)]))
+    job, _ = await service.create_job("subdomains", "csv", FILTERS)
+    await _finish(service, job)
+    monkeypatch.setattr(exports, "export_job_service", service)
+
+    app = FastAPI()
+    app.include_router(exports.router, prefix="/exports")
+    app.dependency_overrides[get_current_user] = lambda: UserResponse(id="u1", email="u@example.com", created_at="now")
+    client = TestClient(app)
+    url = f"/exports/jobs/{job['job_id']}/download"
+    content = service.snapshot_path(job).read_bytes()
+
+    full = client.get(url)
+    assert full.status_code == 200
+    assert full.content == content
+    assert full.headers["etag"] == job["etag"]
+    assert full.headers["accept-ranges"] == "bytes"
+
+    partial = client.get(url, headers={"Range": "bytes=10-19", "If-Range": job["etag"]})
+    assert partial.status_code == 206
+    assert partial.content == content[10:20]
+    assert partial.headers["content-range"] == f"bytes 10-19/{len(content)}"
+
+    resumed = client.get(url, headers={"Range": "bytes=100-"})
+    assert resumed.content == content[100:]
+
+    # Snapshot changed since the client's partial download: send it whole
+    stale = client.get(url, headers={"Range": "bytes=10-19", "If-Range": '"other"'})
+    assert stale.status_code == 200 and stale.content == content
+
+    assert client.get(url, headers={"If-None-Match": job["etag"]}).status_code == 304
+
+    status_response = client.get(f"/exports/jobs/{job['job_id']}").json()
+    assert status_response["status"] == "completed"
+    assert status_response["download_url"].endswith(url)
+    assert client.get("/exports/jobs/not-a-job").status_code == 404
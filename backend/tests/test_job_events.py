@@ -0,0 +1,115 @@
+"""
+Tests for job status events and event-driven pipeline completion.
+"""
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+
+from app.services import scan_pipeline as scan_pipeline_module
+from app.services.job_events import JobStatusEvents
+from app.services.scan_pipeline import ScanPipeline
+
+JOBS = {"job-1": "subfinder", "job-2": "dnsx"}
+
+
+def _change(job_id, status, old_status=None):
+    data = {"table": "batch_scan_jobs", "type": "UPDATE", "record": {"id": job_id, "module": JOBS.get(job_id), "status": status}}
+    if old_status is not None:
+        data["old_record"] = {"id": job_id, "status": old_status}
+    return {"data": data, "ids": [1]}
+
+
+def _pipeline(mock_postgrest, statuses, requests):
+    """ScanPipeline over a mock batch_scan_jobs table with the given statuses."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        rows = [{"id": job_id, "module": module, "status": statuses[job_id], "completed_at": None}
+                for job_id, module in JOBS.items()]
+        return httpx.Response(200, content=json.dumps(rows))
+
+    pipeline = ScanPipeline()
+    pipeline.supabase = mock_postgrest(handler).async_service_client
+    return pipeline
+
+
+async def _until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.asyncio
+async def test_changes_are_routed_to_watching_subscriptions():
+    events = JobStatusEvents(enabled=True, realtime_url="ws://localhost", api_key="x")
+
+    async with events.subscribe(["job-1"]) as first, events.subscribe(["job-1", "job-2"]) as both:
+        events.handle_change(_change("job-2", "completed"))
+        events.handle_change(_change("job-1", "running", old_status="running"))  # progress only
+        events.handle_change(_change("job-1", "failed"))
+
+        assert [c["status"] for c in await first.get(timeout=0.1)] == ["failed"]
+        assert [c["id"] for c in await both.get(timeout=0.1)] == ["job-2", "job-1"]
+        assert await first.get(timeout=0.01) == []
+
+        # Reconnect: anything may have been missed while the channel was down
+        events._on_state("SUBSCRIBED")
+        assert events.live is True
+        assert await first.get(timeout=0.1) is None
+
+    assert events._subscriptions == {}
+
+
+@pytest.mark.asyncio
+async def test_pipeline_completes_from_events_without_polling(monkeypatch, mock_postgrest):
+    events = JobStatusEvents(enabled=True, realtime_url="ws://localhost", api_key="x")
+    events.live = True
+    monkeypatch.setattr(scan_pipeline_module, "job_status_events", events)
+    statuses = {"job-1": "running", "job-2": "running"}
+    requests = []
+    pipeline = _pipeline(mock_postgrest, statuses, requests)
+
+    waiter = asyncio.create_task(pipeline._wait_for_jobs_completion(list(JOBS), timeout=30, check_interval=10))
+    await _until(lambda: requests and events._subscriptions)
+
+    events.handle_change(_change("job-1", "completed"))
+    await asyncio.sleep(0.05)
+    assert not waiter.done()
+
+    finished_at = time.monotonic()
+    events.handle_change(_change("job-2", "failed"))
+    result = await asyncio.wait_for(waiter, timeout=1)
+
+    assert time.monotonic() - finished_at < 1
+    assert result["status"] == "partial_failure"
+    assert result["module_statuses"] == {"subfinder": "completed", "dnsx": "failed"}
+    assert result["checks_performed"] == 1 and len(requests) == 1
+    assert result["events_received"] == 2
+
+
+@pytest.mark.asyncio
+async def test_pipeline_falls_back_to_polling_without_events(monkeypatch, mock_postgrest):
+    events = JobStatusEvents(enabled=False)
+    monkeypatch.setattr(scan_pipeline_module, "job_status_events", events)
+    statuses = {"job-1": "running", "job-2": "completed"}
+    requests = []
+    pipeline = _pipeline(mock_postgrest, statuses, requests)
+
+    waiter = asyncio.create_task(pipeline._wait_for_jobs_completion(list(JOBS), timeout=30, check_interval=0.05))
+    await _until(lambda: len(requests) >= 2)
+    statuses["job-1"] = "completed"
+    result = await asyncio.wait_for(waiter, timeout=1)
+
+    assert result["status"] == "completed"
+    assert result["checks_performed"] >= 3
+
+
+def test_poll_interval_is_slow_only_while_events_are_live():
+    events = JobStatusEvents(enabled=True, realtime_url="ws://localhost", api_key="x")
+    assert events.poll_interval(10) == 10
+    events.live = True
+    assert events.poll_interval(10) >= 60
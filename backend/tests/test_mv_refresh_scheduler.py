@@ -0,0 +1,114 @@
+"""
+Tests for coalesced materialized view refreshes.
+"""
+import asyncio
+import json
+import time
+
+import httpx
+import pytest
+
+from app.services import mv_refresh_scheduler as scheduler_module
+from app.services.mv_refresh_scheduler import MaterializedViewRefreshScheduler
+from app.services.result_cache import ResultCache
+
+
+def _scheduler(mock_postgrest, monkeypatch, calls, locked=(), status_rows=None, **kwargs):
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = json.loads(request.content or b"{}")
+        if request.url.path.endswith("/rpc/get_mv_refresh_status"):
+            return httpx.Response(200, content=json.dumps(status_rows or []))
+        group = body["p_group"]
+        calls.append(group)
+        if group in locked:
+            return httpx.Response(200, content=json.dumps({"view_group": group, "refreshed": False, "reason": "locked"}))
+        return httpx.Response(200, content=json.dumps({"view_group": group, "refreshed": True, "duration_ms": 12}))
+
+    monkeypatch.setattr(scheduler_module, "result_cache", ResultCache(enabled=False))
+
+    async def no_redis():
+        return None
+
+    options = dict(enabled=True, debounce_seconds=0, global_interval_seconds=600, redis_provider=no_redis)
+    options.update(kwargs)
+    scheduler = MaterializedViewRefreshScheduler(**options)
+    scheduler.supabase = mock_postgrest(handler).async_service_client
+    return scheduler
+
+
+@pytest.mark.asyncio
+async def test_burst_of_completions_refreshes_once(monkeypatch, mock_postgrest):
+    calls = []
+    scheduler = _scheduler(mock_postgrest, monkeypatch, calls)
+
+    for asset_id in ("a", "b", "c", "a"):
+        scheduler.notify_scan_completed(asset_id)
+    await scheduler._task
+
+    assert calls == ["lightweight", "dns", "url"]
+    assert scheduler.last_results["url"]["refreshed"] is True
+
+
+@pytest.mark.asyncio
+async def test_global_views_coalesced_per_interval(monkeypatch, mock_postgrest):
+    calls = []
+    scheduler = _scheduler(mock_postgrest, monkeypatch, calls, global_interval_seconds=0.05)
+
+    scheduler.notify_scan_completed("a")
+    await scheduler._task
+    assert calls == ["lightweight", "dns", "url"]
+
+    calls.clear()
+    started = time.monotonic()
+    scheduler.notify_scan_completed("b")
+    scheduler.notify_scan_completed("c")
+    await scheduler._task
+
+    # Asset views refresh right away; global views wait out the interval
+    assert calls == ["lightweight", "dns", "url"]
+    assert time.monotonic() - started >= 0.04
+    assert scheduler._global_dirty is False
+
+
+@pytest.mark.asyncio
+async def test_global_refresh_waits_for_interval(monkeypatch, mock_postgrest):
+    calls = []
+    scheduler = _scheduler(mock_postgrest, monkeypatch, calls, global_interval_seconds=600)
+    scheduler._last_global_refresh = time.monotonic()
+
+    scheduler.notify_scan_completed("a")
+    await asyncio.sleep(0.01)
+
+    assert calls == ["lightweight"]
+    status = await scheduler.get_status()
+    assert status["global_refresh_pending"] is True
+    assert 0 < status["next_global_refresh_in_seconds"] <= 600
+
+    await scheduler.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_locked_groups_are_skipped(monkeypatch, mock_postgrest):
+    calls = []
+    scheduler = _scheduler(mock_postgrest, monkeypatch, calls, locked=("dns",))
+
+    results = await scheduler.refresh_groups(scheduler.GLOBAL_GROUPS)
+
+    assert results["dns"]["refreshed"] is False
+    assert results["dns"]["reason"] == "locked"
+    assert results["url"]["refreshed"] is True
+
+
+@pytest.mark.asyncio
+async def test_status_reports_staleness(monkeypatch, mock_postgrest):
+    rows = [{"view_group": "url", "last_refreshed_at": "2026-01-16T10:00:00+00:00",
+             "last_duration_ms": 9000, "refresh_count": 4, "staleness_seconds": 120}]
+    scheduler = _scheduler(mock_postgrest, monkeypatch, [], status_rows=rows)
+
+    status = await scheduler.get_status()
+    groups = {g["view_group"]: g for g in status["view_groups"]}
+
+    assert groups["url"]["staleness_seconds"] == 120
+    assert groups["url"]["scope"] == "global"
+    assert groups["lightweight"]["last_refreshed_at"] is None
+    assert groups["lightweight"]["scope"] == "asset"
@@ -0,0 +1,86 @@
+"""
+Tests for keyset cursor pagination helpers.
+"""
+import pytest
+from postgrest import AsyncPostgrestClient
+
+from app.utils.pagination import (
+    InvalidCursorError,
+    apply_keyset,
+    decode_cursor,
+    encode_cursor,
+    keyset_page,
+)
+
+
+def _query():
+    return AsyncPostgrestClient("http://localhost/rest/v1").table("dns_records").select("*")
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor("2026-01-10T12:00:00+00:00", "abc-123")
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == ("2026-01-10T12:00:00+00:00", "abc-123")
+
+
+def test_cursor_round_trip_with_null_sort_value():
+    assert decode_cursor(encode_cursor(None, 7)) == (None, "7")
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "", "eyJmb28iOjF9"])
+def test_invalid_cursor_raises(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor)
+
+    # Routes map ValueError to HTTP 400
+    assert issubclass(InvalidCursorError, ValueError)
+
+
+def test_keyset_page_last_page_has_no_cursor():
+    rows = [{"id": "1", "resolved_at": "t1"}, {"id": "2", "resolved_at": "t2"}]
+
+    page, next_cursor = keyset_page(rows, "resolved_at", limit=2)
+
+    assert page == rows
+    assert next_cursor is None
+
+
+def test_keyset_page_trims_look_ahead_row():
+    rows = [{"id": str(i), "resolved_at": f"t{i}"} for i in range(3)]
+
+    page, next_cursor = keyset_page(rows, "resolved_at", limit=2)
+
+    assert [r["id"] for r in page] == ["0", "1"]
+    assert decode_cursor(next_cursor) == ("t1", "1")
+
+
+def test_apply_keyset_first_page_orders_and_fetches_one_extra():
+    params = apply_keyset(_query(), "resolved_at", limit=50).request.params
+
+    assert params["order"] == "resolved_at.desc.nullslast,id.desc"
+    assert params["limit"] == "51"
+    assert "offset" not in params
+    assert "or" not in params
+
+
+def test_apply_keyset_seeks_past_cursor():
+    cursor = encode_cursor("2026-01-10T12:00:00+00:00", "abc")
+
+    params = apply_keyset(_query(), "resolved_at", limit=50, cursor=cursor).request.params
+
+    assert params["or"] == (
+        '(resolved_at.lt."2026-01-10T12:00:00+00:00",'
+        'and(resolved_at.eq."2026-01-10T12:00:00+00:00",id.lt."abc"),'
+        'resolved_at.is.null)'
+    )
+    assert "offset" not in params
+
+
+def test_apply_keyset_inside_null_tail():
+    cursor = encode_cursor(None, "abc")
+
+    params = apply_keyset(_query(), "resolved_at", limit=10, cursor=cursor).request.params
+
+    assert params["resolved_at"] == "is.null"
+    assert params["id"] == "lt.abc"
@@ -0,0 +1,215 @@
+"""
+Tests for pipeline checkpoints, leases and resume.
+"""
+import json
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.services import scan_pipeline as scan_pipeline_module
+from app.services.pipeline_checkpoint import PipelineCheckpoint, PipelineCheckpointStore
+from app.services.scan_pipeline import ScanPipeline
+
+USER_ID = "00000000-0000-0000-0000-0000000000b1"
+
+
+class FakeCheckpointRedis:
+    """In-memory stand-in for the Redis commands the checkpoint store uses."""
+
+    def __init__(self):
+        self.strings = {}
+        self.zsets = {}
+        self.hashes = {}
+
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.strings:
+            return None
+        self.strings[key] = str(value)
+        return True
+
+    async def get(self, key):
+        return self.strings.get(key)
+
+    async def delete(self, key):
+        self.strings.pop(key, None)
+
+    async def expire(self, key, ttl):
+        return key in self.strings or key in self.hashes
+
+    async def zadd(self, key, mapping):
+        self.zsets.setdefault(key, {}).update(mapping)
+
+    async def zrem(self, key, member):
+        self.zsets.get(key, {}).pop(member, None)
+
+    async def zrange(self, key, start, end):
+        return sorted(self.zsets.get(key, {}), key=self.zsets[key].get) if key in self.zsets else []
+
+    async def hsetnx(self, key, field, value):
+        record = self.hashes.setdefault(key, {})
+        if field in record:
+            return False
+        record[field] = value
+        return True
+
+    async def hset(self, key, mapping):
+        self.hashes.setdefault(key, {}).update(mapping)
+
+    async def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+
+def _store(fake, owner):
+    async def provider():
+        return fake
+    return PipelineCheckpointStore(redis_provider=provider, owner=owner, clock=lambda: 1_800_000_000.0)
+
+
+def _checkpoint(asset_scan_id="as-1", parent_scan_id="scan-1"):
+    return PipelineCheckpoint(
+        asset_scan_id=asset_scan_id, asset_id="asset-1", user_id=USER_ID,
+        modules=["subfinder", "dnsx", "httpx"], started_at="2026-01-16T00:00:00",
+        timeout_seconds=3600, parent_scan_id=parent_scan_id
+    )
+
+
+@pytest.mark.asyncio
+async def test_checkpoint_round_trip_and_parent_statuses():
+    fake = FakeCheckpointRedis()
+    store = _store(fake, "api-1")
+
+    first, second = _checkpoint("as-1"), _checkpoint("as-2")
+    first.consumer_groups = [{"module": "dnsx", "stream_key": "scan:as-1:subfinder:output",
+                              "group_name": "dnsx-consumers", "stream_output_key": None,
+                              "name_prefix": "dnsx-as-1", "consumers": {"dnsx-as-1-1": "arn:task/1"}}]
+    first.consumer_jobs = {"dnsx": "job-dnsx"}
+    assert await store.save(first) and await store.save(second)
+
+    loaded = await store.load("as-1")
+    assert loaded == first
+    assert loaded.group("dnsx-consumers")["consumers"] == {"dnsx-as-1-1": "arn:task/1"}
+    assert loaded.consumer_task_arns() == {"dnsx": ["arn:task/1"]}
+    assert await store.active() == ["as-1", "as-2"]
+
+    # One pipeline of the scan still running: no parent statuses yet
+    assert await store.finish(first, "completed") is None
+    assert await store.active() == ["as-2"]
+    assert await store.finish(second, "failed") == {"as-1": "completed", "as-2": "failed"}
+    assert await store.active() == []
+
+
+@pytest.mark.asyncio
+async def test_lease_is_only_taken_over_once_expired():
+    fake = FakeCheckpointRedis()
+    owner, other = _store(fake, "api-1"), _store(fake, "api-2")
+
+    assert await owner.acquire_lease("as-1")
+    assert not await other.acquire_lease("as-1")
+    assert await owner.renew_lease("as-1")
+    assert not await other.renew_lease("as-1")
+
+    # Lease expired (owner died): the other process takes over
+    del fake.strings["scan:as-1:checkpoint:lease"]
+    assert await other.acquire_lease("as-1")
+    assert not await owner.renew_lease("as-1")
+
+    # Releasing someone else's lease is a no-op
+    await owner.release_lease("as-1")
+    assert fake.strings["scan:as-1:checkpoint:lease"] == "api-2"
+
+
+def _row(job_id, module, status="running"):
+    return {"id": job_id, "user_id": USER_ID, "module": module, "status": status,
+            "created_at": "2026-01-16T00:00:00Z"}
+
+
+@pytest.mark.asyncio
+async def test_resume_relaunches_only_dead_tasks(monkeypatch, mock_postgrest):
+    from app.services.batch_workflow_orchestrator import batch_workflow_orchestrator
+    from app.services.stream_coordinator import stream_coordinator
+
+    job_ids = {module: f"00000000-0000-0000-0000-00000000000{i}"
+               for i, module in enumerate(["subfinder", "dnsx", "httpx"], start=1)}
+    rows = [_row(job_ids["subfinder"], "subfinder"), _row(job_ids["dnsx"], "dnsx"), _row(job_ids["httpx"], "httpx")]
+    updates = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "GET":
+            return httpx.Response(200, json=rows)
+        updates.append((str(request.url), json.loads(request.content)))
+        return httpx.Response(200, content="[]")
+
+    pipeline = ScanPipeline()
+    pipeline.supabase = mock_postgrest(handler).async_service_client
+
+    fake = FakeCheckpointRedis()
+    store = _store(fake, "api-2")
+    checkpoint = _checkpoint()
+    checkpoint.producers = {"subfinder": {"job_id": job_ids["subfinder"], "stream_key": "scan:as-1:subfinder:output",
+                                          "task_arn": "arn:task/subfinder"}}
+    checkpoint.consumer_jobs = {"dnsx": job_ids["dnsx"], "httpx": job_ids["httpx"]}
+    # httpx was served by a shared fleet: no group of its own
+    checkpoint.fleet_id = "fleet-scan-1"
+    checkpoint.consumer_groups = [{
+        "module": "dnsx", "stream_key": "scan:as-1:subfinder:output", "group_name": "dnsx-consumers",
+        "stream_output_key": "scan:as-1:dnsx:output", "name_prefix": "dnsx-as-1",
+        "consumers": {"dnsx-as-1-1": "arn:task/dnsx-1", "dnsx-as-1-2": "arn:task/dnsx-2"}
+    }]
+    await store.save(checkpoint)
+
+    async def get_task_status(task_arn):
+        return {"status": "STOPPED" if task_arn == "arn:task/dnsx-2" else "RUNNING"}
+
+    launched = []
+
+    async def launch_streaming_consumer(consumer_job, stream_key, consumer_group_name, consumer_name, **kwargs):
+        launched.append((str(consumer_job.id), consumer_group_name, consumer_name))
+        return {"task_arn": f"arn:task/{consumer_name}"}
+
+    async def launch_streaming_producer(**kwargs):
+        raise AssertionError("running producer must not be relaunched")
+
+    reassigned = []
+
+    async def reassign_pending(stream_key, group, from_consumer, to_consumer):
+        reassigned.append((group, from_consumer, to_consumer))
+        return 7
+
+    async def load_context(supabase, **kwargs):
+        return SimpleNamespace(asset_scan_id=None)
+
+    monitored = {}
+
+    async def monitor(checkpoint, **kwargs):
+        monitored.update(kwargs, checkpoint=checkpoint)
+        return {"status": "completed"}
+
+    monkeypatch.setattr(settings, "consumer_autoscaling_enabled", False)
+    monkeypatch.setattr(scan_pipeline_module, "pipeline_checkpoints", store)
+    monkeypatch.setattr(scan_pipeline_module, "PipelineContext", SimpleNamespace(load=load_context))
+    monkeypatch.setattr(batch_workflow_orchestrator, "get_task_status", get_task_status)
+    monkeypatch.setattr(batch_workflow_orchestrator, "launch_streaming_consumer", launch_streaming_consumer)
+    monkeypatch.setattr(batch_workflow_orchestrator, "launch_streaming_producer", launch_streaming_producer)
+    monkeypatch.setattr(stream_coordinator, "reassign_pending", reassign_pending)
+    monkeypatch.setattr(pipeline, "_monitor_pipeline", monitor)
+
+    assert await pipeline.resume_pipeline("as-1") == {"status": "completed"}
+
+    # Only the stopped consumer is replaced, after its pending entries moved
+    assert reassigned == [("dnsx-consumers", "dnsx-as-1-2", "dnsx-as-1-2-r1")]
+    assert launched == [(job_ids["dnsx"], "dnsx-consumers", "dnsx-as-1-2-r1")]
+    resumed = monitored["checkpoint"]
+    assert resumed.resumes == 1
+    assert resumed.group("dnsx-consumers")["consumers"] == {
+        "dnsx-as-1-1": "arn:task/dnsx-1", "dnsx-as-1-2-r1": "arn:task/dnsx-as-1-2-r1"
+    }
+    assert monitored["producer_task_arns"] == {"subfinder": "arn:task/subfinder"}
+    assert monitored["resumed"] is True
+
+    # The fleet-served job cannot be resumed
+    [(url, body)] = updates
+    assert job_ids["httpx"] in url and body["status"] == "failed"
+
+    assert await pipeline.resume_pipeline("missing") is None
@@ -0,0 +1,152 @@
+"""
+Tests for the per-scan pipeline context.
+"""
+import json
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.services import pipeline_context as pipeline_context_module
+from app.services import scan_pipeline as scan_pipeline_module
+from app.services.batch_workflow_orchestrator import batch_workflow_orchestrator
+from app.services.pipeline_context import PipelineContext
+from app.services.scan_pipeline import ScanPipeline
+from app.services.stream_coordinator import stream_coordinator
+from tests.helpers import ASSET_ID
+
+USER_ID = "00000000-0000-0000-0000-0000000000b1"
+
+
+def _profile(**hints):
+    return SimpleNamespace(is_active=True, optimization_hints=dict(hints))
+
+
+def _database(mock_postgrest, requests):
+    """Mock PostgREST: one asset, two apex domains, echoing inserts."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        table = request.url.path.rsplit("/", 1)[-1]
+        requests.append((request.method, table))
+        if request.method == "GET" and table == "assets":
+            return httpx.Response(200, content=json.dumps([{"id": ASSET_ID, "name": "Example"}]))
+        if request.method == "GET" and table == "apex_domains":
+            return httpx.Response(200, content=json.dumps([{"domain": "example.com"}, {"domain": "example.org"}]))
+        if request.method == "POST" and table == "batch_scan_jobs":
+            rows = json.loads(request.content)
+            rows = rows if isinstance(rows, list) else [rows]
+            return httpx.Response(201, content=json.dumps([{**row, "created_at": "2026-01-16T00:00:00Z"} for row in rows]))
+        return httpx.Response(201, content="[]")
+
+    return mock_postgrest(handler)
+
+
+@pytest.fixture
+def registry_calls(monkeypatch):
+    calls = []
+    profiles = {
+        "subfinder": _profile(task_role_arn="arn:aws:iam::1:role/subfinder"),
+        "dnsx": _profile(requires_database_fetch=True),
+        "httpx": _profile(),
+    }
+
+    async def get_module(module_name, use_cache=True):
+        calls.append(module_name)
+        return profiles.get(module_name)
+
+    monkeypatch.setattr(pipeline_context_module.module_registry, "get_module", get_module)
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_context_loads_asset_domains_and_profiles_once(registry_calls, mock_postgrest):
+    requests = []
+    client = _database(mock_postgrest, requests)
+
+    context = await PipelineContext.load(
+        client.async_service_client, ASSET_ID, USER_ID, ["subfinder", "dnsx", "dnsx", "unknown"]
+    )
+
+    assert context.asset["name"] == "Example"
+    assert context.apex_domains == ["example.com", "example.org"]
+    assert sorted(requests) == [("GET", "apex_domains"), ("GET", "assets")]
+    assert registry_calls == ["subfinder", "dnsx", "unknown"]
+    assert context.invalid_modules == ["unknown"]
+    assert context.module_hints("dnsx") == {"requires_database_fetch": True}
+    assert context.module_hints("unknown") == {}
+
+
+@pytest.mark.asyncio
+async def test_pipeline_reads_context_once_and_bulk_inserts_jobs(monkeypatch, registry_calls, mock_postgrest):
+    requests = []
+    client = _database(mock_postgrest, requests)
+    pipeline = ScanPipeline()
+    pipeline.supabase = client.async_service_client
+
+    async def create_consumer_group(stream_key, group):
+        return True
+
+    async def wait_for_jobs(job_ids, timeout, check_interval):
+        return {"status": "completed", "module_statuses": {}, "successful_modules": len(job_ids),
+                "total_modules": len(job_ids), "elapsed_seconds": 0, "checks_performed": 1, "events_received": 0}
+
+    async def bump_asset_version(asset_id):
+        return None
+
+    async def memory_report(scan_job_id, stream_keys=None):
+        return {"scan_job_id": scan_job_id, "streams": {}, "total_bytes": 0, "backpressure": False}
+
+    async def expire_scan_streams(scan_job_id, stream_keys=None, ttl=None):
+        return len(stream_keys)
+
+    monkeypatch.setattr(stream_coordinator, "create_consumer_group", create_consumer_group)
+    monkeypatch.setattr(stream_coordinator, "get_scan_memory_report", memory_report)
+    monkeypatch.setattr(stream_coordinator, "expire_scan_streams", expire_scan_streams)
+    monkeypatch.setattr(pipeline, "_wait_for_jobs_completion", wait_for_jobs)
+    monkeypatch.setattr(scan_pipeline_module.result_cache, "bump_asset_version", bump_asset_version)
+    monkeypatch.setattr(scan_pipeline_module.mv_refresh_scheduler, "notify_scan_completed", lambda asset_id: None)
+    monkeypatch.setattr(batch_workflow_orchestrator, "ecs_client", None)
+    monkeypatch.setattr(settings, "pipeline_checkpoint_enabled", False)
+
+    result = await pipeline.execute_pipeline(
+        asset_id=ASSET_ID,
+        modules=["subfinder", "httpx"],
+        scan_request=None,
+        user_id=USER_ID,
+        scale_factor=2
+    )
+
+    assert result["producers"] == ["subfinder"]
+    assert sorted(result["consumers"]) == ["dnsx", "httpx"]
+    # 1 asset read, 1 domain read, 1 asset_scan_jobs insert, 1 bulk batch_scan_jobs insert
+    assert requests.count(("GET", "assets")) == 1
+    assert requests.count(("GET", "apex_domains")) == 1
+    assert requests.count(("POST", "batch_scan_jobs")) == 1
+    # One registry lookup per module, none per launched task
+    assert sorted(registry_calls) == ["dnsx", "httpx", "subfinder"]
+
+
+@pytest.mark.asyncio
+async def test_environment_and_role_come_from_context(monkeypatch):
+    from app.schemas.batch import BatchScanJob
+
+    async def unexpected(*args, **kwargs):
+        raise AssertionError("module registry queried despite pipeline context")
+
+    monkeypatch.setattr("app.services.batch_workflow_orchestrator.module_registry.get_module", unexpected)
+    context = PipelineContext(
+        asset_id=ASSET_ID, user_id=USER_ID, asset={}, apex_domains=["example.com"],
+        modules=["dnsx"], execution_order=["dnsx"],
+        module_profiles={"dnsx": _profile(requires_database_fetch=True, task_role_arn="arn:role/dnsx")}
+    )
+    job = BatchScanJob(
+        id="00000000-0000-0000-0000-0000000000c1", user_id=USER_ID, module="dnsx",
+        total_domains=1, created_at="2026-01-16T00:00:00Z", metadata={"asset_id": ASSET_ID}
+    )
+
+    environment = await batch_workflow_orchestrator._build_container_environment(job, None, context=context)
+    role = await batch_workflow_orchestrator._get_task_role_arn("dnsx", context=context)
+
+    assert {"name": "FETCH_FROM_DATABASE", "value": "true"} in environment
+    assert role == "arn:role/dnsx"
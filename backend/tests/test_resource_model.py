@@ -0,0 +1,137 @@
+"""
+Tests for the learned task resource model.
+"""
+import math
+import random
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.core.config import settings
+from app.schemas.batch import BatchScanJob
+from app.services.resource_model import ResourceModel, _solve_ridge, sample_from_row
+
+START = datetime(2026, 1, 1)
+
+
+def _seconds(domains, cpu):
+    # 30s per domain^0.8, 1.6x faster per doubling of vCPU
+    return 30 * (1 + domains) ** 0.8 * (cpu / 1024) ** -0.7
+
+
+def _history(module="dnsx", jobs=120, seed=7):
+    rng = random.Random(seed)
+    rows = []
+    sizes = [(512, 1024), (1024, 2048), (2048, 4096)]
+    for i in range(jobs):
+        cpu, memory = sizes[i % 3]
+        domains = rng.randint(1, 200)
+        seconds = _seconds(domains, cpu) * math.exp(rng.gauss(0, 0.05))
+        started = START + timedelta(hours=i)
+        rows.append({
+            "module": module, "status": "completed", "total_domains": domains,
+            "allocated_cpu": cpu, "allocated_memory": memory, "estimated_duration_minutes": domains * 2,
+            "started_at": started.isoformat(), "completed_at": (started + timedelta(seconds=seconds)).isoformat() + "Z",
+            "metadata": {}
+        })
+    # 0.25 vCPU runs out of memory most of the time
+    for i in range(6):
+        started = START + timedelta(hours=i, minutes=30)
+        rows.append({
+            "module": module, "status": "failed" if i else "completed", "total_domains": 50,
+            "allocated_cpu": 256, "allocated_memory": 512, "started_at": started.isoformat(),
+            "completed_at": (started + timedelta(seconds=60)).isoformat(), "metadata": {}
+        })
+    return [sample_from_row(row) for row in rows]
+
+
+@pytest.fixture
+def model():
+    model = ResourceModel(supabase=object())
+    model.fits = model.fit(_history() + _history("katana", jobs=5))
+    return model
+
+
+def test_solve_recovers_exact_coefficients():
+    rows = [[1.0, x, x * x] for x in range(10)]
+    targets = [2.0 + 0.5 * x - 0.1 * x * x for x in range(10)]
+    assert [round(b, 6) for b in _solve_ridge(rows, targets, 0.0)] == [2.0, 0.5, -0.1]
+
+
+def test_fit_learns_scaling(model, monkeypatch):
+    # Not enough completed katana jobs
+    assert set(model.fits) == {"dnsx"}
+    assert model.predict_duration("katana", domains=10) is None
+
+    fit = model.fits["dnsx"]
+    assert fit.samples == 121
+    for domains, cpu in [(10, 1024), (150, 512), (80, 2048)]:
+        predicted = model.predict_duration("dnsx", domains=domains, cpu=cpu, memory=cpu * 2)
+        assert predicted == pytest.approx(_seconds(domains, cpu), rel=0.15)
+
+    upper = model.timeout_seconds("dnsx", domains=100, cpu=1024, memory=2048)
+    assert upper > model.predict_duration("dnsx", domains=100) * settings.resource_model_timeout_factor
+
+    monkeypatch.setattr(settings, "resource_model_enabled", False)
+    assert model.predict_duration("dnsx", domains=10) is None
+    assert model.recommend("dnsx", domains=10) is None
+
+
+def test_recommend_cheapest_size_meeting_target(model):
+    # 256/512 is the cheapest size but keeps failing: never a candidate
+    assert model.fits["dnsx"].candidate_sizes() == [(512, 1024), (1024, 2048), (2048, 4096)]
+
+    relaxed = model.recommend("dnsx", domains=100, target_seconds=3600)
+    assert (relaxed.cpu, relaxed.memory) == (512, 1024) and relaxed.meets_target
+
+    # ~1960s at 0.5 vCPU, ~1200s at 1 vCPU, ~740s at 2 vCPU
+    tight = model.recommend("dnsx", domains=100, target_seconds=1400)
+    assert (tight.cpu, tight.memory) == (1024, 2048) and tight.meets_target
+    assert tight.estimated_duration_minutes == math.ceil(tight.predicted_seconds / 60)
+
+    impossible = model.recommend("dnsx", domains=100, target_seconds=300)
+    assert (impossible.cpu, impossible.memory) == (2048, 4096) and not impossible.meets_target
+
+    # Default target: half the module timeout, tighter for high priority
+    assert model.target_seconds("dnsx") == 900
+    assert model.target_seconds("dnsx", priority=1) == 720
+
+
+def test_backtest_reports_newest_jobs(model):
+    report = model.backtest(_history(), holdout_fraction=0.25)
+    # 121 completed jobs (one 0.25 vCPU run succeeded), newest quarter held out
+    assert report["test_jobs"] == 31
+    dnsx = report["modules"]["dnsx"]
+    assert dnsx["fitted"] and dnsx["test_jobs"] == 31
+    assert dnsx["mape"] < 0.1 and dnsx["upper_bound_coverage"] >= 0.9
+    # The static 2 min/domain estimate is far off
+    assert dnsx["static_mape"] > 1
+
+
+@pytest.mark.asyncio
+async def test_calculator_and_pipeline_consult_model(model, monkeypatch):
+    from app.services import resource_calculator as calculator_module
+    from app.services import scan_pipeline as scan_pipeline_module
+    from app.services.resource_calculator import ModuleResourceCalculator
+    from app.services.scan_pipeline import ScanPipeline
+
+    monkeypatch.setattr(calculator_module, "resource_model", model)
+    monkeypatch.setattr(scan_pipeline_module, "resource_model", model)
+
+    # ~560s at 0.5 vCPU is within the default 900s dnsx target
+    allocation = await ModuleResourceCalculator().calculate_resources("dnsx", 20, priority=3)
+    assert (allocation.cpu, allocation.memory) == (512, 1024)
+    assert allocation.optimization_applied == "history_model"
+
+    pipeline = ScanPipeline()
+    job = BatchScanJob(
+        id="00000000-0000-0000-0000-0000000000e1", user_id="00000000-0000-0000-0000-0000000000b1",
+        module="dnsx", total_domains=20, allocated_cpu=1024, allocated_memory=2048, created_at=START
+    )
+    # Predicted well under the static floor: the floor stands
+    assert pipeline._module_timeout(job) == ScanPipeline.MODULE_TIMEOUTS["dnsx"]
+
+    huge = job.model_copy(update={"total_domains": 4000, "allocated_cpu": 512, "allocated_memory": 1024})
+    assert pipeline._module_timeout(huge) > ScanPipeline.MODULE_TIMEOUTS["dnsx"]
+    assert pipeline._pipeline_timeout([job]) == ScanPipeline.DEFAULT_PIPELINE_TIMEOUT
+    assert pipeline._pipeline_timeout([job, huge]) == pipeline._module_timeout(huge)
@@ -0,0 +1,200 @@
+"""
+Tests for the Redis result cache and per-asset version invalidation.
+"""
+import asyncio
+
+import pytest
+
+from app.services.result_cache import ResultCache
+from tests.helpers import ASSET_ID
+
+
+class _FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.ops = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.ops.append((name, args, kwargs))
+            return self
+        return queue
+
+    async def execute(self):
+        return [await getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in self.ops]
+
+
+class _FakeRedis:
+    """In-memory subset of redis.asyncio.Redis (decode_responses=True)."""
+
+    def __init__(self):
+        self.values = {}
+        self.zsets = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None, nx=False):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+    async def delete(self, *keys):
+        return sum(1 for key in keys if self.values.pop(key, None) is not None)
+
+    async def exists(self, *keys):
+        return sum(1 for key in keys if key in self.values)
+
+    async def incr(self, key):
+        self.values[key] = str(int(self.values.get(key, 0)) + 1)
+        return int(self.values[key])
+
+    async def zadd(self, key, mapping):
+        self.zsets.setdefault(key, {}).update(mapping)
+
+    async def zcard(self, key):
+        return len(self.zsets.get(key, {}))
+
+    async def zpopmin(self, key, count=1):
+        members = sorted(self.zsets.get(key, {}).items(), key=lambda item: item[1])[:count]
+        for member, _ in members:
+            del self.zsets[key][member]
+        return members
+
+    def pipeline(self, transaction=True):
+        return _FakePipeline(self)
+
+
+def _cache(redis, **kwargs):
+    async def provider():
+        return redis
+
+    options = dict(enabled=True, ttl_seconds=60, stale_ttl_seconds=300, max_entry_bytes=10_000, max_entries=100)
+    options.update(kwargs)
+    return ResultCache(redis_provider=provider, **options)
+
+
+def _counting_compute(calls, value):
+    async def compute():
+        calls.append(value)
+        return value
+    return compute
+
+
+@pytest.mark.asyncio
+async def test_hit_after_miss_and_params_isolated():
+    cache = _cache(_FakeRedis())
+    calls = []
+
+    first = await cache.get_or_compute("url_stats", {"asset_id": ASSET_ID}, _counting_compute(calls, {"total": 1}), asset_id=ASSET_ID)
+    second = await cache.get_or_compute("url_stats", {"asset_id": ASSET_ID}, _counting_compute(calls, {"total": 2}), asset_id=ASSET_ID)
+    other = await cache.get_or_compute("url_stats", {"asset_id": None}, _counting_compute(calls, {"total": 3}))
+
+    assert first == second == {"total": 1}
+    assert other == {"total": 3}
+    assert calls == [{"total": 1}, {"total": 3}]
+    assert cache.get_stats()["url_stats"] == {"misses": 2, "hits": 1}
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_compute_once():
+    cache = _cache(_FakeRedis())
+    calls = []
+
+    async def slow():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"programs": []}
+
+    results = await asyncio.gather(*[cache.get_or_compute("programs", {"page": 1}, slow) for _ in range(5)])
+
+    assert results == [{"programs": []}] * 5
+    assert calls == [1]
+
+
+@pytest.mark.asyncio
+async def test_version_bump_invalidates_asset_and_global_entries():
+    cache = _cache(_FakeRedis())
+    calls = []
+
+    await cache.get_or_compute("filter_options", {"asset_id": ASSET_ID}, _counting_compute(calls, "asset-v0"), asset_id=ASSET_ID)
+    await cache.get_or_compute("programs", {"page": 1}, _counting_compute(calls, "global-v0"))
+    await cache.get_or_compute("filter_options", {"asset_id": "other"}, _counting_compute(calls, "other-v0"), asset_id="other")
+
+    await cache.bump_asset_version(ASSET_ID)
+
+    assert await cache.get_or_compute("filter_options", {"asset_id": ASSET_ID}, _counting_compute(calls, "asset-v1"), asset_id=ASSET_ID) == "asset-v1"
+    assert await cache.get_or_compute("programs", {"page": 1}, _counting_compute(calls, "global-v1")) == "global-v1"
+    # Other assets keep their entries
+    assert await cache.get_or_compute("filter_options", {"asset_id": "other"}, _counting_compute(calls, "other-v1"), asset_id="other") == "other-v0"
+
+
+@pytest.mark.asyncio
+async def test_stale_entry_served_while_refreshing_once():
+    redis = _FakeRedis()
+    cache = _cache(redis, ttl_seconds=-1)
+    calls = []
+
+    await cache.get_or_compute("recon_data", {}, _counting_compute(calls, "v0"))
+    results = [await cache.get_or_compute("recon_data", {}, _counting_compute(calls, "v1")) for _ in range(3)]
+    await asyncio.gather(*cache._refreshing.values())
+
+    assert results == ["v0", "v0", "v0"]
+    assert calls == ["v0", "v1"]
+    assert cache.get_stats()["recon_data"]["stale"] == 3
+    assert not any(key.endswith(":lock") for key in redis.values)
+
+
+@pytest.mark.asyncio
+async def test_oversized_results_are_not_cached():
+    cache = _cache(_FakeRedis(), max_entry_bytes=64)
+    calls = []
+
+    for _ in range(2):
+        await cache.get_or_compute("programs", {}, _counting_compute(calls, "x" * 200))
+
+    assert len(calls) == 2
+    assert cache.get_stats()["programs"]["oversize"] == 2
+
+
+@pytest.mark.asyncio
+async def test_key_count_is_capped():
+    redis = _FakeRedis()
+    cache = _cache(redis, max_entries=2)
+
+    for page in range(1, 5):
+        await cache.get_or_compute("programs", {"page": page}, _counting_compute([], page))
+
+    entry_keys = [key for key in redis.values if key.startswith("rc:programs:")]
+    assert len(entry_keys) == 2
+    assert await redis.zcard("rc:index") == 2
+
+
+@pytest.mark.asyncio
+async def test_falls_through_without_redis():
+    async def unavailable():
+        return None
+
+    cache = ResultCache(redis_provider=unavailable, enabled=True)
+    calls = []
+
+    for _ in range(2):
+        assert await cache.get_or_compute("url_stats", {}, _counting_compute(calls, 7)) == 7
+
+    assert calls == [7, 7]
+    assert cache.get_stats()["url_stats"]["bypass"] == 2
+
+
+@pytest.mark.asyncio
+async def test_compute_errors_propagate_without_retry():
+    cache = _cache(_FakeRedis())
+    calls = []
+
+    async def failing():
+        calls.append(1)
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        await cache.get_or_compute("programs", {}, failing)
+    assert calls == [1]
@@ -0,0 +1,157 @@
+"""
+Tests for single-flight request coalescing.
+"""
+import asyncio
+
+import pytest
+
+from app.services.single_flight import SingleFlight, coalesced, single_flight
+
+
+class _FakeRedis:
+    """In-memory subset of redis.asyncio.Redis used by the leader lock."""
+
+    def __init__(self):
+        self.values = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ex=None, nx=False):
+        if nx and key in self.values:
+            return None
+        self.values[key] = value
+        return True
+
+    async def delete(self, *keys):
+        return sum(1 for key in keys if self.values.pop(key, None) is not None)
+
+    async def exists(self, *keys):
+        return sum(1 for key in keys if key in self.values)
+
+
+def _slow_call(calls, value, delay=0.01):
+    async def call():
+        calls.append(value)
+        await asyncio.sleep(delay)
+        return value
+    return call
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_calls_share_one_execution():
+    flight = SingleFlight()
+    calls = []
+
+    results = await asyncio.gather(*[
+        flight.do("recon_data", {"b": 2, "a": 1, "unused": None}, _slow_call(calls, {"ok": True}))
+        for _ in range(10)
+    ])
+
+    assert calls == [{"ok": True}]
+    assert all(r == {"ok": True} for r in results)
+    assert flight.get_stats()["recon_data"] == {"executed": 1, "coalesced": 9}
+    assert flight._inflight == {}
+
+
+@pytest.mark.asyncio
+async def test_different_params_are_not_coalesced():
+    flight = SingleFlight()
+    calls = []
+
+    await asyncio.gather(
+        flight.do("programs", {"page": 1}, _slow_call(calls, 1)),
+        flight.do("programs", {"page": 2}, _slow_call(calls, 2)),
+    )
+
+    assert sorted(calls) == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_failures_are_shared_and_not_cached():
+    flight = SingleFlight()
+    calls = []
+
+    async def failing():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise ValueError("db down")
+
+    results = await asyncio.gather(*[flight.do("x", {}, failing) for _ in range(3)], return_exceptions=True)
+
+    assert all(isinstance(r, ValueError) for r in results)
+    assert calls == [1]
+    assert await flight.do("x", {}, _slow_call(calls, "recovered")) == "recovered"
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_cancel_shared_call():
+    flight = SingleFlight()
+    calls = []
+
+    first = asyncio.ensure_future(flight.do("x", {}, _slow_call(calls, "v", delay=0.05)))
+    await asyncio.sleep(0)
+    second = asyncio.ensure_future(flight.do("x", {}, _slow_call(calls, "other")))
+    await asyncio.sleep(0)
+    first.cancel()
+
+    assert await second == "v"
+    assert calls == ["v"]
+
+
+@pytest.mark.asyncio
+async def test_decorator_keys_on_bound_arguments(monkeypatch):
+    monkeypatch.setattr(single_flight, "counters", type(single_flight.counters)(single_flight.counters.default_factory))
+    calls = []
+
+    class Service:
+        @coalesced("lookup")
+        async def lookup(self, asset_id, page=1):
+            calls.append((asset_id, page))
+            await asyncio.sleep(0.01)
+            return (asset_id, page)
+
+    service = Service()
+    results = await asyncio.gather(
+        service.lookup("a"), service.lookup(asset_id="a", page=1), service.lookup("b")
+    )
+
+    assert results == [("a", 1), ("a", 1), ("b", 1)]
+    assert sorted(calls) == [("a", 1), ("b", 1)]
+    assert single_flight.get_stats()["lookup"] == {"executed": 2, "coalesced": 1}
+
+
+@pytest.mark.asyncio
+async def test_cross_worker_waiter_reads_leader_result():
+    redis = _FakeRedis()
+    leader, follower = SingleFlight(poll_interval_seconds=0.005), SingleFlight(poll_interval_seconds=0.005)
+    calls = []
+
+    results = await asyncio.gather(
+        leader.do("url_stats", {"asset_id": "a"}, _slow_call(calls, {"total": 5}, delay=0.03), redis_client=redis),
+        follower.do("url_stats", {"asset_id": "a"}, _slow_call(calls, {"total": 6}), redis_client=redis),
+    )
+
+    assert results == [{"total": 5}, {"total": 5}]
+    assert calls == [{"total": 5}]
+    assert follower.get_stats()["url_stats"]["coalesced_remote"] == 1
+    assert not any(key.startswith("sf:lock:") for key in redis.values)
+
+
+@pytest.mark.asyncio
+async def test_cross_worker_waiter_falls_back_when_leader_disappears():
+    redis = _FakeRedis()
+    flight = SingleFlight(poll_interval_seconds=0.005, wait_timeout_seconds=1)
+    key = SingleFlight.key("url_stats", {})
+    await redis.set(f"sf:lock:{key}", "other-worker")
+    calls = []
+
+    async def leader_crashes():
+        await asyncio.sleep(0.01)
+        await redis.delete(f"sf:lock:{key}")
+
+    _, result = await asyncio.gather(leader_crashes(), flight.do("url_stats", {}, _slow_call(calls, 7), redis_client=redis))
+
+    assert result == 7
+    assert calls == [7]
+    assert flight.get_stats()["url_stats"]["remote_fallbacks"] == 1
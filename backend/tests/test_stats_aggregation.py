@@ -0,0 +1,67 @@
+"""
+Tests for single-RPC URL and HTTP probe statistics.
+"""
+import json
+
+import httpx
+import pytest
+
+from app.api.v1 import http_probes as http_probes_api
+from app.api.v1 import urls as urls_api
+from tests.helpers import ASSET_ID
+
+
+def _client_returning(mock_postgrest, payload, calls):
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append((request.url.path, json.loads(request.content or b"null")))
+        return httpx.Response(200, content=json.dumps(payload))
+
+    return mock_postgrest(handler)
+
+
+@pytest.mark.asyncio
+async def test_filtered_url_stats_use_one_rpc(monkeypatch, mock_postgrest):
+    calls = []
+    payload = {
+        "total_urls": 120000, "alive_urls": 80000, "dead_urls": 30000, "pending_urls": 10000,
+        "urls_with_params": 40000, "unique_domains": 321,
+        "top_sources": [{"source": s, "count": 10 - i} for i, s in enumerate("abcdefg")],
+        "top_status_codes": [{"status_code": 200, "count": 70000}],
+        "top_technologies": [{"name": "nginx", "count": 50000}],
+        "top_file_extensions": [{"extension": "js", "count": 9000}],
+    }
+    client = _client_returning(mock_postgrest, payload, calls)
+    monkeypatch.setattr(urls_api, "supabase_client", client)
+
+    stats = await urls_api.get_url_stats(asset_id=ASSET_ID, scan_job_id=None, current_user=None)
+
+    assert len(calls) == 1
+    path, body = calls[0]
+    assert path.endswith("/rpc/get_url_stats_aggregate")
+    assert body == {"p_asset_id": ASSET_ID, "p_scan_job_id": None, "p_top_n": 10}
+    assert stats.total_urls == 120000
+    assert stats.unique_domains == 321
+    assert stats.top_technologies == [{"name": "nginx", "count": 50000}]
+
+
+@pytest.mark.asyncio
+async def test_filtered_http_probe_stats_use_one_rpc(monkeypatch, mock_postgrest):
+    calls = []
+    payload = {
+        "total_probes": 5000, "redirect_chains_count": 700,
+        "status_code_distribution": {"200": 4000, "404": 1000},
+        "top_technologies": [{"name": "React", "count": 3000}],
+        "top_servers": [{"name": "nginx", "count": 2500}],
+        "cdn_usage": {"cloudflare": 1200},
+    }
+    client = _client_returning(mock_postgrest, payload, calls)
+    monkeypatch.setattr(http_probes_api, "supabase_client", client)
+
+    stats = await http_probes_api.get_http_probe_stats(asset_id=None, scan_job_id=ASSET_ID, current_user=None)
+
+    assert len(calls) == 1
+    assert calls[0][0].endswith("/rpc/get_http_probe_stats_aggregate")
+    assert stats.total_probes == 5000
+    assert stats.status_code_distribution == {200: 4000, 404: 1000}
+    assert stats.cdn_usage == {"cloudflare": 1200}
+    assert stats.redirect_chains_count == 700
@@ -0,0 +1,148 @@
+"""
+Tests for Redis stream trimming, backpressure and TTLs.
+"""
+import pytest
+
+from app.core.config import settings
+from app.services.stream_coordinator import StreamCoordinator
+
+
+class FakeStreamRedis:
+    """In-memory stand-in for the handful of stream commands used."""
+
+    def __init__(self):
+        self.streams = {}  # key -> list of entry ids
+        self.groups = {}  # key -> {group: {"last": id, "pending": [ids]}}
+        self.values = {}
+        self.ttls = {}
+
+    def add(self, key, count):
+        entries = self.streams.setdefault(key, [])
+        start = len(entries) + 1 if not entries else int(entries[-1].split("-")[0]) + 1
+        entries.extend(f"{ms}-0" for ms in range(start, start + count))
+
+    def deliver(self, key, group, upto_ms, acked_upto_ms):
+        state = self.groups.setdefault(key, {}).setdefault(group, {"last": "0-0", "pending": []})
+        state["last"] = f"{upto_ms}-0"
+        state["pending"] = [e for e in self.streams[key] if acked_upto_ms < int(e.split("-")[0]) <= upto_ms]
+
+    async def xinfo_groups(self, key):
+        return [
+            {"name": name, "last-delivered-id": g["last"], "pending": len(g["pending"])}
+            for name, g in self.groups.get(key, {}).items()
+        ]
+
+    async def xpending(self, key, group):
+        pending = self.groups[key][group]["pending"]
+        return {"pending": len(pending), "min": pending[0], "max": pending[-1]}
+
+    async def xinfo_stream(self, key):
+        entries = self.streams[key]
+        return {"length": len(entries), "last-entry": (entries[-1], {"type": "completion"}) if entries else None}
+
+    async def xtrim(self, key, minid, approximate=True):
+        bound = tuple(int(p) for p in minid.split("-"))
+        before = len(self.streams[key])
+        self.streams[key] = [e for e in self.streams[key] if tuple(int(p) for p in e.split("-")) >= bound]
+        return before - len(self.streams[key])
+
+    async def xlen(self, key):
+        return len(self.streams.get(key, []))
+
+    async def memory_usage(self, key):
+        return 1000 * len(self.streams.get(key, []))
+
+    async def exists(self, key):
+        return int(key in self.values)
+
+    async def set(self, key, value, ex=None, get=False):
+        previous = self.values.get(key)
+        self.values[key], self.ttls[key] = value, ex
+        return previous if get else True
+
+    async def delete(self, key):
+        return int(self.values.pop(key, None) is not None)
+
+    async def expire(self, key, ttl):
+        if key in self.streams or key in self.values:
+            self.ttls[key] = ttl
+            return True
+        return False
+
+    async def hset(self, key, mapping):
+        self.values.setdefault(key, {}).update(mapping)
+
+    async def hgetall(self, key):
+        return dict(self.values.get(key, {}))
+
+
+@pytest.fixture
+def coordinator():
+    fake = FakeStreamRedis()
+    coordinator = StreamCoordinator()
+
+    async def get_redis():
+        return fake
+
+    coordinator.get_redis = get_redis
+    coordinator.fake = fake
+    return coordinator
+
+
+@pytest.mark.asyncio
+async def test_trim_keeps_unacknowledged_entries(coordinator):
+    fake = coordinator.fake
+    key = "scan:1:subfinder:output"
+    fake.add(key, 100)
+
+    # dnsx has acked 1-60 and holds 61-70 pending; httpx has read up to 80
+    fake.deliver(key, "dnsx-consumers", upto_ms=70, acked_upto_ms=60)
+    assert await coordinator.trim_acknowledged(key, ["dnsx-consumers", "httpx-consumers"]) == 0
+
+    fake.deliver(key, "httpx-consumers", upto_ms=80, acked_upto_ms=80)
+    assert await coordinator.trim_acknowledged(key, ["dnsx-consumers", "httpx-consumers"]) == 60
+    assert fake.streams[key][0] == "61-0"
+
+    # Everything acknowledged: the last entry (completion marker) survives
+    fake.deliver(key, "dnsx-consumers", upto_ms=100, acked_upto_ms=100)
+    fake.deliver(key, "httpx-consumers", upto_ms=100, acked_upto_ms=100)
+    await coordinator.trim_acknowledged(key, ["dnsx-consumers", "httpx-consumers"])
+    assert fake.streams[key] == ["100-0"]
+
+
+@pytest.mark.asyncio
+async def test_backpressure_hysteresis(coordinator, monkeypatch):
+    monkeypatch.setattr(settings, "stream_scan_memory_budget_mb", 1)
+    monkeypatch.setattr(settings, "stream_backpressure_resume_ratio", 0.5)
+    key = coordinator.generate_backpressure_key("scan-1")
+    mb = 1024 * 1024
+
+    assert await coordinator.update_backpressure("scan-1", int(0.8 * mb)) is False
+    assert await coordinator.update_backpressure("scan-1", mb) is True
+    assert coordinator.fake.ttls[key] == settings.stream_backpressure_ttl
+
+    # Between the watermarks the signal stays on, then clears below resume
+    assert await coordinator.update_backpressure("scan-1", int(0.7 * mb)) is True
+    assert await coordinator.update_backpressure("scan-1", int(0.4 * mb)) is False
+    assert key not in coordinator.fake.values
+
+
+@pytest.mark.asyncio
+async def test_memory_report_and_finished_stream_ttl(coordinator):
+    fake = coordinator.fake
+    fake.add("scan:1:subfinder:output", 30)
+    fake.add("scan:2:httpx:output", 10)
+    await coordinator.register_scan_streams("scan-1", {
+        "scan:1:subfinder:output": ["dnsx-consumers"],
+        "scan:2:httpx:output": [],
+    })
+
+    report = await coordinator.get_scan_memory_report("scan-1")
+    assert report["total_bytes"] == 40_000
+    assert report["streams"]["scan:2:httpx:output"] == {"bytes": 10_000, "length": 10}
+    assert report["backpressure"] is False
+
+    await coordinator.update_backpressure("scan-1", 10 ** 12)
+    assert await coordinator.expire_scan_streams("scan-1", ttl=600) == 3
+    assert fake.ttls["scan:1:subfinder:output"] == 600
+    assert coordinator.generate_backpressure_key("scan-1") not in fake.values
@@ -0,0 +1,149 @@
+"""
+Tests for streaming all-subdomain exports (JSON array and NDJSON).
+"""
+import json
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.v1 import assets as assets_api
+from app.api.v1.assets import _stream_subdomains_json, _stream_subdomains_ndjson
+from app.core.dependencies import get_current_user
+from app.schemas.auth import UserResponse
+from app.services.asset_service import AssetService
+
+
+def _service_with_rows(mock_postgrest, total: int, fail_after: int = None):
+    """
+    AssetService backed by a mock PostgREST serving `total` subdomains
+    newest-first; subdomain requests after the first `fail_after` fail.
+    """
+    rows = [
+        {
+            "id": f"{i:06d}",
+            "subdomain": f"s{i}.example.com",
+            "parent_domain": "example.com",
+            "scan_job_id": "job",
+            "discovered_at": f"2026-01-01T00:00:{i % 60:02d}",
+            "last_checked": None,
+            "asset_scan_jobs": {"id": "job", "asset_id": "a1", "status": "completed", "created_at": "t"},
+        }
+        for i in range(total)
+    ]
+    requests = []
+    state = {"pos": 0}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/assets"):
+            return httpx.Response(200, content=json.dumps([{"id": "a1"}]))
+
+        params = request.url.params
+        requests.append(params)
+        if fail_after is not None and len(requests) > fail_after:
+            return httpx.Response(500, content=json.dumps({"message": "statement timeout", "code": "57014"}))
+        limit = int(params["limit"])
+        start = state["pos"] + int(params.get("offset", 0))
+        page = rows[start:start + limit]
+        # The look-ahead row is re-read by the next (cursor) request
+        state["pos"] = start + limit - 1
+        return httpx.Response(200, content=json.dumps(page))
+
+    service = AssetService()
+    service.supabase = mock_postgrest(handler).async_service_client
+    return service, requests
+
+
+@pytest.mark.asyncio
+async def test_iter_all_user_subdomains_uses_bounded_keyset_batches(mock_postgrest):
+    service, requests = _service_with_rows(mock_postgrest, 2500)
+
+    sizes = []
+    ids = []
+    async for batch in service.iter_all_user_subdomains("user", limit=None, batch_size=1000):
+        sizes.append(len(batch))
+        ids.extend(row["id"] for row in batch)
+
+    assert sizes == [1000, 1000, 500]
+    assert len(set(ids)) == 2500
+    assert all(int(p["limit"]) == 1001 for p in requests)
+    # Only the first request starts without a cursor; none use OFFSET
+    assert "or" not in requests[0]
+    assert all("or" in p and "offset" not in p for p in requests[1:])
+
+
+@pytest.mark.asyncio
+async def test_iter_all_user_subdomains_respects_limit_and_flattens(mock_postgrest):
+    service, _ = _service_with_rows(mock_postgrest, 50)
+
+    batches = [b async for b in service.iter_all_user_subdomains("user", limit=25, batch_size=10)]
+    rows = [row for batch in batches for row in batch]
+
+    assert [len(b) for b in batches] == [10, 10, 5]
+    assert "asset_scan_jobs" not in rows[0]
+    assert rows[0]["scan_job_status"] == "completed"
+
+
+async def _batches(*batches):
+    for batch in batches:
+        yield batch
+
+
+@pytest.mark.asyncio
+async def test_json_array_stream_is_valid_json():
+    chunks = [c async for c in _stream_subdomains_json(_batches([{"a": 1}, {"a": 2}], [{"a": 3}]))]
+
+    assert json.loads("".join(chunks)) == [{"a": 1}, {"a": 2}, {"a": 3}]
+    assert json.loads("".join([c async for c in _stream_subdomains_json(_batches())])) == []
+
+
+@pytest.mark.asyncio
+async def test_ndjson_stream_emits_one_row_per_line():
+    body = "".join([c async for c in _stream_subdomains_ndjson(_batches([{"a": 1}], [{"a": 2}]))])
+
+    assert [json.loads(line) for line in body.splitlines()] == [{"a": 1}, {"a": 2}]
+
+
+def _api(monkeypatch, service):
+    monkeypatch.setattr(assets_api, "asset_service", service)
+    app = FastAPI()
+    app.include_router(assets_api.router)
+    app.dependency_overrides[get_current_user] = lambda: UserResponse(id="u1", email="u@example.com", created_at="now")
+    return TestClient(app)
+
+
+def test_failure_before_first_batch_returns_error_status(monkeypatch, mock_postgrest):
+    service, _ = _service_with_rows(mock_postgrest, 50, fail_after=0)
+    api = _api(monkeypatch, service)
+
+    for output in ("json", "ndjson"):
+        response = api.get("/assets/subdomains/all", params={"format": output})
+        assert response.status_code == 500
+        assert "statement timeout" in response.json()["detail"]
+
+
+def test_ndjson_failure_mid_stream_ends_with_error_record(monkeypatch, mock_postgrest):
+    service, _ = _service_with_rows(mock_postgrest, 2500, fail_after=1)
+    api = _api(monkeypatch, service)
+
+    response = api.get("/assets/subdomains/all", params={"format": "ndjson"})
+    lines = [json.loads(line) for line in response.text.splitlines()]
+
+    assert response.status_code == 200
+    assert all("subdomain" in row for row in lines[:-1])
+    assert lines[-1]["rows_streamed"] == len(lines) - 1 == 1000
+    assert "statement timeout" in lines[-1]["error"]
+
+
+@pytest.mark.asyncio
+async def test_json_failure_mid_stream_aborts_without_closing_array():
+    async def failing():
+        yield [{"a": 1}]
+        raise RuntimeError("connection reset")
+
+    chunks = []
+    with pytest.raises(RuntimeError):
+        async for chunk in _stream_subdomains_json(failing()):
+            chunks.append(chunk)
+    assert chunks == ["[", '{"a": 1}']
@@ -0,0 +1,102 @@
+"""
+Tests for local and Docker task runners.
+"""
+import asyncio
+import stat
+
+import pytest
+
+from app.services.batch_workflow_orchestrator import BatchWorkflowOrchestrator
+from app.services.task_runner import LocalTaskRunner, TaskSpec
+
+FAKE_MODULE = """#!/bin/sh
+echo "module=$MODULE_NAME stream=$STREAM_INPUT_KEY"
+env | grep -c '^LEAKED_SECRET=' || true
+sleep "${SLEEP_SECONDS:-0}"
+exit "${EXIT_CODE:-0}"
+"""
+
+
+def _spec(**env):
+    environment = [{"name": "MODULE_NAME", "value": "dnsx"}] + [{"name": k, "value": v} for k, v in env.items()]
+    return TaskSpec(module="dnsx", name="consumer-test", environment=environment, cpu=512, memory=1024)
+
+
+@pytest.fixture
+def bin_dir(tmp_path):
+    binary = tmp_path / "bin" / "dnsx-go"
+    binary.parent.mkdir()
+    binary.write_text(FAKE_MODULE)
+    binary.chmod(binary.stat().st_mode | stat.S_IEXEC)
+    return binary.parent
+
+
+@pytest.mark.asyncio
+async def test_local_runner_runs_binary_with_task_environment(bin_dir, tmp_path, monkeypatch):
+    monkeypatch.setenv("LEAKED_SECRET", "do-not-pass")
+    runner = LocalTaskRunner(mode="subprocess", bin_dir=str(bin_dir), log_dir=str(tmp_path / "logs"))
+
+    [task_arn] = await runner.run(_spec(STREAM_INPUT_KEY="scan:1:subfinder", SLEEP_SECONDS="0.3", EXIT_CODE="3"))
+
+    assert (await runner.describe(task_arn))["status"] == "RUNNING"
+    assert await asyncio.wait_for(runner.wait(task_arn), timeout=5) == 3
+
+    status = await runner.describe(task_arn)
+    assert status["status"] == "STOPPED" and status["exit_code"] == 3 and status["is_healthy"] is False
+
+    [log] = (tmp_path / "logs").iterdir()
+    output = log.read_text().split()
+    assert output[:2] == ["module=dnsx", "stream=scan:1:subfinder"]
+    assert output[2] == "0"  # host environment is not passed through
+
+
+@pytest.mark.asyncio
+async def test_local_runner_stop_and_missing_binary(bin_dir, tmp_path):
+    runner = LocalTaskRunner(mode="subprocess", bin_dir=str(bin_dir), log_dir=str(tmp_path / "logs"))
+
+    task_arns = await runner.run(_spec(SLEEP_SECONDS="30"), count=2)
+    assert len(set(task_arns)) == 2
+    await runner.aclose()
+    assert [(await runner.describe(arn))["status"] for arn in task_arns] == ["STOPPED", "STOPPED"]
+
+    missing = TaskSpec(module="katana", name="x", environment=[], cpu=256, memory=512)
+    with pytest.raises(FileNotFoundError):
+        await runner.run(missing)
+
+
+def test_docker_mode_command():
+    runner = LocalTaskRunner(mode="docker", image_prefix="neobotnet-", log_dir="/tmp")
+    command = runner.command(_spec(STREAM_INPUT_KEY="k"), "dnsx-test")
+
+    assert command[:4] == ["docker", "run", "--rm", "--network"]
+    assert command[command.index("--cpus") + 1] == "0.5"
+    assert command[command.index("--memory") + 1] == "1024m"
+    assert ["-e", "STREAM_INPUT_KEY"] == command[command.index("STREAM_INPUT_KEY") - 1:command.index("STREAM_INPUT_KEY") + 1]
+    assert command[-1] == "neobotnet-dnsx-go"
+    # Values travel in the CLI's environment, not on the command line
+    assert "k" not in command
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_launches_through_configured_runner(bin_dir, tmp_path):
+    from app.schemas.batch import BatchScanJob
+
+    job = BatchScanJob(
+        id="00000000-0000-0000-0000-0000000000d1", user_id="00000000-0000-0000-0000-0000000000b1",
+        module="dnsx", created_at="2026-01-16T00:00:00Z"
+    )
+    orchestrator = BatchWorkflowOrchestrator()
+    orchestrator.ecs_client = None
+
+    mocked = await orchestrator._launch_streaming_task(job, [], "consumer")
+    assert mocked["status"] == "mock_launched"
+    assert mocked["task_arn"].endswith(f"mock-consumer-{job.id}")
+
+    orchestrator.task_runner = LocalTaskRunner(mode="subprocess", bin_dir=str(bin_dir), log_dir=str(tmp_path / "logs"))
+    launched = await orchestrator._launch_streaming_task(job, [{"name": "MODULE_NAME", "value": "dnsx"}], "consumer")
+
+    assert launched["status"] == "launched"
+    assert launched["task_arn"].startswith("local:subprocess/dnsx-consumer-")
+    await orchestrator.task_runner.wait(launched["task_arn"])
+    status = await orchestrator.get_task_status(launched["task_arn"])
+    assert status["status"] == "STOPPED" and status["exit_code"] == 0
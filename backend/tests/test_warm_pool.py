@@ -0,0 +1,200 @@
+"""
+Tests for the warm worker pool.
+"""
+import json
+
+import pytest
+
+from app.core.config import settings
+from app.schemas.batch import BatchScanJob
+from app.services.warm_pool import WarmPool
+
+NOW = 1_800_000_000.0
+
+
+class FakePoolRedis:
+    """In-memory stand-in for the Redis commands the warm pool uses."""
+
+    def __init__(self):
+        self.hashes = {}
+        self.zsets = {}
+        self.strings = {}
+        self.streams = {}
+        self.on_xadd = None
+
+    async def zpopmax(self, key):
+        zset = self.zsets.get(key, {})
+        if not zset:
+            return []
+        member = max(zset, key=zset.get)
+        return [(member, zset.pop(member))]
+
+    async def zadd(self, key, mapping):
+        self.zsets.setdefault(key, {}).update(mapping)
+
+    async def zcount(self, key, low, high):
+        return sum(1 for score in self.zsets.get(key, {}).values() if score >= low)
+
+    async def zcard(self, key):
+        return len(self.zsets.get(key, {}))
+
+    async def zremrangebyscore(self, key, low, high):
+        zset = self.zsets.get(key, {})
+        for member in [m for m, score in zset.items() if score <= high]:
+            del zset[member]
+
+    async def delete(self, key):
+        self.zsets.pop(key, None)
+
+    async def hset(self, key, mapping):
+        self.hashes.setdefault(key, {}).update({k: str(v) for k, v in mapping.items()})
+
+    async def hsetnx(self, key, field, value):
+        record = self.hashes.setdefault(key, {})
+        if field in record:
+            return False
+        record[field] = value
+        return True
+
+    async def hexists(self, key, field):
+        return field in self.hashes.get(key, {})
+
+    async def hgetall(self, key):
+        return dict(self.hashes.get(key, {}))
+
+    async def hincrby(self, key, field, amount):
+        record = self.hashes.setdefault(key, {})
+        record[field] = str(int(record.get(field, 0)) + amount)
+
+    async def expire(self, key, ttl):
+        return True
+
+    async def set(self, key, value, **kwargs):
+        self.strings[key] = str(value)
+        return True
+
+    async def get(self, key):
+        return self.strings.get(key)
+
+    async def xadd(self, key, fields):
+        self.streams.setdefault(key, []).append(fields)
+        if self.on_xadd:
+            await self.on_xadd(fields)
+
+
+def _job(module="dnsx"):
+    return BatchScanJob(
+        id="00000000-0000-0000-0000-0000000000d1", user_id="00000000-0000-0000-0000-0000000000b1",
+        module=module, created_at="2026-01-16T00:00:00Z"
+    )
+
+
+@pytest.fixture
+def fake():
+    return FakePoolRedis()
+
+
+@pytest.fixture
+def pool(fake):
+    async def provider():
+        return fake
+    return WarmPool(enabled=True, modules=["dnsx"], redis_provider=provider, clock=lambda: NOW)
+
+
+def _worker_takes_assignments(fake, worker_id="dnsx-w1"):
+    async def take(fields):
+        await fake.hsetnx(f"warmpool:assignment:{fields['assignment_id']}", "taken", worker_id)
+    fake.on_xadd = take
+
+
+@pytest.mark.asyncio
+async def test_consumer_goes_to_idle_warm_worker(fake, pool, monkeypatch):
+    from app.services import batch_workflow_orchestrator as orchestrator_module
+    from app.services.batch_workflow_orchestrator import BatchWorkflowOrchestrator
+    from app.services.stream_coordinator import stream_coordinator
+
+    async def create_consumer_group(stream_key, group):
+        return True
+
+    async def consumer_env(*args, **kwargs):
+        return [{"name": "STREAM_INPUT_KEY", "value": "scan:1:subfinder:output"}]
+
+    monkeypatch.setattr(stream_coordinator, "create_consumer_group", create_consumer_group)
+    monkeypatch.setattr(orchestrator_module, "warm_pool", pool)
+    orchestrator = BatchWorkflowOrchestrator()
+    orchestrator.ecs_client = None
+    monkeypatch.setattr(orchestrator, "_build_streaming_consumer_environment", consumer_env)
+
+    fake.zsets["warmpool:dnsx:idle"] = {"dnsx-w1": NOW - 5}
+    _worker_takes_assignments(fake)
+
+    result = await orchestrator.launch_streaming_consumer(_job(), "scan:1:subfinder:output", "dnsx-consumers", "dnsx-1")
+    assert result["task_arn"].startswith("warm:dnsx:")
+    [assignment] = fake.streams["warmpool:dnsx:assignments:dnsx-w1"]
+    assert json.loads(assignment["environment"]) == await consumer_env()
+    assert fake.zsets["warmpool:dnsx:idle"] == {}
+    # Only the claimed worker's stream carries the assignment
+    assert list(fake.streams) == ["warmpool:dnsx:assignments:dnsx-w1"]
+
+    # Pool empty now: falls back to an on-demand launch
+    result = await orchestrator.launch_streaming_consumer(_job(), "scan:1:subfinder:output", "dnsx-consumers", "dnsx-2")
+    assert "mock-consumer" in result["task_arn"]
+    assert sum(int(n) for n in fake.hashes["warmpool:dnsx:demand"].values()) == 2
+
+
+@pytest.mark.asyncio
+async def test_stale_worker_and_unclaimed_assignment_fall_back(fake, pool, monkeypatch):
+    fake.zsets["warmpool:dnsx:idle"] = {"dnsx-dead": NOW - 600}
+    assert await pool.assign(_job(), []) is None
+    assert fake.streams == {}
+
+    # Claimed worker never takes the assignment: it is withdrawn
+    monkeypatch.setattr(settings, "warm_pool_pickup_timeout", 0.3)
+    fake.zsets["warmpool:dnsx:idle"] = {"dnsx-w1": NOW - 1}
+    assert await pool.assign(_job(), []) is None
+    [assignment] = fake.streams["warmpool:dnsx:assignments:dnsx-w1"]
+    assert fake.hashes[f"warmpool:assignment:{assignment['assignment_id']}"]["taken"] == "api"
+
+    # Modules outside the pool are never assigned
+    assert await pool.assign(_job("subfinder"), []) is None
+
+
+@pytest.mark.asyncio
+async def test_target_follows_recent_demand_and_reconcile(fake, pool, monkeypatch):
+    monkeypatch.setattr(settings, "warm_pool_min_size", 1)
+    monkeypatch.setattr(settings, "warm_pool_max_size", 6)
+    minute = int(NOW // 60)
+    fake.hashes["warmpool:dnsx:demand"] = {
+        str(minute - 120): "50",  # outside the 1h window
+        str(minute - 10): "4",
+        str(minute): "2",
+    }
+    assert await pool.target_size("dnsx") == 4
+
+    fake.zsets["warmpool:dnsx:workers"] = {"dnsx-w1": NOW - 5, "dnsx-gone": NOW - 600}
+    launched = []
+
+    async def launcher(module, count):
+        launched.append((module, count))
+        return [f"arn:task/{module}-{i}" for i in range(count)]
+
+    report = await pool.reconcile(launcher)
+    assert report["dnsx"] == {"target": 4, "live": 1, "starting": 0, "launched": 3}
+    assert fake.strings["warmpool:dnsx:target"] == "4"
+
+    # Booting workers count as live: nothing more to launch
+    report = await pool.reconcile(launcher)
+    assert report["dnsx"]["launched"] == 0 and launched == [("dnsx", 3)]
+
+    fake.hashes["warmpool:dnsx:demand"] = {str(minute): "40"}
+    assert await pool.target_size("dnsx") == 6
+
+
+@pytest.mark.asyncio
+async def test_describe_assignment(fake, pool):
+    fake.hashes["warmpool:assignment:abc"] = {"status": "ASSIGNED", "claimed_worker": "dnsx-w1"}
+    assert (await pool.describe("warm:dnsx:abc"))["status"] == "PENDING"
+
+    fake.hashes["warmpool:assignment:abc"].update(status="STOPPED", exit_code="0", worker="dnsx-w1")
+    status = await pool.describe("warm:dnsx:abc")
+    assert status["status"] == "STOPPED" and status["exit_code"] == 0 and status["is_healthy"] is True
@@ -3,6 +3,8 @@ Programs (Assets) Command Module
 
 Manage bug bounty programs and their domains.
 """
+import sys
+import asyncio
 import typer
 from pathlib import Path
 from typing import Optional, List
@@ -14,6 +16,9 @@ import uuid
 app = typer.Typer(help="Program (asset) management")
 console = Console()
 
+# Backend checkout next to the CLI (the CLI is installed editable from the repo)
+BACKEND_DIR = Path(__file__).resolve().parents[3] / "backend"
+
 
 def read_domains_from_file(file_path: Path) -> List[str]:
     """Read domains from a file, one per line."""
@@ -31,6 +36,20 @@ def read_domains_from_file(file_path: Path) -> List[str]:
     return list(set(domains))  # Deduplicate
 
 
+def ingest_domains(client, asset_id: str, domains: List[str]) -> dict:
+    """
+    Insert domains in chunks via the bulk_insert_apex_domains RPC.
+    
+    Uses the backend's shared ingest helper (app.utils.domains), the same
+    loop the API and the ECS orchestrator run.
+    """
+    if str(BACKEND_DIR) not in sys.path:
+        sys.path.insert(0, str(BACKEND_DIR))
+    from app.utils.domains import ingest_domains as bulk_ingest
+    
+    return asyncio.run(bulk_ingest(client, asset_id, domains))
+
+
 @app.command("list")
 def list_programs(
     limit: int = typer.Option(50, "--limit", "-l", help="Maximum programs to display")
@@ -200,34 +219,15 @@ def add_program(
         
         # Add domains
         if domain_list:
-            # Get existing domains
-            existing_domains = client.table('apex_domains').select('domain').eq('asset_id', asset_id).execute()
-            existing_set = {d['domain'].lower() for d in (existing_domains.data or [])}
+            result = ingest_domains(client, asset_id, domain_list)
             
-            # Filter new domains
-            new_domains = [d for d in domain_list if d.lower() not in existing_set]
+            if result['inserted']:
+                console.print(f"[green]   Added {result['inserted']} domains[/green]")
             
-            if new_domains:
-                domain_records = [
-                    {
-                        'id': str(uuid.uuid4()),
-                        'asset_id': asset_id,
-                        'domain': d,
-                        'is_active': True,
-                        'created_at': datetime.utcnow().isoformat(),
-                        'updated_at': datetime.utcnow().isoformat()
-                    }
-                    for d in new_domains
-                ]
-                
-                client.table('apex_domains').insert(domain_records).execute()
-                console.print(f"[green]   Added {len(new_domains)} domains[/green]")
-                
-                if len(domain_list) > len(new_domains):
-                    skipped = len(domain_list) - len(new_domains)
-                    console.print(f"[dim]   Skipped {skipped} existing domains[/dim]")
-            else:
-                console.print("[dim]   All domains already exist[/dim]")
+            if result['skipped']:
+                console.print(f"[dim]   Skipped {result['skipped']} existing domains[/dim]")
+            if result['invalid']:
+                console.print(f"[yellow]   Rejected {result['invalid']} invalid domains[/yellow]")
         
         console.print(f"\n[bold]Program ID: {asset_id}[/bold]")
         
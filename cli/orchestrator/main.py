@@ -101,34 +101,26 @@ async def add_domains_to_program(
     asset_id: str,
     domains: List[str]
 ):
-    """Add domains to a program (skips existing)."""
-    
-    # Get existing domains
-    existing = supabase_client.table('apex_domains').select('domain').eq('asset_id', asset_id).execute()
-    existing_domains = {d['domain'].lower() for d in (existing.data or [])}
-    
-    # Filter to only new domains
-    new_domains = [d for d in domains if d.lower() not in existing_domains]
-    
-    if not new_domains:
-        logger.info(f"📋 All {len(domains)} domains already exist for this program")
-        return
-    
-    # Insert new domains
-    domain_records = [
-        {
-            'id': str(uuid.uuid4()),
-            'asset_id': asset_id,
-            'domain': domain.lower().strip(),
-            'is_active': True,
-            'created_at': datetime.utcnow().isoformat(),
-            'updated_at': datetime.utcnow().isoformat()
-        }
-        for domain in new_domains
-    ]
-    
-    supabase_client.table('apex_domains').insert(domain_records).execute()
-    logger.info(f"✅ Added {len(new_domains)} new domains (skipped {len(domains) - len(new_domains)} existing)")
+    """
+    Add domains to a program (skips existing).
+    
+    Domains are normalized and deduped locally, then inserted in chunks via
+    the bulk_insert_apex_domains RPC (same helper as the API and CLI).
+    """
+    from app.utils.domains import ingest_domains
+    
+    result = await ingest_domains(supabase_client, asset_id, domains)
+    
+    if result['invalid_domains']:
+        logger.warning(
+            f"⚠️ Ignoring {len(result['invalid_domains'])} invalid domains: "
+            f"{', '.join(result['invalid_domains'][:10])}"
+        )
+    
+    logger.info(
+        f"✅ Domains for program: {result['inserted']} added, "
+        f"{result['skipped']} already existed, {result['invalid']} rejected"
+    )
 
 
 async def run_scan_pipeline(
@@ -0,0 +1,77 @@
+-- ============================================================================
+-- Migration: Add (sort_column, id) indexes for keyset cursor pagination
+-- Date: 2026-01-16
+--
+-- Problem: List endpoints paginated with OFFSET, so page N made PostgreSQL
+-- walk and discard N * per_page rows. Deep pages on dns_records/urls (2M+
+-- rows) timed out, and DNS offsets had to be capped at 5000.
+--
+-- Solution: List endpoints now use keyset pagination:
+--   ORDER BY <sort> DESC NULLS LAST, id DESC
+--   WHERE <sort> < :v OR (<sort> = :v AND id < :id)
+-- Each index below matches that ordering exactly so every page is a single
+-- index range scan, regardless of depth.
+-- ============================================================================
+
+-- ============================================================================
+-- Global (unfiltered) list endpoints
+-- ============================================================================
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_dns_records_keyset
+ON public.dns_records (resolved_at DESC NULLS LAST, id DESC);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_subdomains_keyset
+ON public.subdomains (discovered_at DESC NULLS LAST, id DESC);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_urls_keyset
+ON public.urls (first_discovered_at DESC NULLS LAST, id DESC);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_http_probes_keyset
+ON public.http_probes (created_at DESC NULLS LAST, id DESC);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_assets_keyset
+ON public.assets (created_at DESC NULLS LAST, id DESC);
+
+-- ============================================================================
+-- Per-asset list endpoints (asset_id equality + keyset order)
+-- ============================================================================
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_dns_records_asset_keyset
+ON public.dns_records (asset_id, resolved_at DESC NULLS LAST, id DESC);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_urls_asset_keyset
+ON public.urls (asset_id, first_discovered_at DESC NULLS LAST, id DESC);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_http_probes_asset_keyset
+ON public.http_probes (asset_id, created_at DESC NULLS LAST, id DESC);
+
+-- ============================================================================
+-- Grouped DNS view (keyset on last_resolved_at, subdomain)
+-- ============================================================================
+CREATE INDEX IF NOT EXISTS idx_subdomain_current_dns_keyset
+ON public.subdomain_current_dns (last_resolved_at DESC NULLS LAST, subdomain DESC);
+
+-- ============================================================================
+-- Verification
+-- ============================================================================
+DO $$
+DECLARE
+    idx_count INTEGER;
+BEGIN
+    SELECT COUNT(*) INTO idx_count
+    FROM pg_indexes
+    WHERE indexname LIKE 'idx_%_keyset';
+
+    IF idx_count >= 9 THEN
+        RAISE NOTICE '✅ Keyset pagination indexes created successfully (%)', idx_count;
+    ELSE
+        RAISE WARNING '❌ Expected 9 keyset indexes, found %', idx_count;
+    END IF;
+END;
+$$;
+
+-- ============================================================================
+-- Test after applying (should be an Index Scan, no Sort node):
+--   EXPLAIN SELECT id FROM dns_records
+--   WHERE resolved_at < '2026-01-01' OR (resolved_at = '2026-01-01' AND id < '...')
+--   ORDER BY resolved_at DESC NULLS LAST, id DESC
+--   LIMIT 51;
+-- ============================================================================
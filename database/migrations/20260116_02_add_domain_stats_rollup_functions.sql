@@ -0,0 +1,73 @@
+-- ============================================================================
+-- Migration: Add grouped rollup functions for apex domain statistics
+-- Date: 2026-01-16
+-- Purpose: Fix N+1 queries in AssetService.get_paginated_asset_domains
+--          Current: 1 subdomain COUNT + 1 asset_scan_jobs fetch per domain
+--                   (~201 round trips for a 100-domain page)
+--          After: 1 grouped subdomain count + 1 scan-status rollup
+--                 (3 round trips per page, independent of page size)
+-- ============================================================================
+
+-- ============================================================================
+-- STEP 1: Subdomain counts grouped by parent_domain
+-- Uses idx on subdomains(parent_domain) - one index scan per requested domain
+-- ============================================================================
+CREATE OR REPLACE FUNCTION public.get_subdomain_counts_by_parent_domain(p_domains TEXT[])
+RETURNS TABLE (parent_domain TEXT, subdomain_count BIGINT)
+LANGUAGE sql
+STABLE
+SECURITY DEFINER
+SET search_path = public
+AS $$
+    SELECT s.parent_domain, COUNT(*)::BIGINT AS subdomain_count
+    FROM public.subdomains s
+    WHERE s.parent_domain = ANY(p_domains)
+    GROUP BY s.parent_domain;
+$$;
+
+COMMENT ON FUNCTION public.get_subdomain_counts_by_parent_domain(TEXT[]) IS
+    'Subdomain counts for a page of apex domains in one grouped query. Domains with no subdomains are omitted.';
+
+-- ============================================================================
+-- STEP 2: Scan status rollup per asset
+-- Aggregates asset_scan_jobs server-side instead of shipping every row
+-- ============================================================================
+CREATE OR REPLACE FUNCTION public.get_asset_scan_status_rollup(p_asset_ids UUID[])
+RETURNS TABLE (
+    asset_id UUID,
+    total_scans BIGINT,
+    completed_scans BIGINT,
+    running_scans BIGINT
+)
+LANGUAGE sql
+STABLE
+SECURITY DEFINER
+SET search_path = public
+AS $$
+    SELECT
+        j.asset_id,
+        COUNT(*)::BIGINT AS total_scans,
+        COUNT(*) FILTER (WHERE LOWER(j.status) = 'completed')::BIGINT AS completed_scans,
+        COUNT(*) FILTER (WHERE LOWER(j.status) IN ('running', 'pending'))::BIGINT AS running_scans
+    FROM public.asset_scan_jobs j
+    WHERE j.asset_id = ANY(p_asset_ids)
+    GROUP BY j.asset_id;
+$$;
+
+COMMENT ON FUNCTION public.get_asset_scan_status_rollup(UUID[]) IS
+    'Scan totals and completed/running breakdown per asset from asset_scan_jobs.';
+
+-- ============================================================================
+-- STEP 3: Permissions (backend calls these with the service role)
+-- ============================================================================
+GRANT EXECUTE ON FUNCTION public.get_subdomain_counts_by_parent_domain(TEXT[]) TO authenticated, service_role;
+GRANT EXECUTE ON FUNCTION public.get_asset_scan_status_rollup(UUID[]) TO authenticated, service_role;
+
+-- ============================================================================
+-- Supporting indexes
+-- ============================================================================
+CREATE INDEX IF NOT EXISTS idx_subdomains_parent_domain
+ON public.subdomains (parent_domain);
+
+CREATE INDEX IF NOT EXISTS idx_asset_scan_jobs_asset_status
+ON public.asset_scan_jobs (asset_id, status);
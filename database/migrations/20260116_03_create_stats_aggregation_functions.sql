@@ -0,0 +1,180 @@
+-- ============================================================================
+-- Migration: Create single-pass stats aggregation functions
+-- Date: 2026-01-16
+-- Purpose: Exact, single-round-trip stats for filtered /urls/stats and
+--          /http-probes/stats/summary
+--          Current: 5-6 count="exact" queries + 1000-row Python samples
+--                   (distributions wrong for large assets)
+--          After: 1 RPC per request; filtered rows are scanned once and all
+--                 counters and top-N distributions are computed in SQL
+-- ============================================================================
+
+-- ============================================================================
+-- STEP 1: URL stats aggregation
+-- Filters are optional (NULL = no filter) and use the asset_id / scan_job_id
+-- indexes. The filtered set is materialized once and reused by every
+-- aggregate below.
+-- ============================================================================
+CREATE OR REPLACE FUNCTION public.get_url_stats_aggregate(
+    p_asset_id UUID DEFAULT NULL,
+    p_scan_job_id UUID DEFAULT NULL,
+    p_top_n INTEGER DEFAULT 10
+)
+RETURNS JSONB
+LANGUAGE sql
+STABLE
+SECURITY DEFINER
+SET search_path = public
+AS $$
+    WITH filtered AS MATERIALIZED (
+        SELECT domain, is_alive, resolved_at, has_params, status_code,
+               file_extension, sources, technologies
+        FROM public.urls
+        WHERE (p_asset_id IS NULL OR asset_id = p_asset_id)
+          AND (p_scan_job_id IS NULL OR scan_job_id = p_scan_job_id)
+    ),
+    counters AS (
+        SELECT
+            COUNT(*) AS total_urls,
+            COUNT(*) FILTER (WHERE is_alive = true) AS alive_urls,
+            COUNT(*) FILTER (WHERE is_alive = false) AS dead_urls,
+            COUNT(*) FILTER (WHERE resolved_at IS NULL) AS pending_urls,
+            COUNT(*) FILTER (WHERE has_params = true) AS urls_with_params,
+            COUNT(DISTINCT domain) AS unique_domains
+        FROM filtered
+    ),
+    top_sources AS (
+        SELECT source, COUNT(*) AS count
+        FROM filtered, jsonb_array_elements_text(
+            CASE WHEN jsonb_typeof(sources) = 'array' THEN sources ELSE '[]'::jsonb END
+        ) AS source
+        GROUP BY source
+        ORDER BY count DESC, source
+        LIMIT p_top_n
+    ),
+    top_status_codes AS (
+        SELECT status_code, COUNT(*) AS count
+        FROM filtered
+        WHERE status_code IS NOT NULL
+        GROUP BY status_code
+        ORDER BY count DESC, status_code
+        LIMIT p_top_n
+    ),
+    top_technologies AS (
+        SELECT tech AS name, COUNT(*) AS count
+        FROM filtered, jsonb_array_elements_text(
+            CASE WHEN jsonb_typeof(technologies) = 'array' THEN technologies ELSE '[]'::jsonb END
+        ) AS tech
+        GROUP BY tech
+        ORDER BY count DESC, tech
+        LIMIT p_top_n
+    ),
+    top_extensions AS (
+        SELECT file_extension AS extension, COUNT(*) AS count
+        FROM filtered
+        WHERE file_extension IS NOT NULL
+        GROUP BY file_extension
+        ORDER BY count DESC, file_extension
+        LIMIT p_top_n
+    )
+    SELECT jsonb_build_object(
+        'total_urls', c.total_urls,
+        'alive_urls', c.alive_urls,
+        'dead_urls', c.dead_urls,
+        'pending_urls', c.pending_urls,
+        'urls_with_params', c.urls_with_params,
+        'unique_domains', c.unique_domains,
+        'top_sources', COALESCE((SELECT jsonb_agg(to_jsonb(s) ORDER BY s.count DESC, s.source) FROM top_sources s), '[]'::jsonb),
+        'top_status_codes', COALESCE((SELECT jsonb_agg(to_jsonb(s) ORDER BY s.count DESC, s.status_code) FROM top_status_codes s), '[]'::jsonb),
+        'top_technologies', COALESCE((SELECT jsonb_agg(to_jsonb(t) ORDER BY t.count DESC, t.name) FROM top_technologies t), '[]'::jsonb),
+        'top_file_extensions', COALESCE((SELECT jsonb_agg(to_jsonb(e) ORDER BY e.count DESC, e.extension) FROM top_extensions e), '[]'::jsonb)
+    )
+    FROM counters c;
+$$;
+
+COMMENT ON FUNCTION public.get_url_stats_aggregate(UUID, UUID, INTEGER) IS
+    'Exact URL counters and top-N distributions (sources, status codes, technologies, extensions) for an optional asset/scan filter in one call.';
+
+-- ============================================================================
+-- STEP 2: HTTP probe stats aggregation
+-- ============================================================================
+CREATE OR REPLACE FUNCTION public.get_http_probe_stats_aggregate(
+    p_asset_id UUID DEFAULT NULL,
+    p_scan_job_id UUID DEFAULT NULL,
+    p_top_n INTEGER DEFAULT 10
+)
+RETURNS JSONB
+LANGUAGE sql
+STABLE
+SECURITY DEFINER
+SET search_path = public
+AS $$
+    WITH filtered AS MATERIALIZED (
+        SELECT status_code, webserver, technologies, cdn_name, chain_status_codes
+        FROM public.http_probes
+        WHERE (p_asset_id IS NULL OR asset_id = p_asset_id)
+          AND (p_scan_job_id IS NULL OR scan_job_id = p_scan_job_id)
+    ),
+    counters AS (
+        SELECT
+            COUNT(*) AS total_probes,
+            COUNT(*) FILTER (
+                WHERE jsonb_typeof(chain_status_codes) = 'array'
+                  AND jsonb_array_length(chain_status_codes) > 0
+            ) AS redirect_chains_count
+        FROM filtered
+    ),
+    status_codes AS (
+        SELECT status_code, COUNT(*) AS count
+        FROM filtered
+        WHERE status_code IS NOT NULL
+        GROUP BY status_code
+    ),
+    top_technologies AS (
+        SELECT tech AS name, COUNT(*) AS count
+        FROM filtered, jsonb_array_elements_text(
+            CASE WHEN jsonb_typeof(technologies) = 'array' THEN technologies ELSE '[]'::jsonb END
+        ) AS tech
+        GROUP BY tech
+        ORDER BY count DESC, tech
+        LIMIT p_top_n
+    ),
+    top_servers AS (
+        SELECT webserver AS name, COUNT(*) AS count
+        FROM filtered
+        WHERE webserver IS NOT NULL
+        GROUP BY webserver
+        ORDER BY count DESC, webserver
+        LIMIT p_top_n
+    ),
+    cdns AS (
+        SELECT cdn_name, COUNT(*) AS count
+        FROM filtered
+        WHERE cdn_name IS NOT NULL
+        GROUP BY cdn_name
+    )
+    SELECT jsonb_build_object(
+        'total_probes', c.total_probes,
+        'redirect_chains_count', c.redirect_chains_count,
+        'status_code_distribution', COALESCE((SELECT jsonb_object_agg(s.status_code::TEXT, s.count) FROM status_codes s), '{}'::jsonb),
+        'top_technologies', COALESCE((SELECT jsonb_agg(to_jsonb(t) ORDER BY t.count DESC, t.name) FROM top_technologies t), '[]'::jsonb),
+        'top_servers', COALESCE((SELECT jsonb_agg(to_jsonb(s) ORDER BY s.count DESC, s.name) FROM top_servers s), '[]'::jsonb),
+        'cdn_usage', COALESCE((SELECT jsonb_object_agg(d.cdn_name, d.count) FROM cdns d), '{}'::jsonb)
+    )
+    FROM counters c;
+$$;
+
+COMMENT ON FUNCTION public.get_http_probe_stats_aggregate(UUID, UUID, INTEGER) IS
+    'Exact HTTP probe counters, status/CDN distributions and top-N technologies/servers for an optional asset/scan filter in one call.';
+
+-- ============================================================================
+-- STEP 3: Permissions
+-- ============================================================================
+GRANT EXECUTE ON FUNCTION public.get_url_stats_aggregate(UUID, UUID, INTEGER) TO authenticated, service_role;
+GRANT EXECUTE ON FUNCTION public.get_http_probe_stats_aggregate(UUID, UUID, INTEGER) TO authenticated, service_role;
+
+-- ============================================================================
+-- Test after applying:
+--   SELECT public.get_url_stats_aggregate('<asset-uuid>'::uuid);
+--   SELECT public.get_http_probe_stats_aggregate(NULL, '<scan-job-uuid>'::uuid, 5);
+-- ============================================================================
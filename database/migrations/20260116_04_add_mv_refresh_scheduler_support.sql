@@ -0,0 +1,137 @@
+-- ============================================================================
+-- Migration: Materialized view refresh scheduler support
+-- Date: 2026-01-16
+-- Problem: MVs are only refreshed by pg_cron every 15 minutes, so dashboards
+--          lag behind finished scans; nothing records when a view was last
+--          refreshed, and overlapping refreshes (cron + backend) are possible
+-- Solution: One entry point per view group guarded by an advisory lock,
+--           a state table recording last refresh per group, and a status
+--           function exposing staleness. The backend scheduler and pg_cron
+--           both go through the same entry point.
+-- ============================================================================
+
+-- ============================================================================
+-- STEP 1: Refresh state per view group
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS public.mv_refresh_state (
+    view_group TEXT PRIMARY KEY,
+    last_refreshed_at TIMESTAMPTZ,
+    last_duration_ms INTEGER,
+    refresh_count BIGINT NOT NULL DEFAULT 0
+);
+
+COMMENT ON TABLE public.mv_refresh_state IS
+    'Last successful refresh per materialized view group (lightweight, dns, url).';
+
+-- ============================================================================
+-- STEP 2: Guarded refresh entry point
+-- pg_try_advisory_xact_lock makes concurrent callers (API tasks, pg_cron)
+-- skip instead of queueing a second refresh of the same group. The lock is
+-- released when the calling transaction ends.
+-- ============================================================================
+CREATE OR REPLACE FUNCTION public.refresh_view_group(p_group TEXT)
+RETURNS JSONB
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path TO 'public'
+AS $$
+DECLARE
+    start_time TIMESTAMPTZ;
+    duration_ms INTEGER;
+BEGIN
+    IF NOT pg_try_advisory_xact_lock(hashtext('mv_refresh:' || p_group)) THEN
+        RETURN jsonb_build_object('view_group', p_group, 'refreshed', false, 'reason', 'locked');
+    END IF;
+
+    start_time := clock_timestamp();
+
+    CASE p_group
+        WHEN 'lightweight' THEN PERFORM public.refresh_lightweight_views();
+        WHEN 'dns' THEN PERFORM public.refresh_dns_views();
+        WHEN 'url' THEN PERFORM public.refresh_url_views();
+        ELSE RAISE EXCEPTION 'Unknown materialized view group: %', p_group;
+    END CASE;
+
+    duration_ms := (EXTRACT(EPOCH FROM clock_timestamp() - start_time) * 1000)::INTEGER;
+
+    INSERT INTO public.mv_refresh_state (view_group, last_refreshed_at, last_duration_ms, refresh_count)
+    VALUES (p_group, NOW(), duration_ms, 1)
+    ON CONFLICT (view_group) DO UPDATE
+        SET last_refreshed_at = EXCLUDED.last_refreshed_at,
+            last_duration_ms = EXCLUDED.last_duration_ms,
+            refresh_count = public.mv_refresh_state.refresh_count + 1;
+
+    RETURN jsonb_build_object('view_group', p_group, 'refreshed', true, 'duration_ms', duration_ms);
+END;
+$$;
+
+COMMENT ON FUNCTION public.refresh_view_group(TEXT) IS
+    'Refreshes one MV group (lightweight | dns | url) unless another session is already refreshing it; records the refresh in mv_refresh_state.';
+
+-- ============================================================================
+-- STEP 3: Staleness per view group
+-- ============================================================================
+CREATE OR REPLACE FUNCTION public.get_mv_refresh_status()
+RETURNS TABLE (
+    view_group TEXT,
+    last_refreshed_at TIMESTAMPTZ,
+    last_duration_ms INTEGER,
+    refresh_count BIGINT,
+    staleness_seconds INTEGER
+)
+LANGUAGE sql
+STABLE
+SECURITY DEFINER
+SET search_path TO 'public'
+AS $$
+    SELECT
+        s.view_group,
+        s.last_refreshed_at,
+        s.last_duration_ms,
+        s.refresh_count,
+        (EXTRACT(EPOCH FROM NOW() - s.last_refreshed_at))::INTEGER AS staleness_seconds
+    FROM public.mv_refresh_state s
+    ORDER BY s.view_group;
+$$;
+
+-- ============================================================================
+-- STEP 4: Route the pg_cron job through the guarded entry point
+-- The cron schedule stays as a safety net; it now skips groups the backend
+-- is refreshing and keeps mv_refresh_state accurate.
+-- ============================================================================
+CREATE OR REPLACE FUNCTION public.refresh_dashboard_views()
+RETURNS void
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path TO 'public'
+AS $$
+DECLARE
+    start_time TIMESTAMP;
+    end_time TIMESTAMP;
+BEGIN
+    start_time := clock_timestamp();
+
+    PERFORM public.refresh_view_group('lightweight');
+    PERFORM public.refresh_view_group('dns');
+    PERFORM public.refresh_view_group('url');
+
+    end_time := clock_timestamp();
+
+    RAISE NOTICE 'All materialized views refreshed at % (duration: %)',
+        NOW(),
+        end_time - start_time;
+END;
+$$;
+
+-- ============================================================================
+-- STEP 5: Permissions
+-- ============================================================================
+REVOKE ALL ON FUNCTION public.refresh_view_group(TEXT) FROM PUBLIC;
+GRANT EXECUTE ON FUNCTION public.refresh_view_group(TEXT) TO service_role;
+GRANT EXECUTE ON FUNCTION public.get_mv_refresh_status() TO authenticated, service_role;
+
+-- ============================================================================
+-- Test after applying:
+--   SELECT public.refresh_view_group('lightweight');
+--   SELECT * FROM public.get_mv_refresh_status();
+-- ============================================================================
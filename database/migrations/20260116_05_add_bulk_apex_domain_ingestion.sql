@@ -0,0 +1,89 @@
+-- ============================================================================
+-- Migration: Bulk apex domain ingestion
+-- Date: 2026-01-16
+-- Problem: Onboarding a program inserts apex domains one row per request
+--          (API) or downloads every existing domain to diff in Python
+--          (CLI, ECS orchestrator). Programs with 5-20k wildcard roots take
+--          minutes to onboard.
+-- Solution: One set-based RPC that normalizes, validates, dedupes and inserts
+--           a whole chunk of domains in a single statement, returning
+--           inserted/skipped/invalid counts. The API, `neobotnet programs add`
+--           and the orchestrator all call it.
+-- ============================================================================
+
+-- ============================================================================
+-- STEP 1: Index for the existence check
+-- apex_domains has no unique constraint on (asset_id, domain) and existing
+-- rows may contain case variants, so duplicates are excluded with an
+-- anti-join on lower(domain) instead of ON CONFLICT.
+-- ============================================================================
+CREATE INDEX IF NOT EXISTS idx_apex_domains_asset_lower_domain
+    ON public.apex_domains (asset_id, lower(domain));
+
+-- ============================================================================
+-- STEP 2: Bulk insert function
+-- Normalization matches app/utils/domains.py: trim, lowercase, strip a
+-- leading "*." wildcard and a trailing dot. Invalid domains are counted
+-- instead of failing the valid_domain CHECK for the whole chunk.
+-- The per-asset advisory lock serializes concurrent ingests for the same
+-- asset so the anti-join cannot race into duplicate rows.
+-- ============================================================================
+CREATE OR REPLACE FUNCTION public.bulk_insert_apex_domains(
+    p_asset_id UUID,
+    p_domains TEXT[]
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path TO 'public'
+AS $$
+DECLARE
+    v_submitted INTEGER := COALESCE(array_length(p_domains, 1), 0);
+    v_invalid INTEGER;
+    v_inserted INTEGER;
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM assets WHERE id = p_asset_id) THEN
+        RAISE EXCEPTION 'Asset % not found', p_asset_id;
+    END IF;
+
+    PERFORM pg_advisory_xact_lock(hashtext('apex_domains:' || p_asset_id::TEXT));
+
+    WITH normalized AS (
+        SELECT regexp_replace(regexp_replace(lower(btrim(d)), '^\*\.', ''), '\.$', '') AS domain
+        FROM unnest(p_domains) AS d
+        WHERE d IS NOT NULL
+    ),
+    valid AS (
+        SELECT DISTINCT domain
+        FROM normalized
+        WHERE domain ~ '^[a-z0-9]([a-z0-9\-]{0,61}[a-z0-9])?(\.[a-z0-9]([a-z0-9\-]{0,61}[a-z0-9])?)*$'
+    ),
+    inserted AS (
+        INSERT INTO apex_domains (asset_id, domain, is_active)
+        SELECT p_asset_id, v.domain, true
+        FROM valid v
+        WHERE NOT EXISTS (
+            SELECT 1 FROM apex_domains a
+            WHERE a.asset_id = p_asset_id AND lower(a.domain) = v.domain
+        )
+        RETURNING 1
+    )
+    SELECT
+        (SELECT COUNT(*) FROM normalized
+         WHERE domain !~ '^[a-z0-9]([a-z0-9\-]{0,61}[a-z0-9])?(\.[a-z0-9]([a-z0-9\-]{0,61}[a-z0-9])?)*$'),
+        (SELECT COUNT(*) FROM inserted)
+    INTO v_invalid, v_inserted;
+
+    RETURN jsonb_build_object(
+        'submitted', v_submitted,
+        'inserted', v_inserted,
+        'skipped', v_submitted - v_invalid - v_inserted,
+        'invalid', v_invalid
+    );
+END;
+$$;
+
+COMMENT ON FUNCTION public.bulk_insert_apex_domains(UUID, TEXT[]) IS
+    'Normalize, validate and insert apex domains for an asset in one statement; returns {submitted, inserted, skipped, invalid}. Existing domains (case-insensitive) and in-batch duplicates are skipped.';
+
+GRANT EXECUTE ON FUNCTION public.bulk_insert_apex_domains(UUID, TEXT[]) TO service_role;
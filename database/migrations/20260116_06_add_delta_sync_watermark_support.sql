@@ -0,0 +1,80 @@
+-- ============================================================================
+-- Migration: Watermark indexes and server-side change stamps for since= deltas
+-- Date: 2026-01-16
+--
+-- Problem: Downstream tools re-download complete exports every hour to find
+-- what changed. Export and list endpoints now accept `since=<watermark>` and
+-- walk each table's change column oldest first:
+--   ORDER BY <change> ASC, id ASC
+--   WHERE (<change>, id) > (:ts, :id) AND <change> <= now() - settle
+-- urls and dns_records track changes in updated_at, which had no index (a
+-- delta would scan the table) and is written by the scan containers using
+-- their own clocks, so a skewed container could stamp rows behind a
+-- watermark that was already handed out.
+--
+-- Solution:
+--   1. (updated_at, id) indexes, global and per asset, for urls and
+--      dns_records. subdomains (discovered_at) and http_probes (created_at)
+--      are already covered by the keyset indexes from 20260116_01, which
+--      Postgres scans backwards for ascending deltas.
+--   2. A trigger that replaces client-supplied updated_at values with the
+--      database clock on insert and whenever a writer bumps updated_at, so
+--      every change stamp comes from one clock and the settle window only
+--      has to cover in-flight transactions.
+-- ============================================================================
+
+-- ============================================================================
+-- STEP 1: Watermark indexes
+-- ============================================================================
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_urls_updated_watermark
+ON public.urls (updated_at, id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_urls_asset_updated_watermark
+ON public.urls (asset_id, updated_at, id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_dns_records_updated_watermark
+ON public.dns_records (updated_at, id);
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_dns_records_asset_updated_watermark
+ON public.dns_records (asset_id, updated_at, id);
+
+-- ============================================================================
+-- STEP 2: Stamp change timestamps with the database clock
+-- ============================================================================
+
+CREATE OR REPLACE FUNCTION public.stamp_change_timestamp()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    -- Inserts always get a server stamp; updates only when the writer marked
+    -- the row as changed (unchanged upserts keep their stamp and stay out of
+    -- the next delta)
+    IF TG_OP = 'INSERT' OR NEW.updated_at IS DISTINCT FROM OLD.updated_at THEN
+        NEW.updated_at = NOW();
+    END IF;
+    RETURN NEW;
+END;
+$$;
+
+COMMENT ON FUNCTION public.stamp_change_timestamp() IS
+'Replaces client-supplied updated_at with the database clock so since= delta watermarks never skip rows stamped by a skewed writer.';
+
+DROP TRIGGER IF EXISTS trigger_urls_change_stamp ON public.urls;
+CREATE TRIGGER trigger_urls_change_stamp
+BEFORE INSERT OR UPDATE ON public.urls
+FOR EACH ROW EXECUTE FUNCTION public.stamp_change_timestamp();
+
+DROP TRIGGER IF EXISTS trigger_dns_records_change_stamp ON public.dns_records;
+CREATE TRIGGER trigger_dns_records_change_stamp
+BEFORE INSERT OR UPDATE ON public.dns_records
+FOR EACH ROW EXECUTE FUNCTION public.stamp_change_timestamp();
+
+-- ============================================================================
+-- VERIFICATION
+-- ============================================================================
+-- EXPLAIN SELECT id FROM urls
+--  WHERE updated_at > now() - interval '1 hour' AND updated_at <= now() - interval '1 minute'
+--  ORDER BY updated_at, id LIMIT 1001;
+-- -> Index Scan using idx_urls_updated_watermark
@@ -0,0 +1,67 @@
+-- ============================================================================
+-- Migration: Publish scan job status changes to Supabase Realtime
+-- Date: 2026-01-16
+--
+-- Problem: Every running pipeline polled batch_scan_jobs every 10 seconds
+-- (asset_scan_jobs every 5) to find out when its containers finished. With
+-- 50 concurrent scans that is a constant stream of queries, and completion
+-- was noticed up to 10 seconds late.
+--
+-- Solution: Add the job tables to the supabase_realtime publication. The
+-- backend subscribes to UPDATEs on them over one Realtime channel per API
+-- task (services/job_events.py) and wakes the pipelines waiting on those
+-- job IDs. Containers keep writing their status exactly as before; the
+-- pipelines still re-read the tables on a slow fallback interval (and
+-- after any Realtime reconnect), so a missed event only delays detection.
+--
+-- The job tables get REPLICA IDENTITY FULL so UPDATE events carry the old
+-- row: the backend compares old and new status to ignore progress-only
+-- updates, and with the default identity old_record only has the primary
+-- key. The cost is the full old row in WAL for each update of these tables.
+-- ============================================================================
+
+-- ============================================================================
+-- STEP 1: Ensure the Realtime publication exists (self-hosted / local setups)
+-- ============================================================================
+
+DO $$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_publication WHERE pubname = 'supabase_realtime') THEN
+        CREATE PUBLICATION supabase_realtime;
+    END IF;
+END;
+$$;
+
+-- ============================================================================
+-- STEP 2: Publish job tables with full old-row images (idempotent)
+-- ============================================================================
+
+DO $$
+DECLARE
+    job_table TEXT;
+BEGIN
+    FOREACH job_table IN ARRAY ARRAY['batch_scan_jobs', 'asset_scan_jobs'] LOOP
+        -- Old values for the status comparison in job_events.handle_change
+        EXECUTE format('ALTER TABLE public.%I REPLICA IDENTITY FULL', job_table);
+
+        IF NOT EXISTS (
+            SELECT 1 FROM pg_publication_tables
+            WHERE pubname = 'supabase_realtime'
+              AND schemaname = 'public'
+              AND tablename = job_table
+        ) THEN
+            EXECUTE format('ALTER PUBLICATION supabase_realtime ADD TABLE public.%I', job_table);
+        END IF;
+    END LOOP;
+END;
+$$;
+
+-- ============================================================================
+-- VERIFICATION
+-- ============================================================================
+-- SELECT tablename FROM pg_publication_tables WHERE pubname = 'supabase_realtime';
+-- -> batch_scan_jobs, asset_scan_jobs
+--
+-- SELECT relname, relreplident FROM pg_class
+-- WHERE relname IN ('batch_scan_jobs', 'asset_scan_jobs');
+-- -> relreplident = 'f' for both
@@ -0,0 +1,57 @@
+-- ============================================================================
+-- Migration: Add per-apex-domain workload counts for batch packing
+-- Date: 2026-01-16
+--
+-- Problem: BatchOptimizer split domains into fixed-size chunks, so an apex
+-- domain with 40k known subdomains landed next to 99 tiny ones and that
+-- batch decided the scan's total runtime.
+--
+-- Solution: Return how much each apex domain produced last time (known
+-- subdomains and URLs) in one grouped call. The optimizer uses these
+-- counts as per-domain work estimates and bin-packs domains into batches
+-- with balanced predicted runtime.
+-- ============================================================================
+
+-- ============================================================================
+-- STEP 1: Subdomain and URL counts grouped by parent_domain
+-- Uses idx_subdomains_parent_domain and idx_urls_parent_domain
+-- ============================================================================
+CREATE OR REPLACE FUNCTION public.get_domain_workload_counts(p_domains TEXT[])
+RETURNS TABLE (parent_domain TEXT, subdomain_count BIGINT, url_count BIGINT)
+LANGUAGE sql
+STABLE
+SECURITY DEFINER
+SET search_path = public
+AS $$
+    WITH requested AS (
+        SELECT DISTINCT UNNEST(p_domains) AS parent_domain
+    ),
+    subdomain_counts AS (
+        SELECT s.parent_domain, COUNT(*)::BIGINT AS subdomain_count
+        FROM public.subdomains s
+        WHERE s.parent_domain = ANY(p_domains)
+        GROUP BY s.parent_domain
+    ),
+    url_counts AS (
+        SELECT u.parent_domain, COUNT(*)::BIGINT AS url_count
+        FROM public.urls u
+        WHERE u.parent_domain = ANY(p_domains)
+        GROUP BY u.parent_domain
+    )
+    SELECT
+        r.parent_domain,
+        COALESCE(sc.subdomain_count, 0) AS subdomain_count,
+        COALESCE(uc.url_count, 0) AS url_count
+    FROM requested r
+    LEFT JOIN subdomain_counts sc ON sc.parent_domain = r.parent_domain
+    LEFT JOIN url_counts uc ON uc.parent_domain = r.parent_domain
+    WHERE sc.subdomain_count IS NOT NULL OR uc.url_count IS NOT NULL;
+$$;
+
+COMMENT ON FUNCTION public.get_domain_workload_counts(TEXT[]) IS
+    'Known subdomain and URL counts per apex domain (batch packing work estimates). Domains with neither are omitted.';
+
+-- ============================================================================
+-- STEP 2: Permissions (backend calls this with the service role)
+-- ============================================================================
+GRANT EXECUTE ON FUNCTION public.get_domain_workload_counts(TEXT[]) TO service_role;